@@ -0,0 +1,103 @@
+"""
+Helpers for native async views.
+
+DRF views are synchronous: under ASGI each one holds a thread for its whole
+duration, including time spent waiting on SendGrid or an AI provider. The
+endpoints that mostly wait on outbound I/O are plain async Django views
+instead, and ``async_api_view`` gives them what DRF would have: token
+authentication, the tenant membership check and DRF's error format, using
+the async ORM. Under WSGI Django runs them through ``async_to_sync``, so
+the same views serve both deployment modes.
+"""
+import json
+from functools import wraps
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.authentication import get_authorization_header
+from rest_framework.authtoken.models import Token
+
+from apps.tenants.models import TenantUser
+
+
+async def aauthenticate(request):
+    """
+    Async ``TokenAuthentication``: the user of the request's token, None when
+    no token was sent. Raises ``AuthenticationFailed`` for a bad token.
+    """
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b"token":
+        return None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed("Invalid token header.")
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed("Invalid token header.")
+    try:
+        token = await Token.objects.select_related("user").aget(key=key)
+    except Token.DoesNotExist:
+        raise exceptions.AuthenticationFailed("Invalid token.")
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed("User inactive or deleted.")
+    return token.user
+
+
+async def ahas_tenant_access(user, tenant):
+    """Whether ``user`` may act in ``tenant`` (superusers always may)."""
+    if tenant is None or user.is_superuser:
+        return True
+    return await TenantUser.objects.filter(user=user, tenant=tenant, is_active=True).aexists()
+
+
+def json_body(request):
+    """The request's JSON body as a dict; ``ParseError`` when malformed."""
+    if not request.body:
+        return {}
+    try:
+        data = json.loads(request.body)
+    except ValueError as e:
+        raise exceptions.ParseError(f"JSON parse error - {e}")
+    if not isinstance(data, dict):
+        raise exceptions.ParseError("Expected a JSON object.")
+    return data
+
+
+def async_api_view(http_method_names):
+    """
+    Decorate an async view that requires an authenticated tenant member.
+
+    Sets ``request.user`` from the token and answers like DRF would: 405 for
+    other methods, 401 without valid credentials, 403 when the user does not
+    belong to the resolved tenant, and ``{"detail": ...}`` with the status of
+    any ``APIException`` the view raises.
+    """
+    allowed = [method.upper() for method in http_method_names]
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in allowed:
+                    raise exceptions.MethodNotAllowed(request.method)
+                user = await aauthenticate(request)
+                if user is None:
+                    raise exceptions.NotAuthenticated()
+                request.user = user
+                if not await ahas_tenant_access(user, getattr(request, "tenant", None)):
+                    return JsonResponse(
+                        {"error": "You do not have access to this tenant"},
+                        status=status.HTTP_403_FORBIDDEN,
+                    )
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as e:
+                response = JsonResponse({"detail": e.detail}, status=e.status_code)
+                if isinstance(e, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                    response["WWW-Authenticate"] = "Token"
+                return response
+
+        # Token authentication is not subject to CSRF, as in DRF
+        return csrf_exempt(wrapper)
+
+    return decorator
@@ -0,0 +1,203 @@
+"""
+In-process execution of batched GET sub-requests (``POST /api/v1/batch/``).
+
+A form that needs suppliers, products, plants, carriers, locations and
+contacts otherwise pays the full middleware stack six times: token
+authentication, tenant resolution queries and the RLS ``SET``. The batch
+view does that once and dispatches each sub-request straight to its view
+with the already authenticated user and resolved tenant attached.
+
+Sub-responses are embedded as raw JSON bytes, so nothing is parsed twice.
+With ``parallel`` they run on a thread pool; each worker thread uses its
+own database connection, scoped to the tenant with ``SET LOCAL`` inside a
+transaction, and closes it when done.
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.tenants.models import TenantUser
+
+logger = logging.getLogger(__name__)
+
+BATCH_PATH_PREFIX = "/api/v1/"
+# Headers that describe the batch POST body, not the GET sub-requests
+_BODY_META = ("CONTENT_LENGTH", "CONTENT_TYPE", "HTTP_CONTENT_TYPE", "HTTP_CONTENT_LENGTH")
+
+
+class BatchError(ValueError):
+    """The batch payload itself is invalid."""
+
+
+class SubRequest:
+    """One GET sub-request of a batch and its response."""
+
+    def __init__(self, key, path):
+        self.key = key
+        self.path, _, self.query = path.partition("?")
+        self.status = None
+        self.body = b"null"
+
+    def as_json(self):
+        return b'{"id":%s,"status":%d,"body":%s}' % (json.dumps(self.key).encode(), self.status, self.body)
+
+
+def parse_batch(payload):
+    """
+    Validate a batch payload -- ``{"requests": [...], "parallel": bool}`` or a
+    bare list -- into ``(sub_requests, parallel)``. Each item is a path
+    string or ``{"id": ..., "path": ...}``; ids default to the position.
+    """
+    if isinstance(payload, list):
+        items, parallel = payload, False
+    elif isinstance(payload, dict):
+        items, parallel = payload.get("requests"), bool(payload.get("parallel", False))
+    else:
+        raise BatchError("Expected a list of requests or {'requests': [...]}")
+    if not isinstance(items, list) or not items:
+        raise BatchError("'requests' must be a non-empty list")
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise BatchError(f"At most {settings.BATCH_MAX_REQUESTS} requests per batch")
+
+    sub_requests = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            key, path, method = index, item, "GET"
+        elif isinstance(item, dict):
+            key, path, method = item.get("id", index), item.get("path"), str(item.get("method", "GET")).upper()
+        else:
+            raise BatchError(f"Request {index}: expected a path or an object")
+        if method != "GET":
+            raise BatchError(f"Request {index}: only GET sub-requests are supported")
+        if not isinstance(path, str) or not path.startswith(BATCH_PATH_PREFIX):
+            raise BatchError(f"Request {index}: path must start with {BATCH_PATH_PREFIX}")
+        sub_requests.append(SubRequest(key, path))
+    return sub_requests, parallel
+
+
+class BatchExecutor:
+    """Run the sub-requests of one batch as the batch request's user and tenant."""
+
+    def __init__(self, request):
+        # ``request`` is the DRF request of the batch view: authentication
+        # has already run, and the tenant middleware has set request.tenant.
+        self.request = request
+        self.django_request = request._request
+        self.tenant = getattr(request, "tenant", None)
+
+    def run(self, sub_requests, parallel=False):
+        if parallel and len(sub_requests) > 1:
+            workers = min(settings.BATCH_MAX_WORKERS, len(sub_requests))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+                list(pool.map(self._run_in_thread, sub_requests))
+        else:
+            for sub_request in sub_requests:
+                self._execute(sub_request)
+        return sub_requests
+
+    def _run_in_thread(self, sub_request):
+        try:
+            with transaction.atomic():
+                if self.tenant is not None:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL app.current_tenant_id = %s", [str(self.tenant.id)])
+                self._execute(sub_request)
+        finally:
+            connection.close()
+
+    def _build(self, sub_request, match):
+        outer = self.django_request
+        sub = HttpRequest()
+        sub.method = "GET"
+        sub.path = sub.path_info = sub_request.path
+        sub.META = {key: value for key, value in outer.META.items() if key not in _BODY_META}
+        sub.META.update(REQUEST_METHOD="GET", PATH_INFO=sub_request.path, QUERY_STRING=sub_request.query)
+        sub.GET = QueryDict(sub_request.query)
+        sub.COOKIES = outer.COOKIES
+        sub.resolver_match = match
+        for attribute in ("session", "user"):
+            if hasattr(outer, attribute):
+                setattr(sub, attribute, getattr(outer, attribute))
+        # Resolved once for the whole batch
+        sub.tenant = self.tenant
+        sub.tenant_user = getattr(outer, "tenant_user", None)
+        # DRF skips its authenticators for requests carrying a forced user
+        sub._force_auth_user = self.request.user
+        sub._force_auth_token = self.request.auth
+        return sub
+
+    def _execute(self, sub_request):
+        try:
+            match = resolve(sub_request.path)
+        except Resolver404:
+            sub_request.status, sub_request.body = 404, b'{"detail":"Not found."}'
+            return
+        if match.url_name == "batch":
+            sub_request.status, sub_request.body = 400, b'{"detail":"Batches cannot be nested."}'
+            return
+
+        view = match.func
+        if iscoroutinefunction(view):
+            view = async_to_sync(view)
+        try:
+            response = view(self._build(sub_request, match), *match.args, **match.kwargs)
+            if hasattr(response, "render"):
+                response.render()
+        except Exception:
+            logger.exception(f"Batch sub-request {sub_request.path} failed")
+            sub_request.status, sub_request.body = 500, b'{"detail":"Internal server error."}'
+            return
+
+        sub_request.status = response.status_code
+        content = b"".join(response) if response.streaming else response.content
+        if "json" in response.get("Content-Type", "") and content:
+            sub_request.body = content
+        else:
+            sub_request.body = json.dumps(content.decode("utf-8", errors="replace")).encode()
+
+
+def render_batch(sub_requests):
+    """The batch response body: ``{"responses": [{id, status, body}, ...]}``."""
+    return b'{"responses":[' + b",".join(s.as_json() for s in sub_requests) + b"]}"
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several GET requests in one round trip.
+
+    Body: ``{"requests": [{"id": "suppliers", "path": "/api/v1/suppliers/"},
+    ...], "parallel": false}`` (or a bare list of paths). Authentication and
+    the tenant are resolved once for the whole batch; the response is
+    ``{"responses": [{"id", "status", "body"}, ...]}`` in request order.
+    """
+    try:
+        sub_requests, parallel = parse_batch(request.data)
+    except BatchError as e:
+        return Response(
+            {'error': 'Invalid batch', 'details': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    tenant = getattr(request, 'tenant', None)
+    if tenant and not request.user.is_superuser and not TenantUser.objects.filter(
+        user=request.user, tenant=tenant, is_active=True
+    ).exists():
+        return Response(
+            {'error': 'You do not have access to this tenant'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    BatchExecutor(request).run(sub_requests, parallel=parallel)
+    return HttpResponse(render_batch(sub_requests), content_type='application/json')
@@ -0,0 +1,226 @@
+"""
+Bulk write helpers for ProjectMeats.
+
+Thin wrappers around PostgreSQL ``COPY`` (psycopg3) for the code paths
+that move rows by the hundred thousand: load generation, CSV imports and
+batch jobs. Regular request handling should keep using the ORM.
+"""
+import enum
+import itertools
+
+from django.db import connection
+from django.db.models import JSONField
+from psycopg.types.json import Jsonb
+
+_MISSING = object()
+
+
+def reserve_ids(model, count):
+    """
+    Reserve ``count`` consecutive primary keys for ``model``.
+
+    Advances the table's identity sequence in one round trip and returns
+    the first reserved id. Rows can then be written with explicit ids via
+    ``copy_rows`` and referenced before they exist. Concurrent inserts into
+    the same table may interleave with the reservation, so only use this
+    from batch jobs.
+    """
+    if count <= 0:
+        return None
+    table = model._meta.db_table
+    pk_column = model._meta.pk.column
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, %s), "
+            "nextval(pg_get_serial_sequence(%s, %s)) + %s - 1)",
+            [table, pk_column, table, pk_column, count],
+        )
+        last = cursor.fetchone()[0]
+    return last - count + 1
+
+
+def rls_enforced(model):
+    """True when row-level security applies to the current role for ``model``."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relrowsecurity
+                   AND NOT r.rolsuper
+                   AND NOT r.rolbypassrls
+                   AND (c.relforcerowsecurity OR c.relowner <> r.oid)
+            FROM pg_class c, pg_roles r
+            WHERE c.oid = %s::regclass AND r.rolname = current_user
+            """,
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+class CopyColumns:
+    """
+    Column layout for streaming model rows through ``COPY``.
+
+    Values omitted from a row dict fall back to the field default, so
+    callers only spell out what they care about. ``get_default`` mirrors
+    what the ORM would have written for blank CharFields and callables.
+    """
+
+    def __init__(self, model, columns=None, include_pk=True):
+        self.model = model
+        fields = list(model._meta.concrete_fields)
+        if columns is not None:
+            by_name = {f.attname: f for f in fields}
+            fields = [by_name[c] for c in columns]
+        elif not include_pk:
+            fields = [f for f in fields if not f.primary_key]
+        self.fields = fields
+        self.columns = [f.column for f in fields]
+        # (attname, static default, default factory, is_json) per column;
+        # static defaults are resolved once instead of per row.
+        self._plan = []
+        for f in fields:
+            if f.has_default() and callable(f.default):
+                static, factory = None, f.get_default
+            else:
+                static, factory = f.get_default(), None
+                if isinstance(static, enum.Enum):
+                    static = static.value
+            self._plan.append((f.attname, static, factory, isinstance(f, JSONField)))
+
+    def row(self, values):
+        out = []
+        for attname, static, factory, is_json in self._plan:
+            value = values.get(attname, _MISSING)
+            if value is _MISSING:
+                value = factory() if factory else static
+            elif isinstance(value, enum.Enum):
+                value = value.value
+            if is_json and value is not None:
+                value = Jsonb(value)
+            out.append(value)
+        return out
+
+
+def copy_rows(model, rows, columns=None):
+    """
+    Stream ``rows`` (dicts keyed by attname) into ``model``'s table.
+
+    ``COPY FROM`` is rejected on tables whose RLS policies apply to the
+    current role, so in that case rows are copied into a temporary table
+    and moved with ``INSERT ... SELECT``, which the policies do check.
+    Rows without a primary key get one from the table's identity default.
+    Returns the number of rows written.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    rows = itertools.chain([first], rows)
+    layout = CopyColumns(model, columns, include_pk=model._meta.pk.attname in first)
+    table = connection.ops.quote_name(model._meta.db_table)
+    column_sql = ", ".join(connection.ops.quote_name(c) for c in layout.columns)
+    staged = rls_enforced(model)
+    target = table
+    count = 0
+
+    with connection.cursor() as cursor:
+        if staged:
+            target = connection.ops.quote_name(f"_copy_{model._meta.db_table}")
+            cursor.execute(f"DROP TABLE IF EXISTS {target}")
+            cursor.execute(f"CREATE TEMP TABLE {target} (LIKE {table} INCLUDING DEFAULTS)")
+        with cursor.copy(f"COPY {target} ({column_sql}) FROM STDIN") as copy:
+            for values in rows:
+                copy.write_row(layout.row(values))
+                count += 1
+        if staged:
+            cursor.execute(
+                f"INSERT INTO {table} ({column_sql}) SELECT {column_sql} FROM {target}"
+            )
+            cursor.execute(f"DROP TABLE {target}")
+    return count
+
+
+def insert_select_sql(model, expressions):
+    """
+    Build ``INSERT INTO <model table> (...) SELECT ...`` for ``model``.
+
+    ``expressions`` maps attnames to SQL expressions, or to ``(sql,
+    params)`` pairs for parameterized ones. Columns not mentioned get the
+    field default as a typed parameter, and the primary key is left to the
+    table's identity default. Returns ``(sql, params)``; callers append
+    ``FROM ...`` (and e.g. ``ON CONFLICT``) and its parameters.
+    """
+    fields = model._meta.concrete_fields
+    unknown = set(expressions) - {f.attname for f in fields}
+    if unknown:
+        raise ValueError(f"{model._meta.label} has no columns {sorted(unknown)}")
+    columns, selects, params = [], [], []
+    for field in fields:
+        if field.primary_key and field.attname not in expressions:
+            continue
+        columns.append(connection.ops.quote_name(field.column))
+        if field.attname in expressions:
+            expression = expressions[field.attname]
+            if isinstance(expression, tuple):
+                expression, expression_params = expression
+                params.extend(expression_params)
+            selects.append(expression)
+            continue
+        selects.append(f"%s::{field.db_type(connection)}")
+        params.append(field_default(field))
+
+    sql = (
+        f"INSERT INTO {connection.ops.quote_name(model._meta.db_table)} "
+        f"({', '.join(columns)}) SELECT {', '.join(selects)}"
+    )
+    return sql, params
+
+
+def field_default(field):
+    """``field``'s default as a value psycopg can send."""
+    value = field.get_default()
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(field, JSONField) and value is not None:
+        value = Jsonb(value)
+    return value
+
+
+def insert_from_select(model, expressions, from_sql, params=()):
+    """
+    Derive rows for ``model`` set-wise with ``INSERT ... SELECT``.
+
+    ``expressions`` maps attnames to SQL expressions over ``from_sql``
+    (everything from ``FROM`` on); see ``insert_select_sql``. Returns the
+    number of rows inserted.
+    """
+    sql, select_params = insert_select_sql(model, expressions)
+    with connection.cursor() as cursor:
+        cursor.execute(f"{sql} {from_sql}", [*select_params, *params])
+        return cursor.rowcount
+
+
+def advisory_xact_lock(keys, shared=False):
+    """
+    Take a transaction-level advisory lock on each of the string ``keys``.
+
+    For delete-then-insert recomputations of derived rows: concurrent
+    transactions recomputing the same keys would otherwise both insert and
+    one would fail on the unique constraint. Locks are taken in a fixed
+    order so overlapping key sets cannot deadlock, and are released at
+    commit or rollback. ``shared`` locks only exclude exclusive ones, e.g.
+    per-key refreshes (shared on the tenant) against a full rebuild.
+    Must run inside ``transaction.atomic()``.
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+    with connection.cursor() as cursor:
+        # OFFSET 0 keeps the sort below the lock calls
+        cursor.execute(
+            f"SELECT {function}(h) FROM "
+            "(SELECT DISTINCT hashtext(k) AS h FROM unnest(%s::text[]) AS k ORDER BY h OFFSET 0) AS ordered",
+            [keys],
+        )
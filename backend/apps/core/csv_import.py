@@ -0,0 +1,585 @@
+"""
+Bulk CSV import for tenant master data and orders.
+
+Onboarding a tenant usually means loading thousands of rows exported from
+PowerApps/Excel. Going through ModelSerializer one row at a time is far
+too slow for that, so imports run set-wise in PostgreSQL instead:
+
+1. The CSV is streamed with ``COPY`` into a temporary (unlogged,
+   transaction-scoped) staging table of text columns.
+2. Values are normalized and validated with a handful of ``UPDATE``
+   statements over the whole staging table: required fields, lengths,
+   numbers, dates, booleans, choice labels (``ProteinTypeChoices`` and
+   friends accept either the stored value or the label, case-insensitive)
+   and lookups such as ``supplier`` by name. Every problem is appended to
+   the row's ``errors`` array. Numbers must fit their column once rounded
+   to its decimal places, and must not be negative unless the entity lists
+   them in ``signed``.
+3. Rows without errors are merged into the real table in the same
+   transaction, with ``INSERT ... ON CONFLICT DO UPDATE`` on the entity's
+   natural key.
+
+Rejected rows are reported with their line number and all of their
+errors; they never abort the import. Model ``save()`` and signals are
+bypassed, just like ``QuerySet.bulk_create``.
+"""
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from apps.core.bulk import field_default, insert_select_sql
+from tenant_apps.ai_assistant.retrieval import bulk_written
+
+MAX_REPORTED_REJECTS = 1000
+
+STAGING_TABLE = "_csv_import_staging"
+
+TRUE_VALUES = ("true", "t", "yes", "y", "1")
+FALSE_VALUES = ("false", "f", "no", "n", "0")
+
+_NUMBER = r"^[+-]?([0-9]+([.][0-9]*)?|[.][0-9]+)$"
+_INTEGER = r"^[+-]?[0-9]{1,9}$"
+
+# Parses ISO (2024-03-01) and US spreadsheet (3/1/2024) dates; anything
+# else, including impossible dates such as 2024-02-30, becomes NULL. Both
+# are single-expression SQL functions without exception handlers, so the
+# planner inlines them into the set-wise UPDATEs.
+_DATE_FUNCTIONS = (
+    r"""
+    CREATE OR REPLACE FUNCTION pg_temp.csv_import_ymd(y int, m int, d int) RETURNS date
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT CASE WHEN y BETWEEN 1 AND 9999 AND m BETWEEN 1 AND 12 AND d >= 1 THEN
+            CASE WHEN d <= extract(day FROM make_date(y, m, 1) + interval '1 month - 1 day')
+                 THEN make_date(y, m, d) END
+        END
+    $$
+    """,
+    r"""
+    CREATE OR REPLACE FUNCTION pg_temp.csv_import_date(v text) RETURNS date
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT CASE
+            WHEN v ~ '^\d{4}-\d{1,2}-\d{1,2}$' THEN pg_temp.csv_import_ymd(
+                split_part(v, '-', 1)::int, split_part(v, '-', 2)::int, split_part(v, '-', 3)::int)
+            WHEN v ~ '^\d{1,2}/\d{1,2}/\d{4}$' THEN pg_temp.csv_import_ymd(
+                split_part(v, '/', 3)::int, split_part(v, '/', 1)::int, split_part(v, '/', 2)::int)
+        END
+    $$
+    """,
+)
+
+_TEXT_FIELDS = (models.CharField, models.TextField)
+_IMPORTABLE_FIELDS = _TEXT_FIELDS + (
+    models.BooleanField, models.IntegerField, models.DecimalField, models.DateField,
+)
+
+
+class CSVImportError(Exception):
+    """The file as a whole cannot be imported (bad header, unknown entity)."""
+
+
+@dataclass(frozen=True)
+class Lookup:
+    """A CSV column resolved to a foreign key by matching another model."""
+
+    name: str
+    model: str
+    match: str
+    target: str
+    case_insensitive: bool = True
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """
+    How one entity is imported.
+
+    ``key`` is the natural key rows are matched on. With ``conflict`` set,
+    the merge is ``ON CONFLICT (<conflict>)``; without it (suppliers and
+    customers have no unique constraint) existing rows are matched on the
+    case-insensitive key and updated, the rest inserted.
+    """
+
+    model: str
+    key: str
+    conflict: tuple = ()
+    key_case_insensitive: bool = False
+    lookups: tuple = ()
+    globally_unique_key: bool = False
+    exclude: tuple = ()
+    signed: tuple = ()
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+
+_SUPPLIER = Lookup("supplier", "suppliers.Supplier", "name", "supplier_id")
+_CUSTOMER = Lookup("customer", "customers.Customer", "name", "customer_id")
+_CARRIER = Lookup("carrier", "carriers.Carrier", "name", "carrier_id")
+_PRODUCT = Lookup("product", "products.Product", "product_code", "product_id", case_insensitive=False)
+
+IMPORT_SPECS = {
+    "suppliers": ImportSpec("suppliers.Supplier", key="name", key_case_insensitive=True),
+    "customers": ImportSpec("customers.Customer", key="name", key_case_insensitive=True),
+    "products": ImportSpec(
+        "products.Product",
+        key="product_code",
+        conflict=("product_code",),
+        globally_unique_key=True,
+        lookups=(_SUPPLIER,),
+    ),
+    "purchase_orders": ImportSpec(
+        "purchase_orders.PurchaseOrder",
+        key="order_number",
+        conflict=("tenant_id", "order_number"),
+        lookups=(_SUPPLIER, _PRODUCT, _CARRIER),
+        exclude=("outstanding_amount", "payment_status"),
+    ),
+    "sales_orders": ImportSpec(
+        "sales_orders.SalesOrder",
+        key="our_sales_order_num",
+        conflict=("tenant_id", "our_sales_order_num"),
+        lookups=(_SUPPLIER, _CUSTOMER, _PRODUCT, _CARRIER),
+        exclude=("outstanding_amount", "payment_status"),
+    ),
+}
+
+
+@dataclass
+class ImportResult:
+    entity: str
+    total: int = 0
+    inserted: int = 0
+    updated: int = 0
+    rejects: list = field(default_factory=list)
+    rejected: int = 0
+    ignored_columns: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            "entity": self.entity,
+            "total": self.total,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "rejected": self.rejected,
+            "rejects": self.rejects,
+            "rejects_truncated": self.rejected > len(self.rejects),
+            "ignored_columns": self.ignored_columns,
+        }
+
+
+def _normalize_header(value):
+    return re.sub(r"[^a-z0-9]+", "_", value.strip().lower()).strip("_")
+
+
+def importable_fields(model, spec):
+    """Concrete scalar fields a CSV may set, keyed by attname."""
+    fields = {}
+    for f in model._meta.concrete_fields:
+        if f.primary_key or f.is_relation or f.attname in spec.exclude:
+            continue
+        if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False):
+            continue
+        if isinstance(f, _IMPORTABLE_FIELDS) and not isinstance(f, models.DateTimeField):
+            fields[f.attname] = f
+    return fields
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class CSVImporter:
+    """Import one CSV file for one tenant. Use ``run()``."""
+
+    def __init__(self, entity, tenant):
+        if entity not in IMPORT_SPECS:
+            raise CSVImportError(
+                f"Unknown import type '{entity}'. Choose from: {', '.join(sorted(IMPORT_SPECS))}"
+            )
+        self.entity = entity
+        self.spec = IMPORT_SPECS[entity]
+        self.model = self.spec.get_model()
+        self.tenant = tenant
+        self.fields = importable_fields(self.model, self.spec)
+        self.lookups = {lookup.name: lookup for lookup in self.spec.lookups}
+        self.columns = []  # staging columns, in CSV order
+
+    # Header -----------------------------------------------------------------
+
+    def _header_aliases(self):
+        aliases = {}
+        for attname, f in self.fields.items():
+            aliases[_normalize_header(attname)] = attname
+            aliases[_normalize_header(str(f.verbose_name))] = attname
+        for name, lookup in self.lookups.items():
+            aliases[name] = name
+            aliases[f"{name}_{lookup.match}"] = name
+            aliases[_normalize_header(str(self.model._meta.get_field(name).verbose_name))] = name
+        return aliases
+
+    def _map_header(self, header, result):
+        aliases = self._header_aliases()
+        positions = {}
+        for index, raw in enumerate(header):
+            name = aliases.get(_normalize_header(raw))
+            if name is None or name in positions:
+                result.ignored_columns.append(raw)
+                continue
+            positions[name] = index
+        missing = [
+            name for name in self._required_columns() if name not in positions
+        ]
+        if missing:
+            raise CSVImportError(f"Missing required column(s): {', '.join(missing)}")
+        return positions
+
+    def _required_columns(self):
+        required = [
+            attname for attname, f in self.fields.items()
+            if not f.blank and not f.has_default()
+        ]
+        required += [
+            name for name, lookup in self.lookups.items()
+            if not self.model._meta.get_field(name).null
+        ]
+        return required
+
+    # Staging ----------------------------------------------------------------
+
+    def _stage(self, cursor, reader, positions, width, result):
+        self.columns = list(positions)
+        column_sql = "".join(f", {_quote(c)} text" for c in self.columns)
+        lookup_sql = "".join(f", {_quote(n + '__id')} bigint" for n in self.columns if n in self.lookups)
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ("
+            f"line integer PRIMARY KEY, problem text, errors text[] NOT NULL DEFAULT '{{}}'"
+            f"{column_sql}{lookup_sql}) ON COMMIT DROP"
+        )
+        copy_columns = ", ".join(["line", "problem", *(_quote(c) for c in self.columns)])
+        with cursor.copy(f"COPY {STAGING_TABLE} ({copy_columns}) FROM STDIN") as copy:
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                problem = None
+                if len(row) < width:
+                    row = row + [""] * (width - len(row))
+                elif len(row) > width and any(cell.strip() for cell in row[width:]):
+                    problem = f"row has {len(row)} cells but the header has {width}"
+                # PostgreSQL text cannot hold NUL characters
+                copy.write_row([
+                    reader.line_num, problem, *(row[positions[c]].replace("\x00", "").strip() for c in self.columns)
+                ])
+                result.total += 1
+        cursor.execute(f"ANALYZE {STAGING_TABLE}")
+
+    # Validation -------------------------------------------------------------
+
+    def _reject(self, cursor, message_sql, where, params=()):
+        cursor.execute(
+            f"UPDATE {STAGING_TABLE} s SET errors = array_append(errors, {message_sql}) WHERE {where}",
+            params,
+        )
+
+    def _normalized_sql(self, name, f):
+        """SQL rewriting staged ``name`` into its canonical text form, or None."""
+        column = f"s.{_quote(name)}"
+        if f.choices:
+            cases = {}
+            for value, label in f.flatchoices:
+                for text in (str(value), str(label)):
+                    cases.setdefault(text.strip().lower(), str(value))
+            whens = " ".join(f"WHEN {_literal(k)} THEN {_literal(v)}" for k, v in cases.items())
+            return f"CASE lower({column}) {whens} ELSE {column} END"
+        if isinstance(f, models.DecimalField):
+            return f"replace(replace({column}, ',', ''), '$', '')"
+        if isinstance(f, models.IntegerField):
+            return f"replace({column}, ',', '')"
+        if isinstance(f, models.DateField):
+            return f"coalesce(to_char(pg_temp.csv_import_date({column}), 'YYYY-MM-DD'), {column})"
+        return None
+
+    def _checks(self, name, f):
+        """``(condition, message)`` SQL pairs that reject a normalized value."""
+        column = f"s.{_quote(name)}"
+        label = _literal(name)
+        shown = f"{label} || ': ' || quote_literal({column})"
+        checks = []
+        if not f.blank and not f.has_default():
+            checks.append((f"{column} = ''", f"{label} || ' is required'"))
+        if f.choices:
+            values = ", ".join(_literal(str(value)) for value, _ in f.flatchoices)
+            checks.append((f"{column} <> '' AND {column} NOT IN ({values})", f"{shown} || ' is not a valid choice'"))
+        elif isinstance(f, models.BooleanField):
+            allowed = ", ".join(_literal(v) for v in TRUE_VALUES + FALSE_VALUES)
+            checks.append((f"{column} <> '' AND lower({column}) NOT IN ({allowed})", f"{shown} || ' is not yes/no'"))
+        elif isinstance(f, models.DecimalField):
+            limit = 10 ** (f.max_digits - f.decimal_places)
+            # Compared as stored: 99999999.999 rounds to 100000000.00
+            checks.append((
+                f"{column} <> '' AND (CASE WHEN {column} ~ '{_NUMBER}' "
+                f"THEN round(abs({column}::numeric), {f.decimal_places}) >= {limit} ELSE true END)",
+                f"{shown} || ' is not a valid number'",
+            ))
+        elif isinstance(f, models.IntegerField):
+            checks.append((f"{column} <> '' AND {column} !~ '{_INTEGER}'", f"{shown} || ' is not a whole number'"))
+        if isinstance(f, (models.DecimalField, models.IntegerField)) and name not in self.spec.signed:
+            checks.append((
+                f"CASE WHEN {column} ~ '{_NUMBER}' THEN {column}::numeric < 0 ELSE false END",
+                f"{shown} || ' must not be negative'",
+            ))
+        elif isinstance(f, models.DateField):
+            checks.append((
+                f"{column} <> '' AND pg_temp.csv_import_date({column}) IS NULL",
+                f"{shown} || ' is not a date (YYYY-MM-DD or M/D/YYYY)'",
+            ))
+        elif isinstance(f, _TEXT_FIELDS) and f.max_length:
+            checks.append((f"length({column}) > {f.max_length}", f"{label} || ' is longer than {f.max_length} characters'"))
+        return checks
+
+    def _lookup_checks(self, lookup):
+        column = f"s.{_quote(lookup.name)}"
+        checks = []
+        if not self.model._meta.get_field(lookup.name).null:
+            checks.append((f"{column} = ''", f"{_literal(lookup.name)} || ' is required'"))
+        checks.append((
+            f"{column} <> '' AND s.{_quote(lookup.name + '__id')} IS NULL",
+            f"'unknown {lookup.name} ' || quote_literal({column})",
+        ))
+        return checks
+
+    def _validate(self, cursor):
+        """
+        Resolve lookups, then normalize every column in one pass and
+        collect every row's errors in a second one.
+        """
+        checks = [("s.problem IS NOT NULL", "s.problem")]
+        assignments = []
+        for name in self.columns:
+            if name in self.lookups:
+                self._resolve_lookup(cursor, self.lookups[name])
+                checks += self._lookup_checks(self.lookups[name])
+                continue
+            f = self.fields[name]
+            normalized = self._normalized_sql(name, f)
+            if normalized:
+                assignments.append(f"{_quote(name)} = {normalized}")
+            checks += self._checks(name, f)
+        if assignments:
+            cursor.execute(f"UPDATE {STAGING_TABLE} s SET {', '.join(assignments)}")
+        errors = ", ".join(f"CASE WHEN {condition} THEN {message} END" for condition, message in checks)
+        cursor.execute(
+            f"UPDATE {STAGING_TABLE} s SET errors = array_remove(ARRAY[{errors}]::text[], NULL) "
+            f"WHERE {' OR '.join(f'({condition})' for condition, _ in checks)}"
+        )
+        self._reject_duplicate_keys(cursor)
+
+    def _resolve_lookup(self, cursor, lookup):
+        related = apps.get_model(lookup.model)
+        table = _quote(related._meta.db_table)
+        match = _quote(related._meta.get_field(lookup.match).column)
+        column = f"s.{_quote(lookup.name)}"
+        if lookup.case_insensitive:
+            key, staged = f"lower({match})", f"lower({column})"
+        else:
+            key, staged = match, column
+        cursor.execute(
+            f"UPDATE {STAGING_TABLE} s SET {_quote(lookup.name + '__id')} = r.id "
+            f"FROM (SELECT {key} AS k, min(id) AS id FROM {table} WHERE tenant_id = %s GROUP BY 1) r "
+            f"WHERE {column} <> '' AND r.k = {staged}",
+            [self.tenant.id],
+        )
+
+    def _key_sql(self, alias="s"):
+        column = f"{alias}.{_quote(self.spec.key)}"
+        return f"lower({column})" if self.spec.key_case_insensitive else column
+
+    def _reject_duplicate_keys(self, cursor):
+        key = self._key_sql()
+        cursor.execute(
+            f"UPDATE {STAGING_TABLE} s SET errors = array_append(errors, "
+            f"'duplicate {self.spec.key} (first on line ' || d.first_line || ')') "
+            f"FROM (SELECT line, min(line) OVER (PARTITION BY {key}) AS first_line "
+            f"FROM {STAGING_TABLE} s WHERE {key} <> '') d "
+            f"WHERE d.line = s.line AND d.first_line <> s.line"
+        )
+        if self.spec.globally_unique_key:
+            table = _quote(self.model._meta.db_table)
+            target = _quote(self.model._meta.get_field(self.spec.key).column)
+            self._reject(
+                cursor,
+                f"'{self.spec.key} ' || quote_literal(s.{_quote(self.spec.key)}) || ' belongs to another tenant'",
+                f"EXISTS (SELECT 1 FROM {table} t WHERE t.{target} = s.{_quote(self.spec.key)} "
+                f"AND t.tenant_id <> %s)",
+                [self.tenant.id],
+            )
+
+    # Merge ------------------------------------------------------------------
+
+    def _value_sql(self, name):
+        """Typed SQL for staging column ``name``; blanks become the field default."""
+        if name in self.lookups:
+            return f"s.{_quote(name + '__id')}", []
+        f = self.fields[name]
+        column = f"s.{_quote(name)}"
+        if isinstance(f, models.BooleanField):
+            value = f"lower({column}) IN ({', '.join(_literal(v) for v in TRUE_VALUES)})"
+        elif isinstance(f, (models.DecimalField, models.IntegerField, models.DateField)):
+            value = f"{column}::{f.db_type(connection)}"
+        else:
+            value = column
+        return (
+            f"CASE WHEN {column} = '' THEN %s::{f.db_type(connection)} ELSE {value} END",
+            [field_default(f)],
+        )
+
+    def _merge(self, cursor, result):
+        now = timezone.now()
+        expressions = {}
+        for name in self.columns:
+            attname = self.lookups[name].target if name in self.lookups else name
+            expressions[attname] = self._value_sql(name)
+        expressions["tenant_id"] = ("%s::uuid", [self.tenant.id])
+        for f in self.model._meta.concrete_fields:
+            if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False):
+                expressions[f.attname] = ("%s::timestamptz", [now])
+        insert_sql, insert_params = insert_select_sql(self.model, expressions)
+
+        updated_columns = [
+            f.column for f in self.model._meta.concrete_fields
+            if f.attname in expressions and f.attname != "tenant_id"
+            and not getattr(f, "auto_now_add", False) and f.attname != self.spec.key
+        ]
+        valid = f"FROM {STAGING_TABLE} s WHERE cardinality(s.errors) = 0"
+
+        if self.spec.conflict:
+            assignments = ", ".join(f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in updated_columns)
+            table = _quote(self.model._meta.db_table)
+            cursor.execute(
+                f"{insert_sql} {valid} ORDER BY s.line "
+                f"ON CONFLICT ({', '.join(_quote(c) for c in self.spec.conflict)}) "
+                f"DO UPDATE SET {assignments} WHERE {table}.tenant_id = EXCLUDED.tenant_id "
+                f"RETURNING (xmax = 0)",
+                insert_params,
+            )
+            outcomes = [row[0] for row in cursor.fetchall()]
+            result.inserted = sum(outcomes)
+            result.updated = len(outcomes) - result.inserted
+            return
+
+        # No unique constraint to conflict on: serialize concurrent imports
+        # for this tenant and table, update matches, then insert the rest.
+        table = _quote(self.model._meta.db_table)
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(%s))",
+            [f"csv_import:{self.model._meta.db_table}:{self.tenant.id}"],
+        )
+        key_column = _quote(self.model._meta.get_field(self.spec.key).column)
+        target_key = f"lower(t.{key_column})" if self.spec.key_case_insensitive else f"t.{key_column}"
+        assignments, update_params = [], []
+        for f in self.model._meta.concrete_fields:
+            if f.column in updated_columns:
+                sql, params = expressions[f.attname]
+                assignments.append(f"{_quote(f.column)} = {sql}")
+                update_params.extend(params)
+        cursor.execute(
+            f"UPDATE {table} t SET {', '.join(assignments)} "
+            f"FROM {STAGING_TABLE} s WHERE cardinality(s.errors) = 0 "
+            f"AND t.tenant_id = %s AND {target_key} = {self._key_sql()} RETURNING s.line",
+            [*update_params, self.tenant.id],
+        )
+        result.updated = len({row[0] for row in cursor.fetchall()})
+        cursor.execute(
+            f"{insert_sql} {valid} AND NOT EXISTS (SELECT 1 FROM {table} t "
+            f"WHERE t.tenant_id = %s AND {target_key} = {self._key_sql()}) ORDER BY s.line",
+            [*insert_params, self.tenant.id],
+        )
+        result.inserted = cursor.rowcount
+
+    # Driver -----------------------------------------------------------------
+
+    def _collect_rejects(self, cursor, result):
+        cursor.execute(f"SELECT count(*) FROM {STAGING_TABLE} WHERE cardinality(errors) > 0")
+        result.rejected = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT line, errors FROM {STAGING_TABLE} WHERE cardinality(errors) > 0 "
+            f"ORDER BY line LIMIT %s",
+            [MAX_REPORTED_REJECTS],
+        )
+        result.rejects = [{"line": line, "errors": errors} for line, errors in cursor.fetchall()]
+
+    def run(self, source):
+        """
+        Import ``source`` (a text or binary file object, or a path).
+
+        Returns an ``ImportResult``; raises ``CSVImportError`` when the
+        header is unusable or the file is not valid CSV. Everything runs
+        in one transaction.
+        """
+        result = ImportResult(entity=self.entity)
+        with _open_csv(source) as handle:
+            reader = csv.reader(handle)
+            try:
+                header = next(reader, None)
+            except csv.Error as e:
+                raise CSVImportError(f"Line {reader.line_num}: {e}")
+            if not header:
+                raise CSVImportError("The file is empty")
+            positions = self._map_header(header, result)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute("SET LOCAL app.current_tenant_id = %s", [str(self.tenant.id)])
+                for statement in _DATE_FUNCTIONS:
+                    cursor.execute(statement)
+                try:
+                    self._stage(cursor, reader, positions, len(header), result)
+                except csv.Error as e:
+                    raise CSVImportError(f"Line {reader.line_num}: {e}")
+                self._validate(cursor)
+                self._merge(cursor, result)
+                bulk_written(self.tenant, self.model)
+                self._collect_rejects(cursor, result)
+                # ON COMMIT DROP only fires at the outermost commit.
+                cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+        return result
+
+
+class _open_csv:
+    """Context manager yielding a text stream for ``source``."""
+
+    def __init__(self, source):
+        self.source = source
+        self.close = None
+
+    def __enter__(self):
+        source = self.source
+        if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+            handle = open(source, newline="", encoding="utf-8-sig")
+            self.close = handle.close
+            return handle
+        if hasattr(source, "open") and hasattr(source, "chunks"):  # UploadedFile
+            source.open("rb")
+            source = source.file
+        if isinstance(source, io.TextIOBase):
+            return source
+        handle = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+        self.close = handle.detach
+        return handle
+
+    def __exit__(self, *exc_info):
+        if self.close:
+            self.close()
+        return False
+
+
+def import_csv(entity, tenant, source):
+    """Import ``source`` as ``entity`` rows for ``tenant``; see ``CSVImporter``."""
+    return CSVImporter(entity, tenant).run(source)
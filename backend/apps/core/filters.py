@@ -0,0 +1,144 @@
+"""
+Filter backends for Core app.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import SAFE_METHODS
+
+from apps.core.serializers import FieldSelectionMixin
+
+
+class QueryPlan:
+    """Columns and relations a serializer will read from a queryset."""
+
+    def __init__(self):
+        self.only = set()
+        self.select_related = set()
+        self.prefetch_related = set()
+        # False once a field reads something we cannot map to a column
+        # (method fields, properties, ``source='*'``); .only() is unsafe then.
+        self.complete = True
+
+    def apply(self, queryset, restrict_columns):
+        if restrict_columns and self.complete:
+            queryset = queryset.select_related(None).prefetch_related(None)
+            if self.select_related:
+                queryset = queryset.select_related(*sorted(self.select_related))
+            if self.prefetch_related:
+                queryset = queryset.prefetch_related(*sorted(self.prefetch_related))
+            return queryset.only(*sorted(self.only or {"pk"}))
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(self.prefetch_related))
+        return queryset
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def plan_serializer(serializer, model, plan=None, prefix=""):
+    """
+    Walk the fields ``serializer`` will render and record the columns,
+    ``select_related`` and ``prefetch_related`` paths they need.
+    """
+    plan = plan if plan is not None else QueryPlan()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            plan.complete = False
+            continue
+        current, path = model, prefix
+        attrs = field.source_attrs
+        for index, attr in enumerate(attrs):
+            model_field = _model_field(current, attr)
+            last = index == len(attrs) - 1
+            if model_field is None:
+                plan.complete = False
+                break
+            if model_field.many_to_many or model_field.one_to_many:
+                plan.prefetch_related.add(path + attr)
+                # Prefetched rows are loaded whole; only their own relations matter.
+                if last and isinstance(field, serializers.ListSerializer):
+                    nested = plan_serializer(field.child, model_field.related_model)
+                    for related in nested.select_related | nested.prefetch_related:
+                        plan.prefetch_related.add(f"{path}{attr}__{related}")
+                break
+            if not model_field.is_relation or (model_field.one_to_one and not model_field.concrete):
+                if model_field.concrete:
+                    plan.only.add(path + attr)
+                else:
+                    plan.complete = False
+                break
+            # Forward foreign key / one-to-one
+            if last:
+                nested = field.child if isinstance(field, serializers.ListSerializer) else field
+                if isinstance(nested, serializers.Serializer):
+                    plan.only.add(path + attr)
+                    plan.select_related.add(path + attr)
+                    plan_serializer(nested, model_field.related_model, plan, f"{path}{attr}__")
+                elif isinstance(field, serializers.RelatedField):
+                    plan.only.add(path + attr)
+                else:
+                    # Renders the related object itself (e.g. str()); load it whole.
+                    plan.select_related.add(path + attr)
+                    plan.complete = False
+                break
+            plan.only.add(path + attr)
+            plan.select_related.add(path + attr)
+            current, path = model_field.related_model, f"{path}{attr}__"
+    return plan
+
+
+class FieldSelectionFilter(BaseFilterBackend):
+    """
+    Push a ``FieldSelectionMixin`` serializer's ``?fields=`` / ``?expand=``
+    selection down into the queryset of read requests.
+
+    Relations read by the rendered fields are joined with
+    ``select_related`` or prefetched; with ``?fields=`` the query is also
+    limited to the selected columns via ``.only()``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if request.method not in SAFE_METHODS or not hasattr(view, "get_serializer"):
+            return queryset
+        serializer = view.get_serializer()
+        if not isinstance(serializer, FieldSelectionMixin):
+            return queryset
+        fields, expand = serializer.get_selection()
+        if fields is None and not expand:
+            return queryset
+        plan = plan_serializer(serializer, queryset.model)
+        return plan.apply(queryset, restrict_columns=fields is not None)
+
+    def get_schema_operation_parameters(self, view):
+        try:
+            serializer_class = view.get_serializer_class()
+        except AssertionError:
+            return []
+        if not issubclass(serializer_class, FieldSelectionMixin):
+            return []
+        expandable = sorted(getattr(serializer_class.Meta, "expandable_fields", {}))
+        parameters = [{
+            "name": "fields",
+            "required": False,
+            "in": "query",
+            "description": "Comma separated fields to return; dotted names select fields of expanded relations",
+            "schema": {"type": "string"},
+        }]
+        if expandable:
+            parameters.append({
+                "name": "expand",
+                "required": False,
+                "in": "query",
+                "description": f"Comma separated relations to embed: {', '.join(expandable)}",
+                "schema": {"type": "string"},
+            })
+        return parameters
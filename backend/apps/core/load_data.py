@@ -0,0 +1,650 @@
+"""
+Synthetic load data generator for ProjectMeats.
+
+Produces large, referentially consistent tenant datasets for benchmarks
+and query-plan work. Small registry rows (tenants, users, memberships) go
+through ``bulk_create``; everything else is streamed with ``COPY`` using
+primary keys reserved up front, so foreign keys can be filled in without
+reading anything back.
+
+The output is fully determined by ``seed`` and ``anchor_date``: the same
+arguments always produce the same rows, which keeps benchmark baselines
+comparable between runs.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+
+from apps.core.bulk import copy_rows, insert_from_select, reserve_ids
+from apps.core.models import (
+    EdibleInedibleChoices,
+    FreshOrFrozenChoices,
+    PackageTypeChoices,
+    ProteinTypeChoices,
+)
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.ai_assistant.retrieval import bulk_written
+from tenant_apps.carriers.models import Carrier
+from tenant_apps.cockpit.models import ActivityLog, ScheduledCall
+from tenant_apps.contacts.models import Contact
+from tenant_apps.customers.models import Customer
+from tenant_apps.invoices.models import Claim, Invoice, PaymentTransaction
+from tenant_apps.locations.models import Location
+from tenant_apps.plants.models import Plant
+from tenant_apps.products.models import Product
+from tenant_apps.purchase_orders.models import (
+    CarrierLane,
+    CarrierPurchaseOrder,
+    ColdStorageEntry,
+    ColdStoragePosition,
+    PurchaseOrder,
+)
+from tenant_apps.sales_orders.models import SalesOrder
+from tenant_apps.suppliers.models import Supplier
+
+DEFAULT_SEED = 42
+DEFAULT_ANCHOR_DATE = datetime(2025, 6, 30).date()
+DEFAULT_PASSWORD = "loadtest123"
+HISTORY_DAYS = 730
+
+COMPANY_WORDS = [
+    "Prairie", "Summit", "Heartland", "Riverbend", "Golden", "Lone Star",
+    "Blue Ridge", "Cedar", "Iron Horse", "Red Rock", "Harvest", "Pioneer",
+    "Frontier", "Silver Creek", "Midwest", "Coastal", "High Plains", "Oak Valley",
+]
+COMPANY_SUFFIXES = ["Meats", "Packing", "Provisions", "Foods", "Protein Co", "Farms", "Cold Storage"]
+FIRST_NAMES = ["Ana", "Ben", "Carla", "Dev", "Elena", "Frank", "Grace", "Hugo", "Ivy", "Jamal", "Kim", "Luis"]
+LAST_NAMES = ["Garcia", "Smith", "Nguyen", "Johnson", "Patel", "Brown", "Lopez", "Miller", "Davis", "Wilson"]
+CUTS = ["Chuck Roll", "Brisket", "Ribeye", "Trim 80/20", "Leg Quarters", "Wings", "Pork Belly", "Loin", "Shoulder", "Ground"]
+CITIES = [
+    ("Omaha", "NE", "68102"), ("Dallas", "TX", "75201"), ("Chicago", "IL", "60601"),
+    ("Denver", "CO", "80202"), ("Atlanta", "GA", "30303"), ("Des Moines", "IA", "50309"),
+    ("Amarillo", "TX", "79101"), ("Fresno", "CA", "93721"), ("Kansas City", "MO", "64105"),
+    ("Greeley", "CO", "80631"), ("Sioux City", "IA", "51101"), ("Memphis", "TN", "38103"),
+]
+NOTE_SNIPPETS = [
+    "Confirmed pickup window with dock.", "Requested updated pricing for next week.",
+    "Carrier running late, ETA pushed two hours.", "Customer asked for COA copy.",
+    "Left voicemail about outstanding invoice.", "Negotiated freight rate.",
+]
+
+PO_STATUSES = [("pending", 15), ("approved", 20), ("delivered", 60), ("cancelled", 5)]
+SO_STATUSES = [("pending", 10), ("confirmed", 15), ("in_transit", 10), ("delivered", 60), ("cancelled", 5)]
+PAYMENT_METHODS = ["wire", "ach", "check", "credit_card"]
+
+
+@dataclass
+class TenantLoadSummary:
+    tenant: Tenant
+    username: str
+    counts: dict = field(default_factory=dict)
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def _money(value):
+    return Decimal(value).quantize(Decimal("0.01"))
+
+
+class LoadDataGenerator:
+    """
+    Generate ``tenants`` tenants with ``orders`` purchase and sales orders each.
+
+    Master data scales with order volume (roughly one supplier and one
+    customer per 40 orders, one product per 20) so list pages and search
+    behave like a proportionally sized production tenant. ``sizes`` can
+    pin individual counts (``{"suppliers": 1, ...}``).
+    """
+
+    def __init__(
+        self,
+        tenants,
+        orders,
+        seed=DEFAULT_SEED,
+        prefix="load",
+        anchor_date=DEFAULT_ANCHOR_DATE,
+        password=DEFAULT_PASSWORD,
+        sizes=None,
+        log=None,
+    ):
+        self.tenant_count = tenants
+        self.orders = orders
+        self.seed = seed
+        self.prefix = prefix
+        self.anchor_date = anchor_date
+        self.password = password
+        self.sizes = sizes or {}
+        self.log = log or (lambda message: None)
+        self.anchor = datetime.combine(anchor_date, time(12, 0), tzinfo=dt_timezone.utc)
+
+    # Sizing -----------------------------------------------------------------
+
+    @property
+    def supplier_count(self):
+        return self.sizes.get("suppliers", max(5, self.orders // 40))
+
+    @property
+    def customer_count(self):
+        return self.sizes.get("customers", max(5, self.orders // 40))
+
+    @property
+    def product_count(self):
+        return self.sizes.get("products", max(10, self.orders // 20))
+
+    @property
+    def carrier_count(self):
+        return self.sizes.get("carriers", max(3, self.orders // 200))
+
+    @property
+    def plant_count(self):
+        return self.sizes.get("plants", max(2, self.orders // 400))
+
+    # Entry point ------------------------------------------------------------
+
+    def run(self):
+        password_hash = make_password(self.password)
+        summaries = []
+        for index in range(self.tenant_count):
+            # Each tenant gets its own RNG so tenant N is identical no matter
+            # how many tenants are generated alongside it.
+            rng = random.Random(f"{self.seed}:{index}")
+            with transaction.atomic():
+                summary = self._generate_tenant(index, rng, password_hash)
+            summaries.append(summary)
+            self.log(summary)
+        return summaries
+
+    # Helpers ----------------------------------------------------------------
+
+    def _timestamp(self, rng, days_back=HISTORY_DAYS):
+        return self.anchor - timedelta(days=rng.randrange(days_back), minutes=rng.randrange(1440))
+
+    def _company(self, rng, n):
+        return f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {n}"
+
+    def _copy(self, model, rows, summary):
+        count = copy_rows(model, rows)
+        bulk_written(summary.tenant, model)
+        summary.counts[model._meta.label] = summary.counts.get(model._meta.label, 0) + count
+        return count
+
+    def _generate_tenant(self, index, rng, password_hash):
+        slug = f"{self.prefix}-{index + 1}"
+        tenant = Tenant.objects.create(
+            name=f"Load Tenant {index + 1}",
+            slug=slug,
+            contact_email=f"{slug}@loadtest.local",
+            is_trial=False,
+        )
+        username = f"{slug}-user"
+        user = User.objects.bulk_create([
+            User(username=username, email=f"{username}@loadtest.local", password=password_hash)
+        ])[0]
+        TenantUser.objects.bulk_create([TenantUser(tenant=tenant, user=user, role="admin")])
+        summary = TenantLoadSummary(tenant=tenant, username=username)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL app.current_tenant_id = %s", [str(tenant.id)])
+
+        code = f"{self.prefix.upper()}{index + 1}"
+        ids = {
+            "supplier": reserve_ids(Supplier, self.supplier_count),
+            "customer": reserve_ids(Customer, self.customer_count),
+            "plant": reserve_ids(Plant, self.plant_count),
+            "carrier": reserve_ids(Carrier, self.carrier_count),
+            "product": reserve_ids(Product, self.product_count),
+            "contact": reserve_ids(Contact, self.supplier_count + self.customer_count),
+            "location": reserve_ids(Location, self.supplier_count + self.customer_count),
+            "purchase_order": reserve_ids(PurchaseOrder, self.orders),
+            "sales_order": reserve_ids(SalesOrder, self.orders),
+        }
+
+        self._copy(Supplier, self._suppliers(rng, tenant, ids), summary)
+        self._copy(Customer, self._customers(rng, tenant, ids), summary)
+        self._copy(Plant, self._plants(rng, tenant, ids, code), summary)
+        self._copy(Carrier, self._carriers(rng, tenant, ids, code), summary)
+        self._copy(Product, self._products(rng, tenant, ids, code), summary)
+        self._copy(Contact, self._contacts(rng, tenant, ids), summary)
+        self._copy(Location, self._locations(rng, tenant, ids), summary)
+
+        products = self._product_catalog(rng, ids)
+        self._copy(PurchaseOrder, self._purchase_orders(rng, tenant, ids, products), summary)
+
+        # Sales orders drive invoices and payments; keep only the compact
+        # tuples needed downstream instead of whole rows.
+        delivered = []
+        self._copy(SalesOrder, self._sales_orders(rng, tenant, ids, products, delivered), summary)
+
+        invoice_start = reserve_ids(Invoice, len(delivered))
+        payments = []
+        self._copy(Invoice, self._invoices(rng, tenant, delivered, invoice_start, payments), summary)
+        self._copy(PaymentTransaction, self._payments(rng, tenant, payments), summary)
+        self._copy(ActivityLog, self._activity_logs(rng, tenant, ids, user.id), summary)
+        self._copy(ScheduledCall, self._scheduled_calls(rng, tenant, ids, user.id), summary)
+        self._derive(tenant, code, summary)
+        return summary
+
+    # Master data ------------------------------------------------------------
+
+    def _suppliers(self, rng, tenant, ids):
+        for n in range(self.supplier_count):
+            city, state, zip_code = rng.choice(CITIES)
+            created = self._timestamp(rng)
+            yield {
+                "id": ids["supplier"] + n,
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "name": self._company(rng, n + 1),
+                "contact_person": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "email": f"sales{n + 1}@supplier.loadtest.local",
+                "phone": f"555-{rng.randrange(1000, 9999)}",
+                "city": city,
+                "state": state,
+                "zip_code": zip_code,
+                "country": "USA",
+                "plant_id": ids["plant"] + rng.randrange(self.plant_count),
+                "edible_inedible": rng.choice(EdibleInedibleChoices.values),
+                "fresh_or_frozen": rng.choice(FreshOrFrozenChoices.values),
+                "package_type": rng.choice(PackageTypeChoices.values),
+                "preferred_protein_types": rng.sample(ProteinTypeChoices.values, 2),
+                "credit_limits": "Net 30",
+            }
+
+    def _customers(self, rng, tenant, ids):
+        for n in range(self.customer_count):
+            city, state, zip_code = rng.choice(CITIES)
+            created = self._timestamp(rng)
+            yield {
+                "id": ids["customer"] + n,
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "name": self._company(rng, n + 1),
+                "contact_person": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "email": f"buyer{n + 1}@customer.loadtest.local",
+                "phone": f"555-{rng.randrange(1000, 9999)}",
+                "city": city,
+                "state": state,
+                "zip_code": zip_code,
+                "country": "USA",
+                "industry": rng.choice(["Retail", "Wholesaler", "Food Service", "Processor"]),
+                "preferred_protein_types": rng.sample(ProteinTypeChoices.values, 2),
+                "industry_array": [],
+                "credit_limits": "Net 30",
+            }
+
+    def _plants(self, rng, tenant, ids, code):
+        for n in range(self.plant_count):
+            city, state, zip_code = rng.choice(CITIES)
+            created = self._timestamp(rng)
+            yield {
+                "id": ids["plant"] + n,
+                "tenant_id": tenant.id,
+                "supplier_id": ids["supplier"] + rng.randrange(self.supplier_count),
+                "name": f"{city} Plant {n + 1}",
+                "code": f"{code}-PL{n + 1:04d}",
+                "plant_est_num": f"EST {rng.randrange(100, 99999)}",
+                "city": city,
+                "state": state,
+                "zip_code": zip_code,
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    def _carriers(self, rng, tenant, ids, code):
+        for n in range(self.carrier_count):
+            created = self._timestamp(rng)
+            yield {
+                "id": ids["carrier"] + n,
+                "tenant_id": tenant.id,
+                "name": f"{rng.choice(COMPANY_WORDS)} Freight {n + 1}",
+                "code": f"{code}-CR{n + 1:04d}",
+                "mc_number": f"MC{rng.randrange(100000, 999999)}",
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    def _products(self, rng, tenant, ids, code):
+        for n in range(self.product_count):
+            protein = rng.choice(ProteinTypeChoices.values)
+            created = self._timestamp(rng)
+            yield {
+                "id": ids["product"] + n,
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "product_code": f"{code}-{n + 1:06d}",
+                "description_of_product_item": f"{protein} {rng.choice(CUTS)} {rng.randrange(10, 90)}lb",
+                "type_of_protein": protein,
+                "fresh_or_frozen": rng.choice(FreshOrFrozenChoices.values),
+                "package_type": rng.choice(PackageTypeChoices.values),
+                "edible_or_inedible": EdibleInedibleChoices.EDIBLE,
+                "supplier_id": ids["supplier"] + rng.randrange(self.supplier_count),
+                "unit_weight": _money(rng.uniform(10, 80)),
+            }
+
+    def _contacts(self, rng, tenant, ids):
+        n = 0
+        for kind, count in (("supplier", self.supplier_count), ("customer", self.customer_count)):
+            for offset in range(count):
+                created = self._timestamp(rng)
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                yield {
+                    "id": ids["contact"] + n,
+                    "tenant_id": tenant.id,
+                    "created_on": created,
+                    "modified_on": created,
+                    f"{kind}_id": ids[kind] + offset,
+                    "first_name": first,
+                    "last_name": last,
+                    "email": f"{first.lower()}.{last.lower()}{n}@loadtest.local",
+                    "contact_type": "Sales" if kind == "supplier" else "Receiving",
+                }
+                n += 1
+
+    def _locations(self, rng, tenant, ids):
+        # One pickup location per supplier followed by one delivery location
+        # per customer, so location ids can be derived from either side.
+        n = 0
+        for kind, count, location_type in (
+            ("supplier", self.supplier_count, "warehouse"),
+            ("customer", self.customer_count, "distribution_center"),
+        ):
+            for offset in range(count):
+                city, state, zip_code = rng.choice(CITIES)
+                created = self._timestamp(rng)
+                yield {
+                    "id": ids["location"] + n,
+                    "tenant_id": tenant.id,
+                    "created_on": created,
+                    "modified_on": created,
+                    "name": f"{city} {location_type.replace('_', ' ').title()} {offset + 1}",
+                    "code": f"LOC-{n + 1:05d}",
+                    "location_type": location_type,
+                    "city": city,
+                    "state": state,
+                    "zip_code": zip_code,
+                    f"{kind}_id": ids[kind] + offset,
+                }
+                n += 1
+
+    def _product_catalog(self, rng, ids):
+        """Per-product (id, protein, price per lb) used to price order lines."""
+        return [
+            (ids["product"] + n, rng.choice(ProteinTypeChoices.values), rng.uniform(1.2, 6.5))
+            for n in range(self.product_count)
+        ]
+
+    # Transactions -----------------------------------------------------------
+
+    def _order_line(self, rng, products):
+        product_id, protein, price = rng.choice(products)
+        quantity = rng.randrange(20, 1200)
+        weight = _money(quantity * rng.uniform(30, 60))
+        return product_id, protein, quantity, weight, price
+
+    def _purchase_orders(self, rng, tenant, ids, products):
+        for n in range(self.orders):
+            supplier = rng.randrange(self.supplier_count)
+            product_id, protein, quantity, weight, price = self._order_line(rng, products)
+            total = _money(weight * Decimal(str(round(price * 0.9, 4))))
+            status = _weighted(rng, PO_STATUSES)
+            created = self._timestamp(rng)
+            yield {
+                "id": ids["purchase_order"] + n,
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "order_number": f"PO{created.year}-{n + 1:07d}",
+                "supplier_id": ids["supplier"] + supplier,
+                "product_id": product_id,
+                "total_amount": total,
+                "status": status,
+                "payment_status": "unpaid",
+                "outstanding_amount": total,
+                "order_date": created.date(),
+                "delivery_date": created.date() + timedelta(days=rng.randrange(2, 14)),
+                "pick_up_date": created.date() + timedelta(days=rng.randrange(1, 7)),
+                "carrier_id": ids["carrier"] + rng.randrange(self.carrier_count),
+                "plant_id": ids["plant"] + rng.randrange(self.plant_count),
+                "pick_up_location_id": ids["location"] + supplier,
+                "delivery_location_id": ids["location"] + self.supplier_count + rng.randrange(self.customer_count),
+                "quantity": quantity,
+                "total_weight": weight,
+                "price_per_unit": _money(price),
+                "type_of_protein": protein,
+                "fresh_or_frozen": rng.choice(FreshOrFrozenChoices.values),
+                "item_description": f"{protein} {rng.choice(CUTS)}",
+            }
+
+    def _sales_orders(self, rng, tenant, ids, products, delivered):
+        for n in range(self.orders):
+            customer = rng.randrange(self.customer_count)
+            product_id, protein, quantity, weight, price = self._order_line(rng, products)
+            total = _money(weight * Decimal(str(round(price, 4))))
+            status = _weighted(rng, SO_STATUSES)
+            created = self._timestamp(rng)
+            order_id = ids["sales_order"] + n
+            number = f"SO{created.year}-{n + 1:07d}"
+            if status == "delivered":
+                delivered.append((order_id, number, ids["customer"] + customer, product_id, protein, quantity, weight, price, total, created))
+            yield {
+                "id": order_id,
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "our_sales_order_num": number,
+                "date_time_stamp": created,
+                "supplier_id": ids["supplier"] + rng.randrange(self.supplier_count),
+                "customer_id": ids["customer"] + customer,
+                "carrier_id": ids["carrier"] + rng.randrange(self.carrier_count),
+                "product_id": product_id,
+                "plant_id": ids["plant"] + rng.randrange(self.plant_count),
+                "pick_up_location_id": ids["location"] + rng.randrange(self.supplier_count),
+                "delivery_location_id": ids["location"] + self.supplier_count + customer,
+                "pick_up_date": created.date() + timedelta(days=rng.randrange(1, 7)),
+                "delivery_date": created.date() + timedelta(days=rng.randrange(2, 14)),
+                "quantity": quantity,
+                "total_weight": weight,
+                "status": status,
+                "payment_status": "unpaid",
+                "total_amount": total,
+                "outstanding_amount": total,
+            }
+
+    def _invoices(self, rng, tenant, delivered, invoice_start, payments):
+        for n, (order_id, number, customer_id, product_id, protein, quantity, weight, price, total, created) in enumerate(delivered):
+            invoice_id = invoice_start + n
+            issued = created + timedelta(days=rng.randrange(1, 10))
+            paid_roll = rng.random()
+            if paid_roll < 0.55:
+                paid = total
+            elif paid_roll < 0.75:
+                paid = _money(total * Decimal(str(round(rng.uniform(0.2, 0.8), 2))))
+            else:
+                paid = Decimal("0.00")
+            if paid:
+                payments.append((invoice_id, paid, issued.date() + timedelta(days=rng.randrange(5, 45))))
+            outstanding = total - paid
+            due = issued.date() + timedelta(days=30)
+            if outstanding == 0:
+                status, payment_status = "paid", "paid"
+            else:
+                status = "overdue" if due < self.anchor_date else "sent"
+                payment_status = "partial" if paid else "unpaid"
+            yield {
+                "id": invoice_id,
+                "tenant_id": tenant.id,
+                "created_on": issued,
+                "modified_on": issued,
+                "invoice_number": f"INV{issued.year}-{n + 1:07d}",
+                "date_time_stamp": issued,
+                "customer_id": customer_id,
+                "sales_order_id": order_id,
+                "product_id": product_id,
+                "due_date": due,
+                "our_sales_order_num": number,
+                "type_of_protein": protein,
+                "quantity": quantity,
+                "total_weight": weight,
+                "unit_price": _money(price),
+                "total_amount": total,
+                "status": status,
+                "payment_status": payment_status,
+                "outstanding_amount": outstanding,
+            }
+
+    def _payments(self, rng, tenant, payments):
+        for invoice_id, amount, paid_on in payments:
+            created = datetime.combine(paid_on, time(15, 0), tzinfo=dt_timezone.utc)
+            yield {
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "invoice_id": invoice_id,
+                "amount": amount,
+                "payment_date": paid_on,
+                "payment_method": rng.choice(PAYMENT_METHODS),
+                "reference_number": f"REF{rng.randrange(10**7, 10**8)}",
+            }
+
+    def _activity_logs(self, rng, tenant, ids, user_id):
+        entities = [
+            ("supplier", ids["supplier"], self.supplier_count),
+            ("customer", ids["customer"], self.customer_count),
+            ("purchase_order", ids["purchase_order"], self.orders),
+            ("sales_order", ids["sales_order"], self.orders),
+        ]
+        for _ in range(self.orders):
+            entity_type, start, count = rng.choice(entities)
+            created = self._timestamp(rng)
+            yield {
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "entity_type": entity_type,
+                "entity_id": start + rng.randrange(count),
+                "title": "Call log",
+                "content": rng.choice(NOTE_SNIPPETS),
+                "created_by_id": user_id,
+                "is_pinned": rng.random() < 0.02,
+            }
+
+    def _scheduled_calls(self, rng, tenant, ids, user_id):
+        entities = [
+            ("supplier", ids["supplier"], self.supplier_count),
+            ("customer", ids["customer"], self.customer_count),
+        ]
+        for n in range(max(1, self.orders // 10)):
+            entity_type, start, count = rng.choice(entities)
+            scheduled = self.anchor + timedelta(days=rng.randrange(-30, 30), minutes=15 * rng.randrange(32, 72))
+            created = scheduled - timedelta(days=rng.randrange(1, 14))
+            duration = rng.choice([15, 30, 45, 60])
+            yield {
+                "tenant_id": tenant.id,
+                "created_on": created,
+                "modified_on": created,
+                "entity_type": entity_type,
+                "entity_id": start + rng.randrange(count),
+                "title": f"Follow-up call {n + 1}",
+                "scheduled_for": scheduled,
+                "duration_minutes": duration,
+                "span": DateTimeTZRange(scheduled, scheduled + timedelta(minutes=duration)),
+                "is_completed": scheduled < self.anchor,
+                "assigned_to_id": user_id,
+                "created_by_id": user_id,
+            }
+
+    # Derived rows -----------------------------------------------------------
+
+    def _derive(self, tenant, code, summary):
+        """
+        Build logistics and claims rows set-wise from the orders just written.
+
+        Selection keys off the deterministic order/invoice numbers, so the
+        derived rows are as reproducible as the rest of the dataset.
+        """
+        tenant_id = str(tenant.id)
+        summary.counts[CarrierPurchaseOrder._meta.label] = insert_from_select(
+            CarrierPurchaseOrder,
+            {
+                "created_on": "po.created_on",
+                "modified_on": "po.created_on",
+                "tenant_id": "po.tenant_id",
+                "date_time_stamp_created": "po.created_on",
+                "carrier_id": "po.carrier_id",
+                "supplier_id": "po.supplier_id",
+                "plant_id": "po.plant_id",
+                "pick_up_location_id": "po.pick_up_location_id",
+                "delivery_location_id": "po.delivery_location_id",
+                "product_id": "po.product_id",
+                "linked_order_id": "po.id",
+                "pick_up_date": "po.pick_up_date",
+                "delivery_date": "po.delivery_date",
+                "our_carrier_po_num": "'C' || po.order_number",
+                "carrier_name": "c.name",
+                "type_of_protein": "po.type_of_protein",
+                "fresh_or_frozen": "po.fresh_or_frozen",
+                "total_weight": "po.total_weight",
+                "quantity": "po.quantity",
+            },
+            "FROM purchase_orders_purchaseorder po "
+            "JOIN carriers_carrier c ON c.id = po.carrier_id "
+            "WHERE po.tenant_id = %s AND po.status IN ('approved', 'delivered')",
+            [tenant_id],
+        )
+        # The inserts bypass the per-order lane and position updates
+        summary.counts[CarrierLane._meta.label] = len(CarrierLane.rebuild(tenant))
+        summary.counts[ColdStorageEntry._meta.label] = insert_from_select(
+            ColdStorageEntry,
+            {
+                "created_on": "po.created_on",
+                "modified_on": "po.created_on",
+                "tenant_id": "po.tenant_id",
+                "date_time_stamp_created": "po.created_on",
+                "supplier_po_id": "po.id",
+                "product_id": "po.product_id",
+                "status_of_load": "'TBD - Not Matched'",
+                "item_production_date": "po.order_date",
+                "item_description": "po.item_description",
+                "finished_weight": "round(po.total_weight * 0.97, 2)",
+                "shrink": "round(po.total_weight * 0.03, 2)",
+                "boxing_cost": "round(po.total_weight * 0.04, 2)",
+                "cold_storage_cost": "round(po.total_weight * 0.02, 2)",
+                "total_cost": "round(po.total_amount + po.total_weight * 0.06, 2)",
+            },
+            "FROM purchase_orders_purchaseorder po "
+            "WHERE po.tenant_id = %s AND po.status = 'delivered' "
+            "AND right(po.order_number, 1) IN ('0', '5')",
+            [tenant_id],
+        )
+        summary.counts[ColdStoragePosition._meta.label] = len(ColdStoragePosition.rebuild(tenant))
+        summary.counts[Claim._meta.label] = insert_from_select(
+            Claim,
+            {
+                "created_on": "i.created_on",
+                "modified_on": "i.created_on",
+                "tenant_id": "i.tenant_id",
+                "claim_number": f"'CLM-{code}-' || i.invoice_number",
+                "claim_type": "'receivable'",
+                "customer_id": "i.customer_id",
+                "sales_order_id": "i.sales_order_id",
+                "invoice_id": "i.id",
+                "reason": "'Short weight on delivery'",
+                "claimed_amount": "round(i.total_amount * 0.05, 2)",
+                "claim_date": "i.due_date",
+            },
+            "FROM invoices_invoice i "
+            "WHERE i.tenant_id = %s AND right(i.invoice_number, 1) = '7'",
+            [tenant_id],
+        )
@@ -0,0 +1,82 @@
+"""
+Management command to audit API query counts and plans for one tenant.
+
+Usage:
+    python manage.py audit_queries --tenant load-1
+    python manage.py audit_queries --tenant load-1 --min-rows 0 --output /tmp/audit.json
+
+Issues GET requests against every list/detail route as an admin of the
+tenant, inside a transaction that is rolled back. Exits non-zero when a
+list endpoint's query count grows with page size or a sequential scan on
+a large tenant table is found (see apps/core/query_audit.py).
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from apps.core.query_audit import DEFAULT_PAGE_SIZES, QueryAuditor, write_report
+from apps.tenants.models import Tenant, TenantUser
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Audit query counts and EXPLAIN plans of every API route for a tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', required=True, help='Tenant slug to audit as')
+        parser.add_argument(
+            '--page-sizes',
+            type=lambda value: tuple(int(v) for v in value.split(',')),
+            default=DEFAULT_PAGE_SIZES,
+            help='Comma separated list page sizes to compare (default: 1,50)',
+        )
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=None,
+            help='Report sequential scans on tenant tables with at least this many rows '
+                 '(default: QUERY_AUDIT_SEQ_SCAN_MIN_ROWS)',
+        )
+        parser.add_argument('--output', help='Report path (default: QUERY_AUDIT_REPORT)')
+
+    def handle(self, *args, **options):
+        try:
+            tenant = Tenant.objects.get(slug=options['tenant'])
+        except Tenant.DoesNotExist:
+            raise CommandError(f"Tenant '{options['tenant']}' not found")
+        membership = (
+            TenantUser.objects.filter(tenant=tenant, is_active=True)
+            .select_related('user')
+            .order_by('role', 'id')
+            .first()
+        )
+        if membership is None:
+            raise CommandError(f"Tenant '{tenant.slug}' has no active users to audit as")
+
+        self.stdout.write(f'🔎 Auditing API queries for {tenant.slug} as {membership.user.username}...')
+        auditor = QueryAuditor(
+            tenant,
+            membership.user,
+            page_sizes=options['page_sizes'],
+            seq_scan_min_rows=options['min_rows'],
+        )
+        report = None
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+                report = auditor.run()
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        path = write_report(report, options['output'])
+        audited = [r for r in report['routes'] if not r['skipped']]
+        self.stdout.write(f'  {len(audited)} route(s) audited, report written to {path}')
+        if report['problems']:
+            for route, problems in report['problems'].items():
+                for problem in problems:
+                    self.stdout.write(self.style.ERROR(f'  ✗ {route}: {problem}'))
+            raise CommandError(f"{len(report['problems'])} route(s) with query problems")
+        self.stdout.write(self.style.SUCCESS('✅ No query problems found'))
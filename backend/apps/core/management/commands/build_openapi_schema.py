@@ -0,0 +1,36 @@
+"""
+Management command to prebuild the cached OpenAPI schema.
+
+Usage:
+    python manage.py build_openapi_schema
+    python manage.py build_openapi_schema --lang en --lang es
+
+Generates the schema for the current code version once and writes the YAML
+and JSON renderings served by /api/schema/ (see apps/core/schema.py), so the
+first visitor of /api/docs/ after a deployment does not pay for generation.
+"""
+from django.core.management.base import BaseCommand
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+from apps.core.schema import code_version, schema_cache
+
+
+class Command(BaseCommand):
+    help = 'Generate and cache the OpenAPI schema for the current code version'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lang',
+            action='append',
+            default=None,
+            help='Also build the schema for this language (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        for lang in [None] + (options['lang'] or []):
+            for renderer in (OpenApiYamlRenderer(), OpenApiJsonRenderer()):
+                content, etag = schema_cache.get(renderer, lang)
+                self.stdout.write(
+                    f"{schema_cache.path(renderer, lang)}: {len(content):,} bytes, ETag {etag}"
+                )
+        self.stdout.write(self.style.SUCCESS(f'OpenAPI schema cached for code version {code_version()}'))
@@ -0,0 +1,111 @@
+"""
+Management command to generate high-volume synthetic data for load testing.
+
+Usage:
+    python manage.py generate_load_data --tenants 5 --orders 200000
+    python manage.py generate_load_data --tenants 2 --orders 1000 --seed 7 --prefix bench
+
+Unlike the seed_* commands (per-row get_or_create, meant for demos), this
+streams rows with PostgreSQL COPY and is deterministic for a given seed.
+"""
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.load_data import (
+    DEFAULT_ANCHOR_DATE,
+    DEFAULT_PASSWORD,
+    DEFAULT_SEED,
+    LoadDataGenerator,
+)
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Generate large, deterministic synthetic tenant datasets with COPY'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenants',
+            type=int,
+            default=3,
+            help='Number of tenants to generate (default: 3)',
+        )
+        parser.add_argument(
+            '--orders',
+            type=int,
+            default=1000,
+            help='Purchase orders and sales orders per tenant (default: 1000)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=DEFAULT_SEED,
+            help=f'Random seed; identical seeds produce identical data (default: {DEFAULT_SEED})',
+        )
+        parser.add_argument(
+            '--prefix',
+            type=str,
+            default='load',
+            help="Tenant slug prefix; tenants are named '<prefix>-1'..'<prefix>-N' (default: load)",
+        )
+        parser.add_argument(
+            '--anchor-date',
+            type=date.fromisoformat,
+            default=DEFAULT_ANCHOR_DATE,
+            help=f'Latest business date in the generated history (default: {DEFAULT_ANCHOR_DATE})',
+        )
+        parser.add_argument(
+            '--password',
+            type=str,
+            default=DEFAULT_PASSWORD,
+            help='Password for the generated tenant users',
+        )
+
+    def handle(self, *args, **options):
+        tenants = options['tenants']
+        orders = options['orders']
+        prefix = options['prefix']
+        if tenants < 1 or orders < 1:
+            raise CommandError('--tenants and --orders must be positive')
+
+        slugs = [f'{prefix}-{i + 1}' for i in range(tenants)]
+        existing = list(Tenant.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+        existing += list(User.objects.filter(
+            username__in=[f'{slug}-user' for slug in slugs]
+        ).values_list('username', flat=True))
+        if existing:
+            raise CommandError(
+                f"Already generated: {', '.join(sorted(existing))}. Use another --prefix."
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚚 Generating {tenants} tenant(s) x {orders} orders (seed={options["seed"]})...'
+        ))
+        started = time.monotonic()
+
+        def log(summary):
+            rows = sum(summary.counts.values())
+            self.stdout.write(f'  ✓ {summary.tenant.slug}: {rows:,} rows (login: {summary.username})')
+            if options['verbosity'] >= 2:
+                for label, count in summary.counts.items():
+                    self.stdout.write(f'      {label}: {count:,}')
+
+        generator = LoadDataGenerator(
+            tenants=tenants,
+            orders=orders,
+            seed=options['seed'],
+            prefix=prefix,
+            anchor_date=options['anchor_date'],
+            password=options['password'],
+            log=log,
+        )
+        summaries = generator.run()
+
+        elapsed = time.monotonic() - started
+        total = sum(sum(s.counts.values()) for s in summaries)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Generated {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 0.001):,.0f} rows/s)'
+        ))
@@ -0,0 +1,61 @@
+"""
+Management command to bulk import a CSV export into a tenant.
+
+Usage:
+    python manage.py import_csv suppliers suppliers.csv --tenant acme
+    python manage.py import_csv purchase_orders pos.csv --tenant acme --rejects rejects.csv
+
+Same pipeline as ``POST /api/v1/<resource>/import/``: COPY into a staging
+table, set-wise validation, one-transaction merge (apps/core/csv_import.py).
+"""
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.csv_import import IMPORT_SPECS, CSVImporter, CSVImportError
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Bulk import suppliers, customers, products or orders from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('entity', choices=sorted(IMPORT_SPECS), help='What the CSV contains')
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument('--tenant', required=True, help='Tenant slug to import into')
+        parser.add_argument('--rejects', help='Write rejected lines and their errors to this CSV')
+
+    def handle(self, *args, **options):
+        try:
+            tenant = Tenant.objects.get(slug=options['tenant'])
+        except Tenant.DoesNotExist:
+            raise CommandError(f"Tenant '{options['tenant']}' not found")
+
+        self.stdout.write(f"📥 Importing {options['entity']} into {tenant.slug}...")
+        started = time.monotonic()
+        try:
+            result = CSVImporter(options['entity'], tenant).run(options['path'])
+        except (CSVImportError, OSError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        if result.ignored_columns:
+            self.stdout.write(self.style.WARNING(
+                f"  Ignored columns: {', '.join(result.ignored_columns)}"
+            ))
+        for reject in result.rejects[:20]:
+            self.stdout.write(f"  ✗ line {reject['line']}: {'; '.join(reject['errors'])}")
+        if result.rejected > 20:
+            self.stdout.write(f'  ... {result.rejected - 20} more rejected line(s)')
+        if options['rejects'] and result.rejects:
+            with open(options['rejects'], 'w', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['line', 'errors'])
+                for reject in result.rejects:
+                    writer.writerow([reject['line'], '; '.join(reject['errors'])])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {result.total:,} rows in {elapsed:.1f}s: {result.inserted:,} inserted, '
+            f'{result.updated:,} updated, {result.rejected:,} rejected'
+        ))
@@ -0,0 +1,334 @@
+"""
+Middleware for Core app.
+
+All middleware here is both sync and async capable, so under ASGI
+(projectmeats/asgi.py) async views run on the event loop without Django
+wrapping the chain in a worker thread.
+"""
+import re
+import secrets
+import struct
+import time
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+try:  # Optional: brotli is preferred when installed, gzip otherwise
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+class _QueryCounter:
+    """``connection.execute_wrapper`` hook that counts and times queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.elapsed += time.perf_counter() - started
+
+
+class QueryCountMiddleware:
+    """
+    Report per-request database work in response headers.
+
+    Adds ``X-Query-Count`` and ``X-Query-Time-Ms`` so load tests can track
+    queries per request from the outside. Disabled unless the
+    QUERY_COUNT_HEADER setting is on; never enable it on public hosts.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_COUNT_HEADER", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        return self._add_headers(response, counter)
+
+    async def __acall__(self, request):
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = await self.get_response(request)
+        return self._add_headers(response, counter)
+
+    @staticmethod
+    def _add_headers(response, counter):
+        response["X-Query-Count"] = str(counter.count)
+        response["X-Query-Time-Ms"] = f"{counter.elapsed * 1000:.2f}"
+        return response
+
+
+COMPRESSIBLE_TYPES = _lazy_re_compile(
+    r"^(text/|application/(json|javascript|xml|x-ndjson|csv|vnd\.[\w.+-]*\+json)|[\w.+-]+/[\w.+-]+\+(json|xml))"
+)
+_ACCEPT_ENCODING = _lazy_re_compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+
+
+def accepted_encodings(header):
+    """Parse ``Accept-Encoding`` into ``{coding: q}`` (codings with q=0 dropped)."""
+    accepted = {}
+    for item in (header or "").split(","):
+        match = _ACCEPT_ENCODING.fullmatch(item)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted[match.group(1).lower()] = quality
+    return accepted
+
+
+def _random_padding(max_random_bytes):
+    """1 to ``max_random_bytes`` filler bytes, of random length; b"" when off."""
+    if not max_random_bytes:
+        return b""
+    return b"a" * (secrets.randbelow(max_random_bytes) + 1)
+
+
+class _Gzip:
+    """
+    Streaming gzip. The header is written here rather than by zlib so that,
+    as Django's ``GZipMiddleware`` does, it can carry a random-length file
+    name as BREACH padding.
+    """
+
+    name = "gzip"
+
+    def __init__(self, level, max_random_bytes=0):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        padding = _random_padding(max_random_bytes)
+        flags = 0x08 if padding else 0  # FNAME
+        self._header = b"\x1f\x8b\x08" + bytes([flags]) + b"\x00\x00\x00\x00\x00\xff"
+        if padding:
+            self._header += padding + b"\x00"
+        self._crc = 0
+        self._size = 0
+
+    def _take_header(self):
+        header, self._header = self._header, b""
+        return header
+
+    def compress(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        return self._take_header() + self._compressor.compress(data)
+
+    def flush(self):
+        return self._take_header() + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        trailer = struct.pack("<II", self._crc, self._size & 0xFFFFFFFF)
+        return self._take_header() + self._compressor.flush(zlib.Z_FINISH) + trailer
+
+
+class _Brotli:
+    """
+    Streaming brotli. Brotli has no header field to pad, so the BREACH
+    padding goes in metadata meta-blocks (RFC 7932, section 9.2), which
+    decoders skip: the stream is flushed to a byte boundary after its
+    header and the padding follows in blocks of at most 256 bytes.
+    """
+
+    name = "br"
+
+    def __init__(self, quality, max_random_bytes=0):
+        self._compressor = brotli.Compressor(quality=quality)
+        padding = _random_padding(max_random_bytes)
+        self._header = b""
+        if padding:
+            self._header = self._compressor.process(b"") + self._compressor.flush()
+            for start in range(0, len(padding), 256):
+                block = padding[start:start + 256]
+                # ISLAST=0, MNIBBLES=0 (metadata), MSKIPBYTES=1, MSKIPLEN-1
+                self._header += (0x16 | (len(block) - 1) << 6).to_bytes(2, "little") + block
+
+    def _take_header(self):
+        header, self._header = self._header, b""
+        return header
+
+    def compress(self, data):
+        return self._take_header() + self._compressor.process(data)
+
+    def flush(self):
+        return self._take_header() + self._compressor.flush()
+
+    def finish(self):
+        return self._take_header() + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress dynamic responses with brotli (when installed) or gzip.
+
+    WhiteNoise only serves pre-compressed static files; this covers API
+    responses. The coding is negotiated from ``Accept-Encoding``. Bodies
+    under the minimum size, non-text content types and responses that
+    already carry a ``Content-Encoding`` are left alone.
+    ``StreamingHttpResponse`` content is compressed chunk by chunk and
+    flushed after each chunk, so streams are never buffered.
+
+    BREACH: compressed bodies that mix a secret with reflected input leak
+    the secret through their length. Like Django's ``GZipMiddleware``, which
+    this replaces, every compressed body gets 1 to ``max_random_bytes`` of
+    random-length padding (a gzip file name, or brotli metadata), which
+    makes the attack much slower. Routes whose bodies carry credentials
+    (auth tokens, invitation tokens) are not compressed at all; see
+    RESPONSE_COMPRESSION_ROUTES.
+
+    Configured with the RESPONSE_COMPRESSION* settings. Per-route overrides
+    in RESPONSE_COMPRESSION_ROUTES are ``(path regex, options)`` pairs,
+    first match wins; options may set ``enabled``, ``min_size``,
+    ``gzip_level``, ``brotli_quality`` and ``max_random_bytes``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "RESPONSE_COMPRESSION", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        self.defaults = {
+            "enabled": True,
+            "min_size": settings.RESPONSE_COMPRESSION_MIN_SIZE,
+            "gzip_level": settings.RESPONSE_COMPRESSION_GZIP_LEVEL,
+            "brotli_quality": settings.RESPONSE_COMPRESSION_BROTLI_QUALITY,
+            "max_random_bytes": getattr(settings, "RESPONSE_COMPRESSION_MAX_RANDOM_BYTES", 100),
+        }
+        self.routes = [
+            (re.compile(pattern), options)
+            for pattern, options in getattr(settings, "RESPONSE_COMPRESSION_ROUTES", [])
+        ]
+
+    def options_for(self, path):
+        for pattern, options in self.routes:
+            if pattern.search(path):
+                return {**self.defaults, **options}
+        return self.defaults
+
+    def _compressor(self, request, options):
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if brotli is not None and "br" in accepted and accepted["br"] >= accepted.get("gzip", 0):
+            return _Brotli(options["brotli_quality"], options["max_random_bytes"])
+        if "gzip" in accepted:
+            return _Gzip(options["gzip_level"], options["max_random_bytes"])
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        options = self.options_for(request.path_info)
+        if not options["enabled"] or response.has_header("Content-Encoding"):
+            return response
+        if not COMPRESSIBLE_TYPES.match(response.get("Content-Type", "")):
+            return response
+        if not response.streaming and len(response.content) < options["min_size"]:
+            return response
+
+        # The response varies on Accept-Encoding whether or not we compress it
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressor = self._compressor(request, options)
+        if compressor is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._compress_async(compressor, response.streaming_content)
+            else:
+                response.streaming_content = self._compress_stream(compressor, response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            compressed = compressor.compress(response.content) + compressor.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # Compressed bytes differ from the original: make a strong ETag weak
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = compressor.name
+        return response
+
+    @staticmethod
+    def _compress_stream(compressor, chunks):
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+    @staticmethod
+    async def _compress_async(compressor, chunks):
+        async for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    ``WhiteNoiseMiddleware`` that can also run in an async middleware chain.
+
+    WhiteNoise 6.6 is sync only, which makes Django run every request below
+    it -- async views included -- in a thread under ASGI. Static lookups are
+    in-memory (or a stat with autorefresh in development), so the async
+    path simply does them inline.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,108 @@
+"""
+ViewSet mixins shared by the tenant apps.
+"""
+import logging
+
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+
+from apps.core.csv_import import CSVImportError, import_csv
+from apps.core.values_serializer import compile_values_serializer
+
+logger = logging.getLogger(__name__)
+
+
+class CSVImportMixin:
+    """
+    Adds ``POST /<resource>/import/`` to a tenant ViewSet.
+
+    Takes a multipart upload with the CSV in the ``file`` field and imports
+    it set-wise (see apps/core/csv_import.py). Valid rows are inserted or
+    updated by natural key; the response lists per-row rejects.
+    """
+
+    csv_import_entity = None
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_csv(self, request):
+        tenant = getattr(request, 'tenant', None)
+        if not tenant:
+            return Response(
+                {'error': 'Tenant context is required to import'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'error': "Upload the CSV in the 'file' field"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            result = import_csv(self.csv_import_entity, tenant, upload)
+        except (CSVImportError, UnicodeDecodeError) as e:
+            return Response(
+                {'error': 'Import failed', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        logger.info(
+            f'CSV import of {self.csv_import_entity} for tenant {tenant.slug} by '
+            f'{request.user.username}: {result.inserted} inserted, {result.updated} updated, '
+            f'{result.rejected} rejected'
+        )
+        return Response(result.as_dict())
+
+
+class _CountedValues:
+    """
+    ``values()`` rows that paginate like the queryset they came from: counting
+    the values queryset would keep all of its joins.
+    """
+
+    def __init__(self, queryset, rows):
+        self.queryset = queryset
+        self.rows = rows
+        self.ordered = rows.ordered
+
+    def count(self):
+        return self.queryset.count()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+
+class ValuesListMixin:
+    """
+    Serves ``list`` from ``queryset.values()`` instead of model instances.
+
+    Used automatically when the list serializer (after any ``?fields=`` /
+    ``?expand=`` selection) only reads columns; the rendered JSON is the
+    same as the serializer's (see apps/core/values_serializer.py).
+    Otherwise falls back to the regular ``list``.
+    """
+
+    values_list_enabled = True
+
+    def get_values_plan(self):
+        if not self.values_list_enabled:
+            return None
+        params = self.request.query_params
+        return compile_values_serializer(
+            self.get_serializer_class(), params.get('fields') or None, params.get('expand') or None
+        )
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.select_related(None).prefetch_related(None).values(*plan.paths)
+        page = self.paginate_queryset(_CountedValues(queryset, rows))
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
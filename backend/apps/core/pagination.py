@@ -0,0 +1,62 @@
+"""
+Pagination classes for Core app.
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from apps.core.renderers import ColumnarJSONRenderer, choice_columns, encode_columnar
+
+
+class ColumnarPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination that also serves the columnar format.
+
+    When ``ColumnarJSONRenderer`` was negotiated the page is encoded as
+    ``{count, next, previous, columns, rows, dictionaries}`` and clients
+    may ask for up to ``COLUMNAR_MAX_PAGE_SIZE`` rows with ``?page_size=``,
+    so grids can load thousands of rows per request. JSON responses are
+    unchanged.
+    """
+
+    page_size_query_param = "page_size"
+
+    def _is_columnar(self, request):
+        return isinstance(getattr(request, "accepted_renderer", None), ColumnarJSONRenderer)
+
+    def get_page_size(self, request):
+        if not self._is_columnar(request):
+            return self.page_size
+        self.max_page_size = settings.COLUMNAR_MAX_PAGE_SIZE
+        return super().get_page_size(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if not self._is_columnar(self.request):
+            return super().get_paginated_response(data)
+        return Response({
+            "count": self.page.paginator.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            **encode_columnar(data, choice_columns(self.view)),
+        })
+
+
+class CreatedOnCursorPagination(CursorPagination):
+    """
+    Cursor pagination over ``created_on``, newest first by default.
+
+    For append-mostly tables with an index ending in ``created_on`` (e.g.
+    chat messages on ``(session, created_on)``): every page is a single
+    index range scan from the cursor, so page 100 costs what page 1 does,
+    and rows added while paging do not shift the pages. No total count is
+    computed.
+    """
+
+    ordering = "-created_on"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
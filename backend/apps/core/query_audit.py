@@ -0,0 +1,298 @@
+"""
+Query-count and query-plan audit for the REST API.
+
+Walks every route registered under ``/api/v1/`` and issues GET requests
+for list and detail endpoints as a tenant user. List endpoints are
+requested at two page sizes: the number of queries must not grow with
+the page, otherwise a serializer or ``get_queryset`` is doing N+1 work.
+Each captured SELECT is run through ``EXPLAIN (FORMAT JSON)`` and
+sequential scans on tenant tables above a size threshold are flagged.
+
+Used by ``apps/core/tests/test_query_budget.py`` against seeded data and
+by ``manage.py audit_queries`` against a real database. Both write a JSON
+report (``QUERY_AUDIT_REPORT``) so regressions show up in review.
+"""
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+API_PREFIX = "api/v1/"
+DEFAULT_PAGE_SIZES = (1, 50)
+
+_REGEX_GROUP = re.compile(r"\(\?P<(\w+)>[^)]*\)")
+_PATH_CONVERTER = re.compile(r"<(?:\w+:)?(\w+)>")
+_REGEX_META = re.compile(r"[\\^$()|?*+\[\]]")
+
+
+@dataclass
+class AuditRoute:
+    """A GET-able API route and what the audit knows about it."""
+
+    template: str
+    name: str
+    kind: str  # "list", "detail" or "other"
+    basename: str = ""
+    model: object = None
+    kwargs: tuple = ()
+
+
+@dataclass
+class RouteResult:
+    path: str
+    name: str
+    kind: str
+    status: dict = field(default_factory=dict)
+    queries: dict = field(default_factory=dict)
+    rows: dict = field(default_factory=dict)
+    seq_scans: list = field(default_factory=list)
+    problems: list = field(default_factory=list)
+    skipped: str = ""
+
+
+def _pattern_template(pattern):
+    """Turn a route or regex pattern into a ``{kwarg}`` path template."""
+    text = str(pattern.pattern)
+    if text.startswith("^"):
+        text = text[1:]
+    if text.endswith("$"):
+        text = text[:-1]
+    text = _REGEX_GROUP.sub(r"{\1}", text)
+    text = _PATH_CONVERTER.sub(r"{\1}", text)
+    return text.replace("\\.", ".").replace("\\-", "-")
+
+
+def _walk(patterns, prefix=""):
+    for entry in patterns:
+        template = prefix + _pattern_template(entry)
+        if isinstance(entry, URLResolver):
+            yield from _walk(entry.url_patterns, template)
+        elif isinstance(entry, URLPattern):
+            yield template, entry
+
+
+def _view_model(view_class):
+    """The model a view serves: its ``queryset`` or its serializer's model."""
+    queryset = getattr(view_class, "queryset", None)
+    if queryset is not None:
+        return queryset.model
+    serializer_class = getattr(view_class, "serializer_class", None)
+    return getattr(getattr(serializer_class, "Meta", None), "model", None)
+
+
+def discover_routes(urlconf=None):
+    """
+    Return the GET routes under ``/api/v1/`` in URLconf order.
+
+    Router viewsets are classified by action: ``list`` and ``retrieve``
+    become list/detail routes, other GET actions and plain API views are
+    "other". Format-suffix duplicates and unresolvable regexes are dropped.
+    """
+    routes, seen = [], set()
+    for template, pattern in _walk(get_resolver(urlconf).url_patterns):
+        if not template.startswith(API_PREFIX) or "{format}" in template:
+            continue
+        if _REGEX_META.search(template.replace("{", "").replace("}", "")) or template in seen:
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, "actions", None)
+        view_class = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+        if actions is not None:
+            handler = actions.get("get")
+            if not handler:
+                continue
+            kind = {"list": "list", "retrieve": "detail"}.get(handler, "other")
+            basename = (getattr(callback, "initkwargs", None) or {}).get("basename", "")
+        elif view_class is not None and not hasattr(view_class, "get"):
+            continue
+        else:
+            kind, basename = "other", ""
+        seen.add(template)
+        routes.append(AuditRoute(
+            template=f"/{template}",
+            name=pattern.name or template,
+            kind=kind,
+            basename=basename,
+            model=_view_model(view_class),
+            kwargs=tuple(re.findall(r"{(\w+)}", template)),
+        ))
+    return routes
+
+
+def tenant_tables():
+    """Database tables of models scoped by a ``tenant`` foreign key."""
+    return {
+        model._meta.db_table
+        for model in apps.get_models()
+        if any(f.name == "tenant" and f.is_relation for f in model._meta.concrete_fields)
+    }
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+class QueryAuditor:
+    """
+    Run the audit for one tenant user.
+
+    ``seq_scan_min_rows`` is compared with the planner's row estimate
+    (``pg_class.reltuples``), so on a freshly seeded test database nothing
+    is flagged until ``ANALYZE`` has run; set it to 0 to report every
+    sequential scan on a tenant table.
+    """
+
+    def __init__(self, tenant, user, page_sizes=DEFAULT_PAGE_SIZES,
+                 seq_scan_min_rows=None, explain=True):
+        self.tenant = tenant
+        self.user = user
+        self.page_sizes = tuple(sorted(page_sizes))
+        if seq_scan_min_rows is None:
+            seq_scan_min_rows = getattr(settings, "QUERY_AUDIT_SEQ_SCAN_MIN_ROWS", 10000)
+        self.seq_scan_min_rows = seq_scan_min_rows
+        self.explain = explain
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+        self._tables = tenant_tables()
+        self._reltuples = {}
+
+    # Requests ---------------------------------------------------------------
+
+    def _get(self, path, page_size=None):
+        patcher = mock.patch.object(
+            PageNumberPagination, "page_size", page_size or PageNumberPagination.page_size
+        )
+        with patcher, CaptureQueriesContext(connection) as captured:
+            response = self.client.get(path, HTTP_X_TENANT_ID=str(self.tenant.id))
+        return response, [q["sql"] for q in captured.captured_queries]
+
+    @staticmethod
+    def _row_count(response):
+        data = getattr(response, "data", None)
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            return len(data["results"])
+        if isinstance(data, list):
+            return len(data)
+        return None
+
+    def _detail_id(self, route):
+        model = route.model
+        if model is None or model._meta.db_table not in self._tables:
+            return None
+        return (
+            model._default_manager.filter(tenant=self.tenant)
+            .order_by("pk").values_list("pk", flat=True).first()
+        )
+
+    # Plans ------------------------------------------------------------------
+
+    def _estimated_rows(self, table):
+        if table not in self._reltuples:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s", [table])
+                row = cursor.fetchone()
+            self._reltuples[table] = int(max(row[0], 0)) if row else 0
+        return self._reltuples[table]
+
+    def _seq_scans(self, sql_statements):
+        found = []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('app.current_tenant_id', %s, true)", [str(self.tenant.id)]
+            )
+            for sql in sql_statements:
+                if not sql.lstrip().upper().startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                for node in _plan_nodes(plan[0]["Plan"]):
+                    table = node.get("Relation Name")
+                    if node.get("Node Type") != "Seq Scan" or table not in self._tables:
+                        continue
+                    found.append({
+                        "table": table,
+                        "estimated_rows": self._estimated_rows(table),
+                        "filter": node.get("Filter", ""),
+                        "sql": sql[:500],
+                    })
+        return found
+
+    # Audit ------------------------------------------------------------------
+
+    def audit_route(self, route):
+        result = RouteResult(path=route.template, name=route.name, kind=route.kind)
+        kwargs = set(route.kwargs)
+        if kwargs - {"pk"}:
+            result.skipped = f"unresolved URL kwargs: {', '.join(sorted(kwargs - {'pk'}))}"
+            return result
+        path = route.template
+        if "pk" in kwargs:
+            pk = self._detail_id(route)
+            if pk is None:
+                result.skipped = "no tenant row to address"
+                return result
+            path = path.replace("{pk}", str(pk))
+        result.path = path
+
+        captured = []
+        sizes = self.page_sizes if route.kind == "list" else (None,)
+        for size in sizes:
+            key = str(size or "default")
+            response, statements = self._get(path, size)
+            result.status[key] = response.status_code
+            result.queries[key] = len(statements)
+            result.rows[key] = self._row_count(response)
+            captured.extend(statements)
+
+        if route.kind == "list" and len(set(result.queries.values())) > 1:
+            small, large = str(self.page_sizes[0]), str(self.page_sizes[-1])
+            if (result.rows.get(large) or 0) > (result.rows.get(small) or 0):
+                result.problems.append(
+                    f"query count grows with page size: {result.queries[small]} queries "
+                    f"for {result.rows[small]} row(s), {result.queries[large]} for "
+                    f"{result.rows[large]}"
+                )
+        if self.explain:
+            scans = self._seq_scans(dict.fromkeys(captured))
+            result.seq_scans = scans
+            for scan in scans:
+                if scan["estimated_rows"] >= self.seq_scan_min_rows:
+                    result.problems.append(
+                        f"sequential scan on {scan['table']} (~{scan['estimated_rows']} rows)"
+                    )
+        return result
+
+    def run(self, routes=None):
+        routes = discover_routes() if routes is None else routes
+        results = [self.audit_route(route) for route in routes]
+        return {
+            "tenant": self.tenant.slug,
+            "page_sizes": list(self.page_sizes),
+            "seq_scan_min_rows": self.seq_scan_min_rows,
+            "routes": [asdict(r) for r in results],
+            "problems": {r.path: r.problems for r in results if r.problems},
+        }
+
+
+def report_path():
+    return Path(getattr(settings, "QUERY_AUDIT_REPORT", Path(settings.BASE_DIR) / "logs" / "query_audit.json"))
+
+
+def write_report(report, path=None):
+    path = Path(path) if path else report_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    return path
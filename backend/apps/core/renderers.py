@@ -0,0 +1,99 @@
+"""
+Renderers for Core app.
+"""
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.projectmeats.columnar+json"
+
+
+def choice_columns(view):
+    """
+    Map top-level choice fields of ``view``'s serializer to their choice
+    values, which seed the column dictionaries.
+    """
+    get_serializer = getattr(view, "get_serializer", None)
+    if get_serializer is None:
+        return {}
+    try:
+        fields = get_serializer().fields
+    except AssertionError:
+        return {}
+    return {
+        name: list(field.choices)
+        for name, field in fields.items()
+        if isinstance(field, serializers.ChoiceField) and not isinstance(field, serializers.MultipleChoiceField)
+        and not field.write_only
+    }
+
+
+def encode_columnar(items, dictionary_columns=None):
+    """
+    Turn a list of row dicts into ``{columns, rows, dictionaries}``.
+
+    Columns are the union of the row keys in order of appearance; a key a
+    row lacks is ``null``. Values of ``dictionary_columns`` are replaced by
+    their index in ``dictionaries[column]``, which starts with the column's
+    choices and grows with any other value seen.
+    """
+    columns, positions = [], {}
+    for item in items:
+        for key in item:
+            if key not in positions:
+                positions[key] = len(columns)
+                columns.append(key)
+
+    dictionaries, encoders = {}, {}
+    for name, choices in (dictionary_columns or {}).items():
+        if name in positions:
+            dictionaries[name] = list(choices)
+            encoders[name] = {value: index for index, value in enumerate(choices)}
+
+    rows = []
+    for item in items:
+        row = [item.get(column) for column in columns]
+        for name, codes in encoders.items():
+            index = positions[name]
+            value = row[index]
+            if value is None:
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(dictionaries[name])
+                dictionaries[name].append(value)
+            row[index] = code
+        rows.append(row)
+    return {"columns": columns, "rows": rows, "dictionaries": dictionaries}
+
+
+def is_columnar(data):
+    return isinstance(data, dict) and "columns" in data and "rows" in data
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Compact list format selected with ``?format=columnar`` or the
+    ``application/vnd.projectmeats.columnar+json`` Accept header.
+
+    Lists render as ``{columns, rows, dictionaries}`` instead of repeating
+    every key on every row; choice fields are dictionary encoded. Paginated
+    lists are encoded by ``ColumnarPageNumberPagination`` and keep their
+    ``count``/``next``/``previous`` keys. Anything that is not a list
+    (details, errors) renders as plain JSON.
+    """
+
+    media_type = COLUMNAR_MEDIA_TYPE
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        view = (renderer_context or {}).get("view")
+        response = (renderer_context or {}).get("response")
+        ok = response is None or response.status_code < 400
+        if ok and isinstance(data, list) and all(isinstance(item, dict) for item in data):
+            data = encode_columnar(data, choice_columns(view))
+        elif ok and isinstance(data, dict) and isinstance(data.get("results"), list) and not is_columnar(data):
+            data = {
+                **{key: value for key, value in data.items() if key != "results"},
+                **encode_columnar(data["results"], choice_columns(view)),
+            }
+        return super().render(data, accepted_media_type, renderer_context)
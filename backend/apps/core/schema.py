@@ -0,0 +1,164 @@
+"""
+Precomputed OpenAPI schema for ``/api/schema/`` (and the Swagger/Redoc UIs).
+
+drf-spectacular walks every view and serializer on each schema request,
+which takes seconds on this API. The schema only changes when the code
+does, so it is generated once per code version -- by ``manage.py
+build_openapi_schema`` during deployment, or on the first request -- and
+kept on disk and in process memory. Responses carry a content-hash ETag so
+browsers revalidate with a cheap 304.
+
+The code version is ``settings.CODE_VERSION`` (e.g. the git SHA of the
+release) when set, otherwise a fingerprint of the project's source files and
+the schema-relevant library versions.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import django
+import drf_spectacular
+import rest_framework
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import translation
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+# Directories (relative to BASE_DIR) whose Python sources define the schema
+SOURCE_DIRS = ("apps", "tenant_apps", "projectmeats")
+
+
+@lru_cache(maxsize=1)
+def code_version():
+    """The configured code version, or a fingerprint of the source tree."""
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    base = Path(settings.BASE_DIR)
+    digest = hashlib.sha256()
+    for directory in SOURCE_DIRS:
+        for path in sorted((base / directory).rglob("*.py")):
+            stat = path.stat()
+            digest.update(f"{path.relative_to(base)}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    for module in (django, rest_framework, drf_spectacular):
+        digest.update(f"{module.__name__}={module.__version__}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+class SchemaCache:
+    """Rendered schemas per (code version, format, language)."""
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._rendered = {}
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return Path(self._directory or settings.OPENAPI_SCHEMA_CACHE_DIR)
+
+    @staticmethod
+    def suffix(renderer, lang=None):
+        return f"-{lang or 'default'}.{renderer.format}"
+
+    def path(self, renderer, lang=None):
+        return self.directory / f"schema-{code_version()}{self.suffix(renderer, lang)}"
+
+    def get(self, renderer, lang=None):
+        """``(content, etag)`` for ``renderer``, generating the schema at most once."""
+        key = (code_version(), renderer.format, lang)
+        cached = self._rendered.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            if key not in self._rendered:
+                path = self.path(renderer, lang)
+                try:
+                    content = path.read_bytes()
+                except OSError:
+                    content = renderer.render(self.schema(lang), renderer.media_type, {})
+                    self._write(path, content, self.suffix(renderer, lang))
+                etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+                self._rendered[key] = (content, etag)
+        return self._rendered[key]
+
+    def schema(self, lang=None):
+        """The schema dict for the current code version, generated on first use."""
+        key = (code_version(), lang)
+        if key not in self._schemas:
+            logger.info(f"Generating OpenAPI schema (code version {key[0]}, lang {lang or 'default'})")
+            generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+            with translation.override(lang):
+                self._schemas[key] = generator.get_schema(request=None, public=True)
+        return self._schemas[key]
+
+    def _write(self, path, content, suffix):
+        """Write atomically and drop files left by earlier code versions."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for stale in self.directory.glob(f"schema-*{suffix}"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+            fd, temp = tempfile.mkstemp(dir=self.directory, prefix=".schema-")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+            os.chmod(temp, 0o644)
+            os.replace(temp, path)
+        except OSError as exc:
+            # A read-only filesystem only costs the on-disk copy
+            logger.warning(f"Could not write OpenAPI schema cache {path}: {exc}")
+
+    def clear(self):
+        self._rendered.clear()
+        self._schemas.clear()
+
+
+schema_cache = SchemaCache()
+
+
+def schema_language(lang):
+    """
+    ``lang`` when it is one of ``settings.LANGUAGES``, else None (the default
+    language): each language is generated and cached separately, so the
+    set must stay bounded.
+    """
+    if not settings.USE_I18N or not lang:
+        return None
+    return lang if lang in dict(settings.LANGUAGES) else None
+
+
+def etag_matches(etag, if_none_match):
+    """Weak comparison of ``etag`` against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in (value.removeprefix("W/") for value in candidates)
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """``SpectacularAPIView`` served from ``schema_cache`` with ETag revalidation."""
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        lang = schema_language(request.GET.get("lang"))
+        renderer = request.accepted_renderer
+        content, etag = schema_cache.get(renderer, lang)
+        if etag_matches(etag, request.headers.get("If-None-Match")):
+            response = HttpResponseNotModified()
+        else:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type += f"; charset={renderer.charset}"
+            response = HttpResponse(content, content_type=content_type)
+            response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, None)}"'
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
@@ -1,10 +1,102 @@
 """
 Serializers for Core app.
 """
+from django.utils.module_loading import import_string
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from apps.core.models import UserPreferences
 
 
+def _parse_selection(value):
+    """
+    Split a ``?fields=`` / ``?expand=`` value into top-level names and
+    per-name nested selections: ``"id,supplier.name"`` becomes
+    ``{"id": [], "supplier": ["name"]}``.
+    """
+    selection = {}
+    for item in (value or "").split(","):
+        name, _, rest = item.strip().partition(".")
+        if not name:
+            continue
+        nested = selection.setdefault(name, [])
+        if rest:
+            nested.append(rest)
+    return selection
+
+
+class FieldSelectionMixin:
+    """
+    Sparse fieldsets and on-demand expansion for model serializers.
+
+    On GET requests the root serializer reads ``?fields=id,name`` to limit
+    the rendered fields and ``?expand=supplier,locations`` to add the
+    nested representations declared in ``Meta.expandable_fields``::
+
+        class Meta:
+            expandable_fields = {
+                "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+                "locations": (LocationListSerializer, {"source": "supplier_locations", "many": True}),
+            }
+
+    Dotted names reach into expanded fields (``?expand=supplier&fields=id,
+    supplier.name``). Unknown names are ignored; without either parameter
+    the payload is unchanged. ``apps.core.filters.FieldSelectionFilter``
+    pushes the selection down into the queryset.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._selected_fields = fields
+        self._selected_expand = expand
+
+    def _is_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def get_selection(self):
+        """Return ``(fields, expand)`` selections; ``fields`` is None for all fields."""
+        fields, expand = self._selected_fields, self._selected_expand
+        if fields is None and expand is None and self._is_root():
+            request = self.context.get("request")
+            if request is not None and request.method in SAFE_METHODS:
+                params = request.query_params
+                fields = params.get("fields") or None
+                expand = params.get("expand")
+        if isinstance(fields, str):
+            fields = _parse_selection(fields)
+        elif fields is not None:
+            fields = _parse_selection(",".join(fields))
+        if isinstance(expand, str) or expand is None:
+            expand = _parse_selection(expand)
+        else:
+            expand = _parse_selection(",".join(expand))
+        return fields, expand
+
+    @property
+    def has_field_selection(self):
+        return self.get_selection()[0] is not None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, expand = self.get_selection()
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        for name, nested_expand in expand.items():
+            if name not in expandable or (selected is not None and name not in selected):
+                continue
+            serializer_class, options = expandable[name]
+            if isinstance(serializer_class, str):
+                serializer_class = import_string(serializer_class)
+            options = {"read_only": True, **options}
+            if issubclass(serializer_class, FieldSelectionMixin):
+                nested_fields = (selected or {}).get(name)
+                options["fields"] = nested_fields or None
+                options["expand"] = nested_expand
+            fields[name] = serializer_class(**options)
+        if selected is not None:
+            fields = {name: field for name, field in fields.items() if name in selected}
+        return fields
+
+
 class UserPreferencesSerializer(serializers.ModelSerializer):
     """Serializer for UserPreferences model."""
     
@@ -0,0 +1,154 @@
+"""
+Tests for the async middleware chain and the native async views.
+"""
+import uuid
+from datetime import timedelta
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import AnonymousUser, User
+from django.core import mail
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from apps.core.middleware import CompressionMiddleware, QueryCountMiddleware, StaticFilesMiddleware
+from apps.tenants.middleware import TenantMiddleware
+from apps.tenants.models import Tenant, TenantInvitation, TenantUser
+from tenant_apps.ai_assistant.models import ChatMessage
+
+CHAT_PATH = "/api/v1/ai-assistant/ai-chat/chat/"
+
+
+class AsyncFixtureMixin:
+    def make_tenant(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Async Co {unique_id}",
+            slug=f"async-co-{unique_id}",
+            contact_email=f"admin_{unique_id}@async.com",
+        )
+        self.user = User.objects.create_user(username=f"async_{unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        self.token = Token.objects.create(user=self.user)
+        self.headers = {"Authorization": f"Token {self.token.key}", "X-Tenant-ID": str(self.tenant.id)}
+
+
+class AsyncMiddlewareTest(AsyncFixtureMixin, TestCase):
+    """Project middleware stays async when wrapping an async handler."""
+
+    def setUp(self):
+        self.make_tenant()
+
+    @override_settings(QUERY_COUNT_HEADER=True)
+    def test_middleware_is_async_capable(self):
+        async def view(request):
+            return HttpResponse("ok")
+
+        def sync_view(request):
+            return HttpResponse("ok")
+
+        for middleware in (TenantMiddleware, QueryCountMiddleware, CompressionMiddleware, StaticFilesMiddleware):
+            self.assertTrue(iscoroutinefunction(middleware(view)), middleware.__name__)
+            self.assertFalse(iscoroutinefunction(middleware(sync_view)), middleware.__name__)
+
+    async def test_tenant_middleware_async_path(self):
+        seen = {}
+
+        async def view(request):
+            seen["tenant"] = request.tenant
+            return HttpResponse("ok")
+
+        request = RequestFactory().get("/api/v1/suppliers/", HTTP_X_TENANT_ID=str(self.tenant.id))
+        request.user = AnonymousUser()
+        response = await TenantMiddleware(view)(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seen["tenant"].id, self.tenant.id)
+
+
+class AsyncChatViewTest(AsyncFixtureMixin, TestCase):
+    """The AI assistant chat as a native async view."""
+
+    def setUp(self):
+        self.make_tenant()
+        self.client = AsyncClient()
+
+    async def test_chat_creates_session_and_messages(self):
+        response = await self.client.post(
+            CHAT_PATH, {"message": "Tell me about suppliers"}, content_type="application/json", headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("supplier", data["response"])
+        self.assertEqual(await ChatMessage.objects.filter(session_id=data["session_id"]).acount(), 2)
+
+        followup = await self.client.post(
+            CHAT_PATH,
+            {"message": "And pricing?", "session_id": data["session_id"]},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(followup.json()["session_id"], data["session_id"])
+
+    async def test_authentication_tenant_and_validation(self):
+        anonymous = await self.client.post(CHAT_PATH, {"message": "hi"}, content_type="application/json")
+        bad_token = await self.client.post(
+            CHAT_PATH, {"message": "hi"}, content_type="application/json", headers={"Authorization": "Token nope"}
+        )
+        wrong_method = await self.client.get(CHAT_PATH, headers=self.headers)
+        invalid = await self.client.post(CHAT_PATH, {}, content_type="application/json", headers=self.headers)
+
+        self.assertEqual(anonymous.status_code, 401)
+        self.assertEqual(anonymous["WWW-Authenticate"], "Token")
+        self.assertEqual(bad_token.status_code, 401)
+        self.assertEqual(wrong_method.status_code, 405)
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("message", invalid.json())
+
+    def test_other_tenant_is_forbidden(self):
+        other = Tenant.objects.create(
+            name=f"Other {self.tenant.slug}", slug=f"other-{self.tenant.slug}", contact_email="o@async.com"
+        )
+        response = self.client_class().post(
+            CHAT_PATH,
+            {"message": "hi"},
+            content_type="application/json",
+            headers={**self.headers, "X-Tenant-ID": str(other.id)},
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ResendInvitationTest(AsyncFixtureMixin, TestCase):
+    """Invitation resend sends the email from an async view."""
+
+    def setUp(self):
+        self.make_tenant()
+        self.invitation = TenantInvitation.objects.create(
+            tenant=self.tenant,
+            email="new.hire@async.com",
+            invited_by=self.user,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        mail.outbox.clear()
+
+    def test_resend_sends_email_and_extends_expiry(self):
+        response = self.client.post(f"/api/v1/invitations/{self.invitation.id}/resend/", headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["new.hire@async.com"])
+        self.invitation.refresh_from_db()
+        self.assertGreater(self.invitation.expires_at, timezone.now() + timedelta(days=6))
+
+    def test_resend_rejects_non_pending_and_unknown(self):
+        TenantInvitation.objects.filter(pk=self.invitation.pk).update(status="revoked")
+
+        revoked = self.client.post(f"/api/v1/invitations/{self.invitation.id}/resend/", headers=self.headers)
+        unknown = self.client.post(f"/api/v1/invitations/{uuid.uuid4()}/resend/", headers=self.headers)
+
+        self.assertEqual(revoked.status_code, 400)
+        self.assertEqual(unknown.status_code, 404)
+        self.assertEqual(len(mail.outbox), 0)
@@ -0,0 +1,105 @@
+"""
+Tests for the batched GET endpoint.
+"""
+import json
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.products.models import Product
+from tenant_apps.suppliers.models import Supplier
+
+PATHS = ["/api/v1/suppliers/", "/api/v1/products/?fields=id,product_code", "/api/v1/plants/",
+         "/api/v1/carriers/", "/api/v1/locations/", "/api/v1/contacts/"]
+
+
+class BatchFixtureMixin:
+    def make_tenant(self):
+        self.unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Batch Co {self.unique_id}",
+            slug=f"batch-co-{self.unique_id}",
+            contact_email=f"admin_{self.unique_id}@batch.com",
+        )
+        self.user = User.objects.create_user(username=f"batch_{self.unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name="Acme Beef")
+        Product.objects.create(tenant=self.tenant, product_code=f"A-{self.unique_id}", supplier=self.supplier)
+        # Token auth like the frontend, so per-request authentication is counted
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+    def batch(self, payload):
+        return self.client.post("/api/v1/batch/", payload, format="json")
+
+
+class BatchEndpointTest(BatchFixtureMixin, TestCase):
+    """Sequential batches."""
+
+    def setUp(self):
+        self.make_tenant()
+
+    def test_batch_matches_individual_requests_with_fewer_queries(self):
+        with CaptureQueriesContext(connection) as individual_queries:
+            individual = [json.loads(self.client.get(path).content) for path in PATHS]
+        with CaptureQueriesContext(connection) as batch_queries:
+            response = self.batch({"requests": [{"id": path, "path": path} for path in PATHS]})
+
+        self.assertEqual(response.status_code, 200, response.content)
+        responses = json.loads(response.content)["responses"]
+        self.assertEqual([r["id"] for r in responses], PATHS)
+        self.assertEqual([r["status"] for r in responses], [200] * len(PATHS))
+        self.assertEqual([r["body"] for r in responses], individual)
+        self.assertEqual(responses[1]["body"]["results"], [{"id": responses[1]["body"]["results"][0]["id"],
+                                                           "product_code": f"A-{self.unique_id}"}])
+        self.assertLess(len(batch_queries), len(individual_queries))
+
+    def test_detail_missing_and_non_json(self):
+        response = self.batch([
+            f"/api/v1/suppliers/{self.supplier.pk}/",
+            "/api/v1/does-not-exist/",
+            "/api/v1/suppliers/999999999/",
+            "/api/v1/batch/",
+        ])
+
+        statuses = [(r["id"], r["status"]) for r in json.loads(response.content)["responses"]]
+        self.assertEqual(statuses, [(0, 200), (1, 404), (2, 404), (3, 400)])
+        self.assertEqual(json.loads(response.content)["responses"][0]["body"]["name"], "Acme Beef")
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_invalid_batches(self):
+        for payload in ({"requests": []}, ["/admin/"], [{"path": "/api/v1/suppliers/", "method": "POST"}],
+                        ["/api/v1/suppliers/"] * 3):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.batch(payload).status_code, 400)
+
+    def test_requires_authentication_and_membership(self):
+        self.assertEqual(APIClient().post("/api/v1/batch/", ["/api/v1/suppliers/"], format="json").status_code, 401)
+
+        outsider = User.objects.create_user(username=f"outsider_{self.unique_id}", password="pass12345")
+        client = APIClient()
+        client.force_authenticate(user=outsider)
+        response = client.post("/api/v1/batch/", ["/api/v1/suppliers/"], format="json",
+                               HTTP_X_TENANT_ID=str(self.tenant.id))
+        self.assertEqual(response.status_code, 403)
+
+
+class ParallelBatchTest(BatchFixtureMixin, TransactionTestCase):
+    """Parallel batches run on worker threads with their own connections."""
+
+    def setUp(self):
+        self.make_tenant()
+
+    def test_parallel_batch(self):
+        response = self.batch({"requests": PATHS, "parallel": True})
+
+        responses = json.loads(response.content)["responses"]
+        self.assertEqual([r["status"] for r in responses], [200] * len(PATHS))
+        self.assertEqual(responses[0]["body"]["results"][0]["name"], "Acme Beef")
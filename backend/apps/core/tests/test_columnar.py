@@ -0,0 +1,90 @@
+"""
+Tests for the columnar list format.
+"""
+import json
+import uuid
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.renderers import COLUMNAR_MEDIA_TYPE, encode_columnar
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.products.models import Product
+
+
+def decode(payload):
+    """Python twin of decodeColumnar() in shared/utils.ts."""
+    dictionaries = payload["dictionaries"]
+    items = []
+    for row in payload["rows"]:
+        item = {}
+        for column, value in zip(payload["columns"], row):
+            if column in dictionaries and value is not None:
+                value = dictionaries[column][value]
+            item[column] = value
+        items.append(item)
+    return items
+
+
+class ColumnarFormatTest(TestCase):
+    """?format=columnar / Accept negotiation, encoding and page sizes."""
+
+    def setUp(self):
+        self.unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Columnar Co {self.unique_id}",
+            slug=f"columnar-co-{self.unique_id}",
+            contact_email=f"admin_{self.unique_id}@columnar.com",
+        )
+        user = User.objects.create_user(username=f"columnar_{self.unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=user, role="admin")
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+        for number in range(30):
+            Product.objects.create(
+                tenant=self.tenant,
+                product_code=f"P{number:03d}-{self.unique_id}",
+                description_of_product_item=f"Cut {number}",
+                type_of_protein="Beef" if number % 2 else "Pork",
+            )
+
+    def _get(self, path, **headers):
+        response = self.client.get(path, HTTP_X_TENANT_ID=str(self.tenant.id), **headers)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_columnar_page_decodes_to_json_page(self):
+        plain = json.loads(self._get("/api/v1/products/?ordering=product_code").content)
+        response = self._get("/api/v1/products/?ordering=product_code&format=columnar")
+        columnar = json.loads(response.content)
+
+        self.assertEqual(response["Content-Type"], COLUMNAR_MEDIA_TYPE)
+        self.assertEqual(columnar["count"], 30)
+        self.assertEqual(decode(columnar), plain["results"])
+        self.assertIn("Beef", columnar["dictionaries"]["type_of_protein"])
+        protein = columnar["columns"].index("type_of_protein")
+        self.assertIsInstance(columnar["rows"][0][protein], int)
+        self.assertLess(len(response.content), len(json.dumps(plain)))
+
+    def test_accept_header_and_page_size(self):
+        response = self._get("/api/v1/products/?page_size=25", HTTP_ACCEPT=COLUMNAR_MEDIA_TYPE)
+        self.assertEqual(len(json.loads(response.content)["rows"]), 25)
+
+        # JSON pages ignore page_size
+        plain = self._get("/api/v1/products/?page_size=25").json()
+        self.assertEqual(len(plain["results"]), 20)
+
+    def test_detail_renders_plain_json(self):
+        product = Product.objects.filter(tenant=self.tenant).first()
+        data = json.loads(self._get(f"/api/v1/products/{product.pk}/?format=columnar").content)
+        self.assertEqual(data["product_code"], product.product_code)
+
+    def test_encode_missing_keys_and_unknown_choices(self):
+        encoded = encode_columnar(
+            [{"a": 1, "s": "x"}, {"s": "legacy", "b": 2}, {"a": 3, "s": None}], {"s": ["x", "y"]}
+        )
+
+        self.assertEqual(encoded["columns"], ["a", "s", "b"])
+        self.assertEqual(encoded["rows"], [[1, 0, None], [None, 2, 2], [3, None, None]])
+        self.assertEqual(encoded["dictionaries"], {"s": ["x", "y", "legacy"]})
@@ -0,0 +1,103 @@
+"""
+Tests for CompressionMiddleware.
+"""
+import gzip
+import unittest
+import zlib
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.core import middleware
+from apps.core.middleware import CompressionMiddleware, accepted_encodings
+
+BODY = b'{"results": [' + b",".join(b'{"id": %d, "name": "Acme Beef"}' % i for i in range(200)) + b"]}"
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+    """Negotiation, size threshold, streaming and per-route options."""
+
+    def _run(self, response, path="/api/v1/products/", encoding="gzip"):
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip_json(self):
+        response = self._run(HttpResponse(BODY, content_type="application/json"))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_skips_small_binary_and_unaccepted(self):
+        small = self._run(HttpResponse(b'{"ok": true}', content_type="application/json"))
+        image = self._run(HttpResponse(BODY, content_type="image/png"))
+        refused = self._run(HttpResponse(BODY, content_type="application/json"), encoding="gzip;q=0, br;q=0")
+
+        for response in (small, image, refused):
+            self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_brotli_falls_back_to_gzip(self):
+        with mock.patch.object(middleware, "brotli", None):
+            response = self._run(HttpResponse(BODY, content_type="application/json"), encoding="br, gzip;q=0.8")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_streaming_is_compressed_per_chunk(self):
+        produced = []
+
+        def chunks():
+            for index in range(3):
+                produced.append(index)
+                yield BODY
+
+        response = self._run(StreamingHttpResponse(chunks(), content_type="application/x-ndjson"))
+        stream = iter(response.streaming_content)
+        decompressor = zlib.decompressobj(31)
+
+        first = next(stream)
+        self.assertEqual(produced, [0])  # nothing read ahead
+        self.assertEqual(decompressor.decompress(first), BODY)  # flushed, decodable on its own
+        rest = b"".join(stream)
+        self.assertEqual(decompressor.decompress(rest), BODY * 2)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_bodies_are_padded_against_breach(self):
+        sizes = set()
+        for _ in range(20):
+            response = self._run(HttpResponse(BODY, content_type="application/json"))
+            self.assertEqual(response.content[3] & 0x08, 0x08)  # FNAME padding
+            self.assertEqual(gzip.decompress(response.content), BODY)
+            sizes.add(len(response.content))
+        self.assertGreater(len(sizes), 1)
+
+        with override_settings(RESPONSE_COMPRESSION_MAX_RANDOM_BYTES=0):
+            response = self._run(HttpResponse(BODY, content_type="application/json"))
+        self.assertEqual(response.content[3], 0)
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    @unittest.skipIf(middleware.brotli is None, "brotli is not installed")
+    def test_brotli_padding(self):
+        for max_random_bytes in (0, 1, 600):
+            with override_settings(RESPONSE_COMPRESSION_MAX_RANDOM_BYTES=max_random_bytes):
+                response = self._run(StreamingHttpResponse([BODY, BODY], content_type="application/json"),
+                                     encoding="br")
+                content = b"".join(response.streaming_content)
+            self.assertEqual(response["Content-Encoding"], "br")
+            self.assertEqual(middleware.brotli.decompress(content), BODY * 2)
+
+    def test_secret_bearing_routes_are_not_compressed(self):
+        for path in ("/api/v1/auth/login/", "/api/v1/invitations/"):
+            response = self._run(HttpResponse(BODY, content_type="application/json"), path=path)
+            self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(RESPONSE_COMPRESSION_ROUTES=[(r"^/api/v1/raw/", {"enabled": False})])
+    def test_route_can_disable_compression(self):
+        response = self._run(HttpResponse(BODY, content_type="application/json"), path="/api/v1/raw/")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings("gzip, br;q=0.5, identity;q=0"), {"gzip": 1.0, "br": 0.5})
+        self.assertEqual(accepted_encodings(""), {})
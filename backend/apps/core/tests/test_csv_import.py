@@ -0,0 +1,176 @@
+"""
+Tests for the COPY-based CSV import pipeline.
+"""
+import csv
+import io
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.csv_import import CSVImportError, import_csv
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.products.models import Product
+from tenant_apps.purchase_orders.models import PurchaseOrder
+from tenant_apps.suppliers.models import Supplier
+
+
+def _csv(text):
+    return io.StringIO(text.lstrip())
+
+
+class CSVImportTest(TestCase):
+    """Staging, set-wise validation and merge."""
+
+    def setUp(self):
+        self.unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Import Co {self.unique_id}",
+            slug=f"import-co-{self.unique_id}",
+            contact_email=f"admin_{self.unique_id}@import.com",
+        )
+        self.other_tenant = Tenant.objects.create(
+            name=f"Other Co {self.unique_id}",
+            slug=f"other-co-{self.unique_id}",
+            contact_email=f"other_{self.unique_id}@import.com",
+        )
+
+    def test_suppliers_insert_update_and_reject(self):
+        Supplier.objects.create(tenant=self.tenant, name="Acme Beef", city="Old Town")
+        result = import_csv("suppliers", self.tenant, _csv("""
+Name,City,Fresh or Frozen,Tested Product,Unknown Column
+acme beef,Omaha,frozen,yes,x
+Prairie Pork,Des Moines,Fresh,no,x
+,Nowhere,Fresh,no,x
+Bad Choice,Reno,Thawed,maybe,x
+Prairie Pork,Ames,Fresh,no,x
+"""))
+
+        self.assertEqual((result.total, result.inserted, result.updated, result.rejected), (5, 1, 1, 3))
+        self.assertEqual(result.ignored_columns, ["Unknown Column"])
+        rejects = {r["line"]: r["errors"] for r in result.rejects}
+        self.assertEqual(rejects[4], ["name is required"])
+        self.assertEqual(len(rejects[5]), 2)  # choice and boolean
+        self.assertIn("duplicate name (first on line 3)", rejects[6])
+
+        acme = Supplier.objects.get(tenant=self.tenant, name="Acme Beef")
+        self.assertEqual((acme.city, acme.fresh_or_frozen, acme.tested_product), ("Omaha", "Frozen", True))
+        pork = Supplier.objects.get(tenant=self.tenant, name="Prairie Pork")
+        self.assertEqual(pork.fresh_or_frozen, "Fresh")
+        self.assertIsNotNone(pork.created_on)
+        self.assertFalse(Supplier.objects.filter(tenant=self.other_tenant).exists())
+
+    def test_products_upsert_on_product_code(self):
+        supplier = Supplier.objects.create(tenant=self.tenant, name="Acme Beef")
+        Product.objects.create(
+            tenant=self.tenant, product_code=f"A-{self.unique_id}", description_of_product_item="Old"
+        )
+        Product.objects.create(
+            tenant=self.other_tenant, product_code=f"X-{self.unique_id}", description_of_product_item="Theirs"
+        )
+        result = import_csv("products", self.tenant, _csv(f"""
+product_code,description_of_product_item,type_of_protein,unit_weight,supplier
+A-{self.unique_id},Ribeye,beef,"1,250.5",ACME BEEF
+B-{self.unique_id},Loin,Pork,abc,Acme Beef
+C-{self.unique_id},Wings,Chicken,,Nobody
+X-{self.unique_id},Stolen,Beef,,
+"""))
+
+        self.assertEqual((result.inserted, result.updated, result.rejected), (0, 1, 3))
+        product = Product.objects.get(product_code=f"A-{self.unique_id}")
+        self.assertEqual(product.description_of_product_item, "Ribeye")
+        self.assertEqual(product.type_of_protein, "Beef")
+        self.assertEqual(product.unit_weight, Decimal("1250.50"))
+        self.assertEqual(product.supplier, supplier)
+        errors = " ".join(e for r in result.rejects for e in r["errors"])
+        self.assertIn("is not a valid number", errors)
+        self.assertIn("unknown supplier 'Nobody'", errors)
+        self.assertIn("belongs to another tenant", errors)
+        self.assertEqual(
+            Product.objects.get(product_code=f"X-{self.unique_id}").description_of_product_item, "Theirs"
+        )
+
+    def test_purchase_orders_resolve_lookups_and_dates(self):
+        Supplier.objects.create(tenant=self.tenant, name="Acme Beef")
+        result = import_csv("purchase_orders", self.tenant, _csv("""
+order_number,supplier,order_date,total_amount,status,quantity
+PO-1,Acme Beef,2024-03-01,"$1,000.00",Approved,10
+PO-2,Acme Beef,3/15/2024,50,pending,
+PO-3,Acme Beef,2024-02-30,50,pending,
+PO-4,,2024-03-01,50,pending,1.5
+"""))
+
+        self.assertEqual((result.inserted, result.rejected), (2, 2))
+        po = PurchaseOrder.objects.get(tenant=self.tenant, order_number="PO-1")
+        self.assertEqual((po.status, po.total_amount, po.quantity), ("approved", Decimal("1000.00"), 10))
+        self.assertEqual(str(PurchaseOrder.objects.get(order_number="PO-2", tenant=self.tenant).order_date), "2024-03-15")
+        errors = {r["line"]: r["errors"] for r in result.rejects}
+        self.assertEqual(len(errors[4]), 1)
+        self.assertIn("supplier is required", errors[5])
+        self.assertIn("quantity: '1.5' is not a whole number", errors[5])
+
+        # Re-importing the same order numbers updates in place
+        again = import_csv("purchase_orders", self.tenant, _csv("""
+order_number,supplier,order_date,total_amount
+PO-1,Acme Beef,2024-03-02,5
+"""))
+        self.assertEqual((again.inserted, again.updated), (0, 1))
+        po.refresh_from_db()
+        self.assertEqual((po.total_amount, po.status), (Decimal("5.00"), "approved"))
+
+    def test_numbers_are_range_checked_per_row(self):
+        Supplier.objects.create(tenant=self.tenant, name="Acme Beef")
+        result = import_csv("purchase_orders", self.tenant, _csv("""
+order_number,supplier,order_date,total_amount,quantity
+PO-1,Acme Beef,2024-03-01,99999999.99,1
+PO-2,Acme Beef,2024-03-01,99999999.999,1
+PO-3,Acme Beef,2024-03-01,-5,-1
+PO-4,Acme\x00 Beef,2024-03-01,0,0
+"""))
+
+        self.assertEqual((result.inserted, result.rejected), (2, 2))
+        errors = {r["line"]: r["errors"] for r in result.rejects}
+        self.assertEqual(errors[3], ["total_amount: '99999999.999' is not a valid number"])
+        self.assertEqual(
+            errors[4], ["total_amount: '-5' must not be negative", "quantity: '-1' must not be negative"]
+        )
+
+    def test_malformed_csv(self):
+        too_long = "x" * (csv.field_size_limit() + 1)
+        with self.assertRaisesMessage(CSVImportError, "Line 2: field larger than field limit"):
+            import_csv("suppliers", self.tenant, _csv(f"name,city\nAcme Beef,{too_long}\n"))
+
+        user = User.objects.create_user(username=f"malformed_{self.unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=user, role="admin")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        upload = SimpleUploadedFile("suppliers.csv", f"name,city\nAcme Beef,{too_long}\n".encode())
+        response = client.post(
+            "/api/v1/suppliers/import/", {"file": upload}, format="multipart",
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "Import failed")
+
+    def test_missing_required_column(self):
+        with self.assertRaises(CSVImportError):
+            import_csv("products", self.tenant, _csv("product_code\nA-1\n"))
+
+    def test_import_endpoint(self):
+        user = User.objects.create_user(username=f"importer_{self.unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=user, role="admin")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        upload = SimpleUploadedFile("suppliers.csv", b"\xef\xbb\xbfname,city\nAcme Beef,Omaha\n")
+
+        response = client.post(
+            "/api/v1/suppliers/import/", {"file": upload}, format="multipart",
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["inserted"], 1)
+        self.assertTrue(Supplier.objects.filter(tenant=self.tenant, name="Acme Beef", city="Omaha").exists())
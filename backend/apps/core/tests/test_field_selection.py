@@ -0,0 +1,93 @@
+"""
+Tests for ?fields= / ?expand= field selection and its queryset push-down.
+"""
+import json
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.locations.models import Location
+from tenant_apps.purchase_orders.models import PurchaseOrder
+from tenant_apps.suppliers.models import Supplier
+
+
+class FieldSelectionTest(TestCase):
+    """Sparse fieldsets and on-demand expansion on tenant endpoints."""
+
+    def setUp(self):
+        self.unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Fields Co {self.unique_id}",
+            slug=f"fields-co-{self.unique_id}",
+            contact_email=f"admin_{self.unique_id}@fields.com",
+        )
+        self.user = User.objects.create_user(username=f"fields_{self.unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name="Acme Beef", city="Omaha")
+        Location.objects.create(
+            tenant=self.tenant, name="Dock 1", location_type="warehouse", supplier=self.supplier
+        )
+        for number in range(3):
+            PurchaseOrder.objects.create(
+                tenant=self.tenant,
+                order_number=f"PO-{self.unique_id}-{number}",
+                supplier=self.supplier,
+                total_amount=100,
+                order_date="2024-03-01",
+            )
+
+    def _get(self, path):
+        response = self.client.get(path, HTTP_X_TENANT_ID=str(self.tenant.id))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_default_payload_is_unchanged(self):
+        results = self._get("/api/v1/suppliers/").data["results"]
+
+        self.assertIn("contact_person", results[0])
+        self.assertNotIn("locations", results[0])
+
+    def test_fields_limits_payload_and_columns(self):
+        full = self._get("/api/v1/purchase-orders/")
+        with CaptureQueriesContext(connection) as queries:
+            sparse = self._get("/api/v1/purchase-orders/?fields=id,order_number,bogus")
+
+        rows = sparse.data["results"]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(set(rows[0]), {"id", "order_number"})
+        self.assertLess(len(sparse.content) * 5, len(full.content))
+        select = next(q["sql"] for q in queries.captured_queries if 'FROM "purchase_orders' in q["sql"]
+                      and "COUNT(" not in q["sql"])
+        self.assertNotIn('"notes"', select)
+        self.assertNotIn("JOIN", select)
+
+    def test_expand_nested_and_dotted_fields(self):
+        rows = self._get("/api/v1/suppliers/?expand=locations").data["results"]
+        self.assertEqual([loc["name"] for loc in rows[0]["locations"]], ["Dock 1"])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get("/api/v1/purchase-orders/?fields=id,supplier.name,supplier.city&expand=supplier")
+        rows = json.loads(response.content)["results"]
+        self.assertEqual(rows[0], {"id": rows[0]["id"], "supplier": {"name": "Acme Beef", "city": "Omaha"}})
+        # The supplier is joined, not fetched per row
+        self.assertFalse([q for q in queries.captured_queries if q["sql"].startswith('SELECT') and
+                          'FROM "suppliers_supplier"' in q["sql"] and "JOIN" not in q["sql"]])
+
+    def test_selection_ignored_on_writes(self):
+        response = self.client.post(
+            "/api/v1/suppliers/?fields=id",
+            {"name": "Prairie Pork"},
+            format="json",
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertIn("name", response.data)
@@ -0,0 +1,58 @@
+"""
+Query budget tests for every API list/detail route.
+
+Seeds one tenant with ~50 rows per table and runs the query audit: list
+endpoints must issue the same number of queries for a 1-row page as for
+a 50-row page. The audit report is written to ``QUERY_AUDIT_REPORT``.
+"""
+import uuid
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.core.load_data import LoadDataGenerator
+from apps.core.query_audit import QueryAuditor, discover_routes, write_report
+from apps.tenants.models import Tenant
+
+SEED_ROWS = 50
+
+
+class QueryBudgetTest(TestCase):
+    """Query counts must not depend on page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        prefix = f"qb{uuid.uuid4().hex[:6]}"
+        LoadDataGenerator(
+            tenants=1,
+            orders=SEED_ROWS * 2,
+            prefix=prefix,
+            sizes={name: SEED_ROWS for name in ("suppliers", "customers", "products", "carriers", "plants")},
+        ).run()
+        cls.tenant = Tenant.objects.get(slug=f"{prefix}-1")
+        cls.user = User.objects.get(username=f"{prefix}-1-user")
+
+    def test_routes_are_discovered(self):
+        routes = {(r.kind, r.template) for r in discover_routes()}
+
+        self.assertIn(("list", "/api/v1/suppliers/"), routes)
+        self.assertIn(("detail", "/api/v1/purchase-orders/{pk}/"), routes)
+        self.assertIn(("list", "/api/v1/cockpit/activity-logs/"), routes)
+        self.assertFalse([t for _, t in routes if "format" in t])
+
+    def test_list_queries_are_constant_in_page_size(self):
+        report = QueryAuditor(self.tenant, self.user).run()
+        write_report(report)
+        results = {r["path"]: r for r in report["routes"]}
+
+        for path in ("/api/v1/suppliers/", "/api/v1/purchase-orders/", "/api/v1/invoices/",
+                     "/api/v1/payments/", "/api/v1/locations/"):
+            with self.subTest(path=path):
+                self.assertEqual(results[path]["status"], {"1": 200, "50": 200})
+                self.assertEqual(results[path]["rows"]["1"], 1)
+                self.assertGreater(results[path]["rows"]["50"], 1)
+
+        for result in report["routes"]:
+            with self.subTest(path=result["path"]):
+                growth = [p for p in result["problems"] if "page size" in p]
+                self.assertEqual(growth, [])
@@ -0,0 +1,23 @@
+"""
+Tests for QueryCountMiddleware.
+"""
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+
+class QueryCountMiddlewareTest(TestCase):
+    """Tests for the X-Query-Count response header."""
+
+    @override_settings(QUERY_COUNT_HEADER=True)
+    def test_header_reports_queries(self):
+        response = APIClient().get('/api/v1/health/detailed/')
+
+        self.assertIn('X-Query-Count', response)
+        self.assertGreaterEqual(int(response['X-Query-Count']), 1)
+        self.assertIn('X-Query-Time-Ms', response)
+
+    @override_settings(QUERY_COUNT_HEADER=False)
+    def test_disabled_by_default(self):
+        response = APIClient().get('/api/v1/health/')
+
+        self.assertNotIn('X-Query-Count', response)
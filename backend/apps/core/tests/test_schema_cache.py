@@ -0,0 +1,84 @@
+"""
+Tests for the precomputed OpenAPI schema served at /api/schema/.
+"""
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.core import schema
+from apps.core.schema import SchemaCache, code_version
+
+SCHEMA = {"openapi": "3.0.3", "info": {"title": "ProjectMeats API", "version": "1.0.0"}, "paths": {}}
+
+
+class SchemaCacheTest(TestCase):
+    """Generated once per code version, stored on disk, served with an ETag."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.cache = SchemaCache(self.directory)
+        self.generate = mock.Mock(return_value=SCHEMA)
+        generator = mock.Mock(return_value=mock.Mock(get_schema=self.generate))
+        patches = [
+            mock.patch.object(schema, "schema_cache", self.cache),
+            mock.patch.object(schema.spectacular_settings, "DEFAULT_GENERATOR_CLASS", generator),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        code_version.cache_clear()
+        self.addCleanup(code_version.cache_clear)
+
+    @override_settings(CODE_VERSION="release-1")
+    def test_etag_and_not_modified(self):
+        response = self.client.get("/api/schema/?format=json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), SCHEMA)
+        self.assertIn("filename=", response["Content-Disposition"])
+        etag = response["ETag"]
+
+        revalidated = self.client.get("/api/schema/?format=json", HTTP_IF_NONE_MATCH=f"W/{etag}")
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated["ETag"], etag)
+        self.assertEqual(self.generate.call_count, 1)
+
+    @override_settings(CODE_VERSION="release-1")
+    def test_generated_once_and_reused_from_disk(self):
+        self.client.get("/api/schema/")
+        self.client.get("/api/schema/?format=json")
+
+        # A fresh process reads the files instead of generating again
+        restarted = SchemaCache(self.directory)
+        with mock.patch.object(schema, "schema_cache", restarted):
+            response = self.client.get("/api/schema/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.generate.call_count, 1)
+
+    def test_regenerated_when_code_version_changes(self):
+        with override_settings(CODE_VERSION="release-1"):
+            first = self.client.get("/api/schema/")["ETag"]
+        code_version.cache_clear()
+        self.generate.return_value = {**SCHEMA, "info": {"title": "ProjectMeats API", "version": "1.1.0"}}
+        with override_settings(CODE_VERSION="release-2"):
+            second = self.client.get("/api/schema/")["ETag"]
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.generate.call_count, 2)
+        # Files of the previous version are removed
+        self.assertEqual(len(list(self.cache.directory.glob("schema-*"))), 1)
+
+    @override_settings(CODE_VERSION="release-1", LANGUAGES=[("en", "English"), ("es", "Spanish")])
+    def test_unknown_languages_share_the_default_schema(self):
+        for lang in ("xx", "../etc", "zz-" + "z" * 200, ""):
+            self.assertEqual(self.client.get("/api/schema/", {"lang": lang}).status_code, 200)
+        self.assertEqual(self.generate.call_count, 1)
+
+        self.client.get("/api/schema/", {"lang": "es"})
+        self.assertEqual(self.generate.call_count, 2)
+        self.assertEqual(len(list(self.cache.directory.glob("schema-*"))), 2)
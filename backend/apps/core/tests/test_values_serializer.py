@@ -0,0 +1,89 @@
+"""
+Tests for the values()-based list fast path.
+"""
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.values_serializer import compile_values_serializer
+from apps.core.mixins import ValuesListMixin
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.carriers.models import Carrier
+from tenant_apps.cockpit.serializers import ActivityLogSerializer
+from tenant_apps.locations.models import Location
+from tenant_apps.products.models import Product
+from tenant_apps.products.serializers import ProductSerializer
+from tenant_apps.purchase_orders.models import PurchaseOrder
+from tenant_apps.suppliers.models import Supplier
+
+
+class ValuesListTest(TestCase):
+    """The fast path must render byte-identical JSON to the serializers."""
+
+    def setUp(self):
+        self.unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Values Co {self.unique_id}",
+            slug=f"values-co-{self.unique_id}",
+            contact_email=f"admin_{self.unique_id}@values.com",
+        )
+        user = User.objects.create_user(username=f"values_{self.unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=user, role="admin")
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+        supplier = Supplier.objects.create(tenant=self.tenant, name="Acme Beef")
+        carrier = Carrier.objects.create(tenant=self.tenant, name="Fast Freight")
+        Product.objects.create(
+            tenant=self.tenant, product_code=f"A-{self.unique_id}", description_of_product_item="Ribeye",
+            supplier=supplier, unit_weight=Decimal("12.50"), type_of_protein="Beef", tested_product=True,
+        )
+        Product.objects.create(tenant=self.tenant, product_code=f"B-{self.unique_id}")
+        dock = Location.objects.create(
+            tenant=self.tenant, name="Dock 1", location_type="warehouse", supplier=supplier, city="Omaha"
+        )
+        Location.objects.create(tenant=self.tenant, name="Yard", location_type="warehouse")
+        PurchaseOrder.objects.create(
+            tenant=self.tenant, order_number=f"PO-{self.unique_id}-1", supplier=supplier, carrier=carrier,
+            total_amount=Decimal("1250.50"), order_date="2024-03-01", pick_up_location=dock, status="approved",
+        )
+        PurchaseOrder.objects.create(
+            tenant=self.tenant, order_number=f"PO-{self.unique_id}-2", supplier=supplier,
+            total_amount=0, order_date="2024-03-02", notes="Call before delivery",
+        )
+
+    def _get(self, path):
+        response = self.client.get(path, HTTP_X_TENANT_ID=str(self.tenant.id))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.content
+
+    def test_json_is_byte_identical(self):
+        for path in (
+            "/api/v1/products/",
+            "/api/v1/locations/",
+            "/api/v1/purchase-orders/",
+            "/api/v1/purchase-orders/?fields=id,order_number,pick_up_location_details",
+            "/api/v1/products/?fields=id,supplier.name&expand=supplier",
+            "/api/v1/purchase-orders/?expand=supplier",
+        ):
+            with self.subTest(path=path):
+                fast = self._get(path)
+                with mock.patch.object(ValuesListMixin, "values_list_enabled", False):
+                    regular = self._get(path)
+                self.assertEqual(fast, regular)
+        # DRF omits read-only dotted fields behind a null foreign key
+        self.assertNotIn(b'"customer_name"', self._get("/api/v1/locations/"))
+
+    def test_fast_path_does_not_instantiate_models(self):
+        with mock.patch.object(PurchaseOrder, "__init__", side_effect=AssertionError("instantiated")):
+            self._get("/api/v1/purchase-orders/")
+
+    def test_ineligible_serializers_are_not_compiled(self):
+        self.assertIsNotNone(compile_values_serializer(ProductSerializer))
+        self.assertIsNone(compile_values_serializer(ActivityLogSerializer))
+        # Expanding into a serializer with many-to-many fields needs instances
+        self.assertIsNone(compile_values_serializer(ProductSerializer, None, "supplier"))
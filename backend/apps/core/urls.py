@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
+from .batch import batch
 
 # Create a router for ViewSets
 router = DefaultRouter()
@@ -11,6 +12,7 @@ urlpatterns = [
     path("auth/guest-login/", views.guest_login, name="guest-login"),
     path("auth/signup/", views.signup, name="signup"),
     path("auth/logout/", views.logout, name="logout"),
+    path("batch/", batch, name="batch"),
     # Include router URLs
     path("", include(router.urls)),
 ]
@@ -0,0 +1,179 @@
+"""
+Read-only fast path that renders list pages straight from ``queryset.values()``.
+
+``ModelSerializer`` builds a model instance per row and then walks every
+field through ``get_attribute``/``to_representation``. For plain column
+fields that work can be precompiled once per serializer: the ``values()``
+paths to select and, per output key, which path to read, which nullable
+foreign keys guard it and which field converter to apply. Rendering a row
+is then a loop over that plan.
+
+The output matches ``serializer.data`` exactly, including DRF's handling of
+``None`` and of dotted sources through a null foreign key (the key is
+omitted for read-only fields). Serializers that need model instances --
+method fields, write-only or many-to-many fields, file fields, properties or
+a custom ``to_representation`` -- are not compiled and keep the normal
+path. See ``apps.core.mixins.ValuesListMixin``.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+from apps.core.serializers import FieldSelectionMixin
+
+UNSUPPORTED_FIELDS = (
+    serializers.SerializerMethodField,
+    serializers.ManyRelatedField,
+    serializers.ListSerializer,
+    serializers.FileField,
+    serializers.HiddenField,
+)
+
+_SKIP = object()
+
+
+class _Entry:
+    """How to render one output key from a ``values()`` row."""
+
+    __slots__ = ("name", "path", "guards", "missing", "convert", "nested")
+
+    def __init__(self, name, path, guards, missing, convert=None, nested=None):
+        self.name = name
+        self.path = path
+        self.guards = guards
+        self.missing = missing
+        self.convert = convert
+        self.nested = nested
+
+
+class ValuesPlan:
+    """A compiled serializer: the ``values()`` paths and per-key converters."""
+
+    def __init__(self, paths, entries):
+        self.paths = tuple(sorted(paths))
+        self.entries = entries
+
+    def render(self, rows):
+        """Render ``values()`` rows as ``serializer.data`` would."""
+        entries = self.entries
+        return [_render_row(entries, row) for row in rows]
+
+
+def _render_row(entries, row):
+    data = {}
+    for entry in entries:
+        if entry.guards and any(row[guard] is None for guard in entry.guards):
+            missing = entry.missing
+            if missing is _SKIP:
+                continue
+            data[entry.name] = missing() if callable(missing) else missing
+            continue
+        value = row[entry.path]
+        if value is None:
+            data[entry.name] = None
+        elif entry.nested is not None:
+            data[entry.name] = _render_row(entry.nested, row)
+        else:
+            data[entry.name] = entry.convert(value)
+    return data
+
+
+def _missing_value(field):
+    """
+    What DRF renders when a dotted source hits a null foreign key, mirroring
+    ``Field.get_attribute``; None means the serializer would raise.
+    """
+    if field.default is not empty:
+        return field.get_default
+    if field.allow_null:
+        return lambda: None
+    if not field.required:
+        return _SKIP
+    return None
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _is_plain_serializer(serializer):
+    return type(serializer).to_representation is serializers.Serializer.to_representation
+
+
+def _compile(serializer, model, prefix, paths):
+    if not _is_plain_serializer(serializer):
+        return None
+    entries = []
+    for name, field in serializer.fields.items():
+        if field.write_only or isinstance(field, UNSUPPORTED_FIELDS) or field.source == "*":
+            return None
+        current, path, guards = model, prefix, []
+        attrs = field.source_attrs
+        entry = None
+        for index, attr in enumerate(attrs):
+            model_field = _model_field(current, attr)
+            if model_field is None or not model_field.concrete or model_field.many_to_many:
+                return None
+            column = path + attr
+            if index < len(attrs) - 1:
+                if not model_field.is_relation:
+                    return None
+                if model_field.null:
+                    guards.append(column)
+                    paths.add(column)
+                current, path = model_field.related_model, column + "__"
+                continue
+            if isinstance(field, serializers.Serializer):
+                if not model_field.is_relation:
+                    return None
+                nested = _compile(field, model_field.related_model, column + "__", paths)
+                if nested is None:
+                    return None
+                entry = _Entry(name, column, guards, None, nested=nested)
+            elif isinstance(field, serializers.RelatedField):
+                if not isinstance(field, serializers.PrimaryKeyRelatedField) or not model_field.is_relation:
+                    return None
+                convert = field.pk_field.to_representation if field.pk_field is not None else _identity
+                entry = _Entry(name, column, guards, None, convert=convert)
+            else:
+                if model_field.is_relation:
+                    return None
+                entry = _Entry(name, column, guards, None, convert=field.to_representation)
+            paths.add(column)
+        if guards:
+            entry.missing = _missing_value(field)
+            if entry.missing is None:
+                return None
+        entries.append(entry)
+    return entries
+
+
+def _identity(value):
+    return value
+
+
+@lru_cache(maxsize=256)
+def compile_values_serializer(serializer_class, fields=None, expand=None):
+    """
+    Compile ``serializer_class`` (with an optional ``?fields=``/``?expand=``
+    selection) into a ``ValuesPlan``, or return None when it cannot be
+    rendered from ``values()``.
+    """
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return None
+    if issubclass(serializer_class, FieldSelectionMixin):
+        serializer = serializer_class(fields=fields, expand=expand or "")
+    elif fields or expand:
+        return None
+    else:
+        serializer = serializer_class()
+    paths = set()
+    entries = _compile(serializer, serializer_class.Meta.model, "", paths)
+    if entries is None:
+        return None
+    return ValuesPlan(paths, entries)
@@ -1,6 +1,10 @@
 """
 Views for tenant invitation system.
 """
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -12,7 +16,9 @@ from rest_framework.serializers import Serializer
 from django.db.models import QuerySet
 import logging
 
+from apps.core.async_views import async_api_view
 from apps.tenants.models import Tenant, TenantUser, TenantInvitation
+from apps.tenants.signals import deliver_invitation_email
 from apps.tenants.invitation_serializers import (
     TenantInvitationCreateSerializer,
     TenantInvitationListSerializer,
@@ -112,28 +118,6 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
         
         return super().create(request, *args, **kwargs)
     
-    @action(detail=True, methods=['post'])
-    def resend(self, request, pk=None):
-        """Resend an invitation email (updates expiration)."""
-        invitation = self.get_object()
-        
-        if invitation.status != 'pending':
-            return Response(
-                {'error': 'Can only resend pending invitations'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Extend expiration by 7 days
-        from django.utils import timezone
-        invitation.expires_at = timezone.now() + timezone.timedelta(days=7)
-        invitation.save()
-        
-        # TODO: Send email notification
-        logger.info(f"Resent invitation {invitation.id} to {invitation.email}")
-        
-        serializer = self.get_serializer(invitation)
-        return Response(serializer.data)
-    
     @action(detail=True, methods=['post'])
     def revoke(self, request, pk=None):
         """Revoke an invitation."""
@@ -149,6 +133,55 @@ class TenantInvitationViewSet(viewsets.ModelViewSet):
             )
 
 
+@async_api_view(['POST'])
+async def resend_invitation(request, pk):
+    """
+    Resend a pending invitation email and extend its expiration by 7 days.
+
+    A native async view: the SendGrid call runs off the event loop, so under
+    ASGI waiting on it does not hold a worker.
+    """
+    user = request.user
+    admin_tenants = TenantUser.objects.filter(
+        user=user,
+        role__in=['admin', 'owner'],
+        is_active=True
+    ).values_list('tenant_id', flat=True)
+    # Same visibility as TenantInvitationViewSet.get_queryset
+    if await admin_tenants.aexists():
+        invitations = TenantInvitation.objects.filter(tenant_id__in=admin_tenants)
+    else:
+        invitations = TenantInvitation.objects.filter(invited_by=user)
+
+    try:
+        invitation = await invitations.select_related('tenant', 'invited_by').aget(pk=pk)
+    except (TenantInvitation.DoesNotExist, ValidationError):
+        return JsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    if invitation.status != 'pending':
+        return JsonResponse(
+            {'error': 'Can only resend pending invitations'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Extend expiration by 7 days
+    invitation.expires_at = timezone.now() + timezone.timedelta(days=7)
+    await invitation.asave(update_fields=['expires_at'])
+
+    if invitation.email:
+        try:
+            await sync_to_async(deliver_invitation_email, thread_sensitive=False)(invitation)
+        except Exception as e:
+            return JsonResponse(
+                {'error': 'Failed to send invitation email', 'details': str(e)},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
+    logger.info(f"Resent invitation {invitation.id} to {invitation.email}")
+
+    data = await sync_to_async(lambda: TenantInvitationDetailSerializer(invitation).data)()
+    return JsonResponse(data)
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def signup_with_invitation(request):
@@ -0,0 +1,79 @@
+"""
+Django management command to restore a tenant backup.
+
+Loads a directory written by ``tenant_backup`` into a tenant in a single
+transaction, remapping primary and foreign keys as it goes.
+"""
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.models import Tenant
+from apps.tenants.utils.tenant_backup import (
+    DEFAULT_BATCH_SIZE,
+    TENANT_FIELDS,
+    TenantBackupError,
+    read_manifest,
+    restore_tenant,
+)
+
+
+class Command(BaseCommand):
+    help = 'Restore a tenant backup directory written by tenant_backup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='Backup directory for a single tenant (contains manifest.json)'
+        )
+        parser.add_argument(
+            '--tenant',
+            type=str,
+            default=None,
+            metavar='SLUG',
+            help='Restore into this tenant (default: slug recorded in the backup)'
+        )
+        parser.add_argument(
+            '--create',
+            action='store_true',
+            help='Create the target tenant from the backup if it does not exist'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per bulk insert (default: {DEFAULT_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        try:
+            manifest = read_manifest(path)
+        except TenantBackupError as e:
+            raise CommandError(str(e))
+
+        slug = options['tenant'] or manifest['tenant']['slug']
+        tenant = Tenant.objects.filter(slug=slug).first()
+        if tenant is None:
+            if not options['create']:
+                raise CommandError(f"Tenant '{slug}' does not exist (use --create)")
+            fields = {f: manifest['tenant'][f] for f in TENANT_FIELDS}
+            fields['slug'] = slug
+            tenant = Tenant.objects.create(**fields)
+            self.stdout.write(f"🏢 Created tenant '{slug}'")
+
+        self.stdout.write(f"♻️  Restoring {path} into '{tenant.slug}'...")
+
+        def log(label, rows):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"   {label}: {rows}")
+
+        try:
+            counts = restore_tenant(path, tenant, batch_size=options['batch_size'], log=log)
+        except TenantBackupError as e:
+            raise CommandError(f"Restore failed, nothing was written: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Restored {sum(counts.values())} rows across {len(counts)} models"
+        ))
@@ -41,6 +41,7 @@ If no tenant can be resolved, request.tenant is set to None.
 ViewSets should handle None tenant by returning empty querysets or raising validation errors.
 """
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.http import HttpRequest, HttpResponseForbidden
 from django.db import connection
 from .models import Tenant, TenantUser, TenantDomain
@@ -61,26 +62,66 @@ class TenantMiddleware:
     - Verifies user has TenantUser association when using X-Tenant-ID header
     - Superusers can access any tenant
     - Returns 403 Forbidden for unauthorized tenant access attempts
+
+    Sync and async capable: under ASGI the resolution queries run in one
+    sync_to_async call and async views are awaited directly.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request: HttpRequest):
         """Process the request and set tenant context."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        forbidden = self.resolve_tenant(request)
+        if forbidden is not None:
+            return forbidden
+        try:
+            response = self.get_response(request)
+        except Exception as e:
+            self._log_exception(request, e)
+            raise
+        self._log_response(request, response)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        forbidden = await sync_to_async(self.resolve_tenant)(request)
+        if forbidden is not None:
+            return forbidden
+        try:
+            response = await self.get_response(request)
+        except Exception as e:
+            self._log_exception(request, e)
+            raise
+        self._log_response(request, response)
+        return response
+
+    def resolve_tenant(self, request: HttpRequest):
+        """
+        Set request.tenant / request.tenant_user and the RLS variable.
+
+        Returns a 403 response when the X-Tenant-ID header names a tenant
+        the user may not access, None otherwise.
+        """
         # Skip tenant resolution for health check and readiness endpoints
         if request.path.startswith('/api/v1/health/') or request.path.startswith('/api/v1/ready/'):
             request.tenant = None
             request.tenant_user = None
-            return self.get_response(request)
+            return None
         
         tenant = None
         resolution_method = None  # Track how tenant was resolved for logging
         
         # Temporary debugging for staging.meatscentral.com and uat.meatscentral.com
         host = request.get_host().split(":")[0]
-        is_debug_host = host in ["staging.meatscentral.com", "uat.meatscentral.com"]
-        debug_prefix = "[STAGING DEBUG]" if host == "staging.meatscentral.com" else "[UAT DEBUG]"
+        debug_prefix = self._debug_prefix(request)
+        is_debug_host = debug_prefix is not None
         if is_debug_host:
             logger.info(
                 f"{debug_prefix} Request received - "
@@ -284,27 +325,37 @@ class TenantMiddleware:
                     f"error={type(e).__name__}: {str(e)}"
                 )
 
-        try:
-            response = self.get_response(request)
-            
-            if is_debug_host:
-                logger.info(
-                    f"{debug_prefix} Response generated - "
-                    f"status_code={response.status_code if hasattr(response, 'status_code') else 'unknown'}"
-                )
-        except Exception as e:
-            if is_debug_host:
-                logger.error(
-                    f"{debug_prefix} Exception during request processing - "
-                    f"error_type={type(e).__name__}, error={str(e)}"
-                )
-            # Log session-related errors that may indicate readonly database
-            if "readonly" in str(e).lower() or "read-only" in str(e).lower():
-                logger.error(
-                    f"Readonly database error detected: "
-                    f"user={request.user.username if request.user.is_authenticated else 'Anonymous'}, "
-                    f"path={request.path}, error={type(e).__name__}: {str(e)}"
-                )
-            raise
-        
-        return response
+        return None
+
+    @staticmethod
+    def _debug_prefix(request: HttpRequest):
+        """Log prefix for the temporarily debugged hosts, None for others."""
+        host = request.get_host().split(":")[0]
+        if host == "staging.meatscentral.com":
+            return "[STAGING DEBUG]"
+        if host == "uat.meatscentral.com":
+            return "[UAT DEBUG]"
+        return None
+
+    def _log_response(self, request: HttpRequest, response):
+        debug_prefix = self._debug_prefix(request)
+        if debug_prefix:
+            logger.info(
+                f"{debug_prefix} Response generated - "
+                f"status_code={response.status_code if hasattr(response, 'status_code') else 'unknown'}"
+            )
+
+    def _log_exception(self, request: HttpRequest, e: Exception):
+        debug_prefix = self._debug_prefix(request)
+        if debug_prefix:
+            logger.error(
+                f"{debug_prefix} Exception during request processing - "
+                f"error_type={type(e).__name__}, error={str(e)}"
+            )
+        # Log session-related errors that may indicate readonly database
+        if "readonly" in str(e).lower() or "read-only" in str(e).lower():
+            logger.error(
+                f"Readonly database error detected: "
+                f"user={request.user.username if request.user.is_authenticated else 'Anonymous'}, "
+                f"path={request.path}, error={type(e).__name__}: {str(e)}"
+            )
@@ -39,39 +39,44 @@ def send_invitation_email(sender, instance, created, **kwargs):
         logger.info(f"SENDGRID_API_KEY: {'✅ SET' if getattr(settings, 'SENDGRID_API_KEY', '') else '❌ NOT SET'}")
         logger.info("=" * 60)
         
-        # Construct the invite link
-        base_url = getattr(settings, 'FRONTEND_URL', 'https://meatscentral.com')
-        invite_url = f"{base_url}/signup?token={instance.token}"
-        
-        subject = f"You've been invited to join {instance.tenant.name} on Meats Central"
-        
-        message = (
-            f"Hello,\n\n\n"
-            f"You have been invited to join '{instance.tenant.name}' as a {instance.role}. "
-            f"Join us on Meats Central!\n\n\n"
-            f"Click the link below to accept the invitation and set up your account:\n"
-            f"{invite_url}\n\n"
-            f"This link expires on {instance.expires_at.strftime('%Y-%m-%d')}.\n\n\n"
-            f"Welcome to easy,\n\n"
-            f"The Meats Central Team"
+        deliver_invitation_email(instance)
+
+
+def deliver_invitation_email(invitation):
+    """Send the invitation email for ``invitation`` (raises on failure)."""
+    # Construct the invite link
+    base_url = getattr(settings, 'FRONTEND_URL', 'https://meatscentral.com')
+    invite_url = f"{base_url}/signup?token={invitation.token}"
+
+    subject = f"You've been invited to join {invitation.tenant.name} on Meats Central"
+
+    message = (
+        f"Hello,\n\n\n"
+        f"You have been invited to join '{invitation.tenant.name}' as a {invitation.role}. "
+        f"Join us on Meats Central!\n\n\n"
+        f"Click the link below to accept the invitation and set up your account:\n"
+        f"{invite_url}\n\n"
+        f"This link expires on {invitation.expires_at.strftime('%Y-%m-%d')}.\n\n\n"
+        f"Welcome to easy,\n\n"
+        f"The Meats Central Team"
+    )
+
+    try:
+        logger.info(f"📤 Sending invitation email to {invitation.email} via SendGrid Web API...")
+        result = send_mail(
+            subject=subject,
+            message=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[invitation.email],
+            fail_silently=False,
         )
-        
-        try:
-            logger.info(f"📤 Sending invitation email to {instance.email} via SendGrid Web API...")
-            result = send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[instance.email],
-                fail_silently=False,
-            )
-            logger.info(f"✅ Email sent successfully! (result={result})")
-        except Exception as e:
-            logger.exception(f"❌ Failed to send email to {instance.email}")
-            logger.error(f"Error type: {type(e).__name__}")
-            logger.error(f"Error message: {str(e)}")
-            # Re-raise to ensure error is visible
-            raise
+        logger.info(f"✅ Email sent successfully! (result={result})")
+    except Exception as e:
+        logger.exception(f"❌ Failed to send email to {invitation.email}")
+        logger.error(f"Error type: {type(e).__name__}")
+        logger.error(f"Error message: {str(e)}")
+        # Re-raise to ensure error is visible
+        raise
 
 
 @receiver(post_save, sender=TenantUser, dispatch_uid="ensure_privileged_roles_have_staff_access")
@@ -0,0 +1,143 @@
+"""
+Tests for the tenant_backup / tenant_restore management commands.
+"""
+import json
+import tempfile
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.tenants.models import Tenant
+from apps.tenants.utils.tenant_backup import MANIFEST_NAME, restore_order, tenant_models
+from tenant_apps.cockpit.models import ActivityLog, RecurrenceChoices, ScheduledCall
+from tenant_apps.contacts.models import Contact
+from tenant_apps.plants.models import Plant
+from tenant_apps.products.models import Product
+from tenant_apps.purchase_orders.models import PurchaseOrder
+from tenant_apps.suppliers.models import Supplier
+
+
+class TenantBackupRestoreTests(TestCase):
+    """Round-trip a tenant through backup and restore."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.unique_id = unique_id
+        self.tenant = Tenant.objects.create(
+            name=f"Backup Co {unique_id}",
+            slug=f"backup-co-{unique_id}",
+            contact_email=f"admin_{unique_id}@backup.com",
+        )
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name=f"Supplier {unique_id}")
+        self.plant = Plant.objects.create(
+            tenant=self.tenant, name=f"Plant {unique_id}", code=f"P-{unique_id}", supplier=self.supplier
+        )
+        # Supplier.plant <-> Plant.supplier is a nullable FK cycle
+        self.supplier.plant = self.plant
+        self.supplier.save()
+        self.contact = Contact.objects.create(
+            tenant=self.tenant, first_name="Jane", last_name="Doe", supplier=self.supplier
+        )
+        self.supplier.contacts.add(self.contact)
+        self.product = Product.objects.create(
+            tenant=self.tenant,
+            product_code=f"BK-{unique_id}",
+            description_of_product_item="Boxed beef",
+            supplier=self.supplier,
+        )
+        self.order = PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number=f"PO-{unique_id}",
+            supplier=self.supplier,
+            product=self.product,
+            total_amount=Decimal("1234.50"),
+            order_date="2024-01-01",
+        )
+        self.log = ActivityLog.objects.create(
+            tenant=self.tenant,
+            entity_type="purchase_order",
+            entity_id=self.order.id,
+            content="Called supplier",
+        )
+        self.call = ScheduledCall.objects.create(
+            tenant=self.tenant,
+            entity_type="supplier",
+            entity_id=self.supplier.id,
+            title="Weekly pricing call",
+            scheduled_for=datetime(2024, 1, 8, 15, 0, 0, 123456, tzinfo=dt_timezone.utc),
+            recurrence=RecurrenceChoices.WEEKLY,
+            recurrence_until=datetime(2024, 3, 25, 15, 0, tzinfo=dt_timezone.utc),
+        )
+        self.output = tempfile.mkdtemp()
+
+    def _backup(self):
+        call_command(
+            'tenant_backup', '--tenant', self.tenant.slug,
+            '--output', self.output, '--workers', '1', verbosity=0,
+        )
+        return Path(self.output) / self.tenant.slug
+
+    def test_backup_writes_manifest_and_files(self):
+        backup_dir = self._backup()
+        manifest = json.loads((backup_dir / MANIFEST_NAME).read_text())
+
+        rows = {entry['model']: entry['rows'] for entry in manifest['models']}
+        self.assertEqual(rows['suppliers.Supplier'], 1)
+        self.assertEqual(rows['suppliers.Supplier_contacts'], 1)
+        self.assertEqual(rows['purchase_orders.PurchaseOrder'], 1)
+        for entry in manifest['models']:
+            self.assertTrue((backup_dir / entry['file']).exists())
+        self.assertIn('ai_assistant.ChatSession', manifest['skipped_models'])
+
+    def test_restore_into_new_tenant_remaps_keys(self):
+        backup_dir = self._backup()
+        # Globally unique codes must not collide with the source rows.
+        Product.objects.filter(pk=self.product.pk).update(product_code=f"OLD-{self.unique_id}")
+        Plant.objects.filter(pk=self.plant.pk).update(code=f"OLD-{self.unique_id}")
+
+        new_slug = f"restored-{self.unique_id}"
+        call_command(
+            'tenant_restore', str(backup_dir), '--tenant', new_slug, '--create', verbosity=0,
+        )
+        restored = Tenant.objects.get(slug=new_slug)
+
+        supplier = Supplier.objects.get(tenant=restored)
+        self.assertNotEqual(supplier.pk, self.supplier.pk)
+        self.assertEqual(supplier.plant.tenant, restored)
+        self.assertEqual(supplier.plant.supplier, supplier)
+        self.assertEqual(list(supplier.contacts.values_list('last_name', flat=True)), ['Doe'])
+
+        order = PurchaseOrder.objects.get(tenant=restored)
+        self.assertEqual(order.order_number, self.order.order_number)
+        self.assertEqual(order.total_amount, Decimal("1234.50"))
+        self.assertEqual(order.product.supplier, supplier)
+        self.assertEqual(order.created_on, self.order.created_on)
+
+        log = ActivityLog.objects.get(tenant=restored)
+        self.assertEqual(log.entity_id, order.pk)
+
+        call = ScheduledCall.objects.get(tenant=restored)
+        self.assertEqual(call.entity_id, supplier.pk)
+        self.assertEqual(call.span, self.call.span)
+        self.assertEqual(call.span, call.compute_span())
+
+    def test_restore_refuses_non_empty_tenant(self):
+        backup_dir = self._backup()
+        from django.core.management.base import CommandError
+
+        with self.assertRaises(CommandError):
+            call_command('tenant_restore', str(backup_dir), verbosity=0)
+        self.assertEqual(Supplier.objects.filter(tenant=self.tenant).count(), 1)
+
+    def test_restore_order_breaks_nullable_cycles(self):
+        included, _ = tenant_models()
+        order, deferred = restore_order({m._meta.label: m for m in included})
+
+        self.assertLess(order.index('suppliers.Supplier'), order.index('purchase_orders.PurchaseOrder'))
+        self.assertLess(order.index('purchase_orders.PurchaseOrder'), order.index('cockpit.ActivityLog'))
+        deferred_fields = [a for attnames in deferred.values() for a in attnames]
+        self.assertTrue(deferred_fields)
@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import TenantViewSet, TenantUserViewSet
 from .invitation_views import (
     TenantInvitationViewSet,
+    resend_invitation,
     signup_with_invitation,
     validate_invitation
 )
@@ -15,6 +16,8 @@ router.register(r"invitations", TenantInvitationViewSet, basename='tenant-invita
 app_name = "tenants"
 
 urlpatterns = [
+    # Native async view (see apps/core/async_views.py)
+    path("invitations/<str:pk>/resend/", resend_invitation, name='tenant-invitation-resend'),
     path("", include(router.urls)),
     path("invitations/validate/", validate_invitation, name='validate-invitation'),
     path("auth/signup-with-invitation/", signup_with_invitation, name='signup-with-invitation'),
@@ -0,0 +1,5 @@
+"""
+HTTP load-test and benchmark suite for the ProjectMeats API.
+
+See benchmarks/README.md for usage.
+"""
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: CPU cost vs bandwidth saved by response compression.
+
+Usage (from backend/):
+    python -m benchmarks.compression --tenant bench-1
+    python -m benchmarks.compression --tenant bench-1 --paths products/,payments/?format=columnar
+
+Fetches typical ``/api/v1/`` list pages in-process as the tenant's first
+active user, then compresses each body with the codings and levels
+CompressionMiddleware can use (gzip levels; brotli qualities when the
+``brotli`` package is installed). Reports the compressed size, the CPU time
+per response and the bytes saved per millisecond of CPU, which is the
+number to weigh against the deployment's bandwidth and latency budget.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import zlib
+from unittest import mock
+
+DEFAULT_PATHS = (
+    "products/",
+    "purchase-orders/",
+    "payments/",
+    "suppliers/",
+    "products/?format=columnar&page_size=1000",
+    "purchase-orders/?format=columnar&page_size=1000",
+)
+
+
+def gzip_bytes(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def codecs(gzip_levels, brotli_qualities):
+    """``[(label, compress function)]`` for the available codings."""
+    available = [(f"gzip-{level}", lambda data, level=level: gzip_bytes(data, level)) for level in gzip_levels]
+    try:
+        import brotli
+    except ImportError:
+        return available
+    available += [
+        (f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality))
+        for quality in brotli_qualities
+    ]
+    return available
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tenant", default="bench-1", help="Tenant slug to fetch as")
+    parser.add_argument(
+        "--paths",
+        type=lambda value: value.split(","),
+        default=list(DEFAULT_PATHS),
+        help="Comma separated paths under /api/v1/",
+    )
+    parser.add_argument("--page-size", type=int, default=100, help="JSON page size for list pages")
+    parser.add_argument("--gzip-levels", type=lambda v: [int(x) for x in v.split(",")], default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=lambda v: [int(x) for x in v.split(",")], default=[1, 4, 11])
+    parser.add_argument("--repeat", type=int, default=20, help="Timed compressions per body and codec")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "projectmeats.settings.development")
+    import django
+
+    django.setup()
+    from django.test.utils import override_settings
+    from rest_framework.pagination import PageNumberPagination
+    from rest_framework.test import APIClient
+
+    from apps.tenants.models import Tenant, TenantUser
+
+    try:
+        tenant = Tenant.objects.get(slug=args.tenant)
+    except Tenant.DoesNotExist:
+        sys.exit(f"Tenant '{args.tenant}' not found; seed it with generate_load_data")
+    membership = TenantUser.objects.filter(tenant=tenant, is_active=True).select_related("user").first()
+    if membership is None:
+        sys.exit(f"Tenant '{args.tenant}' has no active users")
+
+    client = APIClient()
+    client.force_authenticate(user=membership.user)
+    available = codecs(args.gzip_levels, args.brotli_qualities)
+
+    header = f"{'path':<48}{'codec':>9}{'bytes':>11}{'ratio':>8}{'cpu ms':>9}{'saved KB/cpu ms':>17}"
+    print(header)
+    print("-" * len(header))
+    for path in args.paths:
+        with override_settings(ALLOWED_HOSTS=["testserver"]), \
+                mock.patch.object(PageNumberPagination, "page_size", args.page_size):
+            response = client.get(f"/api/v1/{path}", HTTP_X_TENANT_ID=str(tenant.id))
+        if response.status_code != 200:
+            print(f"{path:<48} HTTP {response.status_code}, skipped")
+            continue
+        body = response.content
+        print(f"{path:<48}{'identity':>9}{len(body):>11,}{1.0:>8.2f}{0.0:>9.2f}{'-':>17}")
+        for label, compress in available:
+            size = len(compress(body))
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                compress(body)
+                samples.append((time.perf_counter() - started) * 1000)
+            cpu_ms = statistics.median(samples)
+            saved = (len(body) - size) / 1024 / cpu_ms if cpu_ms else float("inf")
+            print(f"{'':<48}{label:>9}{size:>11,}{len(body) / size:>8.2f}{cpu_ms:>9.2f}{saved:>17.0f}")
+    if not any(label.startswith("br-") for label, _ in available):
+        print("\nbrotli is not installed; only gzip was measured (pip install brotli)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrency capacity of sync (WSGI) vs uvicorn (ASGI) workers.
+
+Usage (from backend/):
+    python -m benchmarks.concurrency
+    python -m benchmarks.concurrency --workers 2 --latency-ms 300 --concurrency 1,8,32,64
+
+Boots gunicorn with sync workers and then with uvicorn workers (same worker
+count), with the AI assistant's mock provider waiting ``--latency-ms`` per
+reply like a remote model call. At each concurrency level, that many clients
+post to ``/api/v1/ai-assistant/ai-chat/chat/`` for ``--duration`` seconds.
+Sync workers top out near ``workers / latency`` requests per second while
+the async chat view keeps scaling until the database becomes the limit.
+
+With ``--stream`` the clients use the server-sent event endpoint
+(``ai-chat/stream/``) instead and the time to first byte is reported too:
+the first event leaves before the provider is called.
+
+Requires benchmark tenants (``manage.py generate_load_data --prefix bench``)
+and the ``uvicorn`` package for the ASGI run.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+from benchmarks.server import Server
+from benchmarks.workloads import BenchmarkClient
+
+CHAT_PATH = "/api/v1/ai-assistant/ai-chat/chat/"
+STREAM_PATH = "/api/v1/ai-assistant/ai-chat/stream/"
+MODES = {"wsgi": "gunicorn", "asgi": "uvicorn"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modes", type=lambda v: v.split(","), default=list(MODES), help="wsgi,asgi")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes")
+    parser.add_argument("--latency-ms", type=int, default=300, help="Simulated provider latency")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=[1, 8, 32, 64],
+        help="Comma separated concurrent client counts",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Measured seconds per level")
+    parser.add_argument("--stream", action="store_true", help="Use the SSE endpoint and report TTFB")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--prefix", default="bench", help="Tenant prefix used by generate_load_data")
+    parser.add_argument("--password", default="loadtest123")
+    return parser.parse_args(argv)
+
+
+def post_chat(session, base_url, payload):
+    """Post one chat message; ``(ttfb_s, session_id)``, raising on failure."""
+    started = time.perf_counter()
+    response = session.post(f"{base_url}{CHAT_PATH}", json=payload, timeout=60)
+    response.raise_for_status()
+    return time.perf_counter() - started, response.json()["session_id"]
+
+
+def post_stream(session, base_url, payload):
+    """Stream one reply to completion; ``(ttfb_s, session_id)``, raising on failure."""
+    started = time.perf_counter()
+    ttfb = None
+    body = b""
+    with session.post(f"{base_url}{STREAM_PATH}", json=payload, timeout=60, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=None):
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+            body += chunk
+    last = body.decode().strip().rsplit("\n\n", 1)[-1]
+    if not last.startswith("event: done"):
+        raise RuntimeError("stream did not complete")
+    return ttfb, json.loads(last.split("data: ", 1)[1])["session_id"]
+
+
+def drive(base_url, headers, clients, duration, post=post_chat):
+    """``clients`` threads posting chat messages; returns (latencies, ttfbs, errors)."""
+    latencies, ttfbs, errors = [], [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        session = requests.Session()
+        session.headers.update(headers)
+        session_id = None
+        local, local_ttfb = [], []
+        while time.monotonic() < deadline:
+            payload = {"message": "Show me supplier pricing trends"}
+            if session_id:
+                payload["session_id"] = session_id
+            started = time.perf_counter()
+            try:
+                ttfb, session_id = post(session, base_url, payload)
+            except (requests.RequestException, RuntimeError, ValueError):
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - started)
+            local_ttfb.append(ttfb)
+        with lock:
+            latencies.extend(local)
+            ttfbs.extend(local_ttfb)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, ttfbs, errors[0]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    env = dict(os.environ, AI_ASSISTANT_MOCK_LATENCY_MS=str(args.latency_ms))
+
+    post = post_stream if args.stream else post_chat
+    header = (
+        f"{'mode':<6}{'clients':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'ttfb p50':>10}{'ttfb p95':>10}{'errors':>8}"
+    )
+    print(f"{args.workers} workers, {args.latency_ms} ms provider latency, {args.duration:.0f}s per level")
+    print(f"Sync ceiling: ~{args.workers * 1000 / args.latency_ms:.1f} req/s\n")
+    print(header)
+    print("-" * len(header))
+    for mode in args.modes:
+        with Server(port=args.port, workers=args.workers, kind=MODES[mode], env=env) as server:
+            client = BenchmarkClient(server.url, f"{args.prefix}-1-user", args.password)
+            client.login()
+            headers = dict(client.session.headers)
+            for clients in args.concurrency:
+                latencies, ttfbs, errors = drive(server.url, headers, clients, args.duration, post)
+                if not latencies:
+                    print(f"{mode:<6}{clients:>9}{'-':>9}{'-':>9}{'-':>9}{'-':>10}{'-':>10}{errors:>8}")
+                    continue
+                print(
+                    f"{mode:<6}{clients:>9}{len(latencies) / args.duration:>9.1f}"
+                    f"{statistics.median(latencies) * 1000:>9.0f}{percentile(latencies, 0.95) * 1000:>9.0f}"
+                    f"{statistics.median(ttfbs) * 1000:>10.0f}{percentile(ttfbs, 0.95) * 1000:>10.0f}{errors:>8}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Run an HTTP load test against the ProjectMeats API.
+
+Usage (from backend/):
+    # Seed, boot gunicorn, run the mixed workload and record a baseline
+    python -m benchmarks.run --seed-data --boot --record mixed
+
+    # Same workload, fail (exit 1) if it regressed against the stored baseline
+    python -m benchmarks.run --boot --compare mixed --threshold 0.15
+
+    # Point at an already running server
+    python -m benchmarks.run --url http://127.0.0.1:8000 --clients 32 --duration 60
+
+The database comes from the usual Django settings (DJANGO_SETTINGS_MODULE,
+DATABASE_URL / DB_*). Benchmark tenants are created with
+``manage.py generate_load_data --prefix bench``.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.server import BACKEND_DIR, Server, seed
+from benchmarks.stats import BASELINE_SCHEMA_VERSION, compare, summarize
+from benchmarks.workloads import WORKLOADS, BenchmarkClient, pick_operation
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def run_clients(args, base_url):
+    """Drive the workload from ``args.clients`` threads; return summaries."""
+    weights = WORKLOADS[args.workload]
+    clients = []
+    for index in range(args.clients):
+        tenant = index % args.tenants + 1
+        client = BenchmarkClient(
+            base_url,
+            username=f"{args.prefix}-{tenant}-user",
+            password=args.password,
+            seed=args.random_seed + index,
+        )
+        client.prepare()
+        clients.append(client)
+
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    start_measuring = time.monotonic() + args.warmup
+    deadline = start_measuring + args.duration
+
+    def worker(client):
+        local = defaultdict(list)
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            name = pick_operation(client.rng, weights)
+            latency, ok, queries, _ = getattr(client, f"op_{name}")()
+            if now >= start_measuring:
+                local[name].append((latency, ok, queries))
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+
+    threads = [threading.Thread(target=worker, args=(c,), daemon=True) for c in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {name: summarize(values, args.duration) for name, values in sorted(samples.items())}
+    results["_all"] = summarize([s for values in samples.values() for s in values], args.duration)
+    return results
+
+
+def git_sha():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results):
+    header = f"{'operation':<16}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<16}{r['requests']:>8}{r['errors']:>6}{r['throughput_rps'] or 0:>9.1f}"
+            f"{r['p50_ms'] or 0:>9.1f}{r['p95_ms'] or 0:>9.1f}{r['p99_ms'] or 0:>9.1f}"
+            f"{r['queries_per_request'] if r['queries_per_request'] is not None else '-':>8}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ProjectMeats API load test")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Benchmark an already running server")
+    target.add_argument("--boot", action="store_true", help="Boot a local server for the run")
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn", "runserver"], default="gunicorn")
+    parser.add_argument("--server-workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--tenants", type=int, default=3, help="Tenants the clients are spread across")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring")
+    parser.add_argument("--seed-data", action="store_true", help="Generate benchmark tenants first")
+    parser.add_argument("--orders", type=int, default=20000, help="Orders per tenant when seeding")
+    parser.add_argument("--prefix", default="bench", help="Tenant prefix used by generate_load_data")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--record", metavar="NAME", help="Write results to baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against baselines/NAME.json")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p95/throughput regression")
+    parser.add_argument("--query-tolerance", type=float, default=0.5, help="Allowed extra queries/request")
+    parser.add_argument("--output", help="Also write the raw results JSON here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed_data:
+        created = seed(args.tenants, args.orders, args.random_seed, args.prefix)
+        print("Seeded benchmark tenants" if created else "Benchmark tenants already present")
+
+    config = {
+        key: getattr(args, key)
+        for key in ("workload", "clients", "tenants", "duration", "warmup", "orders", "server", "server_workers")
+    }
+    if args.boot or not args.url:
+        with Server(port=args.port, workers=args.server_workers, kind=args.server) as server:
+            results = run_clients(args, server.url)
+    else:
+        results = run_clients(args, args.url)
+
+    report = {
+        "schema_version": BASELINE_SCHEMA_VERSION,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "git_sha": git_sha(),
+        "config": config,
+        "results": results,
+    }
+    print_table(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.record:
+        path = BASELINE_DIR / f"{args.record}.json"
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {path}")
+    if args.compare:
+        path = BASELINE_DIR / f"{args.compare}.json"
+        baseline = json.loads(path.read_text())
+        if baseline.get("schema_version") != BASELINE_SCHEMA_VERSION:
+            print(f"Baseline {path} uses schema {baseline.get('schema_version')}; re-record it")
+            return 2
+        if baseline.get("config") != config:
+            print(f"Warning: run config differs from baseline config {baseline.get('config')}")
+        regressions = compare(
+            baseline, report,
+            latency_threshold=args.threshold,
+            throughput_threshold=args.threshold,
+            query_tolerance=args.query_tolerance,
+        )
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nNo regressions against {path.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
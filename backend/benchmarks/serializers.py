@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: ModelSerializer list pages vs the values() fast path.
+
+Usage (from backend/):
+    python -m benchmarks.serializers --tenant bench-1
+    python -m benchmarks.serializers --tenant bench-1 --page-sizes 20,100,500 --repeat 30
+
+Calls the list action of the product, location and purchase order
+ViewSets in-process (no HTTP, no middleware) as the tenant's first active
+user, once with ``ValuesListMixin`` disabled and once enabled, renders the
+JSON, checks both payloads are identical and reports the median time per
+page. The database comes from the usual Django settings; benchmark tenants
+are created with ``manage.py generate_load_data --prefix bench``.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from unittest import mock
+
+ENDPOINTS = (
+    ("products", "tenant_apps.products.views.ProductViewSet"),
+    ("locations", "tenant_apps.locations.views.LocationViewSet"),
+    ("purchase-orders", "tenant_apps.purchase_orders.views.PurchaseOrderViewSet"),
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tenant", default="bench-1", help="Tenant slug to list as")
+    parser.add_argument(
+        "--page-sizes",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=[20, 100, 500],
+        help="Comma separated page sizes (default: 20,100,500)",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per path and page size")
+    parser.add_argument("--query", default="", help="Extra query string, e.g. 'fields=id,name'")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "projectmeats.settings.development")
+    import django
+
+    django.setup()
+    from django.utils.module_loading import import_string
+    from rest_framework.pagination import PageNumberPagination
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from apps.core.mixins import ValuesListMixin
+    from apps.tenants.models import Tenant, TenantUser
+
+    try:
+        tenant = Tenant.objects.get(slug=args.tenant)
+    except Tenant.DoesNotExist:
+        sys.exit(f"Tenant '{args.tenant}' not found; seed it with generate_load_data")
+    membership = TenantUser.objects.filter(tenant=tenant, is_active=True).select_related("user").first()
+    if membership is None:
+        sys.exit(f"Tenant '{args.tenant}' has no active users")
+
+    factory = APIRequestFactory()
+    renderer = JSONRenderer()
+
+    def render_page(view, path, page_size):
+        request = factory.get(f"/api/v1/{path}/?{args.query}")
+        request.tenant = tenant
+        force_authenticate(request, user=membership.user)
+        with mock.patch.object(PageNumberPagination, "page_size", page_size):
+            response = view(request)
+        return renderer.render(response.data)
+
+    def timed(view, path, page_size, enabled):
+        with mock.patch.object(ValuesListMixin, "values_list_enabled", enabled):
+            payload = render_page(view, path, page_size)
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                render_page(view, path, page_size)
+                samples.append((time.perf_counter() - started) * 1000)
+        return payload, statistics.median(samples)
+
+    header = f"{'endpoint':<18}{'page':>6}{'serializer ms':>15}{'values ms':>12}{'speedup':>10}{'bytes':>10}"
+    print(header)
+    print("-" * len(header))
+    mismatches = []
+    for path, view_path in ENDPOINTS:
+        view = import_string(view_path).as_view({"get": "list"})
+        for page_size in args.page_sizes:
+            regular, regular_ms = timed(view, path, page_size, False)
+            fast, fast_ms = timed(view, path, page_size, True)
+            if fast != regular:
+                mismatches.append(f"{path} page {page_size}")
+            print(
+                f"{path:<18}{page_size:>6}{regular_ms:>15.1f}{fast_ms:>12.1f}"
+                f"{regular_ms / fast_ms:>9.1f}x{len(fast):>10,}"
+            )
+    if mismatches:
+        print(f"\nPAYLOAD MISMATCH: {', '.join(mismatches)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
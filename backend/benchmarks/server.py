@@ -0,0 +1,103 @@
+"""
+Boot a local API server for benchmarking.
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def manage(*args, env=None):
+    """Run a manage.py command and return the CompletedProcess."""
+    return subprocess.run(
+        [sys.executable, "manage.py", *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def seed(tenants, orders, seed_value, prefix, env=None):
+    """Generate benchmark tenants unless they already exist."""
+    result = manage(
+        "generate_load_data",
+        "--tenants", str(tenants),
+        "--orders", str(orders),
+        "--seed", str(seed_value),
+        "--prefix", prefix,
+        env=env,
+    )
+    if result.returncode != 0 and "Already generated" not in result.stderr:
+        raise RuntimeError(f"Seeding failed:\n{result.stderr[-2000:]}")
+    return result.returncode == 0
+
+
+class Server:
+    """
+    Context manager running gunicorn (or runserver) with query counting on.
+
+    ``kind="uvicorn"`` runs gunicorn with uvicorn workers on the ASGI
+    application, like ``SERVER_MODE=asgi`` in gunicorn.conf.py.
+    """
+
+    def __init__(self, port=8765, workers=4, threads=1, kind="gunicorn", env=None):
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.kind = kind
+        self.env = dict(env or os.environ)
+        self.env["QUERY_COUNT_HEADER"] = "true"
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def command(self):
+        if self.kind == "runserver":
+            return [sys.executable, "manage.py", "runserver", f"127.0.0.1:{self.port}", "--noreload"]
+        if self.kind == "uvicorn":
+            return [
+                sys.executable, "-m", "gunicorn", "projectmeats.asgi:application",
+                "--worker-class", "uvicorn.workers.UvicornWorker",
+                "--bind", f"127.0.0.1:{self.port}",
+                "--workers", str(self.workers),
+                "--log-level", "warning",
+            ]
+        return [
+            sys.executable, "-m", "gunicorn", "projectmeats.wsgi:application",
+            "--bind", f"127.0.0.1:{self.port}",
+            "--workers", str(self.workers),
+            "--threads", str(self.threads),
+            "--log-level", "warning",
+        ]
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.command(), cwd=BACKEND_DIR, env=self.env)
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}")
+            try:
+                if requests.get(f"{self.url}/api/v1/health/", timeout=2).ok:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        self.__exit__(None, None, None)
+        raise RuntimeError("Server did not become healthy within 60s")
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        return False
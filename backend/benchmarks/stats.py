@@ -0,0 +1,81 @@
+"""
+Latency statistics and baseline comparison for the benchmark suite.
+"""
+import math
+import statistics
+
+BASELINE_SCHEMA_VERSION = 1
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list (``pct`` in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples, duration):
+    """
+    Summarise one operation's samples.
+
+    ``samples`` is a list of ``(latency_seconds, ok, query_count)`` tuples;
+    query_count is None when the server does not send X-Query-Count.
+    """
+    latencies = [s[0] * 1000 for s in samples]
+    errors = sum(1 for s in samples if not s[1])
+    queries = [s[2] for s in samples if s[2] is not None]
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / duration, 2) if duration else None,
+        "p50_ms": _round(percentile(latencies, 50)),
+        "p95_ms": _round(percentile(latencies, 95)),
+        "p99_ms": _round(percentile(latencies, 99)),
+        "mean_ms": _round(statistics.fmean(latencies)) if latencies else None,
+        "queries_per_request": _round(statistics.fmean(queries)) if queries else None,
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def compare(baseline, current, latency_threshold=0.15, throughput_threshold=0.15, query_tolerance=0.5):
+    """
+    Return a list of human-readable regressions of ``current`` vs ``baseline``.
+
+    Latency regresses when p95 grows by more than ``latency_threshold``
+    (a fraction), throughput when it drops by more than
+    ``throughput_threshold``, and queries per request when the mean grows
+    by more than ``query_tolerance`` queries.
+    """
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        if base.get("p95_ms") and now.get("p95_ms"):
+            limit = base["p95_ms"] * (1 + latency_threshold)
+            if now["p95_ms"] > limit:
+                regressions.append(
+                    f"{name}: p95 {now['p95_ms']}ms > {limit:.2f}ms "
+                    f"(baseline {base['p95_ms']}ms +{latency_threshold:.0%})"
+                )
+        if base.get("throughput_rps") and now.get("throughput_rps") is not None:
+            floor = base["throughput_rps"] * (1 - throughput_threshold)
+            if now["throughput_rps"] < floor:
+                regressions.append(
+                    f"{name}: throughput {now['throughput_rps']} rps < {floor:.2f} rps "
+                    f"(baseline {base['throughput_rps']} rps -{throughput_threshold:.0%})"
+                )
+        if base.get("queries_per_request") is not None and now.get("queries_per_request") is not None:
+            if now["queries_per_request"] > base["queries_per_request"] + query_tolerance:
+                regressions.append(
+                    f"{name}: {now['queries_per_request']} queries/request "
+                    f"(baseline {base['queries_per_request']})"
+                )
+        if now.get("errors") and not base.get("errors"):
+            regressions.append(f"{name}: {now['errors']} errors (baseline had none)")
+    return regressions
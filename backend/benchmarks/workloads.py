@@ -0,0 +1,132 @@
+"""
+Workload definitions for the benchmark suite.
+
+Each benchmark client is a logged-in tenant user with its own HTTP
+session. Operations mirror what the frontend does most: list pages,
+cockpit search, creating purchase orders and posting payments.
+"""
+import random
+import time
+from datetime import date
+
+import requests
+
+SEARCH_TERMS = ["beef", "pork", "prairie", "summit", "PO2025", "SO2024", "meats", "golden"]
+LIST_PAGES = [
+    "/api/v1/suppliers/",
+    "/api/v1/customers/",
+    "/api/v1/products/",
+    "/api/v1/purchase-orders/",
+    "/api/v1/sales-orders/",
+    "/api/v1/invoices/",
+]
+
+# Operation weights per workload preset.
+WORKLOADS = {
+    "mixed": {"list_page": 45, "cockpit_search": 20, "po_create": 10, "payment_post": 10, "login": 5, "po_detail": 10},
+    "read": {"list_page": 60, "cockpit_search": 25, "po_detail": 15},
+    "write": {"po_create": 50, "payment_post": 50},
+}
+
+
+class BenchmarkClient:
+    """A logged-in tenant user issuing timed API requests."""
+
+    def __init__(self, base_url, username, password, timeout=30, seed=0):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+        self.supplier_ids = []
+        self.invoice_ids = []
+        self.order_ids = []
+        self.page_counts = {}
+
+    def request(self, method, path, **kwargs):
+        """Issue a request and return ``(latency_s, ok, query_count, response)``."""
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException:
+            return time.perf_counter() - started, False, None, None
+        latency = time.perf_counter() - started
+        queries = response.headers.get("X-Query-Count")
+        return latency, response.ok, int(queries) if queries else None, response
+
+    def login(self):
+        sample = self.request(
+            "POST", "/api/v1/auth/login/",
+            json={"username": self.username, "password": self.password},
+        )
+        response = sample[3]
+        if response is None or not response.ok:
+            raise RuntimeError(f"Login failed for {self.username}: {getattr(response, 'text', '')[:200]}")
+        payload = response.json()
+        self.session.headers["Authorization"] = f"Token {payload['token']}"
+        if payload.get("tenants"):
+            self.session.headers["X-Tenant-ID"] = str(payload["tenants"][0]["tenant__id"])
+        return sample
+
+    def prepare(self):
+        """Log in and collect ids the write operations need."""
+        self.login()
+        for path in LIST_PAGES:
+            _, ok, _, response = self.request("GET", path)
+            data = response.json() if ok else {}
+            rows = data.get("results", []) if isinstance(data, dict) else data
+            count = data.get("count", len(rows)) if isinstance(data, dict) else len(rows)
+            # Only request pages that exist (capped so deep pages don't dominate).
+            self.page_counts[path] = min(5, max(1, -(-count // max(1, len(rows)))))
+            ids = [row["id"] for row in rows if "id" in row]
+            if path == "/api/v1/suppliers/":
+                self.supplier_ids = ids
+            elif path == "/api/v1/invoices/":
+                self.invoice_ids = ids
+            elif path == "/api/v1/purchase-orders/":
+                self.order_ids = ids
+
+    # Operations -------------------------------------------------------------
+
+    def op_login(self):
+        return self.login()
+
+    def op_list_page(self):
+        path = self.rng.choice(LIST_PAGES)
+        return self.request("GET", path, params={"page": self.rng.randint(1, self.page_counts.get(path, 1))})
+
+    def op_cockpit_search(self):
+        return self.request("GET", "/api/v1/cockpit/slots/", params={"q": self.rng.choice(SEARCH_TERMS)})
+
+    def op_po_detail(self):
+        if not self.order_ids:
+            return self.op_list_page()
+        return self.request("GET", f"/api/v1/purchase-orders/{self.rng.choice(self.order_ids)}/")
+
+    def op_po_create(self):
+        if not self.supplier_ids:
+            return self.op_list_page()
+        return self.request("POST", "/api/v1/purchase-orders/", json={
+            "supplier": self.rng.choice(self.supplier_ids),
+            "order_date": date.today().isoformat(),
+            "total_amount": f"{self.rng.uniform(500, 50000):.2f}",
+        })
+
+    def op_payment_post(self):
+        if not self.invoice_ids:
+            return self.op_list_page()
+        return self.request("POST", "/api/v1/payments/", json={
+            "invoice": self.rng.choice(self.invoice_ids),
+            "amount": "1.00",
+            "payment_date": date.today().isoformat(),
+            "payment_method": "ach",
+            "reference_number": f"BENCH{self.rng.randrange(10**8)}",
+        })
+
+
+def pick_operation(rng, weights):
+    names = list(weights)
+    return rng.choices(names, weights=[weights[n] for n in names], k=1)[0]
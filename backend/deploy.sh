@@ -33,7 +33,7 @@ fi
 log_info "Starting ProjectMeats deployment..."
 
 # Step 1: Check database connectivity
-log_info "Step 1/6: Checking database connectivity..."
+log_info "Step 1/7: Checking database connectivity..."
 MAX_RETRIES=30
 RETRY_COUNT=0
 
@@ -53,7 +53,7 @@ while [ $RETRY_COUNT -lt $MAX_RETRIES ]; do
 done
 
 # Step 2: Run migrations
-log_info "Step 2/6: Running database migrations..."
+log_info "Step 2/7: Running database migrations..."
 python manage.py migrate --noinput || {
     log_error "Migration failed"
     exit 1
@@ -61,26 +61,32 @@ python manage.py migrate --noinput || {
 log_info "Migrations completed successfully"
 
 # Step 3: Create superuser and root tenant (idempotent)
-log_info "Step 3/6: Creating superuser and root tenant..."
+log_info "Step 3/7: Creating superuser and root tenant..."
 python manage.py create_super_tenant --verbosity=1 || {
     log_warn "create_super_tenant command failed or not available, continuing..."
 }
 
 # Step 4: Create guest tenant (idempotent)
-log_info "Step 4/6: Creating guest tenant..."
+log_info "Step 4/7: Creating guest tenant..."
 python manage.py create_guest_tenant --verbosity=1 || {
     log_warn "create_guest_tenant command failed or not available, continuing..."
 }
 
 # Step 5: Collect static files
-log_info "Step 5/6: Collecting static files..."
+log_info "Step 5/7: Collecting static files..."
 python manage.py collectstatic --noinput --clear || {
     log_warn "collectstatic failed, but continuing (may not be critical)"
 }
 log_info "Static files collected successfully"
 
-# Step 6: Run system checks
-log_info "Step 6/6: Running system checks..."
+# Step 6: Prebuild the OpenAPI schema so /api/docs/ loads instantly
+log_info "Step 6/7: Building OpenAPI schema cache..."
+python manage.py build_openapi_schema || {
+    log_warn "build_openapi_schema failed, schema will be generated on first request"
+}
+
+# Step 7: Run system checks
+log_info "Step 7/7: Running system checks..."
 python manage.py check || {
     log_warn "System check found issues, but deployment continues"
 }
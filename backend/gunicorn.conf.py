@@ -0,0 +1,31 @@
+"""
+Gunicorn deployment profiles, selected with SERVER_MODE.
+
+- ``wsgi`` (default): sync workers serving projectmeats.wsgi. Every request
+  holds its worker until it completes, including time spent waiting on
+  SendGrid or the AI provider.
+- ``asgi``: uvicorn workers serving projectmeats.asgi. Native async views
+  wait on outbound I/O without holding the worker; DRF views run in a
+  thread per request. Needs the ``uvicorn`` package, and persistent DB
+  connections are disabled in this mode (see settings/production.py).
+
+Usage (from backend/, picked up automatically by gunicorn):
+    gunicorn
+    SERVER_MODE=asgi GUNICORN_WORKERS=4 gunicorn
+
+Compare both with ``python -m benchmarks.concurrency``.
+"""
+import os
+
+server_mode = os.environ.get("SERVER_MODE", "wsgi").lower()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+
+if server_mode == "asgi":
+    wsgi_app = "projectmeats.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "projectmeats.wsgi:application"
+    worker_class = "sync"
@@ -3,6 +3,11 @@ ASGI config for projectmeats project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Served by uvicorn workers under gunicorn when SERVER_MODE=asgi (see
+gunicorn.conf.py). The middleware stack is async capable end to end, so
+native async views (AI assistant chat, invitation resend) await outbound
+I/O on the event loop; DRF views keep running in a thread per request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -11,6 +16,7 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "projectmeats.settings")
+# Same default as wsgi.py
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "projectmeats.settings.production")
 
 application = get_asgi_application()
@@ -52,12 +52,14 @@ _PROJECT_APPS = [
     "apps.tenants",  # Tenant management (shared-schema approach)
     # Business apps (all use tenant_id for data isolation)
     "tenant_apps.accounts_receivables",
+    "tenant_apps.analytics",
     "tenant_apps.ai_assistant",
     "tenant_apps.bug_reports",
     "tenant_apps.carriers",
     "tenant_apps.cockpit",
     "tenant_apps.contacts",
     "tenant_apps.customers",
+    "tenant_apps.dedupe",
     "tenant_apps.invoices",
     "tenant_apps.locations",
     "tenant_apps.plants",
@@ -77,8 +79,10 @@ INSTALLED_APPS = (
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # Must be first for CORS headers
+    "apps.core.middleware.QueryCountMiddleware",  # No-op unless QUERY_COUNT_HEADER is on
+    "apps.core.middleware.CompressionMiddleware",  # gzip/brotli for dynamic responses
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",  # Static files middleware
+    "apps.core.middleware.StaticFilesMiddleware",  # WhiteNoise static files, async capable
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -154,6 +158,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
+        "apps.core.renderers.ColumnarJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
@@ -166,12 +171,13 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.ColumnarPageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
+        "apps.core.filters.FieldSelectionFilter",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "apps.core.exceptions.exception_handler",
@@ -187,6 +193,13 @@ SPECTACULAR_SETTINGS = {
     "SORT_OPERATIONS": False,
 }
 
+# /api/schema/ is served from a schema generated once per code version
+# (apps/core/schema.py). CODE_VERSION identifies the release (e.g. the git
+# SHA); when unset, a fingerprint of the source files is used instead.
+# `manage.py build_openapi_schema` prebuilds the files during deployment.
+CODE_VERSION = os.environ.get("CODE_VERSION", os.environ.get("GIT_SHA", ""))
+OPENAPI_SCHEMA_CACHE_DIR = os.environ.get("OPENAPI_SCHEMA_CACHE_DIR", str(BASE_DIR / ".openapi_cache"))
+
 # Ensure logs directory exists for file handlers
 # Reference: https://docs.python.org/3/library/logging.html#logging.FileHandler
 # This ensures the logs directory is created before Django configures logging,
@@ -272,6 +285,78 @@ LOGGING = {
     },
 }
 
+# ==============================================================================
+# Performance Instrumentation
+# ==============================================================================
+# Adds X-Query-Count / X-Query-Time-Ms response headers via
+# apps.core.middleware.QueryCountMiddleware. Used by the benchmark suite in
+# backend/benchmarks/; keep it off on public deployments.
+QUERY_COUNT_HEADER = os.environ.get("QUERY_COUNT_HEADER", "false").lower() == "true"
+
+# Query audit (apps.core.query_audit, manage.py audit_queries): where the
+# JSON report goes and how large a tenant table must be (planner estimate)
+# before a sequential scan on it is reported as a problem.
+QUERY_AUDIT_REPORT = os.environ.get("QUERY_AUDIT_REPORT", str(BASE_DIR / "logs" / "query_audit.json"))
+QUERY_AUDIT_SEQ_SCAN_MIN_ROWS = int(os.environ.get("QUERY_AUDIT_SEQ_SCAN_MIN_ROWS", "10000"))
+
+# Largest ?page_size= a client may request with the columnar list format
+# (?format=columnar, see apps/core/renderers.py). JSON pages stay at PAGE_SIZE.
+COLUMNAR_MAX_PAGE_SIZE = int(os.environ.get("COLUMNAR_MAX_PAGE_SIZE", "5000"))
+
+# Response compression for dynamic responses (apps.core.middleware.
+# CompressionMiddleware). Brotli is used when the `brotli` package is
+# installed and the client accepts it, gzip otherwise. See
+# `python -m benchmarks.compression` for the CPU/bandwidth trade-off.
+# Compressed bodies are padded with up to RESPONSE_COMPRESSION_MAX_RANDOM_BYTES
+# random bytes against BREACH, as Django's GZipMiddleware does (0 disables).
+RESPONSE_COMPRESSION = os.environ.get("RESPONSE_COMPRESSION", "True").lower() == "true"
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+RESPONSE_COMPRESSION_GZIP_LEVEL = int(os.environ.get("RESPONSE_COMPRESSION_GZIP_LEVEL", "6"))
+RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.environ.get("RESPONSE_COMPRESSION_BROTLI_QUALITY", "4"))
+RESPONSE_COMPRESSION_MAX_RANDOM_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MAX_RANDOM_BYTES", "100"))
+# Per-route overrides: (path regex, options), first match wins
+RESPONSE_COMPRESSION_ROUTES = [
+    # WhiteNoise serves its own pre-compressed variants
+    (r"^/static/", {"enabled": False}),
+    # Bodies carrying auth or invitation tokens are never compressed (BREACH)
+    (r"^/api/v1/auth/", {"enabled": False}),
+    (r"^/api/v1/invitations/", {"enabled": False}),
+]
+
+# POST /api/v1/batch/: GET sub-requests per batch, and threads used when the
+# client asks for "parallel" (each thread holds its own DB connection).
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "20"))
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", "4"))
+
+# AI assistant: simulated model latency of the mock chat provider
+# (tenant_apps/ai_assistant/providers.py), used by benchmarks.concurrency.
+AI_ASSISTANT_MOCK_LATENCY_MS = int(os.environ.get("AI_ASSISTANT_MOCK_LATENCY_MS", "0"))
+
+# AI assistant history: each turn is generated from the session's last
+# AI_ASSISTANT_HISTORY_WINDOW messages plus ChatSession.summary, into which
+# older messages are folded as they leave the window (at most
+# AI_ASSISTANT_SUMMARY_MAX_CHARS), so turns cost the same in long sessions.
+AI_ASSISTANT_HISTORY_WINDOW = int(os.environ.get("AI_ASSISTANT_HISTORY_WINDOW", "20"))
+AI_ASSISTANT_SUMMARY_MAX_CHARS = int(os.environ.get("AI_ASSISTANT_SUMMARY_MAX_CHARS", "4000"))
+
+# AI assistant grounding: per-tenant BM25 index over suppliers, customers,
+# products, PO notes and activity logs (tenant_apps/ai_assistant/retrieval.py).
+# The top AI_RETRIEVAL_TOP_K records are added to each chat turn's context;
+# the change journal is folded into the snapshot every
+# AI_RETRIEVAL_JOURNAL_LIMIT lines. `manage.py build_retrieval_index` rebuilds.
+AI_RETRIEVAL_INDEX_DIR = os.environ.get("AI_RETRIEVAL_INDEX_DIR", str(BASE_DIR / ".retrieval_index"))
+AI_RETRIEVAL_TOP_K = int(os.environ.get("AI_RETRIEVAL_TOP_K", "5"))
+AI_RETRIEVAL_JOURNAL_LIMIT = int(os.environ.get("AI_RETRIEVAL_JOURNAL_LIMIT", "1000"))
+
+# Location coordinates and distances (tenant_apps/locations/geo.py). Locations
+# are geocoded from LOCATION_ZIP_CENTROIDS, the offline ZIP centroid dataset
+# imported per deployment (see tenant_apps/locations/data/README.md); each
+# tenant's precomputed distance matrix is cached in LOCATION_DISTANCE_DIR.
+LOCATION_ZIP_CENTROIDS = os.environ.get(
+    "LOCATION_ZIP_CENTROIDS", str(BASE_DIR / "tenant_apps" / "locations" / "data" / "zip_centroids.csv.gz")
+)
+LOCATION_DISTANCE_DIR = os.environ.get("LOCATION_DISTANCE_DIR", str(BASE_DIR / ".distance_matrix"))
+
 # Cache Configuration
 CACHES = {
     "default": {
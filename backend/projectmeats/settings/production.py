@@ -88,6 +88,12 @@ DATABASES = {
     "default": _db_config
 }
 
+# Under ASGI (SERVER_MODE=asgi, see gunicorn.conf.py) ORM calls run on a new
+# thread per request, so persistent connections would accumulate instead of
+# being reused. Use a connection pooler such as PgBouncer in that mode.
+if os.environ.get("SERVER_MODE", "wsgi").lower() == "asgi":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
 # -----------------------------------------------------------------------------
 # CORS & CSRF Trusted Origins
 # -----------------------------------------------------------------------------
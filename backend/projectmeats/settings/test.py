@@ -2,6 +2,7 @@
 Test settings for ProjectMeats - with shared-schema multi-tenancy
 """
 import os
+import tempfile
 
 import dj_database_url
 
@@ -14,8 +15,9 @@ SECRET_KEY = "test-secret-key-not-for-production-use-only-testing"
 # This ensures request.user is available when TenantMiddleware runs
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "apps.core.middleware.QueryCountMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.core.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -64,6 +66,12 @@ PASSWORD_HASHERS = [
 # Allow all hosts for testing (including tenant domain tests)
 ALLOWED_HOSTS = ["*"]
 
+# Keep AI assistant retrieval indexes, distance matrices and the query audit
+# report out of the source tree
+AI_RETRIEVAL_INDEX_DIR = os.path.join(tempfile.gettempdir(), "projectmeats-retrieval-test")
+LOCATION_DISTANCE_DIR = os.path.join(tempfile.gettempdir(), "projectmeats-distance-test")
+QUERY_AUDIT_REPORT = os.path.join(tempfile.gettempdir(), "projectmeats-query-audit-test.json")
+
 # Disable caching during tests
 CACHES = {
     "default": {
@@ -8,11 +8,9 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+from apps.core.schema import CachedSpectacularAPIView
 from .health import health_check, health_detailed, ready_check
 
 urlpatterns = [
@@ -39,8 +37,10 @@ urlpatterns = [
     path("api/v1/", include("apps.core.urls")),  # Core shared utilities
     path("api/v1/bug-reports/", include("tenant_apps.bug_reports.urls")),
     path("api/v1/cockpit/", include("tenant_apps.cockpit.urls")),
+    path("api/v1/analytics/", include("tenant_apps.analytics.urls")),
+    path("api/v1/dedupe/", include("tenant_apps.dedupe.urls")),
     # API Documentation
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     path(
         "api/docs/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -14,6 +14,11 @@ The script exports:
 - TenantUser model instances
 - TenantInvitation model instances
 
+For tenant business data (suppliers, orders, invoices, ...) use the
+streaming ``python manage.py tenant_backup`` / ``tenant_restore`` commands
+instead; this script loads everything into memory and is only suitable for
+the small tenant registry tables.
+
 GDPR Compliance:
 - No PII is exported (passwords are hashed)
 - Email addresses are included as necessary for tenant identification
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from tenant_apps.accounts_receivables.models import AccountsReceivable
 
 
-class AccountsReceivableSerializer(serializers.ModelSerializer):
+class AccountsReceivableSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     customer_name = serializers.CharField(source="customer.name", read_only=True)
     created_by_name = serializers.CharField(
         source="created_by.username", read_only=True
@@ -31,6 +32,10 @@ class AccountsReceivableSerializer(serializers.ModelSerializer):
             "created_by",
             "created_by_name",
         ]
+        # Opt-in nested data (?expand=customer)
+        expandable_fields = {
+            "customer": ("tenant_apps.customers.serializers.CustomerSerializer", {}),
+        }
 
     def validate_invoice_number(self, value):
         """Validate invoice number is provided and is a valid string."""
@@ -4,6 +4,7 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.filters import FieldSelectionFilter
 from django.core.exceptions import ValidationError
 from tenant_apps.accounts_receivables.models import AccountsReceivable
 from tenant_apps.accounts_receivables.serializers import AccountsReceivableSerializer
@@ -17,7 +18,7 @@ class AccountsReceivableViewSet(viewsets.ModelViewSet):
     queryset = AccountsReceivable.objects.all()
     serializer_class = AccountsReceivableSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter, FieldSelectionFilter]
     filterset_fields = ["status", "customer", "due_date"]
     search_fields = ["invoice_number", "description", "customer__name"]
     ordering_fields = ["due_date", "created_at", "amount"]
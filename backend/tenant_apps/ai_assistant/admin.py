@@ -23,7 +23,7 @@ class ChatSessionAdmin(admin.ModelAdmin):
 
     def get_message_count(self, obj):
         """Return the number of messages in this session."""
-        return obj.chatmessage_set.count()
+        return obj.message_count
 
     get_message_count.short_description = "Messages"
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AiAssistantConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = 'tenant_apps.ai_assistant'
+
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        import tenant_apps.ai_assistant.signals  # noqa: F401
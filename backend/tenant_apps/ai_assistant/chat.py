@@ -0,0 +1,210 @@
+"""
+One chat turn: a user message, the assistant's reply and how they are saved.
+
+The tenant records most relevant to the message are looked up in the local
+retrieval index (retrieval.py) first and given to the provider as context;
+the reply's metadata lists them as ``sources``. The provider also gets the
+session's last AI_ASSISTANT_HISTORY_WINDOW messages and its rolling summary,
+never the full history; messages leaving the window with a turn are folded
+into the summary when it is saved.
+
+Nothing is written while the reply is generated. When it is complete, the
+session (if new), both messages, ``last_activity`` and ``message_count`` are
+saved in a single transaction: one INSERT for the two messages plus one
+session INSERT or UPDATE (and one more UPDATE when the summary changes).
+
+``events()`` / ``aevents()`` stream the reply as server-sent events for
+``POST /api/v1/ai-assistant/ai-chat/stream/``:
+
+    event: start   {"session_id": ...}
+    event: delta   {"content": "..."}   one per provider chunk
+    event: done    {"session_id", "message_id", "processing_time",
+                    "time_to_first_chunk", "metadata"}
+
+or ``event: error`` with ``{"error": ...}`` if generation or saving fails;
+nothing is saved then, including when the client disconnects mid-stream.
+"""
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import retrieval
+from .models import ChatMessage, ChatSession, MessageTypeChoices
+
+logger = logging.getLogger(__name__)
+
+
+def sse(event, data):
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def aresolve_session(user, session_id=None, context=None):
+    """
+    The user's session ``session_id`` (None if it is not theirs), or a new,
+    unsaved session; ``ChatTurn.save`` inserts it with the first messages.
+    """
+    if session_id:
+        try:
+            return await ChatSession.objects.aget(id=session_id, owner=user)
+        except ChatSession.DoesNotExist:
+            return None
+    return ChatSession(
+        title=f"Chat {timezone.now().strftime('%Y-%m-%d %H:%M')}",
+        context_data=context or {},
+        owner=user,
+        created_by=user,
+        modified_by=user,
+    )
+
+
+async def aload_history(session):
+    """The last AI_ASSISTANT_HISTORY_WINDOW messages of ``session``, oldest first."""
+    if session._state.adding:
+        return []
+    recent = (
+        ChatMessage.objects.filter(session=session)
+        .order_by("-created_on")
+        .only("id", "message_type", "content", "created_on")[:settings.AI_ASSISTANT_HISTORY_WINDOW]
+    )
+    return [message async for message in recent][::-1]
+
+
+def retrieve_context(tenant, user_message):
+    """
+    The tenant's records relevant to ``user_message``; none without a tenant
+    or when the index cannot be read, which must not fail the chat.
+    """
+    if tenant is None:
+        return []
+    try:
+        return retrieval.search(tenant, user_message)
+    except Exception:
+        logger.exception(f"Retrieval failed for tenant {tenant.id}")
+        return []
+
+
+class ChatTurn:
+    """Generate and save the assistant's reply to one user message."""
+
+    def __init__(self, user, session, user_message, provider, retrieval_time=0.0):
+        self.user = user
+        self.session = session
+        self.user_message = user_message
+        self.provider = provider
+        self.retrieval_time = retrieval_time
+        self.started = time.time()
+        self.first_chunk_at = None
+
+    @property
+    def metadata(self):
+        return {
+            "model": self.provider.model,
+            "provider": self.provider.provider,
+            "tokens_used": len(self.user_message) // 4,
+            "response_type": "mock",
+            "sources": [hit._asdict() for hit in self.provider.context],
+            "history_messages": len(self.provider.history),
+            "retrieval_time": self.retrieval_time,
+        }
+
+    def _leaving_window(self):
+        """History messages pushed out of the window by this turn and not summarized yet."""
+        overflow = len(self.provider.history) + 2 - settings.AI_ASSISTANT_HISTORY_WINDOW
+        until = self.session.summarized_until
+        return [
+            message for message in self.provider.history[:max(overflow, 0)]
+            if until is None or message.created_on > until
+        ]
+
+    def save(self, reply):
+        """Save the session, both messages and the summary; return the reply message."""
+        owned = {"owner": self.user, "created_by": self.user, "modified_by": self.user}
+        leaving = self._leaving_window()
+        summary = self.provider.summarize(self.session.summary, leaving) if leaving else None
+        with transaction.atomic():
+            if self.session._state.adding:
+                self.session.message_count = 2
+                self.session.save(force_insert=True)
+            else:
+                sessions = ChatSession.objects.filter(pk=self.session.pk)
+                sessions.update(last_activity=timezone.now(), message_count=F("message_count") + 2)
+                if leaving:
+                    # Only if no concurrent turn has folded these messages already
+                    sessions.filter(summarized_until=self.session.summarized_until).update(
+                        summary=summary, summarized_until=leaving[-1].created_on
+                    )
+            _, reply_message = ChatMessage.objects.bulk_create([
+                ChatMessage(
+                    session=self.session,
+                    message_type=MessageTypeChoices.USER,
+                    content=self.user_message,
+                    **owned,
+                ),
+                ChatMessage(
+                    session=self.session,
+                    message_type=MessageTypeChoices.ASSISTANT,
+                    content=reply,
+                    metadata=self.metadata,
+                    **owned,
+                ),
+            ])
+        return reply_message
+
+    def result(self, reply_message):
+        """The chat response payload for a saved reply."""
+        result = {
+            "response": reply_message.content,
+            "session_id": self.session.id,
+            "message_id": reply_message.id,
+            "processing_time": time.time() - self.started,
+            "metadata": reply_message.metadata,
+        }
+        if self.first_chunk_at is not None:
+            result["time_to_first_chunk"] = self.first_chunk_at - self.started
+        return result
+
+    def _delta(self, chunk):
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.time()
+        return sse("delta", {"content": chunk})
+
+    def _done(self, reply_message):
+        result = self.result(reply_message)
+        del result["response"]
+        return sse("done", result)
+
+    def _error(self):
+        logger.exception(f"Error streaming chat reply for session {self.session.id}")
+        return sse("error", {"error": "Failed to generate response"})
+
+    def events(self):
+        """Server-sent events for WSGI, where async iterators are buffered."""
+        yield sse("start", {"session_id": self.session.id})
+        parts = []
+        try:
+            for chunk in self.provider.stream(self.user_message):
+                parts.append(chunk)
+                yield self._delta(chunk)
+            yield self._done(self.save("".join(parts)))
+        except Exception:
+            yield self._error()
+
+    async def aevents(self):
+        """Server-sent events for ASGI; provider waits do not hold a thread."""
+        yield sse("start", {"session_id": self.session.id})
+        parts = []
+        try:
+            async for chunk in self.provider.astream(self.user_message):
+                parts.append(chunk)
+                yield self._delta(chunk)
+            yield self._done(await sync_to_async(self.save)("".join(parts)))
+        except Exception:
+            yield self._error()
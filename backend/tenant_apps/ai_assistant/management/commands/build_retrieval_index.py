@@ -0,0 +1,43 @@
+"""
+Management command to rebuild the AI assistant's retrieval indexes.
+
+Usage:
+    python manage.py build_retrieval_index
+    python manage.py build_retrieval_index --tenant acme-meats
+
+Indexes each active tenant's suppliers, customers, products, purchase order
+notes and activity logs from the database and writes a fresh snapshot (see
+tenant_apps/ai_assistant/retrieval.py). Saves are indexed incrementally and
+bulk writes trigger a background rebuild, so this is only needed to warm a
+new deployment or after writes made outside the application.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.models import Tenant
+from tenant_apps.ai_assistant.retrieval import index_store
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the AI assistant retrieval index of every (or one) tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            type=str,
+            help='Slug of the only tenant to rebuild',
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.filter(is_active=True)
+        if options['tenant']:
+            tenants = tenants.filter(slug=options['tenant'])
+            if not tenants.exists():
+                raise CommandError(f"No active tenant with slug '{options['tenant']}'")
+
+        for tenant in tenants:
+            started = time.time()
+            count = index_store.build(tenant)
+            self.stdout.write(f"{tenant.slug}: {count:,} documents in {time.time() - started:.2f}s")
+        self.stdout.write(self.style.SUCCESS(f'Retrieval indexes written to {index_store.directory}'))
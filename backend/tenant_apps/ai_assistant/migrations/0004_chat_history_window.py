@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:02
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_messages(apps, schema_editor):
+    """Backfill message_count for existing sessions."""
+    ChatSession = apps.get_model("ai_assistant", "ChatSession")
+    ChatMessage = apps.get_model("ai_assistant", "ChatMessage")
+    counts = (
+        ChatMessage.objects.filter(session=OuterRef("pk"))
+        .order_by()
+        .values("session")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    ChatSession.objects.update(message_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ai_assistant", "0003_state_sync_tenant"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatsession",
+            name="message_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of messages in this session"
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatsession",
+            name="summarized_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Creation time of the newest message folded into the summary",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatsession",
+            name="summary",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="Rolling summary of the messages older than the history window",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(
+                fields=["session", "created_on"], name="ai_msg_session_created_idx"
+            ),
+        ),
+        migrations.RunPython(count_messages, migrations.RunPython.noop),
+    ]
@@ -57,6 +57,22 @@ class ChatSession(OwnedModel, StatusModel):
         auto_now=True, help_text="Timestamp of last activity in this session"
     )
 
+    message_count = models.PositiveIntegerField(
+        default=0, help_text="Number of messages in this session"
+    )
+
+    summary = models.TextField(
+        blank=True,
+        default="",
+        help_text="Rolling summary of the messages older than the history window",
+    )
+
+    summarized_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Creation time of the newest message folded into the summary",
+    )
+
     class Meta:
         db_table = "ai_assistant_chat_sessions"
         verbose_name = "Chat Session"
@@ -116,6 +132,10 @@ class ChatMessage(OwnedModel):
         verbose_name = "Chat Message"
         verbose_name_plural = "Chat Messages"
         ordering = ["created_on"]
+        indexes = [
+            # History windows and cursor pagination within a session
+            models.Index(fields=["session", "created_on"], name="ai_msg_session_created_idx"),
+        ]
 
     def __str__(self):
         preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
@@ -0,0 +1,135 @@
+"""
+Reply generation for the AI assistant.
+
+No model provider is wired up yet: ``MockChatProvider`` answers with canned,
+keyword-matched text, streamed word by word like a model emits tokens.
+AI_ASSISTANT_MOCK_LATENCY_MS makes it wait the way a remote model call would
+(spread over the chunks, without holding a thread in async views), which is
+what ``python -m benchmarks.concurrency`` measures.
+
+``context`` holds the tenant records retrieved for the turn
+(``retrieval.Hit``); a model would be prompted with them, the mock lists them.
+``history`` (the session's recent messages) and ``summary`` (what came
+before them, see ``summarize``) complete the prompt.
+"""
+import asyncio
+import re
+import time
+
+from django.conf import settings
+
+_CHUNK = re.compile(r"\S+\s*")
+
+
+class MockChatProvider:
+    """Stand-in for an LLM provider; see ``mock_reply``."""
+
+    provider = "openai"
+    model = "gpt-4o-mini"
+
+    def __init__(self, latency_ms=0, context=(), history=(), summary=""):
+        self.latency_ms = latency_ms
+        self.context = context
+        self.history = history
+        self.summary = summary
+
+    def _chunks(self, user_message: str):
+        """The reply's chunks and the simulated delay before each one."""
+        chunks = _CHUNK.findall(mock_reply(user_message, self.context))
+        return chunks, self.latency_ms / 1000 / max(len(chunks), 1)
+
+    def stream(self, user_message: str):
+        """Yield the reply to ``user_message`` chunk by chunk."""
+        chunks, delay = self._chunks(user_message)
+        for chunk in chunks:
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+    async def astream(self, user_message: str):
+        """Async ``stream``: the delays do not block the event loop."""
+        chunks, delay = self._chunks(user_message)
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    async def areply(self, user_message: str) -> str:
+        """The complete reply to ``user_message``."""
+        return "".join([chunk async for chunk in self.astream(user_message)])
+
+    def summarize(self, summary: str, messages) -> str:
+        """
+        Fold ``messages`` (oldest first) into the rolling ``summary``. The
+        mock keeps one shortened line per message, newest lines last, within
+        AI_ASSISTANT_SUMMARY_MAX_CHARS.
+        """
+        lines = [summary] if summary else []
+        for message in messages:
+            text = " ".join(message.content.split())
+            lines.append(f"{message.message_type}: {text[:157] + '...' if len(text) > 160 else text}")
+        summary = "\n".join(lines)
+        limit = settings.AI_ASSISTANT_SUMMARY_MAX_CHARS
+        if len(summary) > limit:
+            summary = summary[-limit:].partition("\n")[2]
+        return summary
+
+
+def get_provider(context=(), history=(), summary=""):
+    """The chat provider configured for this deployment, with the turn's prompt inputs."""
+    return MockChatProvider(
+        latency_ms=settings.AI_ASSISTANT_MOCK_LATENCY_MS,
+        context=context,
+        history=history,
+        summary=summary,
+    )
+
+
+def mock_reply(user_message: str, context=()) -> str:
+    """Generate a mock AI response for demonstration purposes."""
+    reply = _canned_reply(user_message)
+    if context:
+        records = "\n".join(f"- {hit.kind.replace('_', ' ').capitalize()}: {hit.title}" for hit in context)
+        reply += f"\n\nRelated records in your account:\n{records}"
+    return reply
+
+
+def _canned_reply(user_message: str) -> str:
+    message_lower = user_message.lower()
+
+    # Meat industry specific responses
+    if any(word in message_lower for word in ["supplier", "suppliers"]):
+        return "I can help you manage your meat suppliers. Our system tracks supplier performance, pricing, and delivery schedules. Would you like me to show you current supplier metrics or help you find new suppliers for specific meat products?"
+
+    elif any(word in message_lower for word in ["purchase order", "po", "order"]):
+        return "I can assist with purchase order management. I can help you create new POs, track existing orders, analyze spending patterns, and ensure compliance with quality standards. What specific aspect of purchase order management would you like help with?"
+
+    elif any(word in message_lower for word in ["customer", "customers", "client"]):
+        return "I can help you manage customer relationships and analyze customer data. Our system tracks customer preferences, order history, and payment patterns. Would you like to review customer performance or get insights about customer trends?"
+
+    elif any(word in message_lower for word in ["inventory", "stock"]):
+        return "I can help you monitor inventory levels, track product movements, and optimize stock management. Our system provides real-time inventory data and can suggest reorder points. What inventory information do you need?"
+
+    elif any(word in message_lower for word in ["price", "pricing", "cost"]):
+        return "I can analyze pricing trends, compare supplier costs, and help optimize your procurement strategy. Our system tracks historical pricing data and market trends. Would you like to see current price analysis or historical trends?"
+
+    elif any(
+        word in message_lower for word in ["quality", "compliance", "inspection"]
+    ):
+        return "I can help you manage quality standards and compliance requirements. Our system tracks USDA regulations, HACCP compliance, and quality inspection results. What quality management information do you need?"
+
+    elif any(
+        word in message_lower for word in ["delivery", "shipping", "logistics"]
+    ):
+        return "I can help you track deliveries, optimize logistics, and manage carrier relationships. Our system monitors delivery performance and can suggest improvements. What delivery or logistics information would you like?"
+
+    elif any(word in message_lower for word in ["report", "analytics", "analysis"]):
+        return "I can generate various reports and analytics for your meat business operations. Available reports include supplier performance, customer analysis, inventory trends, and financial summaries. What type of analysis would you like me to prepare?"
+
+    elif (
+        "hello" in message_lower or "hi" in message_lower or "help" in message_lower
+    ):
+        return "Hello! I'm your AI assistant for meat market operations. I can help you with supplier management, purchase orders, customer relationships, inventory tracking, pricing analysis, and compliance. What would you like assistance with today?"
+
+    else:
+        return f"Thank you for your message. I'm designed to help with meat market operations including supplier management, purchase orders, customer relationships, and business analytics. I understand you mentioned: '{user_message[:100]}...' - could you provide more specific details about what you'd like help with?"
@@ -0,0 +1,469 @@
+"""
+Local retrieval index over tenant data, for grounding AI assistant replies.
+
+Each tenant gets a BM25 index over its suppliers, customers, products,
+purchase order notes and activity log entries (``SOURCES``). ``search()``
+answers from memory in a few milliseconds, without an external service.
+
+On disk, in AI_RETRIEVAL_INDEX_DIR, per tenant:
+
+    <tenant_id>.idx      snapshot: a JSON header (document keys and titles,
+                         vocabulary, document frequencies) followed by the
+                         document lengths and the postings as contiguous
+                         uint32 slot / uint16 term frequency arrays
+    <tenant_id>.journal  changes since the snapshot, one JSON line each,
+                         appended after commit by the signals in signals.py
+    <tenant_id>.stale    present while a rebuild is due (see below)
+
+Every process keeps the indexes it has searched in memory and replays new
+journal lines before each search, so a change saved by any worker is found
+by all of them on their next query. When the journal reaches
+AI_RETRIEVAL_JOURNAL_LIMIT lines it is folded into a new snapshot. A tenant
+without a snapshot is indexed from the database on its first search, or
+ahead of time by ``manage.py build_retrieval_index``.
+
+Bulk writes (CSV import, load data, ``bulk_create``/``bulk_update``,
+``QuerySet.update()``) skip the signals. Their callers use
+``bulk_written()``: once the transaction commits, the tenant's index is
+marked stale and rebuilt on a background thread, and searches keep being
+answered from the current snapshot meanwhile. A stale mark left behind by
+a process that exited mid-rebuild starts a new rebuild on the next search.
+"""
+import fcntl
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from operator import itemgetter
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+FORMAT_VERSION = 1
+_HEADER_SIZE = struct.Struct("<I")
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "an and are as at be but by can do for from has have how in is it me my "
+    "of on or our show tell than that the their them there these they this "
+    "to us was we what when where which who why will with you your".split()
+)
+
+Source = namedtuple("Source", "model fields title")
+Hit = namedtuple("Hit", "kind id title score")
+
+SOURCES = {
+    "supplier": Source(
+        "suppliers.Supplier",
+        ("name", "contact_person", "city", "state", "country", "origin", "country_origin",
+         "type_of_plant", "type_of_certificate", "fresh_or_frozen", "package_type",
+         "departments", "shipping_offered"),
+        lambda supplier: supplier.name,
+    ),
+    "customer": Source(
+        "customers.Customer",
+        ("name", "contact_person", "buyer_contact_name", "city", "state", "country",
+         "industry", "purchasing_preference_origin", "type_of_plant"),
+        lambda customer: customer.name,
+    ),
+    "product": Source(
+        "products.Product",
+        ("product_code", "description_of_product_item", "type_of_protein", "fresh_or_frozen",
+         "package_type", "origin", "carton_type", "namp", "usda"),
+        lambda product: f"{product.product_code} {product.description_of_product_item}",
+    ),
+    "purchase_order": Source(
+        "purchase_orders.PurchaseOrder",
+        ("order_number", "our_purchase_order_num", "status", "type_of_protein",
+         "item_description", "notes", "special_instructions"),
+        lambda order: f"PO {order.order_number}",
+    ),
+    "activity": Source(
+        "cockpit.ActivityLog",
+        ("title", "content", "tags", "entity_type"),
+        lambda log: log.title or log.content,
+    ),
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords; a plural ``s`` is dropped."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def source_kind(model):
+    """The ``SOURCES`` key for ``model``, or None if it is not indexed."""
+    for kind, source in SOURCES.items():
+        if source.model == model._meta.label:
+            return kind
+    return None
+
+
+def bulk_written(tenant, model, fields=None):
+    """
+    Have ``tenant``'s index rebuilt after the current transaction commits,
+    for a bulk write of ``model`` rows that skipped the save signals. Writes
+    to models, or only to ``fields``, that are not indexed change nothing.
+    """
+    kind = source_kind(model)
+    if kind is None or (fields is not None and not set(fields) & set(SOURCES[kind].fields)):
+        return
+    tenant_id = str(getattr(tenant, "pk", tenant))
+    transaction.on_commit(lambda: index_store.mark_stale(tenant_id), robust=True)
+
+
+def document(kind, instance):
+    """``(key, title, text)`` of a model instance for the index."""
+    source = SOURCES[kind]
+    text = " ".join(str(value) for value in (getattr(instance, field) for field in source.fields) if value)
+    return f"{kind}:{instance.pk}", " ".join(source.title(instance).split())[:120], text
+
+
+class TenantIndex:
+    """
+    BM25 over one tenant's documents.
+
+    Documents occupy slots; replacing or removing one frees its slot (the
+    postings keep pointing at it and are skipped) until the next snapshot
+    renumbers them.
+    """
+
+    def __init__(self):
+        self.keys = []  # slot -> "kind:pk", None once removed
+        self.titles = []
+        self.lengths = array("I")
+        self.slots = {}  # "kind:pk" -> slot
+        self.postings = {}  # term -> (array("I") slots, array("H") term frequencies)
+        self.total_length = 0
+        self.removed = 0
+        self._norms = None  # slot -> BM25 length normalization, until the next change
+
+    def __len__(self):
+        return len(self.slots)
+
+    def put(self, key, title, text):
+        """Add the document ``key``, replacing any previous version."""
+        self.remove(key)
+        counts = Counter(tokenize(text))
+        slot = len(self.keys)
+        length = sum(counts.values())
+        self._norms = None
+        self.keys.append(key)
+        self.titles.append(title)
+        self.lengths.append(length)
+        self.slots[key] = slot
+        self.total_length += length
+        for term, tf in counts.items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array("I"), array("H"))
+            entry[0].append(slot)
+            entry[1].append(min(tf, 0xFFFF))
+
+    def remove(self, key):
+        """Remove the document ``key`` if it is indexed."""
+        slot = self.slots.pop(key, None)
+        if slot is not None:
+            self._norms = None
+            self.removed += 1
+            self.total_length -= self.lengths[slot]
+            self.keys[slot] = None
+            self.titles[slot] = ""
+
+    def apply(self, change):
+        """Apply one journal entry."""
+        if change["op"] == "put":
+            self.put(change["key"], change["title"], change["text"])
+        else:
+            self.remove(change["key"])
+
+    def search(self, query, k):
+        """The ``k`` best BM25 matches for ``query``, best first."""
+        count = len(self.slots)
+        if not count:
+            return []
+        if self._norms is None:
+            average_length = self.total_length / count or 1
+            self._norms = array("d", (K1 * (1 - B + B * length / average_length) for length in self.lengths))
+        keys, norms = self.keys, self._norms
+        scores = {}
+        get = scores.get
+        for term in set(tokenize(query)):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            postings = zip(*entry)
+            if self.removed:
+                postings = [(slot, tf) for slot, tf in postings if keys[slot] is not None]
+                frequency = len(postings)
+            else:
+                frequency = len(entry[0])
+            weight = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5)) * (K1 + 1)
+            for slot, tf in postings:
+                scores[slot] = get(slot, 0.0) + weight * tf / (tf + norms[slot])
+        return [
+            Hit(*keys[slot].split(":", 1), self.titles[slot], round(score, 3))
+            for slot, score in heapq.nlargest(k, scores.items(), key=itemgetter(1))
+        ]
+
+    def dump(self):
+        """The snapshot bytes; removed documents are dropped and slots renumbered."""
+        renumbered = {}
+        keys, titles, lengths = [], [], array("I")
+        for slot, key in enumerate(self.keys):
+            if key is not None:
+                renumbered[slot] = len(keys)
+                keys.append(key)
+                titles.append(self.titles[slot])
+                lengths.append(self.lengths[slot])
+        terms, frequencies = [], []
+        all_slots, all_tfs = array("I"), array("H")
+        for term, (slots, tfs) in self.postings.items():
+            before = len(all_slots)
+            for slot, tf in zip(slots, tfs):
+                if slot in renumbered:
+                    all_slots.append(renumbered[slot])
+                    all_tfs.append(tf)
+            if len(all_slots) > before:
+                terms.append(term)
+                frequencies.append(len(all_slots) - before)
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "keys": keys,
+            "titles": titles,
+            "terms": terms,
+            "df": frequencies,
+        }).encode()
+        return b"".join([
+            _HEADER_SIZE.pack(len(header)), header, lengths.tobytes(), all_slots.tobytes(), all_tfs.tobytes(),
+        ])
+
+    @classmethod
+    def load(cls, data):
+        """Read a snapshot written by ``dump``."""
+        (size,) = _HEADER_SIZE.unpack_from(data)
+        offset = _HEADER_SIZE.size + size
+        header = json.loads(data[_HEADER_SIZE.size:offset])
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported retrieval index version {header['version']}")
+
+        def read(typecode, count):
+            nonlocal offset
+            values = array(typecode)
+            end = offset + values.itemsize * count
+            values.frombytes(data[offset:end])
+            if header["byteorder"] != sys.byteorder:
+                values.byteswap()
+            offset = end
+            return values
+
+        index = cls()
+        index.keys = header["keys"]
+        index.titles = header["titles"]
+        index.lengths = read("I", len(index.keys))
+        index.slots = {key: slot for slot, key in enumerate(index.keys)}
+        index.total_length = sum(index.lengths)
+        total = sum(header["df"])
+        slots, tfs = read("I", total), read("H", total)
+        start = 0
+        for term, frequency in zip(header["terms"], header["df"]):
+            index.postings[term] = (slots[start:start + frequency], tfs[start:start + frequency])
+            start += frequency
+        return index
+
+
+class _Loaded:
+    """A tenant index in memory and how far it has read the journal."""
+
+    def __init__(self, index, snapshot=None):
+        self.index = index
+        self.snapshot = snapshot  # identity of the snapshot file it was loaded from
+        self.journal = None  # inode of the journal being replayed
+        self.offset = 0
+        self.lines = 0
+
+
+class IndexStore:
+    """The tenant indexes of this process, kept current from disk."""
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._loaded = {}
+        self._rebuilding = set()
+
+    @property
+    def directory(self):
+        return Path(self._directory or settings.AI_RETRIEVAL_INDEX_DIR)
+
+    def path(self, tenant_id, suffix):
+        return self.directory / f"{tenant_id}.{suffix}"
+
+    @contextmanager
+    def _file_lock(self, tenant_id):
+        """Serialize journal writes and snapshots across processes."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.path(tenant_id, "lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _snapshot_id(self, tenant_id):
+        try:
+            stat = self.path(tenant_id, "idx").stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def record(self, tenant_id, change):
+        """
+        Append a change to the tenant's journal. Tenants that were never
+        indexed are skipped: their first search reads the database anyway.
+        """
+        line = json.dumps(change) + "\n"
+        journal = self.path(tenant_id, "journal")
+        with self._file_lock(tenant_id):
+            if journal.exists() or self.path(tenant_id, "idx").exists():
+                with open(journal, "a", encoding="utf-8") as f:
+                    f.write(line)
+
+    def _replay(self, tenant_id, loaded):
+        """Apply the journal lines ``loaded`` has not seen yet."""
+        try:
+            f = open(self.path(tenant_id, "journal"), "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != loaded.journal:
+                # A new journal since the last read; replaying from the
+                # start is safe because every entry is idempotent
+                loaded.journal, loaded.offset, loaded.lines = inode, 0, 0
+            f.seek(loaded.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # a line still being written is read next time
+        for line in data[:end].splitlines():
+            loaded.index.apply(json.loads(line))
+            loaded.lines += 1
+        loaded.offset += end
+
+    def _checkpoint(self, tenant_id, loaded):
+        """Fold the whole journal into a new snapshot and remove the journal."""
+        with self._file_lock(tenant_id):
+            self._replay(tenant_id, loaded)
+            data = loaded.index.dump()
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{tenant_id}.")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path(tenant_id, "idx"))
+            self.path(tenant_id, "journal").unlink(missing_ok=True)
+        loaded.index = TenantIndex.load(data)
+        loaded.snapshot = self._snapshot_id(tenant_id)
+        loaded.journal, loaded.offset, loaded.lines = None, 0, 0
+
+    def mark_stale(self, tenant_id):
+        """Flag the tenant's index as out of date and rebuild it in the background."""
+        tenant_id = str(tenant_id)
+        with self._file_lock(tenant_id):
+            self.path(tenant_id, "stale").touch()
+        self._rebuild_in_background(tenant_id)
+
+    def _rebuild_in_background(self, tenant_id):
+        with self._lock:
+            if tenant_id in self._rebuilding:
+                return
+            self._rebuilding.add(tenant_id)
+        self._start_rebuild(tenant_id)
+
+    def _start_rebuild(self, tenant_id):
+        threading.Thread(target=self._rebuild_thread, args=(tenant_id,), name=f"retrieval-{tenant_id}").start()
+
+    def _rebuild_thread(self, tenant_id):
+        try:
+            self._rebuild(tenant_id)
+        finally:
+            connection.close()
+
+    def _rebuild(self, tenant_id):
+        try:
+            tenant = apps.get_model("tenants.Tenant").objects.filter(pk=tenant_id).first()
+            if tenant is not None:
+                self.build(tenant)
+        except Exception:
+            logger.exception(f"Rebuilding the retrieval index of tenant {tenant_id} failed")
+        finally:
+            with self._lock:
+                self._rebuilding.discard(tenant_id)
+
+    def build(self, tenant):
+        """Index all of ``tenant``'s documents from the database; returns the count."""
+        tenant_id = str(tenant.id)
+        with self._file_lock(tenant_id):
+            # Changes committed while the database is read are journaled,
+            # bulk writes committed meanwhile mark it stale again
+            self.path(tenant_id, "journal").touch()
+            self.path(tenant_id, "stale").unlink(missing_ok=True)
+        index = TenantIndex()
+        for kind, source in SOURCES.items():
+            model = apps.get_model(source.model)
+            rows = model.objects.filter(tenant=tenant).only("pk", *source.fields)
+            for instance in rows.iterator(chunk_size=2000):
+                index.put(*document(kind, instance))
+        loaded = _Loaded(index)
+        self._checkpoint(tenant_id, loaded)
+        with self._lock:
+            self._loaded[tenant_id] = loaded
+        logger.info(f"Built retrieval index for tenant {tenant_id}: {len(index)} documents")
+        return len(index)
+
+    def search(self, tenant, query, k=None):
+        """The ``k`` (default AI_RETRIEVAL_TOP_K) records of ``tenant`` most relevant to ``query``."""
+        tenant_id = str(tenant.id)
+        if self._snapshot_id(tenant_id) is None:
+            self.build(tenant)
+        elif self.path(tenant_id, "stale").exists():
+            self._rebuild_in_background(tenant_id)
+        with self._lock:
+            loaded = self._loaded.get(tenant_id)
+            snapshot = self._snapshot_id(tenant_id)
+            if loaded is None or loaded.snapshot != snapshot:
+                loaded = _Loaded(TenantIndex.load(self.path(tenant_id, "idx").read_bytes()), snapshot)
+                self._loaded[tenant_id] = loaded
+            self._replay(tenant_id, loaded)
+            if loaded.lines >= settings.AI_RETRIEVAL_JOURNAL_LIMIT:
+                self._checkpoint(tenant_id, loaded)
+            return loaded.index.search(query, k or settings.AI_RETRIEVAL_TOP_K)
+
+
+index_store = IndexStore()
+
+
+def search(tenant, query, k=None):
+    """Shortcut for ``index_store.search``."""
+    return index_store.search(tenant, query, k)
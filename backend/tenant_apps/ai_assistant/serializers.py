@@ -2,10 +2,11 @@
 Serializers for AI Assistant functionality.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from .models import AIConfiguration, ChatMessage, ChatSession
 
 
-class ChatSessionListSerializer(serializers.ModelSerializer):
+class ChatSessionListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for chat session list view."""
 
     message_count = serializers.ReadOnlyField()
@@ -22,7 +23,7 @@ class ChatSessionListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ChatSessionDetailSerializer(serializers.ModelSerializer):
+class ChatSessionDetailSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for chat session detail view."""
 
     message_count = serializers.ReadOnlyField()
@@ -38,10 +39,13 @@ class ChatSessionDetailSerializer(serializers.ModelSerializer):
             "created_on",
             "modified_on",
             "message_count",
+            "summary",
+            "summarized_until",
         ]
+        read_only_fields = ["summary", "summarized_until"]
 
 
-class ChatMessageSerializer(serializers.ModelSerializer):
+class ChatMessageSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for chat messages."""
 
     class Meta:
@@ -59,7 +63,7 @@ class ChatMessageSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_on", "modified_on"]
 
 
-class ChatMessageCreateSerializer(serializers.ModelSerializer):
+class ChatMessageCreateSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for creating chat messages."""
 
     class Meta:
@@ -85,7 +89,7 @@ class ChatBotResponseSerializer(serializers.Serializer):
     metadata = serializers.JSONField(default=dict)
 
 
-class AIConfigurationSerializer(serializers.ModelSerializer):
+class AIConfigurationSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for AI configurations."""
 
     class Meta:
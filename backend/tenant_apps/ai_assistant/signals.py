@@ -0,0 +1,36 @@
+"""
+Signal handlers keeping the retrieval index (retrieval.py) current.
+
+Saves and deletes of indexed models are journaled once their transaction
+commits, so rolled-back changes never reach the index. Bulk writes bypass
+these signals and call ``retrieval.bulk_written`` instead.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import retrieval
+from .retrieval import SOURCES, document, source_kind
+
+
+def _journal(tenant_id, change):
+    transaction.on_commit(lambda: retrieval.index_store.record(str(tenant_id), change), robust=True)
+
+
+def index_saved(sender, instance, **kwargs):
+    """Journal the new version of a saved record."""
+    if instance.tenant_id is None:
+        return
+    key, title, text = document(source_kind(sender), instance)
+    _journal(instance.tenant_id, {"op": "put", "key": key, "title": title, "text": text})
+
+
+def index_deleted(sender, instance, **kwargs):
+    """Journal the removal of a deleted record."""
+    if instance.tenant_id is None:
+        return
+    _journal(instance.tenant_id, {"op": "delete", "key": f"{source_kind(sender)}:{instance.pk}"})
+
+
+for _source in SOURCES.values():
+    post_save.connect(index_saved, sender=_source.model, dispatch_uid=f"retrieval_save_{_source.model}")
+    post_delete.connect(index_deleted, sender=_source.model, dispatch_uid=f"retrieval_delete_{_source.model}")
@@ -0,0 +1,304 @@
+"""
+Tests for the AI assistant chat endpoints.
+"""
+import io
+import json
+import shutil
+import tempfile
+import uuid
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from apps.core.csv_import import import_csv
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.ai_assistant.models import ChatMessage, ChatSession, MessageTypeChoices
+from tenant_apps.ai_assistant import retrieval
+from tenant_apps.ai_assistant.providers import MockChatProvider
+from tenant_apps.ai_assistant.retrieval import IndexStore
+from tenant_apps.cockpit.models import ActivityLog
+from tenant_apps.products.models import Product
+from tenant_apps.purchase_orders.models import PurchaseOrder
+from tenant_apps.suppliers.models import Supplier
+
+STREAM_PATH = "/api/v1/ai-assistant/ai-chat/stream/"
+CHAT_PATH = "/api/v1/ai-assistant/ai-chat/chat/"
+
+
+def parse_events(body):
+    """``[(event, data), ...]`` from a text/event-stream body."""
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class ChatStreamTest(TestCase):
+    """Server-sent event streaming of assistant replies."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Chat Co {unique_id}",
+            slug=f"chat-co-{unique_id}",
+            contact_email=f"admin_{unique_id}@chat.com",
+        )
+        self.user = User.objects.create_user(username=f"chat_{unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.headers = {"Authorization": f"Token {token.key}", "X-Tenant-ID": str(self.tenant.id)}
+
+    def post(self, payload):
+        response = self.client.post(STREAM_PATH, payload, content_type="application/json", headers=self.headers)
+        return response, parse_events(b"".join(response.streaming_content))
+
+    def test_stream_events_and_single_save(self):
+        response, events = self.post({"message": "What about pricing?"})
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "start")
+        self.assertEqual(names[-1], "done")
+        self.assertGreater(names.count("delta"), 5)
+
+        done = events[-1][1]
+        reply = "".join(data["content"] for name, data in events if name == "delta")
+        self.assertEqual(done["session_id"], events[0][1]["session_id"])
+        self.assertIn("time_to_first_chunk", done)
+        messages = list(ChatMessage.objects.filter(session_id=done["session_id"]).order_by("created_on"))
+        self.assertEqual([m.message_type for m in messages], [MessageTypeChoices.USER, MessageTypeChoices.ASSISTANT])
+        self.assertEqual(messages[1].content, reply)
+        self.assertEqual(str(messages[1].id), done["message_id"])
+
+    def test_existing_session_updates_last_activity(self):
+        _, events = self.post({"message": "hello"})
+        session = ChatSession.objects.get(id=events[0][1]["session_id"])
+        before = session.last_activity
+
+        _, events = self.post({"message": "suppliers?", "session_id": str(session.id)})
+
+        session.refresh_from_db()
+        self.assertEqual(events[-1][0], "done")
+        self.assertGreater(session.last_activity, before)
+        self.assertEqual(session.messages.count(), 4)
+
+        missing = self.client.post(
+            STREAM_PATH,
+            {"message": "hi", "session_id": str(uuid.uuid4())},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_async_stream_failure_saves_nothing(self):
+        async def failing(self, user_message):
+            yield "Partial "
+            raise RuntimeError("provider went away")
+
+        with mock.patch.object(MockChatProvider, "astream", failing):
+            response = await AsyncClient().post(
+                STREAM_PATH, {"message": "hi"}, content_type="application/json", headers=self.headers
+            )
+            body = b"".join([chunk async for chunk in response.streaming_content])
+
+        events = parse_events(body)
+        self.assertEqual([name for name, _ in events], ["start", "delta", "error"])
+        self.assertFalse(await ChatSession.objects.filter(id=events[0][1]["session_id"]).aexists())
+
+
+class RetrievalIndexTest(TestCase):
+    """Per-tenant BM25 index used to ground chat replies."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Index Co {unique_id}",
+            slug=f"index-co-{unique_id}",
+            contact_email=f"admin_{unique_id}@index.com",
+        )
+        self.other = Tenant.objects.create(
+            name=f"Other Co {unique_id}",
+            slug=f"other-co-{unique_id}",
+            contact_email=f"admin_{unique_id}@other.com",
+        )
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name="Prairie Angus Beef", city="Omaha")
+        Supplier.objects.create(tenant=self.other, name="Wagyu Elsewhere")
+        Product.objects.create(
+            tenant=self.tenant,
+            product_code=f"BR-{unique_id}",
+            description_of_product_item="Pork belly, skin on",
+        )
+        self.order = PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number=f"PO-{unique_id}",
+            supplier=self.supplier,
+            order_date="2024-01-01",
+            total_amount="1500.00",
+            notes="Wagyu striploin, rush delivery before the holidays",
+        )
+        ActivityLog.objects.create(
+            tenant=self.tenant, entity_type="supplier", entity_id=self.supplier.pk, content="Called about brisket pricing"
+        )
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.store = IndexStore(self.directory)
+        patch = mock.patch.object(retrieval, "index_store", self.store)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_search_ranks_tenant_records(self):
+        hits = self.store.search(self.tenant, "wagyu striploin order")
+
+        self.assertEqual(hits[0].kind, "purchase_order")
+        self.assertEqual(hits[0].id, str(self.order.pk))
+        self.assertEqual(hits[0].title, f"PO {self.order.order_number}")
+        self.assertEqual(len(hits), 1)  # the other tenant's wagyu supplier is not in this index
+        self.assertEqual(self.store.search(self.tenant, "pork bellies")[0].kind, "product")
+        self.assertEqual(self.store.search(self.tenant, "nothing matches this"), [])
+
+    def test_incremental_updates_reach_every_process(self):
+        self.store.search(self.tenant, "warmup")
+        other_process = IndexStore(self.directory)
+        self.assertEqual(other_process.search(self.tenant, "bison"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bison = Supplier.objects.create(tenant=self.tenant, name="High Plains Bison Ranch")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.supplier.delete()
+
+        self.assertEqual(other_process.search(self.tenant, "bison")[0].id, str(bison.pk))
+        self.assertEqual(self.store.search(self.tenant, "angus"), [])
+
+        # Folding the journal into a snapshot keeps the same results
+        with override_settings(AI_RETRIEVAL_JOURNAL_LIMIT=1):
+            self.store.search(self.tenant, "bison")
+        self.assertFalse(self.store.path(self.tenant.id, "journal").exists())
+        restarted = IndexStore(self.directory)
+        self.assertEqual(restarted.search(self.tenant, "bison")[0].id, str(bison.pk))
+        self.assertEqual(restarted.search(self.tenant, "angus"), [])
+
+    def test_bulk_writes_rebuild_the_index_in_the_background(self):
+        self.store.search(self.tenant, "warmup")
+        rebuilds = []
+
+        def start_rebuild(tenant_id):
+            rebuilds.append(tenant_id)
+            self.store._rebuild(tenant_id)
+
+        with mock.patch.object(self.store, "_start_rebuild", side_effect=start_rebuild):
+            with self.captureOnCommitCallbacks(execute=True):
+                import_csv("suppliers", self.tenant, io.StringIO("name,city\nHigh Plains Bison Ranch,Denver\n"))
+            with self.captureOnCommitCallbacks(execute=True):
+                retrieval.bulk_written(self.tenant, PurchaseOrder, ["supplier"])  # not an indexed field
+
+            self.assertEqual(rebuilds, [str(self.tenant.id)])
+            self.assertFalse(self.store.path(self.tenant.id, "stale").exists())
+            bison = Supplier.objects.get(tenant=self.tenant, name="High Plains Bison Ranch")
+            self.assertEqual(self.store.search(self.tenant, "bison ranch")[0].id, str(bison.pk))
+
+            # A stale mark left by an interrupted rebuild is picked up by the next search
+            self.store.path(self.tenant.id, "stale").touch()
+            self.store.search(self.tenant, "bison")
+            self.assertEqual(len(rebuilds), 2)
+
+    def test_chat_reply_is_grounded_in_records(self):
+        user = User.objects.create_user(username=f"index_{self.tenant.slug}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=user, role="admin")
+        token = Token.objects.create(user=user)
+
+        response = self.client.post(
+            CHAT_PATH,
+            {"message": "Any update on the wagyu order?"},
+            content_type="application/json",
+            headers={"Authorization": f"Token {token.key}", "X-Tenant-ID": str(self.tenant.id)},
+        )
+
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f"PO {self.order.order_number}", data["response"])
+        self.assertEqual(data["metadata"]["sources"][0]["id"], str(self.order.pk))
+        self.assertIn("retrieval_time", data["metadata"])
+
+
+@override_settings(AI_ASSISTANT_HISTORY_WINDOW=4)
+class ChatHistoryWindowTest(TestCase):
+    """Turns read a bounded window plus a rolling summary; listings use a cursor."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"History Co {unique_id}",
+            slug=f"history-co-{unique_id}",
+            contact_email=f"admin_{unique_id}@history.com",
+        )
+        self.user = User.objects.create_user(username=f"history_{unique_id}", password="pass12345")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.headers = {"Authorization": f"Token {token.key}", "X-Tenant-ID": str(self.tenant.id)}
+        self.session_id = None
+
+    def send(self, message):
+        payload = {"message": message}
+        if self.session_id:
+            payload["session_id"] = self.session_id
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(CHAT_PATH, payload, content_type="application/json", headers=self.headers)
+        self.session_id = response.json()["session_id"]
+        return response.json(), len(queries)
+
+    def test_window_and_rolling_summary(self):
+        query_counts = []
+        for turn in range(1, 7):
+            data, queries = self.send(f"question number {turn}")
+            query_counts.append(queries)
+
+        session = ChatSession.objects.get(id=self.session_id)
+        self.assertEqual(session.message_count, 12)
+        self.assertEqual(data["metadata"]["history_messages"], 4)
+        # Turns 1-4 left the window; turn 5 is still in it
+        self.assertIn("user: question number 1", session.summary)
+        self.assertIn("user: question number 4", session.summary)
+        self.assertNotIn("question number 5", session.summary)
+        self.assertEqual(session.summary.count("assistant: "), 4)
+        # Once the window is full every turn costs the same
+        self.assertEqual(query_counts[3], query_counts[5])
+
+    @override_settings(AI_ASSISTANT_SUMMARY_MAX_CHARS=400)
+    def test_summary_keeps_newest_lines_within_limit(self):
+        for turn in range(6):
+            self.send(f"a long question about brisket and short ribs, take {turn}")
+
+        summary = ChatSession.objects.get(id=self.session_id).summary
+        self.assertLessEqual(len(summary), 400)
+        self.assertIn("take 3", summary)
+        self.assertNotIn("take 0", summary)
+
+    def test_messages_cursor_pagination(self):
+        for turn in range(4):
+            self.send(f"question {turn}")
+
+        url = f"/api/v1/ai-assistant/ai-sessions/{self.session_id}/messages/?page_size=3"
+        seen = []
+        while url:
+            page = self.client.get(url, headers=self.headers).json()
+            self.assertNotIn("count", page)
+            seen.extend(page["results"])
+            url = page["next"]
+
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(len({message["id"] for message in seen}), 8)
+        self.assertEqual(seen[-1]["content"], "question 0")
+        created = [message["created_on"] for message in seen]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+        listed = self.client.get(
+            f"/api/v1/ai-assistant/ai-messages/?session={self.session_id}&page_size=20", headers=self.headers
+        ).json()
+        self.assertEqual(listed["results"][0]["content"], "question 0")
+        self.assertEqual(len(listed["results"]), 8)
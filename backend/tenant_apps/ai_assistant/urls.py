@@ -7,14 +7,16 @@ and AI-powered business intelligence.
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import ChatBotAPIViewSet, ChatSessionViewSet, ChatMessageViewSet
+from .views import ChatSessionViewSet, ChatMessageViewSet, chat, chat_stream
 
 # Create router for ViewSets
 router = DefaultRouter()
 router.register(r"ai-sessions", ChatSessionViewSet, basename="ai-session")
 router.register(r"ai-messages", ChatMessageViewSet, basename="ai-message")
-router.register(r"ai-chat", ChatBotAPIViewSet, basename="ai-chatbot")
 
 urlpatterns = [
+    # Native async view (see apps/core/async_views.py)
+    path("ai-chat/chat/", chat, name="ai-chatbot-chat"),
+    path("ai-chat/stream/", chat_stream, name="ai-chatbot-stream"),
     path("", include(router.urls)),
 ]
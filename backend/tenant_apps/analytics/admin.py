@@ -0,0 +1,31 @@
+"""
+Django admin configuration for Analytics app.
+"""
+from django.contrib import admin
+from apps.core.admin import TenantFilteredAdmin
+from .models import ProductPriceWeek
+
+
+@admin.register(ProductPriceWeek)
+class ProductPriceWeekAdmin(TenantFilteredAdmin):
+    """Read-only admin for ProductPriceWeek, maintained from orders and invoices."""
+
+    list_display = (
+        "product",
+        "week",
+        "side",
+        "supplier",
+        "customer",
+        "order_count",
+        "amount",
+        "weight_lbs",
+    )
+    list_filter = ("side",)
+    search_fields = ("product__product_code", "product__description_of_product_item")
+    raw_id_fields = ("product", "supplier", "customer")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,41 @@
+"""
+Management command to rebuild the weekly price facts behind margins and
+price trends.
+
+Usage:
+    python manage.py build_price_weeks
+    python manage.py build_price_weeks --tenant acme-meats
+
+Facts follow every saved or deleted purchase order, sales order and
+invoice; run this after deploying the analytics app and after bulk imports
+or ``QuerySet.update()`` calls, which bypass saves.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.models import Tenant
+from tenant_apps.analytics.models import ProductPriceWeek
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the weekly product price facts from orders and invoices'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            type=str,
+            help='Slug of the only tenant to rebuild',
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.order_by('slug')
+        if options['tenant']:
+            tenants = tenants.filter(slug=options['tenant'])
+            if not tenants.exists():
+                raise CommandError(f"No tenant with slug '{options['tenant']}'")
+
+        total = 0
+        for tenant in tenants:
+            facts = ProductPriceWeek.rebuild(tenant)
+            total += len(facts)
+            self.stdout.write(f'{tenant.slug}: {len(facts):,} facts')
+        self.stdout.write(self.style.SUCCESS(f'Built {total:,} price facts'))
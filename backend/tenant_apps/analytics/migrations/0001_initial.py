@@ -0,0 +1,144 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:42
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("customers", "0006_add_products_m2m"),
+        ("products", "0006_catalog_search"),
+        ("suppliers", "0008_add_preferred_protein_types"),
+        ("tenants", "0006_metadata_lockdown"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductPriceWeek",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("modified_on", models.DateTimeField(auto_now=True)),
+                ("week", models.DateField(help_text="Monday starting the week")),
+                (
+                    "side",
+                    models.CharField(
+                        choices=[("buy", "Buy"), ("sell", "Sell")],
+                        help_text="Buy (purchase orders) or sell (sales orders and invoices)",
+                        max_length=4,
+                    ),
+                ),
+                (
+                    "order_count",
+                    models.IntegerField(default=0, help_text="Number of order lines"),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total amount of the order lines",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "priced_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total amount of the order lines with a weight",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "weight_lbs",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total weight of the order lines, in pounds",
+                        max_digits=14,
+                        verbose_name="Weight (LBS)",
+                    ),
+                ),
+                (
+                    "customer",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Customer sold to (sell side)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_weeks",
+                        to="customers.customer",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        help_text="Product bought or sold",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_weeks",
+                        to="products.product",
+                    ),
+                ),
+                (
+                    "supplier",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Supplier bought from (buy side)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_weeks",
+                        to="suppliers.supplier",
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        help_text="Tenant this price fact belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_price_weeks",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Product Price Week",
+                "verbose_name_plural": "Product Price Weeks",
+                "ordering": ["product", "week", "side"],
+                "indexes": [
+                    models.Index(
+                        fields=["tenant", "week"], name="analytics_p_tenant__abcacf_idx"
+                    ),
+                    models.Index(
+                        fields=["tenant", "product", "week"],
+                        name="analytics_p_tenant__ad4418_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "tenant",
+                            "product",
+                            "week",
+                            "side",
+                            "supplier",
+                            "customer",
+                        ),
+                        name="unique_product_price_week",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
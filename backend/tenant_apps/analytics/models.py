@@ -0,0 +1,331 @@
+"""
+Analytics models for ProjectMeats.
+
+Weekly buy and sell price facts per product, maintained from purchase
+orders, sales orders and invoices.
+
+Implements tenant ForeignKey field for shared-schema multi-tenancy.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import models, transaction
+from django.db.models import Case, Count, DecimalField, Exists, F, OuterRef, Q, Sum, When
+from django.db.models.functions import Coalesce, TruncDate, TruncWeek
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.core.bulk import advisory_xact_lock
+from apps.core.models import TenantManager, TimestampModel, WeightUnitChoices
+from apps.tenants.models import Tenant
+from tenant_apps.invoices.models import Invoice, InvoiceStatus
+from tenant_apps.purchase_orders.models import KG_TO_LBS, PurchaseOrder, PurchaseOrderStatus, _deleting_tenant
+from tenant_apps.sales_orders.models import SalesOrder, SalesOrderStatus
+
+# Order line fields that move a line between facts or change its amounts
+PRICED_FIELDS = frozenset({
+    "product",
+    "supplier",
+    "customer",
+    "sales_order",
+    "status",
+    "order_date",
+    "pick_up_date",
+    "total_amount",
+    "unit_price",
+    "quantity",
+    "total_weight",
+    "weight_unit",
+})
+
+
+class PriceSideChoices(models.TextChoices):
+    """Whether a price fact is what we paid or what we charged."""
+
+    BUY = "buy", "Buy"
+    SELL = "sell", "Sell"
+
+
+def week_of(day):
+    """The Monday starting the week of ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def _dated(model):
+    """``model``'s rows annotated with ``fact_date``, the day they are priced on."""
+    if model is PurchaseOrder:
+        return PurchaseOrder.objects.annotate(fact_date=F("order_date"))
+    return model.objects.annotate(fact_date=Coalesce("pick_up_date", TruncDate("date_time_stamp")))
+
+
+def _sources():
+    """
+    ``(side, party, lines)`` of the order lines priced into the facts, with
+    ``fact_amount`` annotated. A sales order counts until it is invoiced; then
+    its invoice, with the billed amount, counts instead.
+    """
+    invoices = Invoice.objects.filter(sales_order=OuterRef("pk")).exclude(status=InvoiceStatus.CANCELLED)
+    invoice_amount = Case(
+        When(total_amount=0, unit_price__isnull=False, quantity__isnull=False, then=F("unit_price") * F("quantity")),
+        default=F("total_amount"),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+    return (
+        (
+            PriceSideChoices.BUY,
+            "supplier",
+            _dated(PurchaseOrder).exclude(status=PurchaseOrderStatus.CANCELLED).annotate(fact_amount=F("total_amount")),
+        ),
+        (
+            PriceSideChoices.SELL,
+            "customer",
+            _dated(SalesOrder).exclude(status=SalesOrderStatus.CANCELLED).exclude(Exists(invoices))
+            .annotate(fact_amount=Coalesce("total_amount", Decimal("0"))),
+        ),
+        (
+            PriceSideChoices.SELL,
+            "customer",
+            _dated(Invoice).exclude(status=InvoiceStatus.CANCELLED).annotate(fact_amount=invoice_amount),
+        ),
+    )
+
+
+def price_weeks(instance):
+    """
+    The ``(product_id, week)`` facts the stored ``instance`` (a purchase
+    order, sales order or invoice) is priced into; for an invoice also its
+    sales order's, which stops or starts counting with it.
+    """
+    model = type(instance)
+    rows = set(_dated(model).filter(pk=instance.pk).values_list("product_id", "fact_date"))
+    if model is Invoice:
+        rows |= set(_dated(SalesOrder).filter(invoice__pk=instance.pk).values_list("product_id", "fact_date"))
+    return {(product_id, week_of(day)) for product_id, day in rows if product_id is not None and day is not None}
+
+
+class ProductPriceWeek(TimestampModel):
+    """
+    What was bought and sold of a product in a week: one row per (tenant,
+    product, week, side, supplier or customer) with the number of order
+    lines, their amount and their weight in pounds. ``priced_amount`` is the
+    amount of the lines with a weight, so ``priced_amount / weight_lbs`` is
+    the average price per pound.
+
+    Purchase orders are the buy side (per supplier, by order date); sales
+    orders until invoiced and then their invoices are the sell side (per
+    customer, by pick up date or else creation date). Cancelled lines are
+    left out. Recomputed for the affected (product, week) facts on every
+    order and invoice save and delete, so margin and price trend queries
+    read a few rows per product and week instead of every order line.
+    ``QuerySet.update()`` and ``bulk_create()`` bypass this; call
+    ``ProductPriceWeek.rebuild(tenant)`` (or ``manage.py build_price_weeks``)
+    after such bulk changes.
+    """
+    # Use custom manager for multi-tenancy
+    objects = TenantManager()
+
+    # Multi-tenancy
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="product_price_weeks",
+        help_text="Tenant this price fact belongs to"
+    )
+
+    product = models.ForeignKey(
+        "products.Product",
+        on_delete=models.CASCADE,
+        related_name="price_weeks",
+        help_text="Product bought or sold",
+    )
+    week = models.DateField(help_text="Monday starting the week")
+    side = models.CharField(
+        max_length=4,
+        choices=PriceSideChoices.choices,
+        help_text="Buy (purchase orders) or sell (sales orders and invoices)",
+    )
+    supplier = models.ForeignKey(
+        "suppliers.Supplier",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="price_weeks",
+        help_text="Supplier bought from (buy side)",
+    )
+    customer = models.ForeignKey(
+        "customers.Customer",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="price_weeks",
+        help_text="Customer sold to (sell side)",
+    )
+
+    order_count = models.IntegerField(default=0, help_text="Number of order lines")
+    amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        help_text="Total amount of the order lines",
+    )
+    priced_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        help_text="Total amount of the order lines with a weight",
+    )
+    weight_lbs = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Weight (LBS)",
+        help_text="Total weight of the order lines, in pounds",
+    )
+
+    class Meta:
+        ordering = ["product", "week", "side"]
+        verbose_name = "Product Price Week"
+        verbose_name_plural = "Product Price Weeks"
+        indexes = [
+            # Margins: every product's facts of a period
+            models.Index(fields=['tenant', 'week']),
+            # Price trends and refreshes: one product's facts by week
+            models.Index(fields=['tenant', 'product', 'week']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'product', 'week', 'side', 'supplier', 'customer'],
+                name='unique_product_price_week',
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self):
+        return f"Product {self.product_id} {self.side} week of {self.week}"
+
+    @property
+    def price_per_lb(self):
+        """Average price per pound, None without weighed lines."""
+        return self.priced_amount / self.weight_lbs if self.weight_lbs else None
+
+    @classmethod
+    def _create(cls, tenant_id, condition):
+        """Aggregate the tenant's order lines matching ``condition`` into new facts."""
+        weight_lbs = Case(
+            When(weight_unit=WeightUnitChoices.KG, then=F("total_weight") * KG_TO_LBS),
+            default=F("total_weight"),
+        )
+        weighed = Q(total_weight__gt=0)
+        facts = {}
+        for side, party, lines in _sources():
+            rows = (
+                lines.filter(condition, tenant_id=tenant_id, product__isnull=False, fact_date__isnull=False)
+                .order_by()
+                .values("product", party, week=TruncWeek("fact_date"))
+                .annotate(
+                    order_count=Count("id"),
+                    amount=Sum("fact_amount"),
+                    priced_amount=Sum("fact_amount", filter=weighed),
+                    weight_lbs=Sum(weight_lbs, filter=weighed),
+                )
+            )
+            for row in rows:
+                party_id = row.pop(party)
+                key = (row["product"], row["week"], side, party_id)
+                fact = facts.get(key)
+                if fact is None:
+                    facts[key] = cls(
+                        tenant_id=tenant_id,
+                        product_id=row["product"],
+                        week=row["week"],
+                        side=side,
+                        **{f"{party}_id": party_id},
+                        order_count=0,
+                        amount=Decimal("0"),
+                        priced_amount=Decimal("0"),
+                        weight_lbs=Decimal("0"),
+                    )
+                    fact = facts[key]
+                fact.order_count += row["order_count"]
+                fact.amount += row["amount"] or 0
+                fact.priced_amount += row["priced_amount"] or 0
+                fact.weight_lbs += row["weight_lbs"] or 0
+        return cls.objects.bulk_create(facts.values(), batch_size=1000)
+
+    @classmethod
+    def refresh(cls, tenant_id, keys):
+        """Recompute the tenant's ``(product_id, week)`` facts."""
+        weeks = {}
+        for product_id, week in keys:
+            if product_id is not None:
+                weeks.setdefault(week, set()).add(product_id)
+        if tenant_id is None or not weeks:
+            return
+        # One condition per week rather than per key keeps batch refreshes cheap
+        with transaction.atomic():
+            # Concurrent refreshes of a fact would both insert it
+            advisory_xact_lock([f"price_week:{tenant_id}"], shared=True)
+            advisory_xact_lock(
+                f"price_week:{tenant_id}:{product_id}:{week}"
+                for week, products in weeks.items()
+                for product_id in products
+            )
+            cls.objects.filter(
+                reduce(or_, (Q(week=week, product_id__in=products) for week, products in weeks.items())),
+                tenant_id=tenant_id,
+            ).delete()
+            cls._create(tenant_id, reduce(or_, (
+                Q(product_id__in=products, fact_date__gte=week, fact_date__lt=week + timedelta(days=7))
+                for week, products in weeks.items()
+            )))
+
+    @classmethod
+    def rebuild(cls, tenant):
+        """Recompute all of ``tenant``'s facts from its orders and invoices."""
+        with transaction.atomic():
+            advisory_xact_lock([f"price_week:{tenant.id}"])
+            cls.objects.filter(tenant=tenant).delete()
+            return cls._create(tenant.id, Q())
+
+
+def _prices_changed(kwargs):
+    update_fields = kwargs.get("update_fields")
+    return update_fields is None or any(field.removesuffix("_id") in PRICED_FIELDS for field in update_fields)
+
+
+@receiver(pre_save, sender=PurchaseOrder)
+@receiver(pre_save, sender=SalesOrder)
+@receiver(pre_save, sender=Invoice)
+def remember_price_weeks(sender, instance, **kwargs):
+    """Note the facts an order line was priced into before it is saved."""
+    instance._price_weeks = set()
+    if not instance._state.adding and not kwargs.get("raw") and _prices_changed(kwargs):
+        instance._price_weeks = price_weeks(instance)
+
+
+@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_save, sender=SalesOrder)
+@receiver(post_save, sender=Invoice)
+def refresh_price_weeks(sender, instance, **kwargs):
+    """Recompute the facts a saved order line was and is priced into."""
+    if kwargs.get("raw") or not _prices_changed(kwargs):
+        return
+    ProductPriceWeek.refresh(instance.tenant_id, getattr(instance, "_price_weeks", set()) | price_weeks(instance))
+
+
+@receiver(pre_delete, sender=PurchaseOrder)
+@receiver(pre_delete, sender=SalesOrder)
+@receiver(pre_delete, sender=Invoice)
+def remember_deleted_price_weeks(sender, instance, **kwargs):
+    """Note the facts of an order line about to be deleted (including cascades)."""
+    instance._price_weeks = set() if _deleting_tenant(kwargs.get("origin")) else price_weeks(instance)
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+@receiver(post_delete, sender=SalesOrder)
+@receiver(post_delete, sender=Invoice)
+def remove_deleted_price_weeks(sender, instance, **kwargs):
+    """Recompute the facts a deleted order line was priced into."""
+    ProductPriceWeek.refresh(instance.tenant_id, getattr(instance, "_price_weeks", set()))
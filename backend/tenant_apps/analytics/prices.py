@@ -0,0 +1,213 @@
+"""
+Margins and price trends from the weekly price facts (ProductPriceWeek).
+
+Every query reads the facts of a period, a few rows per product and week
+however many orders there were, with one indexed query. Margins are
+aggregated per product, supplier or customer in SQL; trends return one row
+per week, and their moving averages and percentiles are computed in Python
+over those rows.
+
+Prices are per pound: ``priced_amount / weight_lbs`` of the lines with a
+weight. A margin prices the pounds on one side at the product's average
+price on the other side over the same period: a customer's margin is what
+it paid less what its pounds cost on average, a supplier's is what its
+pounds sold for on average less what it charged. Pounds of products never
+bought (or never sold) in the period have no margin and are left out of it.
+"""
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import F, Sum
+
+from tenant_apps.customers.models import Customer
+from tenant_apps.products.models import Product
+from tenant_apps.suppliers.models import Supplier
+
+from .models import PriceSideChoices, ProductPriceWeek, week_of
+
+MARGIN_DIMENSIONS = ("product", "supplier", "customer")
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def percentiles(values, points=PERCENTILES):
+    """``{"p10": ..., ...}`` of ``values`` with linear interpolation between ranks; None when empty."""
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{point}": None for point in points}
+    last = len(ordered) - 1
+    result = {}
+    for point in points:
+        position = last * point / 100
+        low = int(position)
+        high = min(low + 1, last)
+        result[f"p{point}"] = ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+    return result
+
+
+def moving_average(amounts, weights, window):
+    """
+    Weighted trailing averages: for each position, the sum of the last
+    ``window`` amounts over the sum of their weights, None without weight.
+    """
+    averages = []
+    amount_sum = weight_sum = 0.0
+    for index, (amount, weight) in enumerate(zip(amounts, weights)):
+        amount_sum += amount
+        weight_sum += weight
+        if index >= window:
+            amount_sum -= amounts[index - window]
+            weight_sum -= weights[index - window]
+        averages.append(amount_sum / weight_sum if weight_sum > 1e-9 else None)
+    return averages
+
+
+def _price(priced_amount, weight_lbs):
+    return priced_amount / weight_lbs if weight_lbs > 1e-9 else None
+
+
+def _round(value, digits):
+    return None if value is None else round(value, digits)
+
+
+def _facts(tenant, start, end):
+    return ProductPriceWeek.objects.filter(tenant=tenant, week__gte=week_of(start), week__lt=end)
+
+
+def _sums(rows):
+    for row in rows:
+        for field in ("amount", "priced_amount", "weight_lbs"):
+            row[field] = float(row[field] or 0)
+        yield row
+
+
+def _labels(by, ids):
+    if by == "product":
+        return {
+            product_id: f"{code} {description}".strip()
+            for product_id, code, description in Product.objects.filter(id__in=ids).values_list(
+                "id", "product_code", "description_of_product_item"
+            )
+        }
+    model = Supplier if by == "supplier" else Customer
+    return dict(model.objects.filter(id__in=ids).values_list("id", "name"))
+
+
+def margins(tenant, by, start, end):
+    """
+    Margins per ``by`` (product, supplier or customer) over the weeks from
+    the week of ``start`` until ``end``, by descending margin: ``[{"id",
+    "name", "order_count", "amount", "weight_lbs", "price_per_lb",
+    "matched_lbs", "revenue", "cost", "margin", "margin_pct"}, ...]``.
+    ``amount``, ``weight_lbs`` and ``price_per_lb`` are of ``by``'s own side
+    (sales for products and customers, purchases for suppliers).
+    """
+    own_side = PriceSideChoices.BUY if by == "supplier" else PriceSideChoices.SELL
+    other_side = PriceSideChoices.SELL if by == "supplier" else PriceSideChoices.BUY
+    sql, params = (
+        _facts(tenant, start, end)
+        .order_by()
+        .values_list("side", "product_id", F(f"{by}_id"), "order_count", "amount", "priced_amount", "weight_lbs")
+        .query.sql_with_params()
+    )
+    # Each product's average price per pound on the other side, joined to the own side's facts
+    query = f"""
+        WITH facts (side, product_id, group_id, order_count, amount, priced_amount, weight_lbs) AS ({sql}),
+        other AS (
+            SELECT product_id, sum(priced_amount) / sum(weight_lbs) AS price
+            FROM facts WHERE side = %s
+            GROUP BY product_id HAVING sum(weight_lbs) > 0
+        )
+        SELECT group_id, sum(order_count), sum(amount), sum(priced_amount), sum(weight_lbs),
+            coalesce(sum(weight_lbs) FILTER (WHERE other.price IS NOT NULL), 0),
+            coalesce(sum(priced_amount) FILTER (WHERE other.price IS NOT NULL), 0),
+            coalesce(sum(other.price * weight_lbs), 0)
+        FROM facts LEFT JOIN other USING (product_id)
+        WHERE side = %s
+        GROUP BY group_id
+    """
+    results = []
+    with connection.cursor() as cursor:
+        cursor.execute(query, [*params, other_side, own_side])
+        for group, order_count, amount, priced_amount, weight_lbs, matched_lbs, own_value, other_value in cursor:
+            amount, priced_amount, weight_lbs, matched_lbs, own_value, other_value = (
+                float(value) for value in (amount, priced_amount, weight_lbs, matched_lbs, own_value, other_value)
+            )
+            if own_side == PriceSideChoices.SELL:
+                revenue, cost = own_value, other_value
+            else:
+                revenue, cost = other_value, own_value
+            margin = revenue - cost if matched_lbs > 1e-9 else None
+            results.append({
+                "id": group,
+                "order_count": order_count,
+                "amount": round(amount, 2),
+                "weight_lbs": round(weight_lbs, 2),
+                "price_per_lb": _round(_price(priced_amount, weight_lbs), 4),
+                "matched_lbs": round(matched_lbs, 2),
+                "revenue": round(revenue, 2),
+                "cost": round(cost, 2),
+                "margin": _round(margin, 2),
+                "margin_pct": _round(margin / revenue * 100 if margin is not None and revenue else None, 2),
+            })
+    results.sort(key=lambda item: (item["margin"] is None, -(item["margin"] or 0), str(item["id"])))
+    names = _labels(by, [item["id"] for item in results if item["id"] is not None])
+    for item in results:
+        item["name"] = names.get(item["id"], "")
+    return results
+
+
+def price_trend(tenant, product_id, start, end, window=4):
+    """
+    The weekly buy and sell prices of a product from the week of ``start``
+    until ``end``: ``{"weeks": [...], "summary": {...}}``. Every week is
+    listed, with None prices in weeks without weighed lines; ``*_moving_avg``
+    is the price over the trailing ``window`` weeks. The summary has the
+    percentiles, mean and range of each side's weekly prices.
+    """
+    first = week_of(start)
+    weeks = []
+    week = first
+    while week < end:
+        weeks.append(week)
+        week += timedelta(weeks=1)
+    slots = {week: index for index, week in enumerate(weeks)}
+    series = {
+        side: {field: [0.0] * len(weeks) for field in ("amount", "priced_amount", "weight_lbs")}
+        for side in PriceSideChoices.values
+    }
+    rows = _sums(
+        _facts(tenant, start, end)
+        .filter(product_id=product_id)
+        .order_by()
+        .values("week", "side")
+        .annotate(amount=Sum("amount"), priced_amount=Sum("priced_amount"), weight_lbs=Sum("weight_lbs"))
+    )
+    for row in rows:
+        for field in ("amount", "priced_amount", "weight_lbs"):
+            series[row["side"]][field][slots[row["week"]]] = row[field]
+
+    points = [{"week": week} for week in weeks]
+    summary = {}
+    for side, values in series.items():
+        prices = [_price(*pair) for pair in zip(values["priced_amount"], values["weight_lbs"])]
+        averages = moving_average(values["priced_amount"], values["weight_lbs"], window)
+        for point, price, average, lbs, amount in zip(
+            points, prices, averages, values["weight_lbs"], values["amount"]
+        ):
+            point[f"{side}_price"] = _round(price, 4)
+            point[f"{side}_moving_avg"] = _round(average, 4)
+            point[f"{side}_lbs"] = round(lbs, 2)
+            point[f"{side}_amount"] = round(amount, 2)
+        known = [price for price in prices if price is not None]
+        summary[side] = {key: _round(value, 4) for key, value in percentiles(known).items()}
+        summary[side].update({
+            "weeks": len(known),
+            "min": _round(min(known, default=None), 4),
+            "max": _round(max(known, default=None), 4),
+            "mean": _round(sum(known) / len(known) if known else None, 4),
+            "price_per_lb": _round(_price(sum(values["priced_amount"]), sum(values["weight_lbs"])), 4),
+        })
+    for point in points:
+        buy, sell = point["buy_price"], point["sell_price"]
+        point["margin_per_lb"] = _round(sell - buy, 4) if buy is not None and sell is not None else None
+    return {"weeks": points, "summary": summary}
@@ -0,0 +1,157 @@
+"""
+Tests for the weekly price facts, margins and price trends.
+"""
+import uuid
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.analytics.models import ProductPriceWeek
+from tenant_apps.analytics.prices import moving_average, percentiles
+from tenant_apps.customers.models import Customer
+from tenant_apps.invoices.models import Invoice, InvoiceStatus
+from tenant_apps.products.models import Product
+from tenant_apps.purchase_orders.models import PurchaseOrder
+from tenant_apps.sales_orders.models import SalesOrder
+from tenant_apps.suppliers.models import Supplier
+
+WEEK = date(2025, 3, 3)
+
+
+class PriceAnalyticsTest(APITestCase):
+    """Orders and invoices feed weekly price facts that margins and trends read."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Margin Co {unique_id}",
+            slug=f"margin-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@margin.com",
+        )
+        self.user = User.objects.create_user(username=f"margin-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+        self.product = Product.objects.create(
+            tenant=self.tenant, product_code="RIB-1", description_of_product_item="Ribeye"
+        )
+        self.prairie = Supplier.objects.create(tenant=self.tenant, name="Prairie Beef")
+        self.valley = Supplier.objects.create(tenant=self.tenant, name="Valley Beef")
+        self.diner = Customer.objects.create(tenant=self.tenant, name="Diner")
+        self.grill = Customer.objects.create(tenant=self.tenant, name="Grill")
+
+    def buy(self, supplier, amount, weight, order_date=WEEK, **fields):
+        return PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number=uuid.uuid4().hex[:10],
+            supplier=supplier,
+            product=self.product,
+            order_date=order_date,
+            total_amount=Decimal(amount),
+            total_weight=Decimal(weight),
+            **fields,
+        )
+
+    def sell(self, customer, amount, weight, pick_up_date=WEEK):
+        return SalesOrder.objects.create(
+            tenant=self.tenant,
+            our_sales_order_num=uuid.uuid4().hex[:10],
+            supplier=self.prairie,
+            customer=customer,
+            product=self.product,
+            pick_up_date=pick_up_date,
+            total_amount=Decimal(amount),
+            total_weight=Decimal(weight),
+        )
+
+    def margins(self, by):
+        response = self.client.get("/api/v1/analytics/margins/", {"by": by, "start": "2025-03-01", "end": "2025-04-01"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item["name"], item["margin"]) for item in response.data["results"]]
+
+    def test_margins_follow_orders_and_invoices(self):
+        first = self.buy(self.prairie, "2000.00", "1000")
+        second = self.buy(self.valley, "3000.00", "1000")
+        invoiced = self.sell(self.diner, "3500.00", "1000")
+        self.sell(self.grill, "2000.00", "1000")
+        invoice = Invoice.objects.create(
+            tenant=self.tenant,
+            invoice_number="INV-1",
+            customer=self.diner,
+            sales_order=invoiced,
+            product=self.product,
+            pick_up_date=WEEK,
+            total_amount=Decimal("3600.00"),
+            total_weight=Decimal("1000"),
+        )
+
+        # The invoice replaces its sales order; buy 2.50/lb, sell 2.80/lb
+        self.assertEqual(ProductPriceWeek.objects.filter(tenant=self.tenant).count(), 4)
+        self.assertEqual(self.margins("customer"), [("Diner", 1100.0), ("Grill", -500.0)])
+        self.assertEqual(self.margins("supplier"), [("Prairie Beef", 800.0), ("Valley Beef", -200.0)])
+        product = self.client.get("/api/v1/analytics/margins/", {"start": "2025-03-01", "end": "2025-04-01"})
+        self.assertEqual(product.data["results"][0]["margin"], 600.0)
+        self.assertEqual(product.data["results"][0]["margin_pct"], 10.71)
+
+        invoice.status = InvoiceStatus.CANCELLED
+        invoice.save()
+        self.assertEqual(self.margins("customer"), [("Diner", 1000.0), ("Grill", -500.0)])
+        second.delete()
+        self.assertEqual(self.margins("customer"), [("Diner", 1500.0), ("Grill", 0.0)])
+
+        first.order_date = date(2025, 5, 6)
+        first.save()
+        self.assertEqual(self.margins("customer"), [("Diner", None), ("Grill", None)])
+        self.assertEqual(
+            list(ProductPriceWeek.objects.filter(tenant=self.tenant, side="buy").values_list("week", "weight_lbs")),
+            [(date(2025, 5, 5), Decimal("1000.00"))],
+        )
+
+        # Incremental maintenance matches a rebuild
+        def facts():
+            return sorted(ProductPriceWeek.objects.filter(tenant=self.tenant).values_list(
+                "product", "week", "side", "supplier", "customer", "order_count", "amount", "priced_amount",
+                "weight_lbs",
+            ))
+
+        before = facts()
+        call_command("build_price_weeks", tenant=self.tenant.slug, stdout=StringIO())
+        self.assertEqual(facts(), before)
+
+    def test_price_trend(self):
+        self.buy(self.prairie, "2000.00", "1000")
+        self.buy(self.prairie, "1100.00", "500", order_date=date(2025, 3, 11), weight_unit="KG")
+        self.sell(self.diner, "3000.00", "1000", pick_up_date=date(2025, 3, 19))
+
+        response = self.client.get(
+            f"/api/v1/analytics/price-trends/{self.product.id}/",
+            {"start": "2025-03-05", "end": "2025-03-24", "window": 2},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        weeks = response.data["weeks"]
+        self.assertEqual([week["week"] for week in weeks], [date(2025, 3, 3), date(2025, 3, 10), date(2025, 3, 17)])
+        self.assertEqual([week["buy_price"] for week in weeks], [2.0, 0.9979, None])
+        self.assertEqual([week["buy_moving_avg"] for week in weeks], [2.0, 1.4746, 0.9979])
+        self.assertEqual(weeks[2]["sell_price"], 3.0)
+        self.assertEqual(response.data["summary"]["buy"]["p50"], 1.499)
+        self.assertEqual(response.data["summary"]["sell"]["weeks"], 1)
+
+        self.assertEqual(self.client.get("/api/v1/analytics/margins/", {"by": "plant"}).status_code, 400)
+        backwards = {"start": "2025-04-01", "end": "2025-03-01"}
+        self.assertEqual(
+            self.client.get(f"/api/v1/analytics/price-trends/{self.product.id}/", backwards).status_code, 400
+        )
+
+    def test_statistics(self):
+        self.assertEqual(percentiles([4, 1, 3, 2], (0, 50, 100)), {"p0": 1, "p50": 2.5, "p100": 4})
+        self.assertEqual(percentiles([])["p50"], None)
+        self.assertEqual(moving_average([2, 0, 6], [1, 0, 2], 2), [2.0, 2.0, 3.0])
+        self.assertEqual(moving_average([0.0], [0.0], 3), [None])
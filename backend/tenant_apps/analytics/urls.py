@@ -0,0 +1,14 @@
+"""
+URL routing for Analytics app.
+"""
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import MarginViewSet, PriceTrendViewSet
+
+router = DefaultRouter()
+router.register(r'margins', MarginViewSet, basename='margins')
+router.register(r'price-trends', PriceTrendViewSet, basename='price-trends')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,96 @@
+"""
+ViewSets for Analytics app.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .prices import MARGIN_DIMENSIONS, margins, price_trend
+
+
+class PriceAnalyticsMixin:
+    """Validation shared by the price analytics endpoints."""
+    permission_classes = [IsAuthenticated]
+
+    def _bad_request(self, error, details):
+        return Response({'error': error, 'details': details}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _period(self):
+        """``(start, end)`` dates of ``?start=`` and ``?end=`` (default: the last 52 weeks); None if invalid."""
+        params = self.request.query_params
+        try:
+            end = parse_date(params['end']) if params.get('end') else timezone.localdate() + timedelta(days=1)
+            start = parse_date(params['start']) if params.get('start') else end - timedelta(weeks=52)
+        except (TypeError, ValueError):
+            return None
+        if start is None or end is None or start >= end:
+            return None
+        return start, end
+
+
+class MarginViewSet(PriceAnalyticsMixin, viewsets.ViewSet):
+    """
+    Margins per product, supplier or customer from the weekly price facts
+    (prices.py), by descending margin.
+
+    GET /api/v1/analytics/margins/?by=customer&start=2025-01-01&end=2026-01-01&limit=100
+    """
+
+    def list(self, request):
+        params = request.query_params
+        by = params.get('by', 'product')
+        if by not in MARGIN_DIMENSIONS:
+            return self._bad_request('Invalid by', f"Pass ?by= as one of {', '.join(MARGIN_DIMENSIONS)}")
+        try:
+            limit = int(params.get('limit', 100))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= 1000:
+            return self._bad_request('Invalid limit', 'Pass ?limit= from 1 to 1000')
+        period = self._period()
+        if period is None:
+            return self._bad_request('Invalid period', 'Pass ?start= and ?end= as ISO dates, start before end')
+
+        if not getattr(request, 'tenant', None):
+            return Response({'by': by, 'start': period[0], 'end': period[1], 'count': 0, 'results': []})
+        results = margins(request.tenant, by, *period)
+        return Response({
+            'by': by,
+            'start': period[0],
+            'end': period[1],
+            'count': len(results),
+            'results': results[:limit],
+        })
+
+
+class PriceTrendViewSet(PriceAnalyticsMixin, viewsets.ViewSet):
+    """
+    Weekly buy and sell prices per pound of one product, with moving
+    averages and percentiles (prices.py).
+
+    GET /api/v1/analytics/price-trends/{product_id}/?start=2024-01-01&end=2026-01-01&window=4
+    """
+
+    def retrieve(self, request, pk=None):
+        params = request.query_params
+        try:
+            product_id = int(pk)
+            window = int(params.get('window', 4))
+        except ValueError:
+            return self._bad_request('Invalid request', 'Pass a numeric product id and ?window=')
+        if not 1 <= window <= 52:
+            return self._bad_request('Invalid window', 'Pass ?window= from 1 to 52 weeks')
+        period = self._period()
+        if period is None or period[1] - period[0] > timedelta(weeks=520):
+            return self._bad_request(
+                'Invalid period', 'Pass ?start= and ?end= as ISO dates, start before end and at most 10 years apart'
+            )
+
+        if not getattr(request, 'tenant', None):
+            return Response({'product': product_id, 'weeks': [], 'summary': {}})
+        trend = price_trend(request.tenant, product_id, *period, window=window)
+        return Response({'product': product_id, 'window': window, **trend})
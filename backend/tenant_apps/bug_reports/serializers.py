@@ -2,10 +2,11 @@
 Bug Reports serializers for ProjectMeats.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from .models import BugReport
 
 
-class BugReportSerializer(serializers.ModelSerializer):
+class BugReportSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for BugReport model."""
 
     reporter_name = serializers.CharField(
@@ -3,6 +3,7 @@ Bug Reports views for ProjectMeats.
 """
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.filters import FieldSelectionFilter
 from .models import BugReport
 from .serializers import BugReportSerializer
 
@@ -20,6 +21,7 @@ class BugReportViewSet(viewsets.ModelViewSet):
         DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
+        FieldSelectionFilter,
     ]
     filterset_fields = ["status", "severity", "category", "reporter"]
     search_fields = ["title", "description"]
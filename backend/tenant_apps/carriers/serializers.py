@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from tenant_apps.carriers.models import Carrier
 
 
-class CarrierSerializer(serializers.ModelSerializer):
+class CarrierSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(
         source="created_by.username", read_only=True
     )
@@ -62,6 +63,10 @@ class CarrierSerializer(serializers.ModelSerializer):
             "created_by",
             "created_by_name",
         ]
+        # Opt-in nested data (?expand=contacts)
+        expandable_fields = {
+            "contacts": ("tenant_apps.contacts.serializers.ContactSerializer", {"many": True}),
+        }
 
     def create(self, validated_data):
         validated_data["created_by"] = self.context["request"].user
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.filters import FieldSelectionFilter
 from django.core.exceptions import ValidationError
 from tenant_apps.carriers.models import Carrier
 from tenant_apps.carriers.serializers import CarrierSerializer
@@ -17,7 +18,7 @@ class CarrierViewSet(viewsets.ModelViewSet):
     queryset = Carrier.objects.all()
     serializer_class = CarrierSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter, FieldSelectionFilter]
     filterset_fields = ["carrier_type", "is_active", "city", "state"]
     search_fields = [
         "name",
@@ -34,7 +35,9 @@ class CarrierViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter carriers by current tenant."""
         if hasattr(self.request, 'tenant') and self.request.tenant:
-            queryset = Carrier.objects.for_tenant(self.request.tenant)
+            queryset = Carrier.objects.for_tenant(self.request.tenant).select_related(
+                'created_by'
+            ).prefetch_related('contacts')
             # Filter by active carriers by default unless specified
             is_active = self.request.query_params.get("is_active")
             if is_active is None:
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cockpit", "0002_alter_activitylog_content_type_and_more"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("tenants", "0006_metadata_lockdown"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="activitylog",
+            name="cockpit_act_tenant__2fc30b_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="scheduledcall",
+            name="cockpit_sch_entity__09408c_idx",
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["tenant", "entity_type", "entity_id", "-created_on"],
+                name="cockpit_act_tenant__156909_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scheduledcall",
+            index=models.Index(
+                fields=["tenant", "entity_type", "entity_id", "scheduled_for"],
+                name="cockpit_sch_tenant__f2d9a2_idx",
+            ),
+        ),
+    ]
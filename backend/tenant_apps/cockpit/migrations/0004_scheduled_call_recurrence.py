@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:31
+
+from datetime import timedelta
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.conf import settings
+from django.db import migrations, models
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+
+
+def fill_spans(apps, schema_editor):
+    """Give the existing (one-off) calls their span."""
+    ScheduledCall = apps.get_model("cockpit", "ScheduledCall")
+    calls = list(ScheduledCall.objects.only("scheduled_for", "duration_minutes"))
+    for call in calls:
+        call.span = DateTimeTZRange(call.scheduled_for, call.scheduled_for + timedelta(minutes=call.duration_minutes))
+    ScheduledCall.objects.bulk_update(calls, ["span"], batch_size=1000)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cockpit", "0003_timeline_indexes"),
+        ("tenants", "0006_metadata_lockdown"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name="scheduledcall",
+            name="recurrence",
+            field=models.CharField(
+                choices=[
+                    ("none", "Does not repeat"),
+                    ("daily", "Daily"),
+                    ("weekly", "Weekly"),
+                    ("monthly", "Monthly"),
+                ],
+                default="none",
+                help_text="How this call repeats, starting at scheduled_for",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="scheduledcall",
+            name="recurrence_interval",
+            field=models.PositiveSmallIntegerField(
+                default=1, help_text="Repeat every N days, weeks or months"
+            ),
+        ),
+        migrations.AddField(
+            model_name="scheduledcall",
+            name="recurrence_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Latest start of a recurring call (repeats indefinitely if empty)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="scheduledcall",
+            name="span",
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(
+                editable=False,
+                help_text="Time covered by this call, or by all occurrences of a recurring call",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(fill_spans, noop),
+        migrations.AlterField(
+            model_name="scheduledcall",
+            name="span",
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(
+                editable=False,
+                help_text="Time covered by this call, or by all occurrences of a recurring call",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scheduledcall",
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=["tenant", "assigned_to", "span"], name="scheduled_call_span_idx"
+            ),
+        ),
+    ]
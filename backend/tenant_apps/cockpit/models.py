@@ -5,10 +5,15 @@ Provides activity tracking and logging functionality for all business entities.
 
 Implements tenant ForeignKey field for shared-schema multi-tenancy.
 """
+from datetime import timedelta
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
 
 from apps.tenants.models import Tenant
 from apps.core.models import TimestampModel, TenantManager
@@ -27,6 +32,14 @@ class EntityTypeChoices(models.TextChoices):
     CONTACT = "contact", "Contact"
 
 
+class RecurrenceChoices(models.TextChoices):
+    """How a scheduled call repeats."""
+    NONE = "none", "Does not repeat"
+    DAILY = "daily", "Daily"
+    WEEKLY = "weekly", "Weekly"
+    MONTHLY = "monthly", "Monthly"
+
+
 class ActivityLog(TimestampModel):
     """
     Activity Log model for tracking notes and history across all entities.
@@ -113,7 +126,7 @@ class ActivityLog(TimestampModel):
         verbose_name = "Activity Log"
         verbose_name_plural = "Activity Logs"
         indexes = [
-            models.Index(fields=['tenant', 'entity_type', 'entity_id']),
+            models.Index(fields=['tenant', 'entity_type', 'entity_id', '-created_on']),
             models.Index(fields=['tenant', '-created_on']),
             models.Index(fields=['content_type', 'object_id']),
         ]
@@ -170,6 +183,27 @@ class ScheduledCall(TimestampModel):
         help_text="Expected call duration in minutes"
     )
     
+    # Recurrence (occurrences are expanded per requested window, see scheduling.py)
+    recurrence = models.CharField(
+        max_length=10,
+        choices=RecurrenceChoices.choices,
+        default=RecurrenceChoices.NONE,
+        help_text="How this call repeats, starting at scheduled_for"
+    )
+    recurrence_interval = models.PositiveSmallIntegerField(
+        default=1,
+        help_text="Repeat every N days, weeks or months"
+    )
+    recurrence_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Latest start of a recurring call (repeats indefinitely if empty)"
+    )
+    span = DateTimeRangeField(
+        editable=False,
+        help_text="Time covered by this call, or by all occurrences of a recurring call"
+    )
+    
     # Status
     is_completed = models.BooleanField(
         default=False,
@@ -216,8 +250,35 @@ class ScheduledCall(TimestampModel):
         indexes = [
             models.Index(fields=['tenant', 'scheduled_for']),
             models.Index(fields=['tenant', 'is_completed']),
-            models.Index(fields=['entity_type', 'entity_id']),
+            models.Index(fields=['tenant', 'entity_type', 'entity_id', 'scheduled_for']),
+            # Calendar windows and conflict checks per assignee (btree_gist
+            # provides the GiST operator classes for tenant and assigned_to)
+            GistIndex(fields=['tenant', 'assigned_to', 'span'], name='scheduled_call_span_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} - {self.scheduled_for.strftime('%Y-%m-%d %H:%M')}"
+    
+    @property
+    def is_recurring(self):
+        return self.recurrence != RecurrenceChoices.NONE
+    
+    @property
+    def duration(self):
+        return timedelta(minutes=self.duration_minutes)
+    
+    def compute_span(self):
+        """The time this call, or all of its occurrences, can cover."""
+        if not self.is_recurring:
+            return DateTimeTZRange(self.scheduled_for, self.scheduled_for + self.duration)
+        if self.recurrence_until is None:
+            return DateTimeTZRange(self.scheduled_for, None)
+        return DateTimeTZRange(self.scheduled_for, max(self.recurrence_until, self.scheduled_for) + self.duration)
+    
+    def save(self, *args, **kwargs):
+        """Keep ``span`` in step with the schedule."""
+        self.span = self.compute_span()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "span"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,159 @@
+"""
+Calendar queries for scheduled calls: occurrences in a window, free/busy and
+conflicts.
+
+Every call stores its ``span``: the range from its start to its end or, for
+a recurring call, from its first start to the end of its last possible
+occurrence (unbounded when it repeats indefinitely). A window query is one
+overlap (``&&``) search of the GiST index on ``(tenant, assigned_to,
+span)``, so it reads only the tenant's (or assignee's) calls that can touch
+the window however many years of calls exist.
+Recurring calls are then expanded into just the occurrences inside the
+window, jumping straight to the first of them.
+
+Recurrences step in the wall-clock time of the current time zone, so a
+weekly 9:00 call stays at 9:00 across daylight saving changes. A monthly
+call falls on the same day of the month, or on the last day of shorter
+months.
+
+Free/busy is computed in SQL: the one-off calls and the expanded
+occurrences are merged per assignee with ``range_agg``.
+"""
+import calendar
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.db import connection
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.utils import timezone
+
+from .models import RecurrenceChoices, ScheduledCall
+
+# How far ahead an open-ended recurring call is checked for conflicts
+CONFLICT_HORIZON = timedelta(days=366)
+
+
+def _add_months(value, months):
+    month = value.month - 1 + months
+    year, month = value.year + month // 12, month % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def _step(first, recurrence, count):
+    """The wall-clock time ``count`` days, weeks or months after ``first``."""
+    if recurrence == RecurrenceChoices.DAILY:
+        return first + timedelta(days=count)
+    if recurrence == RecurrenceChoices.WEEKLY:
+        return first + timedelta(weeks=count)
+    return _add_months(first, count)
+
+
+def occurrences(call, start, end):
+    """Start times of the occurrences of ``call`` overlapping [start, end), in order."""
+    duration = call.duration
+    if not call.is_recurring:
+        if call.scheduled_for < end and call.scheduled_for + duration > start:
+            yield call.scheduled_for
+        return
+
+    tz = timezone.get_current_timezone()
+    first = timezone.localtime(call.scheduled_for, tz).replace(tzinfo=None)
+    earliest = timezone.localtime(start - duration, tz).replace(tzinfo=None)
+    if call.recurrence == RecurrenceChoices.MONTHLY:
+        units = (earliest.year - first.year) * 12 + earliest.month - first.month
+    else:
+        units = (earliest - first).days // (7 if call.recurrence == RecurrenceChoices.WEEKLY else 1)
+    # Start one occurrence early: a daylight saving change can move it into the window
+    n = max(0, units // call.recurrence_interval - 1)
+    while True:
+        occurrence = timezone.make_aware(_step(first, call.recurrence, n * call.recurrence_interval), tz)
+        if occurrence >= end or (call.recurrence_until and occurrence > call.recurrence_until):
+            return
+        if occurrence + duration > start:
+            yield occurrence
+        n += 1
+
+
+def window(queryset, start, end):
+    """The calls of ``queryset`` with an occurrence that can overlap [start, end)."""
+    return queryset.filter(span__overlap=DateTimeTZRange(start, end))
+
+
+def expand(calls, start, end):
+    """``[(call, occurrence_start), ...]`` of ``calls`` inside [start, end), by start."""
+    expanded = [(call, occurrence) for call in calls for occurrence in occurrences(call, start, end)]
+    expanded.sort(key=lambda item: (item[1], item[0].pk))
+    return expanded
+
+
+def free_busy(tenant, start, end, assignees):
+    """
+    ``{assigned_to_id: {"busy": [(start, end), ...], "free": [...]}}``
+    within [start, end) for each user id in ``assignees``.
+    """
+    calls = window(ScheduledCall.objects.filter(tenant=tenant, assigned_to__in=assignees), start, end)
+    users, ranges = [], []
+    for call in calls.exclude(recurrence=RecurrenceChoices.NONE):
+        for occurrence in occurrences(call, start, end):
+            users.append(call.assigned_to_id)
+            ranges.append(DateTimeTZRange(occurrence, occurrence + call.duration))
+    one_off_sql, one_off_params = (
+        calls.filter(recurrence=RecurrenceChoices.NONE).order_by().values_list("assigned_to_id", "span")
+        .query.sql_with_params()
+    )
+    sql = f"""
+        SELECT assigned_to_id, lower(busy), upper(busy)
+        FROM (
+            SELECT assigned_to_id, unnest(range_agg(span * %s)) AS busy
+            FROM ({one_off_sql} UNION ALL SELECT * FROM unnest(%s::integer[], %s::tstzrange[]))
+                AS calls (assigned_to_id, span)
+            GROUP BY assigned_to_id
+        ) AS merged
+        ORDER BY assigned_to_id, lower(busy)
+    """
+    result = {assigned_to: {"busy": [], "free": []} for assigned_to in assignees}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [DateTimeTZRange(start, end), *one_off_params, users, ranges])
+        for assigned_to, busy_start, busy_end in cursor.fetchall():
+            result[assigned_to]["busy"].append((busy_start, busy_end))
+    for periods in result.values():
+        free_from = start
+        for busy_start, busy_end in periods["busy"]:
+            if busy_start > free_from:
+                periods["free"].append((free_from, busy_start))
+            free_from = busy_end
+        if free_from < end:
+            periods["free"].append((free_from, end))
+    return result
+
+
+def conflicts(call):
+    """
+    ``[(other_call, occurrence_start), ...]``: the open calls of the same
+    assignee overlapping ``call`` (saved or not), each at its first overlap.
+    Open-ended recurring calls are checked CONFLICT_HORIZON ahead.
+    """
+    if call.assigned_to_id is None or call.is_completed:
+        return []
+    span = call.compute_span()
+    start = span.lower
+    end = min(span.upper or start + CONFLICT_HORIZON, start + CONFLICT_HORIZON)
+    mine = list(occurrences(call, start, end))
+    if not mine:
+        return []
+
+    others = window(
+        ScheduledCall.objects.filter(tenant_id=call.tenant_id, assigned_to_id=call.assigned_to_id, is_completed=False),
+        start,
+        end,
+    ).exclude(pk=call.pk)
+    found = []
+    for other in others.order_by("scheduled_for", "pk"):
+        for occurrence in occurrences(other, start, end):
+            # All of this call's occurrences last as long, so the latest one starting
+            # before the other ends is the only one that can still be running
+            before = bisect_left(mine, occurrence + other.duration)
+            if before and mine[before - 1] + call.duration > occurrence:
+                found.append((other, occurrence))
+                break
+    return found
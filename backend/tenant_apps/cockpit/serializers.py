@@ -4,13 +4,14 @@ Cockpit serializers for aggregated search across tenant models.
 Provides lightweight, type-annotated serializers for polymorphic search results.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from tenant_apps.customers.models import Customer
 from tenant_apps.suppliers.models import Supplier
 from tenant_apps.purchase_orders.models import PurchaseOrder
 from tenant_apps.cockpit.models import ActivityLog, ScheduledCall
 
 
-class CustomerSlotSerializer(serializers.ModelSerializer):
+class CustomerSlotSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Lightweight serializer for Customer search results."""
     
     type = serializers.CharField(default='customer', read_only=True)
@@ -21,7 +22,7 @@ class CustomerSlotSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'type', 'contact_name', 'email', 'phone']
 
 
-class SupplierSlotSerializer(serializers.ModelSerializer):
+class SupplierSlotSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Lightweight serializer for Supplier search results."""
     
     type = serializers.CharField(default='supplier', read_only=True)
@@ -32,7 +33,7 @@ class SupplierSlotSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'type', 'contact_name', 'email', 'phone']
 
 
-class OrderSlotSerializer(serializers.ModelSerializer):
+class OrderSlotSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Lightweight serializer for PurchaseOrder search results."""
     
     type = serializers.CharField(default='order', read_only=True)
@@ -43,7 +44,7 @@ class OrderSlotSerializer(serializers.ModelSerializer):
         fields = ['id', 'order_number', 'our_purchase_order_num', 'type', 'status', 'supplier_name', 'total_amount']
 
 
-class ActivityLogSerializer(serializers.ModelSerializer):
+class ActivityLogSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for ActivityLog model."""
     
     created_by_name = serializers.SerializerMethodField()
@@ -72,7 +73,7 @@ class ActivityLogSerializer(serializers.ModelSerializer):
         return "System"
 
 
-class ScheduledCallSerializer(serializers.ModelSerializer):
+class ScheduledCallSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for ScheduledCall model."""
     
     assigned_to_name = serializers.SerializerMethodField()
@@ -88,6 +89,9 @@ class ScheduledCallSerializer(serializers.ModelSerializer):
             "description",
             "scheduled_for",
             "duration_minutes",
+            "recurrence",
+            "recurrence_interval",
+            "recurrence_until",
             "is_completed",
             "completed_at",
             "assigned_to",
@@ -100,6 +104,12 @@ class ScheduledCallSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "created_on", "modified_on", "assigned_to_name", "created_by_name"]
     
+    def validate_recurrence_interval(self, value):
+        """A call repeats at least every 1 day, week or month."""
+        if value < 1:
+            raise serializers.ValidationError("Must be at least 1.")
+        return value
+    
     def get_assigned_to_name(self, obj):
         """Get the name of the user this call is assigned to."""
         if obj.assigned_to:
@@ -4,13 +4,21 @@ Tests for Cockpit aggregated search functionality.
 Verifies multi-tenant search across Customer, Supplier, and PurchaseOrder models.
 """
 import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
 from django.test import TestCase
 from django.contrib.auth.models import User
-from rest_framework.test import APIClient
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 
 from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.cockpit.models import ActivityLog, ScheduledCall
 from tenant_apps.customers.models import Customer
+from tenant_apps.invoices.models import Claim, PaymentTransaction
 from tenant_apps.suppliers.models import Supplier
 from tenant_apps.purchase_orders.models import PurchaseOrder
 
@@ -132,3 +140,239 @@ class CockpitSearchTestCase(TestCase):
         response = self.client.get('/api/v1/cockpit/slots/', {'q': 'test'})
         
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TimelineTest(APITestCase):
+    """Merged, cursor-paged event timeline of an entity or a tenant."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.unique_id = unique_id
+        self.tenant = Tenant.objects.create(
+            name=f"Timeline Co {unique_id}",
+            slug=f"timeline-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@timeline.com",
+        )
+        self.user = User.objects.create_user(username=f"timeline-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name="Prairie Beef")
+        self.other = Supplier.objects.create(tenant=self.tenant, name="Other Beef")
+        self.order = PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number=f"PO-{unique_id}",
+            supplier=self.supplier,
+            order_date="2024-01-01",
+            total_amount=Decimal("1500.00"),
+        )
+        PaymentTransaction.objects.create(
+            tenant=self.tenant, purchase_order=self.order, amount=Decimal("500.00"), payment_date="2024-01-05"
+        )
+        Claim.objects.create(
+            tenant=self.tenant,
+            claim_number=f"CL-{unique_id}",
+            claim_type="payable",
+            supplier=self.supplier,
+            reason="Short shipped",
+            claim_date="2024-01-06",
+        )
+        for note in ("Called about pricing", "Sent spec sheet", "Confirmed pickup"):
+            self.note(self.supplier, note)
+        self.note(self.other, "Not about Prairie Beef")
+        ScheduledCall.objects.create(
+            tenant=self.tenant,
+            entity_type="supplier",
+            entity_id=self.supplier.id,
+            title="Follow up",
+            scheduled_for=timezone.now() - timedelta(days=1),
+        )
+
+    def note(self, supplier, content):
+        return ActivityLog.objects.create(
+            tenant=self.tenant, entity_type="supplier", entity_id=supplier.id, content=content
+        )
+
+    def pages(self, params):
+        url, pages = "/api/v1/cockpit/timeline/", []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data["results"])
+            url, params = response.data["next"], None
+        return pages
+
+    def test_entity_timeline_merges_sources_newest_first(self):
+        pages = self.pages({"entity_type": "supplier", "entity_id": self.supplier.id, "page_size": 2})
+        events = [event for page in pages for event in page]
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 2])
+        self.assertEqual(
+            sorted(event["source"] for event in events),
+            # The payment also updates the order, which records a second history entry
+            ["activity"] * 3 + ["call", "claim", "payment"] + ["purchase_order_history"] * 2,
+        )
+        keys = [(event["timestamp"], event["source"], event["id"]) for event in events]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+        self.assertEqual(events[0]["detail"], "Confirmed pickup")
+        self.assertEqual(events[-1]["source"], "call")
+        payment = next(event for event in events if event["source"] == "payment")
+        self.assertEqual((payment["entity_type"], payment["entity_id"]), ("purchase_order", self.order.id))
+        self.assertNotIn("Not about Prairie Beef", [event["detail"] for event in events])
+
+        order_events = self.pages({"entity_type": "purchase_order", "entity_id": self.order.id})[0]
+        self.assertEqual(
+            [event["source"] for event in order_events], ["purchase_order_history", "payment", "purchase_order_history"]
+        )
+
+    def test_new_events_do_not_shift_pages(self):
+        first = self.client.get("/api/v1/cockpit/timeline/", {"page_size": 3}).data
+        self.note(self.supplier, "Recorded while paging")
+        rest, url = [], first["next"]
+        while url:
+            page = self.client.get(url).data
+            rest.extend(page["results"])
+            url = page["next"]
+
+        ids = [(event["source"], event["id"]) for event in first["results"] + rest]
+        self.assertEqual(len(ids), 9)
+        self.assertEqual(len(set(ids)), 9)
+        self.assertNotIn("Recorded while paging", [event["detail"] for event in rest])
+
+    def test_invalid_parameters(self):
+        for params in (
+            {"entity_type": "supplier"},
+            {"entity_type": "planet", "entity_id": 1},
+            {"page_size": 0},
+            {"cursor": "not-a-cursor"},
+        ):
+            response = self.client.get("/api/v1/cockpit/timeline/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class ScheduledCallCalendarTest(APITestCase):
+    """Window queries, recurring calls, free/busy and conflicts of scheduled calls."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Calendar Co {unique_id}",
+            slug=f"calendar-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@calendar.com",
+        )
+        self.user = User.objects.create_user(username=f"calendar-{unique_id}", password="testpass123")
+        self.rep = User.objects.create_user(username=f"rep-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+    def call(self, scheduled_for, **kwargs):
+        kwargs.setdefault("assigned_to", self.user)
+        return ScheduledCall.objects.create(
+            tenant=self.tenant,
+            entity_type="supplier",
+            entity_id=1,
+            title=kwargs.pop("title", "Call"),
+            scheduled_for=scheduled_for,
+            **kwargs,
+        )
+
+    def test_window_expands_recurring_calls(self):
+        weekly = self.call(utc(2020, 1, 6, 15), title="Weekly", recurrence="weekly")
+        monthly = self.call(utc(2024, 1, 31, 14), title="Monthly", recurrence="monthly")
+        self.call(utc(2024, 2, 12, 9), title="One-off")
+        self.call(utc(2023, 2, 12, 9), title="Last year")
+        self.call(utc(2020, 2, 3, 9), title="Ended", recurrence="daily", recurrence_until=utc(2020, 3, 1))
+
+        params = {"start": "2024-02-01", "end": "2024-03-01"}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/cockpit/scheduled-calls/calendar/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [item["title"] for item in response.data]
+        self.assertEqual(titles.count("Weekly"), 4)
+        self.assertEqual(titles.count("One-off"), 1)
+        self.assertNotIn("Last year", titles)
+        self.assertNotIn("Ended", titles)
+        monthly_starts = [item["occurrence_start"] for item in response.data if item["title"] == "Monthly"]
+        self.assertEqual(monthly_starts, [utc(2024, 2, 29, 14)])
+        self.assertEqual(response.data[0]["occurrence_start"], utc(2024, 2, 5, 15))
+        calendar_queries = len(queries)
+
+        # Four more years of weekly calls do not add queries
+        for week in range(200):
+            self.call(utc(2020, 1, 7, 9) + timedelta(weeks=week), title="History")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/v1/cockpit/scheduled-calls/calendar/", params)
+        self.assertEqual(len(queries), calendar_queries)
+
+        listed = self.client.get("/api/v1/cockpit/scheduled-calls/", params).data
+        listed = listed.get("results", listed)
+        self.assertEqual({item["id"] for item in listed} - {weekly.id, monthly.id}, {
+            call.id for call in ScheduledCall.objects.filter(title="One-off")
+        })
+
+        for params in ({"start": "2024-02-01"}, {"start": "2024-03-01", "end": "2024-02-01"}, {"start": "x", "end": "y"}):
+            response = self.client.get("/api/v1/cockpit/scheduled-calls/calendar/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_free_busy_merges_calls_per_assignee(self):
+        self.call(utc(2024, 5, 1, 9), duration_minutes=60)
+        self.call(utc(2024, 5, 1, 9, 30), duration_minutes=60)
+        self.call(utc(2024, 4, 1, 13), duration_minutes=30, recurrence="daily")
+        self.call(utc(2024, 5, 1, 11), assigned_to=self.rep)
+
+        response = self.client.get("/api/v1/cockpit/scheduled-calls/free-busy/", {
+            "start": "2024-05-01T08:00:00Z", "end": "2024-05-01T14:00:00Z", "assigned_to": f"{self.user.id},{self.rep.id}",
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mine, rep = response.data["users"]
+        self.assertEqual(mine["busy"], [
+            {"start": utc(2024, 5, 1, 9), "end": utc(2024, 5, 1, 10, 30)},
+            {"start": utc(2024, 5, 1, 13), "end": utc(2024, 5, 1, 13, 30)},
+        ])
+        self.assertEqual(mine["free"], [
+            {"start": utc(2024, 5, 1, 8), "end": utc(2024, 5, 1, 9)},
+            {"start": utc(2024, 5, 1, 10, 30), "end": utc(2024, 5, 1, 13)},
+            {"start": utc(2024, 5, 1, 13, 30), "end": utc(2024, 5, 1, 14)},
+        ])
+        self.assertEqual(rep["busy"], [{"start": utc(2024, 5, 1, 11), "end": utc(2024, 5, 1, 11, 30)}])
+
+    def test_conflicts_are_rejected_on_create_and_reschedule(self):
+        self.call(utc(2024, 5, 6, 10), title="Weekly review", recurrence="weekly")
+        payload = {
+            "entity_type": "supplier",
+            "entity_id": 1,
+            "title": "Pricing call",
+            "scheduled_for": "2024-06-03T10:15:00Z",
+            "assigned_to": self.user.id,
+        }
+
+        response = self.client.post("/api/v1/cockpit/scheduled-calls/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["conflicts"][0]["title"], "Weekly review")
+        self.assertEqual(response.data["conflicts"][0]["start"], "2024-06-03T10:00:00+00:00")
+
+        response = self.client.post(
+            "/api/v1/cockpit/scheduled-calls/", dict(payload, scheduled_for="2024-06-03T10:30:00Z"), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(ActivityLog.objects.filter(tenant=self.tenant, title="Call Scheduled: Pricing call").exists())
+
+        url = f"/api/v1/cockpit/scheduled-calls/{response.data['id']}/"
+        self.assertEqual(
+            self.client.patch(url, {"scheduled_for": "2024-06-10T09:45:00Z"}, format="json").status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.patch(
+                f"{url}?allow_conflicts=true", {"scheduled_for": "2024-06-10T09:45:00Z"}, format="json"
+            ).status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(self.client.patch(url, {"is_completed": True}, format="json").status_code, status.HTTP_200_OK)
@@ -0,0 +1,242 @@
+"""
+Timeline: the events of one entity, or of a whole tenant, newest first.
+
+Five sources feed it: ActivityLog notes, PurchaseOrderHistory changes,
+PaymentTransactions and Claims (when they were recorded) and ScheduledCalls
+(when they are scheduled for). Each source is read as a cursor in the order
+of one of its indexes ending in its time column, and the cursors are
+combined with a streaming k-way merge (``heapq.merge``), so a page reads at
+most page size + 1 rows from each source however long the history is.
+
+Events are ordered by (time, source, id), newest first. The cursor of the
+next page is the key of the last event of this one; each source resumes
+strictly after it, so events recorded while paging never shift or repeat
+events across pages.
+"""
+import base64
+import heapq
+import json
+from functools import reduce
+from itertools import islice
+from operator import itemgetter, or_
+
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+
+from tenant_apps.cockpit.models import ActivityLog, ScheduledCall
+from tenant_apps.invoices.models import Claim, PaymentTransaction
+from tenant_apps.purchase_orders.models import PurchaseOrderHistory
+
+# (entity_type, lookup) of the first entity an event row links to
+PAYMENT_ENTITIES = (
+    ("purchase_order", "purchase_order"),
+    ("sales_order", "sales_order"),
+    ("invoice", "invoice"),
+)
+CLAIM_ENTITIES = PAYMENT_ENTITIES + (("supplier", "supplier"), ("customer", "customer"))
+
+
+def _linked_entity(row, entities):
+    for entity_type, lookup in entities:
+        if row[lookup]:
+            return entity_type, row[lookup]
+    return "", None
+
+
+def _activity(row):
+    return {
+        "entity_type": row["entity_type"],
+        "entity_id": row["entity_id"],
+        "title": row["title"] or "Note",
+        "detail": row["content"],
+        "user": row["user"],
+    }
+
+
+def _purchase_order_history(row):
+    changed = sorted(row["changed_data"] or {})
+    return {
+        "entity_type": "purchase_order",
+        "entity_id": row["purchase_order"],
+        "title": f"PO {row['order_number']} {row['change_type']}",
+        "detail": "" if row["change_type"] == "created" else ", ".join(changed),
+        "user": row["user"],
+    }
+
+
+def _payment(row):
+    entity_type, entity_id = _linked_entity(row, PAYMENT_ENTITIES)
+    detail = f"Paid {row['payment_date'].isoformat()}"
+    if row["reference_number"]:
+        detail += f", ref {row['reference_number']}"
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "title": f"Payment ${row['amount']} ({row['payment_method']})",
+        "detail": detail,
+        "user": row["user"],
+    }
+
+
+def _claim(row):
+    entity_type, entity_id = _linked_entity(row, CLAIM_ENTITIES)
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "title": f"Claim {row['claim_number']} ${row['claimed_amount']} ({row['status']})",
+        "detail": row["reason"],
+        "user": row["user"],
+    }
+
+
+def _call(row):
+    return {
+        "entity_type": row["entity_type"],
+        "entity_id": row["entity_id"],
+        "title": f"{'Call completed' if row['is_completed'] else 'Call'}: {row['title']}",
+        "detail": row["description"],
+        "user": row["user"],
+    }
+
+
+class Source:
+    """One feed of the timeline: a model read newest first by ``time_field``."""
+
+    def __init__(self, name, model, time_field, fields, user_field, describe, entities=None, related=None):
+        self.name = name
+        self.model = model
+        self.time_field = time_field
+        self.fields = fields
+        # Read as ``user``, and {name: lookup} of any other related values
+        self.related = dict(related or {}, user=user_field)
+        self.describe = describe
+        # {entity_type: (lookup, ...)}; None when the model has entity_type/entity_id columns
+        self.entities = entities
+
+    def entity_filter(self, entity_type, entity_id):
+        """Q of this source's rows about an entity, None when it has no rows of that type."""
+        if self.entities is None:
+            return Q(entity_type=entity_type, entity_id=entity_id)
+        lookups = self.entities.get(entity_type)
+        if not lookups:
+            return None
+        return reduce(or_, (Q(**{lookup: entity_id}) for lookup in lookups))
+
+    def events(self, tenant, entity, after, limit):
+        """``((time, source, id), event)`` pairs after the ``after`` key, newest first."""
+        rows = self.model.objects.filter(tenant=tenant)
+        if entity:
+            condition = self.entity_filter(*entity)
+            if condition is None:
+                return
+            rows = rows.filter(condition)
+        time_field = self.time_field
+        if after:
+            time, name, pk = after
+            rows = rows.filter(**{f"{time_field}__lte": time})
+            if self.name == name:
+                rows = rows.filter(Q(**{f"{time_field}__lt": time}) | Q(pk__lt=pk))
+            elif self.name > name:
+                rows = rows.filter(**{f"{time_field}__lt": time})
+        rows = rows.order_by(f"-{time_field}", "-pk").values(
+            "pk", *self.fields, time=F(time_field), **{name: F(lookup) for name, lookup in self.related.items()}
+        )[:limit]
+        for row in rows:
+            event = {"source": self.name, "id": row["pk"], "timestamp": row["time"]}
+            event.update(self.describe(row))
+            yield (row["time"], self.name, row["pk"]), event
+
+
+SOURCES = (
+    Source(
+        "activity",
+        ActivityLog,
+        "created_on",
+        ("entity_type", "entity_id", "title", "content"),
+        "created_by__username",
+        _activity,
+    ),
+    Source(
+        "call",
+        ScheduledCall,
+        "scheduled_for",
+        ("entity_type", "entity_id", "title", "description", "is_completed"),
+        "assigned_to__username",
+        _call,
+    ),
+    Source(
+        "claim",
+        Claim,
+        "created_on",
+        ("claim_number", "claimed_amount", "status", "reason") + tuple(lookup for _, lookup in CLAIM_ENTITIES),
+        "created_by__username",
+        _claim,
+        entities={
+            "supplier": ("supplier",),
+            "customer": ("customer",),
+            "purchase_order": ("purchase_order",),
+            "sales_order": ("sales_order",),
+            "invoice": ("invoice",),
+        },
+    ),
+    Source(
+        "payment",
+        PaymentTransaction,
+        "created_on",
+        ("amount", "payment_date", "payment_method", "reference_number")
+        + tuple(lookup for _, lookup in PAYMENT_ENTITIES),
+        "created_by__username",
+        _payment,
+        entities={
+            "supplier": ("purchase_order__supplier",),
+            "customer": ("sales_order__customer", "invoice__customer"),
+            "purchase_order": ("purchase_order",),
+            "sales_order": ("sales_order",),
+            "invoice": ("invoice",),
+        },
+    ),
+    Source(
+        "purchase_order_history",
+        PurchaseOrderHistory,
+        "created_on",
+        ("purchase_order", "change_type", "changed_data"),
+        "changed_by__username",
+        _purchase_order_history,
+        entities={
+            "supplier": ("purchase_order__supplier",),
+            "purchase_order": ("purchase_order",),
+        },
+        related={"order_number": "purchase_order__order_number"},
+    ),
+)
+
+
+def encode_cursor(key):
+    time, name, pk = key
+    return base64.urlsafe_b64encode(json.dumps([time.isoformat(), name, pk]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """The ``(time, source, id)`` key in a cursor; ValueError if it is malformed."""
+    try:
+        time, name, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        time = parse_datetime(time)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    if time is None or not isinstance(name, str) or not isinstance(pk, int):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    return time, name, pk
+
+
+def timeline(tenant, entity=None, cursor=None, page_size=50):
+    """
+    ``(events, next_cursor)``: a page of the events about ``entity`` (an
+    ``(entity_type, entity_id)`` pair; None for the whole tenant) after
+    ``cursor``, newest first. ``next_cursor`` is None on the last page.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    limit = page_size + 1
+    streams = [source.events(tenant, entity, after, limit) for source in SOURCES]
+    page = list(islice(heapq.merge(*streams, key=itemgetter(0), reverse=True), limit))
+    next_cursor = encode_cursor(page[page_size - 1][0]) if len(page) > page_size else None
+    return [event for _, event in page[:page_size]], next_cursor
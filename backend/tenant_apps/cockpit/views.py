@@ -8,9 +8,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+from copy import copy
+from datetime import datetime, time, timedelta
 from django.db.models import Q
 from django.db import IntegrityError
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 import logging
 
 from .serializers import (
@@ -20,7 +24,9 @@ from .serializers import (
     ActivityLogSerializer,
     ScheduledCallSerializer,
 )
-from .models import ActivityLog, ScheduledCall
+from .models import ActivityLog, EntityTypeChoices, ScheduledCall
+from .timeline import timeline
+from . import scheduling
 from tenant_apps.customers.models import Customer
 
 logger = logging.getLogger(__name__)
@@ -97,7 +103,7 @@ class ActivityLogViewSet(viewsets.ModelViewSet):
         if entity_type and entity_id:
             queryset = queryset.filter(entity_type=entity_type, entity_id=entity_id)
         
-        return queryset.order_by('-is_pinned', '-created_on')
+        return queryset.select_related('created_by').order_by('-is_pinned', '-created_on')
     
     def perform_create(self, serializer):
         """Auto-assign tenant and created_by on create."""
@@ -107,16 +113,79 @@ class ActivityLogViewSet(viewsets.ModelViewSet):
         )
 
 
+class TimelineViewSet(viewsets.ViewSet):
+    """
+    Unified, newest-first timeline of activity logs, PO history, payments,
+    claims and scheduled calls (timeline.py).
+
+    GET /api/v1/cockpit/timeline/?entity_type=supplier&entity_id=12&page_size=50
+    GET /api/v1/cockpit/timeline/ (the whole tenant)
+
+    Pages are cursor based: follow ``next`` until it is null.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _bad_request(self, error, details):
+        return Response({'error': error, 'details': details}, status=status.HTTP_400_BAD_REQUEST)
+
+    def list(self, request):
+        params = request.query_params
+        try:
+            page_size = int(params.get('page_size', 50))
+        except ValueError:
+            page_size = 0
+        if not 1 <= page_size <= 200:
+            return self._bad_request('Invalid page_size', 'Pass ?page_size= from 1 to 200')
+
+        entity = None
+        if params.get('entity_type') or params.get('entity_id'):
+            try:
+                entity = params['entity_type'], int(params['entity_id'])
+            except (KeyError, ValueError):
+                entity = None
+            if entity is None or entity[0] not in EntityTypeChoices.values:
+                return self._bad_request(
+                    'Invalid entity',
+                    f"Pass ?entity_type= (one of {', '.join(EntityTypeChoices.values)}) with a numeric ?entity_id=",
+                )
+
+        if not getattr(request, 'tenant', None):
+            return Response({'next': None, 'results': []})
+        try:
+            events, cursor = timeline(request.tenant, entity, params.get('cursor'), page_size)
+        except ValueError as e:
+            return self._bad_request('Invalid cursor', str(e))
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', cursor) if cursor else None
+        return Response({'next': next_url, 'results': events})
+
+
 class ScheduledCallViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Scheduled Calls with strict tenant isolation.
     
     Supports filtering by date range and completion status.
     Automatically creates activity log entries for related entities.
+    
+    Calendar endpoints (scheduling.py); ``start`` and ``end`` are ISO dates or
+    datetimes, at most MAX_WINDOW_DAYS apart:
+    
+    GET /api/v1/cockpit/scheduled-calls/?start=2024-05-01&end=2024-06-01
+    GET /api/v1/cockpit/scheduled-calls/calendar/?start=...&end=...&assigned_to=3
+    GET /api/v1/cockpit/scheduled-calls/free-busy/?start=...&end=...&assigned_to=3,4
+    
+    Creating or rescheduling a call that overlaps another open call of the
+    same assignee is rejected unless ``?allow_conflicts=true`` is passed.
     """
     serializer_class = ScheduledCallSerializer
     permission_classes = [IsAuthenticated]
     
+    MAX_WINDOW_DAYS = 366
+    
+    # Fields whose change can move a call onto another one
+    SCHEDULE_FIELDS = {
+        'scheduled_for', 'duration_minutes', 'recurrence', 'recurrence_interval', 'recurrence_until', 'assigned_to',
+    }
+    
     def get_queryset(self):
         """Filter scheduled calls by tenant and optional filters."""
         if not hasattr(self.request, 'tenant') or not self.request.tenant:
@@ -129,7 +198,106 @@ class ScheduledCallViewSet(viewsets.ModelViewSet):
         if is_completed is not None:
             queryset = queryset.filter(is_completed=is_completed.lower() == 'true')
         
-        return queryset
+        # Filter by assignee
+        assigned_to = self.request.query_params.get('assigned_to')
+        if assigned_to and self.action in ('list', 'calendar'):
+            queryset = queryset.filter(assigned_to__in=self._ids(assigned_to))
+        
+        # Filter to calls with an occurrence in a date range
+        if self.action == 'list' and ('start' in self.request.query_params or 'end' in self.request.query_params):
+            queryset = scheduling.window(queryset, *self._window())
+        
+        return queryset.select_related('assigned_to', 'created_by')
+    
+    def _ids(self, value):
+        try:
+            return [int(part) for part in value.split(',') if part.strip()]
+        except ValueError:
+            raise ValidationError({'error': 'Invalid assigned_to', 'detail': 'Pass comma-separated user ids.'})
+    
+    def _bound(self, value):
+        """An aware datetime from an ISO datetime or date (midnight); None if invalid."""
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            moment = datetime.combine(day, time.min)
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+    
+    def _window(self):
+        """(start, end) from ``?start=&end=``; ValidationError if missing or invalid."""
+        try:
+            start = self._bound(self.request.query_params['start'])
+            end = self._bound(self.request.query_params['end'])
+        except (KeyError, ValueError):
+            start = end = None
+        if start is None or end is None or not start < end <= start + timedelta(days=self.MAX_WINDOW_DAYS):
+            raise ValidationError({
+                'error': 'Invalid date range',
+                'detail': f'Pass ?start= and ?end= as ISO dates or datetimes, at most {self.MAX_WINDOW_DAYS} days apart.',
+            })
+        return start, end
+    
+    @action(detail=False, methods=['get'], url_path='calendar')
+    def calendar(self, request):
+        """Every occurrence in the window, recurring calls expanded, by start."""
+        start, end = self._window()
+        occurrences = []
+        for call, occurrence in scheduling.expand(scheduling.window(self.get_queryset(), start, end), start, end):
+            item = self.get_serializer(call).data
+            item['occurrence_start'] = occurrence
+            item['occurrence_end'] = occurrence + call.duration
+            occurrences.append(item)
+        return Response(occurrences)
+    
+    @action(detail=False, methods=['get'], url_path='free-busy')
+    def free_busy(self, request):
+        """Merged busy periods and the free time between them for each assignee."""
+        start, end = self._window()
+        assignees = self._ids(request.query_params.get('assigned_to', ''))
+        if not assignees:
+            raise ValidationError({'error': 'Invalid assigned_to', 'detail': 'Pass ?assigned_to= user ids.'})
+        if not getattr(request, 'tenant', None):
+            return Response({'start': start, 'end': end, 'users': []})
+        periods = scheduling.free_busy(request.tenant, start, end, assignees)
+        return Response({
+            'start': start,
+            'end': end,
+            'users': [
+                {
+                    'assigned_to': assigned_to,
+                    'busy': [{'start': lower, 'end': upper} for lower, upper in periods[assigned_to]['busy']],
+                    'free': [{'start': lower, 'end': upper} for lower, upper in periods[assigned_to]['free']],
+                }
+                for assigned_to in assignees
+            ],
+        })
+    
+    def _check_conflicts(self, call):
+        """Reject ``call`` if it overlaps another open call of its assignee."""
+        if self.request.query_params.get('allow_conflicts', '').lower() == 'true':
+            return
+        found = scheduling.conflicts(call)
+        if found:
+            raise ValidationError({
+                'error': 'Scheduling conflict',
+                'detail': (
+                    f'Overlaps {len(found)} other call(s) assigned to the same user. '
+                    'Pass ?allow_conflicts=true to schedule it anyway.'
+                ),
+                'conflicts': [
+                    {
+                        'id': other.id,
+                        'title': other.title,
+                        'start': occurrence.isoformat(),
+                        'end': (occurrence + other.duration).isoformat(),
+                    }
+                    for other, occurrence in found
+                ],
+            })
     
     def perform_create(self, serializer):
         """
@@ -151,6 +319,8 @@ class ScheduledCallViewSet(viewsets.ModelViewSet):
                     'detail': 'Please refresh and try again.'
                 })
             
+            self._check_conflicts(ScheduledCall(tenant=self.request.tenant, **serializer.validated_data))
+            
             scheduled_call = serializer.save(
                 tenant=self.request.tenant,
                 created_by=self.request.user
@@ -195,6 +365,12 @@ class ScheduledCallViewSet(viewsets.ModelViewSet):
             old_instance = self.get_object()
             was_completed = old_instance.is_completed
             
+            if self.SCHEDULE_FIELDS & serializer.validated_data.keys():
+                call = copy(old_instance)
+                for field, value in serializer.validated_data.items():
+                    setattr(call, field, value)
+                self._check_conflicts(call)
+            
             scheduled_call = serializer.save()
             
             # If call was just marked as completed, log it
@@ -231,16 +407,15 @@ class ScheduledCallViewSet(viewsets.ModelViewSet):
             title = f"Call Scheduled: {scheduled_call.title}"
             content = (
                 f"Scheduled call for {scheduled_call.scheduled_for.strftime('%Y-%m-%d %H:%M')}.\n"
-                f"Duration: {scheduled_call.duration_minutes} minutes\n"
-                f"Purpose: {scheduled_call.call_purpose}"
+                f"Duration: {scheduled_call.duration_minutes} minutes"
             )
+            if scheduled_call.is_recurring:
+                content += f"\nRepeats: {scheduled_call.get_recurrence_display()}"
             if scheduled_call.description:
                 content += f"\n\nNotes: {scheduled_call.description}"
         elif action == 'completed':
             title = f"Call Completed: {scheduled_call.title}"
             content = f"Call was completed."
-            if scheduled_call.outcome:
-                content += f"\n\nOutcome: {scheduled_call.outcome}"
         else:
             title = f"Call Updated: {scheduled_call.title}"
             content = "Call details were updated."
@@ -4,10 +4,11 @@ Contacts serializers for ProjectMeats.
 Provides serialization for contact API endpoints.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from tenant_apps.contacts.models import Contact
 
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for Contact model."""
     supplier_name = serializers.CharField(source='supplier.name', read_only=True)
     customer_name = serializers.CharField(source='customer.name', read_only=True)
@@ -33,6 +34,11 @@ class ContactSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "supplier_name", "customer_name", "created_on", "modified_on", "created_at", "updated_at"]
+        # Opt-in nested data (?expand=supplier,customer)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+            "customer": ("tenant_apps.customers.serializers.CustomerSerializer", {}),
+        }
 
     def validate_first_name(self, value):
         """Validate first name is provided and is a valid string."""
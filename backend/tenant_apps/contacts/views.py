@@ -26,7 +26,9 @@ class ContactViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter contacts by current tenant."""
         if hasattr(self.request, 'tenant') and self.request.tenant:
-            return Contact.objects.for_tenant(self.request.tenant)
+            return Contact.objects.for_tenant(self.request.tenant).select_related(
+                'supplier', 'customer'
+            )
         return Contact.objects.none()
 
     def perform_create(self, serializer):
@@ -4,11 +4,12 @@ Customers serializers for ProjectMeats.
 Provides serialization for customer API endpoints.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from tenant_apps.customers.models import Customer
 from tenant_apps.locations.serializers import LocationListSerializer
 
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for Customer model."""
     
     # ArrayField serialization
@@ -22,9 +23,6 @@ class CustomerSerializer(serializers.ModelSerializer):
         required=False,
         allow_empty=True,
     )
-    
-    # Nested locations (via reverse FK)
-    locations = LocationListSerializer(many=True, read_only=True)
 
     class Meta:
         model = Customer
@@ -52,7 +50,6 @@ class CustomerSerializer(serializers.ModelSerializer):
             "contacts",
             "products",
             "will_pickup_load",
-            "locations",
             "accounting_payment_terms",
             "credit_limits",
             "account_line_of_credit",
@@ -66,7 +63,13 @@ class CustomerSerializer(serializers.ModelSerializer):
             "created_on",
             "modified_on",
         ]
-        read_only_fields = ["id", "created_on", "modified_on", "locations"]
+        read_only_fields = ["id", "created_on", "modified_on"]
+        # Opt-in nested data (?expand=locations,contacts,plant)
+        expandable_fields = {
+            "locations": (LocationListSerializer, {"source": "customer_locations", "many": True}),
+            "contacts": ("tenant_apps.contacts.serializers.ContactSerializer", {"many": True}),
+            "plant": ("tenant_apps.plants.serializers.PlantSerializer", {}),
+        }
 
     def validate_name(self, value):
         """Validate customer name is provided and is a valid string."""
@@ -22,11 +22,12 @@ from tenant_apps.customers.serializers import CustomerSerializer
 from apps.tenants.models import TenantUser
 import logging
 from django.utils import timezone
+from apps.core.mixins import CSVImportMixin
 
 logger = logging.getLogger(__name__)
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(CSVImportMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing customers with strict tenant isolation.
     
@@ -38,6 +39,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
 
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
+    csv_import_entity = 'customers'
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -53,7 +55,9 @@ class CustomerViewSet(viewsets.ModelViewSet):
         """
         # Use tenant from middleware
         if hasattr(self.request, 'tenant') and self.request.tenant:
-            return Customer.objects.for_tenant(self.request.tenant)
+            return Customer.objects.for_tenant(self.request.tenant).prefetch_related(
+                'proteins', 'contacts', 'products'
+            )
         
         # No tenant = no data (security)
         logger.warning(
@@ -0,0 +1,30 @@
+"""
+Django admin configuration for Dedupe app.
+"""
+from django.contrib import admin
+from apps.core.admin import TenantFilteredAdmin
+from .models import DuplicateCandidate
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(TenantFilteredAdmin):
+    """Read-only admin for DuplicateCandidate; review and merge through the API."""
+
+    list_display = (
+        "entity_type",
+        "record_id",
+        "duplicate_id",
+        "score",
+        "matched_on",
+        "status",
+        "reviewed_by",
+        "reviewed_on",
+    )
+    list_filter = ("entity_type", "status")
+    raw_id_fields = ("reviewed_by",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
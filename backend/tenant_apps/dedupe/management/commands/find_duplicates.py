@@ -0,0 +1,59 @@
+"""
+Management command to scan suppliers, customers and contacts for duplicates.
+
+Usage:
+    python manage.py find_duplicates --tenant acme-meats
+    python manage.py find_duplicates --tenant acme-meats --entity supplier --threshold 0.75
+
+Replaces the tenant's pending duplicate candidates with the pairs found
+(see tenant_apps/dedupe/matching.py); review and merge them through
+/api/v1/dedupe/candidates/. Same as POST /api/v1/dedupe/candidates/scan/.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.models import Tenant
+from tenant_apps.dedupe.matching import DEFAULT_THRESHOLD, find_duplicates
+from tenant_apps.dedupe.models import DuplicateEntityChoices
+
+
+class Command(BaseCommand):
+    help = 'Scan suppliers, customers and contacts for likely duplicates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, required=True, help='Slug of the tenant to scan')
+        parser.add_argument(
+            '--entity',
+            choices=DuplicateEntityChoices.values,
+            action='append',
+            dest='entities',
+            help='Kind of record to scan (repeatable; default: all)',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=str,
+            default=str(DEFAULT_THRESHOLD),
+            help='Lowest score (0 to 1) kept as a candidate',
+        )
+
+    def handle(self, *args, **options):
+        tenant = Tenant.objects.filter(slug=options['tenant']).first()
+        if tenant is None:
+            raise CommandError(f"No tenant with slug '{options['tenant']}'")
+        try:
+            threshold = Decimal(options['threshold'])
+        except InvalidOperation:
+            threshold = None
+        if threshold is None or not 0 <= threshold <= 1:
+            raise CommandError('--threshold must be from 0 to 1')
+
+        total = 0
+        for entity in options['entities'] or DuplicateEntityChoices.values:
+            result = find_duplicates(tenant, entity, threshold)
+            total += result['candidates']
+            self.stdout.write(
+                f"{entity}: {result['candidates']:,} candidates among {result['records']:,} records "
+                f"({result['compared']:,} pairs compared)"
+            )
+        self.stdout.write(self.style.SUCCESS(f'Found {total:,} duplicate candidates'))
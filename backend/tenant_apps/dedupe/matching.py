@@ -0,0 +1,284 @@
+"""
+Duplicate detection for suppliers, customers and contacts.
+
+Every record of a kind is reduced to normalized keys: its name (lowercased,
+punctuation and legal suffixes such as Inc or LLC dropped, initials joined,
+so "A.B.C. Meats Inc" and "ABC Meats" share "abc meats"), its phone numbers
+(the last ten digits) and its email addresses and company email domain.
+
+Comparing every pair of records is quadratic, so records are first put in
+blocks by key: the same name, compact name, name prefix, phone, email or
+domain, and each of a record's two rarest name words (rare words like
+"Prairie" say more than "Meats"). Only records sharing a block are
+compared, and blocks larger than MAX_BLOCK (a domain everyone shares, say)
+are skipped, which keeps a scan near linear in the number of records; such
+common domains do not count towards a score either.
+
+Pairs are scored by the trigram similarity of their names, computed as
+PostgreSQL's pg_trgm ``similarity()`` does (words padded with spaces, the
+shared share of distinct trigrams), plus BONUS per shared phone, email or
+company, and kept from ``threshold`` on as pending DuplicateCandidates.
+Names that differ in their numbers ("Cold Storage 13" and "Cold Storage
+15") are different places of a business, and contacts of different
+companies different people, unless a phone or email says otherwise.
+Scoring runs in Python on the pairs blocking produced, so it needs neither
+the pg_trgm extension nor a database round trip per pair.
+"""
+import logging
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import combinations
+
+from django.db import transaction
+
+from tenant_apps.contacts.models import Contact
+from tenant_apps.customers.models import Customer
+from tenant_apps.suppliers.models import Supplier
+
+from .models import DuplicateCandidate, DuplicateEntityChoices, DuplicateStatusChoices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = Decimal("0.6")
+MAX_BLOCK = 200
+BONUS = 0.2
+# Contacts of different companies are rarely the same person
+COMPANY_PENALTY = 0.5
+
+ENTITY_MODELS = {
+    DuplicateEntityChoices.SUPPLIER: Supplier,
+    DuplicateEntityChoices.CUSTOMER: Customer,
+    DuplicateEntityChoices.CONTACT: Contact,
+}
+
+# Words that do not tell businesses apart
+LEGAL_WORDS = frozenset(
+    "the inc incorporated llc llp lp ltd limited co company corp corporation plc pllc".split()
+)
+# Email domains many unrelated parties share
+FREE_MAIL_DOMAINS = frozenset(
+    "gmail.com googlemail.com yahoo.com hotmail.com outlook.com live.com msn.com aol.com "
+    "icloud.com me.com mac.com comcast.net att.net sbcglobal.net verizon.net proton.me protonmail.com".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def name_key(name):
+    """``name`` normalized for comparison: "A.B.C. Meats, Inc." -> "abc meats"."""
+    text = str(name or "").lower().replace("&", " and ")
+    text = re.sub(r"[.'`’]", "", text)
+    words = [word for word in _WORD.findall(text) if word not in LEGAL_WORDS]
+    return " ".join(_join_initials(words))
+
+
+def _join_initials(words):
+    """Join runs of single letters: ["a", "b", "c", "meats"] -> ["abc", "meats"]."""
+    joined, initials = [], False
+    for word in words:
+        if len(word) == 1 and word.isalpha():
+            if initials:
+                joined[-1] += word
+            else:
+                joined.append(word)
+            initials = True
+        else:
+            joined.append(word)
+            initials = False
+    return joined
+
+
+def phone_key(phone):
+    """The last ten digits of ``phone``; "" with fewer than seven digits."""
+    digits = re.sub(r"\D", "", str(phone or ""))
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def email_key(email):
+    return str(email or "").strip().lower()
+
+
+def domain_key(email):
+    """The domain of ``email`` unless it is a free mail provider's."""
+    domain = email_key(email).rpartition("@")[2]
+    return "" if not domain or domain in FREE_MAIL_DOMAINS else domain
+
+
+def trigrams(text):
+    """pg_trgm's trigrams of ``text``: each word padded with two spaces in front and one behind."""
+    grams = set()
+    for word in _WORD.findall(str(text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(left, right):
+    """Trigram similarity of two strings, 0 to 1, as pg_trgm's ``similarity()``."""
+    return _similarity(trigrams(left), trigrams(right))
+
+
+def _similarity(left, right):
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+@dataclass
+class Record:
+    """A record reduced to the keys it is blocked and scored on."""
+
+    id: int
+    name: str
+    phones: set = field(default_factory=set)
+    emails: set = field(default_factory=set)
+    domains: set = field(default_factory=set)
+    company: str = ""
+    grams: set = field(default_factory=set)
+    numbers: frozenset = frozenset()
+
+
+def load_records(tenant, entity):
+    """The tenant's records of ``entity`` as ``Record``\\ s."""
+    model = ENTITY_MODELS[entity]
+    if entity == DuplicateEntityChoices.CONTACT:
+        rows = model.objects.filter(tenant=tenant).values_list(
+            "id", "first_name", "last_name", "email", "phone", "main_phone", "direct_phone", "cell_phone",
+            "company", "supplier_id", "customer_id",
+        )
+        records = []
+        for pk, first, last, email, *phones, company, supplier_id, customer_id in rows:
+            parent = f"supplier:{supplier_id}" if supplier_id else f"customer:{customer_id}" if customer_id else ""
+            records.append(_record(pk, f"{first or ''} {last or ''}", phones, [email], name_key(company) or parent))
+        return records
+    rows = model.objects.filter(tenant=tenant).values_list("id", "name", "email", "phone")
+    return [_record(pk, name, [phone], [email]) for pk, name, email, phone in rows]
+
+
+def _record(pk, name, phones, emails, company=""):
+    key = name_key(name)
+    return Record(
+        id=pk,
+        name=key,
+        phones={phone_key(phone) for phone in phones} - {""},
+        emails={email_key(email) for email in emails} - {""},
+        domains={domain_key(email) for email in emails} - {""},
+        company=company,
+        grams=trigrams(key),
+        numbers=frozenset(word for word in key.split() if any(char.isdigit() for char in word)),
+    )
+
+
+def blocks(records):
+    """``{block key: [record, ...]}`` of the keys at least two records share."""
+    frequency = Counter(word for record in records for word in set(record.name.split()))
+    index = defaultdict(list)
+    for record in records:
+        keys = {f"p:{phone}" for phone in record.phones}
+        keys |= {f"e:{email}" for email in record.emails}
+        keys |= {f"d:{domain}" for domain in record.domains}
+        if record.name:
+            compact = record.name.replace(" ", "")
+            keys |= {f"n:{record.name}", f"c:{compact}", f"x:{compact[:5]}"}
+            rarest = sorted(set(record.name.split()), key=lambda word: (frequency[word], word))
+            keys |= {f"w:{word}" for word in rarest[:2] if len(word) > 2}
+        for key in keys:
+            index[key].append(record)
+    return {key: members for key, members in index.items() if len(members) > 1}
+
+
+def score(left, right):
+    """``(score, name similarity, matched_on)`` of a pair of records."""
+    name = _similarity(left.grams, right.grams)
+    if left.numbers and right.numbers and left.numbers != right.numbers:
+        name = 0.0
+    matched_on = []
+    if left.name and left.name == right.name:
+        matched_on.append("name")
+    if left.phones & right.phones:
+        matched_on.append("phone")
+    if left.emails & right.emails:
+        matched_on.append("email")
+    elif left.domains & right.domains:
+        matched_on.append("domain")
+    total = name + BONUS * sum(key in matched_on for key in ("phone", "email"))
+    total += BONUS / 2 * ("domain" in matched_on)
+    if left.company and right.company:
+        # Contacts: the same person works for one company
+        if left.company == right.company:
+            matched_on.append("company")
+            total += BONUS
+        else:
+            total -= COMPANY_PENALTY
+    return min(max(total, 0.0), 1.0), name, matched_on
+
+
+def candidate_pairs(records, threshold=DEFAULT_THRESHOLD):
+    """
+    ``({(low id, high id): (score, similarity, matched_on)}, stats)`` of the
+    pairs of ``records`` scoring at least ``threshold``.
+    """
+    threshold = float(threshold)
+    # A domain that many records share (a hosting provider's) says nothing
+    domains = Counter(domain for record in records for domain in record.domains)
+    for record in records:
+        record.domains = {domain for domain in record.domains if domains[domain] <= MAX_BLOCK}
+    pairs, compared, skipped = {}, set(), 0
+    for key, members in blocks(records).items():
+        if len(members) > MAX_BLOCK:
+            skipped += 1
+            continue
+        for left, right in combinations(members, 2):
+            pair = (left.id, right.id) if left.id < right.id else (right.id, left.id)
+            if pair in compared:
+                continue
+            compared.add(pair)
+            result = score(left, right)
+            if result[0] >= threshold:
+                pairs[pair] = result
+    return pairs, {"records": len(records), "compared": len(compared), "skipped_blocks": skipped}
+
+
+def _decimal(value):
+    return Decimal(str(round(value, 3)))
+
+
+def find_duplicates(tenant, entity, threshold=DEFAULT_THRESHOLD):
+    """
+    Rescan the tenant's records of ``entity`` and replace its pending
+    candidates with the pairs found; dismissed and merged pairs are kept
+    and not suggested again. Returns ``{"entity", "records", "compared",
+    "skipped_blocks", "candidates"}``.
+    """
+    pairs, stats = candidate_pairs(load_records(tenant, entity), threshold)
+    with transaction.atomic():
+        existing = DuplicateCandidate.objects.filter(tenant=tenant, entity_type=entity)
+        existing.filter(status=DuplicateStatusChoices.PENDING).delete()
+        reviewed = set(existing.values_list("record_id", "duplicate_id"))
+        DuplicateCandidate.objects.bulk_create(
+            [
+                DuplicateCandidate(
+                    tenant=tenant,
+                    entity_type=entity,
+                    record_id=record_id,
+                    duplicate_id=duplicate_id,
+                    score=_decimal(total),
+                    name_similarity=_decimal(name),
+                    matched_on=matched_on,
+                )
+                for (record_id, duplicate_id), (total, name, matched_on) in pairs.items()
+                if (record_id, duplicate_id) not in reviewed
+            ],
+            batch_size=1000,
+        )
+    candidates = sum(pair not in reviewed for pair in pairs)
+    logger.info(
+        "Found %d %s duplicate candidates among %d records of tenant %s (%d pairs compared)",
+        candidates, entity, stats["records"], tenant.slug, stats["compared"],
+    )
+    return {"entity": entity, **stats, "candidates": candidates}
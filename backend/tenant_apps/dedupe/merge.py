@@ -0,0 +1,175 @@
+"""
+Merging duplicate suppliers, customers or contacts into one record.
+
+``merge_records`` keeps one record and folds the others into it, in one
+transaction with all of them locked:
+
+- every foreign key to a merged record (purchase and sales orders,
+  invoices, claims, locations, plants, contacts, ...) is repointed with one
+  ``UPDATE`` per relation, found from the model's reverse relations, so
+  relations added later are covered too;
+- many-to-many rows (products, proteins, contacts, carriers' contacts) are
+  copied to the kept record with one ``INSERT ... SELECT ... ON CONFLICT DO
+  NOTHING`` per table, and go with the merged records;
+- the cockpit's activity logs and scheduled calls, which point at records
+  by entity type and id (GENERIC_REFERENCES of the tenant backup), are
+  repointed the same way;
+- blank fields of the kept record are filled from the merged records, in
+  the order given;
+- the merged records are deleted, and the weekly price facts
+  (analytics.ProductPriceWeek), which are aggregated per supplier and
+  customer, are recomputed for the products and weeks they had facts in.
+
+``QuerySet.update()`` skips save signals: purchase order history is not
+written for the repointed orders.
+"""
+import logging
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.bulk import insert_from_select
+from apps.tenants.utils.tenant_backup import GENERIC_REFERENCES
+from tenant_apps.ai_assistant.retrieval import bulk_written
+from tenant_apps.analytics.models import ProductPriceWeek
+
+from .matching import ENTITY_MODELS
+from .models import DuplicateCandidate, DuplicateStatusChoices
+
+logger = logging.getLogger(__name__)
+
+MAX_MERGED = 100
+
+
+class MergeError(Exception):
+    """The records cannot be merged."""
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _copy_m2m(through, own, other, keep_id, merge_ids):
+    """Link the kept record to everything the merged ones are linked to in ``through``."""
+    own_field, other_field = through._meta.get_field(own), through._meta.get_field(other)
+    return insert_from_select(
+        through,
+        {
+            own_field.attname: (f"%s::{own_field.db_type(connection)}", [keep_id]),
+            other_field.attname: _quote(other_field.column),
+        },
+        f"FROM {_quote(through._meta.db_table)} WHERE {_quote(own_field.column)} = ANY(%s) "
+        f"GROUP BY {_quote(other_field.column)} ON CONFLICT DO NOTHING",
+        [list(merge_ids)],
+    )
+
+
+def _is_blank(value):
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _fill_blanks(keep, merged):
+    """Copy values of the merged records into the kept record's blank fields; returns their names."""
+    filled = []
+    for model_field in keep._meta.concrete_fields:
+        if model_field.primary_key or model_field.name == "tenant" or getattr(model_field, "auto_now", False):
+            continue
+        if getattr(model_field, "auto_now_add", False) or not _is_blank(getattr(keep, model_field.attname)):
+            continue
+        for record in merged:
+            value = getattr(record, model_field.attname)
+            if not _is_blank(value):
+                setattr(keep, model_field.attname, value)
+                filled.append(model_field.name)
+                break
+    return filled
+
+
+def merge_records(tenant, entity, keep_id, merge_ids, user=None):
+    """
+    Merge the tenant's ``entity`` records ``merge_ids`` into ``keep_id``.
+    Returns ``{"entity", "kept", "merged", "filled", "updated"}``, where
+    ``updated`` counts the repointed rows per ``app.Model.field``. Raises
+    ``MergeError`` for unknown or repeated records.
+    """
+    model = ENTITY_MODELS[entity]
+    merge_ids = list(dict.fromkeys(merge_ids))
+    if not merge_ids:
+        raise MergeError("Pass at least one record to merge")
+    if keep_id in merge_ids:
+        raise MergeError("The kept record cannot also be merged")
+    if len(merge_ids) > MAX_MERGED:
+        raise MergeError(f"Merge at most {MAX_MERGED} records at once")
+
+    with transaction.atomic():
+        records = {
+            record.pk: record
+            for record in model.objects.select_for_update().filter(tenant=tenant, pk__in=[keep_id, *merge_ids])
+        }
+        missing = [pk for pk in [keep_id, *merge_ids] if pk not in records]
+        if missing:
+            raise MergeError(f"No {entity} with id {', '.join(map(str, missing))}")
+        keep = records[keep_id]
+        updated = {}
+
+        price_weeks = set()
+        for relation in model._meta.related_objects:
+            related = relation.related_model
+            label = f"{related._meta.label}.{relation.field.name}"
+            if related is ProductPriceWeek:
+                # Derived and unique per supplier and customer: recomputed below
+                price_weeks |= set(
+                    related.objects.filter(**{f"{relation.field.name}__in": merge_ids})
+                    .values_list("product_id", "week")
+                )
+            elif relation.many_to_many:
+                through = relation.through
+                own = relation.field.m2m_reverse_field_name()
+                updated[label] = _copy_m2m(through, own, relation.field.m2m_field_name(), keep_id, merge_ids)
+            else:
+                updated[label] = related._base_manager.filter(
+                    **{f"{relation.field.name}__in": merge_ids}
+                ).update(**{relation.field.name: keep})
+                bulk_written(tenant, related, [relation.field.name])
+        for m2m in model._meta.many_to_many:
+            through = m2m.remote_field.through
+            updated[f"{model._meta.label}.{m2m.name}"] = _copy_m2m(
+                through, m2m.m2m_field_name(), m2m.m2m_reverse_field_name(), keep_id, merge_ids
+            )
+        for label, (type_field, id_field) in GENERIC_REFERENCES.items():
+            updated[f"{label}.{id_field}"] = apps.get_model(label)._base_manager.filter(
+                tenant=tenant, **{type_field: entity, f"{id_field}__in": merge_ids}
+            ).update(**{id_field: keep_id})
+            bulk_written(tenant, apps.get_model(label), [id_field])
+        activity = apps.get_model("cockpit.ActivityLog")
+        updated["cockpit.ActivityLog.object_id"] = activity._base_manager.filter(
+            tenant=tenant, content_type=ContentType.objects.get_for_model(model), object_id__in=merge_ids
+        ).update(object_id=keep_id)
+        bulk_written(tenant, activity, ["object_id"])
+
+        filled = _fill_blanks(keep, [records[pk] for pk in merge_ids])
+        if filled:
+            keep.save(update_fields=[*filled, "modified_on"])
+        model.objects.filter(pk__in=merge_ids).delete()
+        ProductPriceWeek.refresh(tenant.id, price_weeks)
+
+        candidates = DuplicateCandidate.objects.filter(tenant=tenant, entity_type=entity)
+        candidates.filter(record_id__in=[keep_id, *merge_ids], duplicate_id__in=[keep_id, *merge_ids]).update(
+            status=DuplicateStatusChoices.MERGED, reviewed_by=user, reviewed_on=timezone.now()
+        )
+        # Pairs with a merged record are found again for the kept one on the next scan
+        candidates.filter(
+            Q(record_id__in=merge_ids) | Q(duplicate_id__in=merge_ids), status=DuplicateStatusChoices.PENDING
+        ).delete()
+
+    logger.info("Merged %s %s into %d for tenant %s", entity, merge_ids, keep_id, tenant.slug)
+    return {
+        "entity": entity,
+        "kept": keep_id,
+        "merged": merge_ids,
+        "filled": filled,
+        "updated": {label: count for label, count in updated.items() if count},
+    }
@@ -0,0 +1,142 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:02
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("tenants", "0006_metadata_lockdown"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DuplicateCandidate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("modified_on", models.DateTimeField(auto_now=True)),
+                (
+                    "entity_type",
+                    models.CharField(
+                        choices=[
+                            ("supplier", "Supplier"),
+                            ("customer", "Customer"),
+                            ("contact", "Contact"),
+                        ],
+                        help_text="Kind of the two records",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "record_id",
+                    models.PositiveIntegerField(
+                        help_text="ID of the first record of the pair"
+                    ),
+                ),
+                (
+                    "duplicate_id",
+                    models.PositiveIntegerField(
+                        help_text="ID of the record that may duplicate it"
+                    ),
+                ),
+                (
+                    "score",
+                    models.DecimalField(
+                        decimal_places=3,
+                        help_text="Likelihood of a duplicate, 0 to 1",
+                        max_digits=4,
+                    ),
+                ),
+                (
+                    "name_similarity",
+                    models.DecimalField(
+                        decimal_places=3,
+                        help_text="Trigram similarity of the normalized names, 0 to 1",
+                        max_digits=4,
+                    ),
+                ),
+                (
+                    "matched_on",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=20),
+                        blank=True,
+                        default=list,
+                        help_text="Keys the records share (name, phone, email, domain)",
+                        size=None,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending review"),
+                            ("dismissed", "Not a duplicate"),
+                            ("merged", "Merged"),
+                        ],
+                        default="pending",
+                        help_text="Review state",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "reviewed_on",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the pair was dismissed or merged",
+                        null=True,
+                    ),
+                ),
+                (
+                    "reviewed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="User who dismissed or merged the pair",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="reviewed_duplicates",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        help_text="Tenant these records belong to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="duplicate_candidates",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Duplicate Candidate",
+                "verbose_name_plural": "Duplicate Candidates",
+                "ordering": ["-score", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["tenant", "entity_type", "status", "-score"],
+                        name="dedupe_dupl_tenant__04fa1a_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tenant", "entity_type", "record_id", "duplicate_id"),
+                        name="unique_duplicate_candidate",
+                    )
+                ],
+            },
+        ),
+    ]
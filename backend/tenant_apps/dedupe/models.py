@@ -0,0 +1,103 @@
+"""
+Dedupe models for ProjectMeats.
+
+Likely duplicate suppliers, customers and contacts, queued for review.
+
+Implements tenant ForeignKey field for shared-schema multi-tenancy.
+"""
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+
+from apps.core.models import TenantManager, TimestampModel
+from apps.tenants.models import Tenant
+
+
+class DuplicateEntityChoices(models.TextChoices):
+    """Kinds of records checked for duplicates."""
+
+    SUPPLIER = "supplier", "Supplier"
+    CUSTOMER = "customer", "Customer"
+    CONTACT = "contact", "Contact"
+
+
+class DuplicateStatusChoices(models.TextChoices):
+    """Review state of a duplicate candidate."""
+
+    PENDING = "pending", "Pending review"
+    DISMISSED = "dismissed", "Not a duplicate"
+    MERGED = "merged", "Merged"
+
+
+class DuplicateCandidate(TimestampModel):
+    """
+    A pair of records of one kind that look like the same party, found by
+    ``matching.find_duplicates`` and reviewed through the API: dismissed
+    pairs are not suggested again, merged ones record what was merged.
+    ``record_id`` is the lower id of the pair.
+    """
+    # Use custom manager for multi-tenancy
+    objects = TenantManager()
+
+    # Multi-tenancy
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="duplicate_candidates",
+        help_text="Tenant these records belong to"
+    )
+
+    entity_type = models.CharField(
+        max_length=20,
+        choices=DuplicateEntityChoices.choices,
+        help_text="Kind of the two records",
+    )
+    record_id = models.PositiveIntegerField(help_text="ID of the first record of the pair")
+    duplicate_id = models.PositiveIntegerField(help_text="ID of the record that may duplicate it")
+    score = models.DecimalField(
+        max_digits=4,
+        decimal_places=3,
+        help_text="Likelihood of a duplicate, 0 to 1",
+    )
+    name_similarity = models.DecimalField(
+        max_digits=4,
+        decimal_places=3,
+        help_text="Trigram similarity of the normalized names, 0 to 1",
+    )
+    matched_on = ArrayField(
+        models.CharField(max_length=20),
+        default=list,
+        blank=True,
+        help_text="Keys the records share (name, phone, email, domain)",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=DuplicateStatusChoices.choices,
+        default=DuplicateStatusChoices.PENDING,
+        help_text="Review state",
+    )
+    reviewed_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="reviewed_duplicates",
+        help_text="User who dismissed or merged the pair",
+    )
+    reviewed_on = models.DateTimeField(null=True, blank=True, help_text="When the pair was dismissed or merged")
+
+    class Meta:
+        ordering = ["-score", "id"]
+        verbose_name = "Duplicate Candidate"
+        verbose_name_plural = "Duplicate Candidates"
+        indexes = [
+            models.Index(fields=['tenant', 'entity_type', 'status', '-score']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'entity_type', 'record_id', 'duplicate_id'],
+                name='unique_duplicate_candidate',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} #{self.record_id} ~ #{self.duplicate_id} ({self.score})"
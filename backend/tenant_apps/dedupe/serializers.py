@@ -0,0 +1,78 @@
+"""
+Serializers for Dedupe app.
+"""
+from rest_framework import serializers
+
+from .matching import DEFAULT_THRESHOLD
+from .merge import MAX_MERGED
+from .models import DuplicateCandidate, DuplicateEntityChoices
+
+
+class DuplicateCandidateSerializer(serializers.ModelSerializer):
+    """A candidate pair with a summary of both records (``context["records"]``)."""
+
+    record = serializers.SerializerMethodField()
+    duplicate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DuplicateCandidate
+        fields = [
+            "id",
+            "entity_type",
+            "record_id",
+            "duplicate_id",
+            "record",
+            "duplicate",
+            "score",
+            "name_similarity",
+            "matched_on",
+            "status",
+            "reviewed_by",
+            "reviewed_on",
+            "created_on",
+        ]
+        read_only_fields = fields
+
+    def _summary(self, obj, pk):
+        return self.context.get("records", {}).get((obj.entity_type, pk))
+
+    def get_record(self, obj):
+        return self._summary(obj, obj.record_id)
+
+    def get_duplicate(self, obj):
+        return self._summary(obj, obj.duplicate_id)
+
+
+class DuplicateScanSerializer(serializers.Serializer):
+    """Options of a duplicate scan (matching.find_duplicates)."""
+
+    entity_type = serializers.ChoiceField(
+        choices=DuplicateEntityChoices.choices, required=False, help_text="Kind to scan (default: all)"
+    )
+    threshold = serializers.DecimalField(
+        max_digits=4,
+        decimal_places=3,
+        min_value=0,
+        max_value=1,
+        default=DEFAULT_THRESHOLD,
+        help_text="Lowest score kept as a candidate",
+    )
+
+
+class CandidateMergeSerializer(serializers.Serializer):
+    """Which record of a candidate pair to keep."""
+
+    keep = serializers.IntegerField(required=False, help_text="record_id or duplicate_id (default: record_id)")
+
+
+class DuplicateMergeSerializer(serializers.Serializer):
+    """Records to merge into one (merge.merge_records)."""
+
+    entity_type = serializers.ChoiceField(choices=DuplicateEntityChoices.choices)
+    keep = serializers.IntegerField(help_text="ID of the record to keep")
+    merge = serializers.ListField(
+        child=serializers.IntegerField(),
+        min_length=1,
+        max_length=MAX_MERGED,
+        help_text="IDs of the records to fold into it",
+    )
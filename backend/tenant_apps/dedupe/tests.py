@@ -0,0 +1,162 @@
+"""
+Tests for duplicate detection, review and merging.
+"""
+import uuid
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.analytics.models import ProductPriceWeek
+from tenant_apps.cockpit.models import ActivityLog
+from tenant_apps.contacts.models import Contact
+from tenant_apps.customers.models import Customer
+from tenant_apps.dedupe.matching import name_key, phone_key, similarity
+from tenant_apps.dedupe.models import DuplicateCandidate
+from tenant_apps.products.models import Product
+from tenant_apps.purchase_orders.models import PurchaseOrder
+from tenant_apps.sales_orders.models import SalesOrder
+from tenant_apps.suppliers.models import Supplier
+
+
+class MatchingKeysTest(SimpleTestCase):
+    """Names, phones and similarities are normalized as the scan compares them."""
+
+    def test_keys(self):
+        self.assertEqual(name_key("A.B.C. Meats, Inc."), "abc meats")
+        self.assertEqual(name_key("A B C Meats LLC"), "abc meats")
+        self.assertEqual(name_key("Smith & Sons Co"), "smith and sons")
+        self.assertEqual(phone_key("+1 (555) 123-4567"), "5551234567")
+        self.assertEqual(phone_key("ext 12"), "")
+        # pg_trgm: SELECT similarity('word', 'two words') = 0.36363637
+        self.assertAlmostEqual(similarity("word", "two words"), 4 / 11)
+        self.assertEqual(similarity("abc meats", "ABC Meats"), 1.0)
+
+
+class DedupeTest(APITestCase):
+    """Duplicates are found by blocking and scoring, reviewed, and merged set-wise."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Dedupe Co {unique_id}",
+            slug=f"dedupe-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@dedupe.com",
+        )
+        self.user = User.objects.create_user(username=f"dedupe-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+        self.abc = Supplier.objects.create(tenant=self.tenant, name="ABC Meats", phone="555-123-4567")
+        self.abc_inc = Supplier.objects.create(
+            tenant=self.tenant, name="A.B.C. Meats Inc", phone="(555) 123 4567", email="sales@abcmeats.com"
+        )
+        Supplier.objects.create(tenant=self.tenant, name="Prairie Beef", phone="555-000-1111")
+        Supplier.objects.create(tenant=self.tenant, name="Valley Pork")
+        self.diner = Customer.objects.create(tenant=self.tenant, name="Main Street Diner")
+        self.diner_llc = Customer.objects.create(tenant=self.tenant, name="Main St Diner LLC")
+        Customer.objects.create(tenant=self.tenant, name="Harbor Grill")
+        self.ribeye = Product.objects.create(tenant=self.tenant, product_code="RIB-1")
+        self.brisket = Product.objects.create(tenant=self.tenant, product_code="BRI-1")
+
+    def candidates(self, **params):
+        return self.client.get("/api/v1/dedupe/candidates/", params).data["results"]
+
+    def test_scan_review_and_merge(self):
+        scan = self.client.post("/api/v1/dedupe/candidates/scan/", {}, format="json")
+        self.assertEqual(scan.status_code, status.HTTP_200_OK)
+        pairs = self.candidates(entity_type="supplier")
+        self.assertEqual(len(pairs), 1)
+        pair = pairs[0]
+        self.assertEqual((pair["record_id"], pair["duplicate_id"]), (self.abc.id, self.abc_inc.id))
+        self.assertEqual(pair["score"], "1.000")
+        self.assertEqual(pair["matched_on"], ["name", "phone"])
+        self.assertEqual(pair["duplicate"]["name"], "A.B.C. Meats Inc")
+
+        # A dismissed pair is not suggested again
+        diners = self.candidates(entity_type="customer")
+        self.assertEqual(len(diners), 1)
+        dismissed = self.client.post(f"/api/v1/dedupe/candidates/{diners[0]['id']}/dismiss/")
+        self.assertEqual(dismissed.data["status"], "dismissed")
+        output = StringIO()
+        call_command("find_duplicates", tenant=self.tenant.slug, entities=["customer"], stdout=output)
+        self.assertIn("customer: 0 candidates among 3 records", output.getvalue())
+        self.assertEqual(self.candidates(entity_type="customer"), [])
+
+        order = PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number="PO-1",
+            supplier=self.abc_inc,
+            product=self.ribeye,
+            order_date=date(2026, 9, 14),
+            total_amount=Decimal("1000.00"),
+            total_weight=Decimal("250"),
+        )
+        PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number="PO-2",
+            supplier=self.abc,
+            product=self.ribeye,
+            order_date=date(2026, 9, 15),
+            total_amount=Decimal("800.00"),
+            total_weight=Decimal("200"),
+        )
+        self.abc.products.add(self.ribeye)
+        self.abc_inc.products.add(self.ribeye, self.brisket)
+        contact = Contact.objects.create(tenant=self.tenant, first_name="Ann", last_name="Lee", supplier=self.abc_inc)
+        note = ActivityLog.objects.create(
+            tenant=self.tenant, entity_type="supplier", entity_id=self.abc_inc.id, content="Called about ribs"
+        )
+
+        merged = self.client.post(f"/api/v1/dedupe/candidates/{pair['id']}/merge/", {}, format="json")
+        self.assertEqual(merged.status_code, status.HTTP_200_OK)
+        self.assertEqual(merged.data["merged"], [self.abc_inc.id])
+        self.assertEqual(merged.data["filled"], ["email"])
+        self.assertEqual(merged.data["updated"]["purchase_orders.PurchaseOrder.supplier"], 1)
+        self.assertFalse(Supplier.objects.filter(pk=self.abc_inc.pk).exists())
+        order.refresh_from_db()
+        contact.refresh_from_db()
+        note.refresh_from_db()
+        self.abc.refresh_from_db()
+        self.assertEqual((order.supplier_id, contact.supplier_id, note.entity_id), (self.abc.id,) * 3)
+        self.assertEqual(self.abc.email, "sales@abcmeats.com")
+        self.assertEqual(set(self.abc.products.all()), {self.ribeye, self.brisket})
+        self.assertEqual(DuplicateCandidate.objects.get(pk=pair["id"]).status, "merged")
+
+        # Price facts were folded into the kept supplier, as a rebuild would have them
+        def facts():
+            return sorted(ProductPriceWeek.objects.filter(tenant=self.tenant).values_list(
+                "product", "week", "side", "supplier", "order_count", "amount"
+            ))
+
+        incremental = facts()
+        self.assertEqual([fact[3] for fact in incremental], [self.abc.id])
+        ProductPriceWeek.rebuild(self.tenant)
+        self.assertEqual(facts(), incremental)
+
+    def test_merge_contacts(self):
+        keep = Contact.objects.create(tenant=self.tenant, first_name="Pat", last_name="Jones", email="pat@diner.com")
+        other = Contact.objects.create(tenant=self.tenant, first_name="Pat", last_name="Jones", phone="555-222-3333")
+        self.diner.contacts.add(other)
+        order = SalesOrder.objects.create(
+            tenant=self.tenant, our_sales_order_num="SO-1", supplier=self.abc, customer=self.diner, contact=other
+        )
+
+        url = "/api/v1/dedupe/candidates/merge/"
+        invalid = self.client.post(url, {"entity_type": "contact", "keep": keep.id, "merge": [keep.id]}, format="json")
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, {"entity_type": "contact", "keep": keep.id, "merge": [other.id]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        order.refresh_from_db()
+        keep.refresh_from_db()
+        self.assertEqual(order.contact_id, keep.id)
+        self.assertEqual(list(self.diner.contacts.all()), [keep])
+        self.assertEqual((keep.email, keep.phone), ("pat@diner.com", "555-222-3333"))
@@ -0,0 +1,13 @@
+"""
+URL routing for Dedupe app.
+"""
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import DuplicateCandidateViewSet
+
+router = DefaultRouter()
+router.register(r'candidates', DuplicateCandidateViewSet, basename='duplicate-candidate')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,152 @@
+"""
+ViewSets for Dedupe app.
+"""
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from tenant_apps.contacts.models import Contact
+
+from .matching import ENTITY_MODELS, find_duplicates
+from .merge import MergeError, merge_records
+from .models import DuplicateCandidate, DuplicateEntityChoices, DuplicateStatusChoices
+from .serializers import (
+    CandidateMergeSerializer,
+    DuplicateCandidateSerializer,
+    DuplicateMergeSerializer,
+    DuplicateScanSerializer,
+)
+
+
+def record_summaries(tenant, candidates):
+    """``{(entity_type, id): {"id", "name", "email", "phone"}}`` of both records of ``candidates``."""
+    ids = {}
+    for candidate in candidates:
+        ids.setdefault(candidate.entity_type, set()).update((candidate.record_id, candidate.duplicate_id))
+    summaries = {}
+    for entity, pks in ids.items():
+        model = ENTITY_MODELS[entity]
+        if model is Contact:
+            rows = model.objects.filter(tenant=tenant, pk__in=pks).values_list(
+                "id", "first_name", "last_name", "email", "phone"
+            )
+            rows = [(pk, f"{first} {last}".strip(), email, phone) for pk, first, last, email, phone in rows]
+        else:
+            rows = model.objects.filter(tenant=tenant, pk__in=pks).values_list("id", "name", "email", "phone")
+        for pk, name, email, phone in rows:
+            summaries[entity, pk] = {"id": pk, "name": name, "email": email, "phone": phone}
+    return summaries
+
+
+class DuplicateCandidateViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Review queue of likely duplicate suppliers, customers and contacts.
+
+    GET  /api/v1/dedupe/candidates/?entity_type=supplier&status=pending&min_score=0.8
+    POST /api/v1/dedupe/candidates/scan/           {"entity_type", "threshold"} (matching.py)
+    POST /api/v1/dedupe/candidates/{id}/dismiss/   not a duplicate; not suggested again
+    POST /api/v1/dedupe/candidates/{id}/merge/     {"keep"}: merge the pair (merge.py)
+    POST /api/v1/dedupe/candidates/merge/          {"entity_type", "keep", "merge": [ids]}
+    """
+
+    queryset = DuplicateCandidate.objects.all()
+    serializer_class = DuplicateCandidateSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """The tenant's candidates; listed are the pending ones unless ``?status=`` (or ``all``) says otherwise."""
+        if not hasattr(self.request, 'tenant') or not self.request.tenant:
+            return DuplicateCandidate.objects.none()
+        params = self.request.query_params
+        queryset = DuplicateCandidate.objects.filter(tenant=self.request.tenant)
+        if self.action != 'list':
+            return queryset
+        if params.get('entity_type'):
+            queryset = queryset.filter(entity_type=params['entity_type'])
+        review_status = params.get('status', DuplicateStatusChoices.PENDING)
+        if review_status != 'all':
+            queryset = queryset.filter(status=review_status)
+        if params.get('min_score'):
+            try:
+                queryset = queryset.filter(score__gte=float(params['min_score']))
+            except ValueError:
+                return DuplicateCandidate.objects.none()
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        candidates = page if page is not None else list(queryset)
+        context = {**self.get_serializer_context(), 'records': record_summaries(request.tenant, candidates)}
+        serializer = self.get_serializer_class()(candidates, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        candidate = self.get_object()
+        context = {**self.get_serializer_context(), 'records': record_summaries(request.tenant, [candidate])}
+        return Response(self.get_serializer_class()(candidate, context=context).data)
+
+    def _bad_request(self, error, details):
+        return Response({'error': error, 'details': details}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _merge(self, entity, keep, merge):
+        try:
+            result = merge_records(self.request.tenant, entity, keep, merge, user=self.request.user)
+        except MergeError as e:
+            return self._bad_request('Merge failed', str(e))
+        return Response(result)
+
+    @action(detail=False, methods=['post'])
+    def scan(self, request):
+        """Rescan one or every kind of record for duplicates."""
+        options = DuplicateScanSerializer(data=request.data)
+        if not options.is_valid():
+            return self._bad_request('Invalid scan options', options.errors)
+        if not getattr(request, 'tenant', None):
+            return self._bad_request('No tenant', 'Pass X-Tenant-ID')
+        data = options.validated_data
+        entities = [data['entity_type']] if 'entity_type' in data else DuplicateEntityChoices.values
+        results = [find_duplicates(request.tenant, entity, data['threshold']) for entity in entities]
+        return Response({'results': results})
+
+    @action(detail=True, methods=['post'])
+    def dismiss(self, request, pk=None):
+        """Mark a pending pair as not a duplicate."""
+        candidate = self.get_object()
+        if candidate.status != DuplicateStatusChoices.PENDING:
+            return self._bad_request('Not pending', f'This pair is already {candidate.status}')
+        candidate.status = DuplicateStatusChoices.DISMISSED
+        candidate.reviewed_by = request.user
+        candidate.reviewed_on = timezone.now()
+        candidate.save(update_fields=['status', 'reviewed_by', 'reviewed_on', 'modified_on'])
+        return Response(self.get_serializer(candidate).data)
+
+    @action(detail=True, methods=['post'], url_path='merge')
+    def merge_pair(self, request, pk=None):
+        """Merge a pending pair into the record given as ``keep``."""
+        candidate = self.get_object()
+        options = CandidateMergeSerializer(data=request.data)
+        if not options.is_valid():
+            return self._bad_request('Invalid merge options', options.errors)
+        if candidate.status != DuplicateStatusChoices.PENDING:
+            return self._bad_request('Not pending', f'This pair is already {candidate.status}')
+        keep = options.validated_data.get('keep', candidate.record_id)
+        if keep not in (candidate.record_id, candidate.duplicate_id):
+            return self._bad_request('Invalid keep', 'Pass the record_id or duplicate_id of this pair')
+        merge = candidate.duplicate_id if keep == candidate.record_id else candidate.record_id
+        return self._merge(candidate.entity_type, keep, [merge])
+
+    @action(detail=False, methods=['post'], url_path='merge')
+    def merge(self, request):
+        """Merge any number of records of one kind into one."""
+        options = DuplicateMergeSerializer(data=request.data)
+        if not options.is_valid():
+            return self._bad_request('Invalid merge options', options.errors)
+        if not getattr(request, 'tenant', None):
+            return self._bad_request('No tenant', 'Pass X-Tenant-ID')
+        data = options.validated_data
+        return self._merge(data['entity_type'], data['keep'], data['merge'])
@@ -0,0 +1,146 @@
+"""
+Batch invoicing: one invoice per delivered, uninvoiced sales order.
+
+A run locks the tenant's delivered sales orders that have no open
+(non-cancelled) invoice, skipping orders another run has locked, so two
+runs never invoice the same order. The invoices are built in memory from
+the orders, their customers and products, numbered from one range
+reserved from the tenant's InvoiceNumberSequence, and written with
+``bulk_create``, all in one transaction: a run invoices all of its orders
+or none of them. ``limit`` bounds how many orders one run (and one
+transaction) takes; run again for the rest.
+
+``bulk_create`` skips save signals, so the run refreshes the weekly price
+facts (analytics.ProductPriceWeek) of the invoiced orders itself.
+"""
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from tenant_apps.ai_assistant.retrieval import bulk_written
+from tenant_apps.analytics.models import ProductPriceWeek, week_of
+from tenant_apps.sales_orders.models import SalesOrder, SalesOrderStatus
+
+from .models import Invoice, InvoiceNumberSequence, InvoiceStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DUE_DAYS = 30
+MAX_ORDERS = 20000
+
+
+def uninvoiced_sales_orders(tenant, delivered_through=None, customer_ids=None):
+    """The tenant's delivered sales orders without an open invoice, oldest delivery first."""
+    invoices = Invoice.objects.filter(sales_order=OuterRef("pk")).exclude(status=InvoiceStatus.CANCELLED)
+    orders = SalesOrder.objects.filter(tenant=tenant, status=SalesOrderStatus.DELIVERED).exclude(Exists(invoices))
+    if delivered_through:
+        orders = orders.filter(delivery_date__lte=delivered_through)
+    if customer_ids:
+        orders = orders.filter(customer_id__in=customer_ids)
+    return orders.order_by("delivery_date", "id")
+
+
+def _invoice(order, issued, due_days):
+    customer, product = order.customer, order.product
+    total = order.total_amount or Decimal("0.00")
+    return Invoice(
+        tenant_id=order.tenant_id,
+        customer=customer,
+        sales_order=order,
+        product=product,
+        pick_up_date=order.pick_up_date,
+        delivery_date=order.delivery_date,
+        due_date=(order.delivery_date or issued) + timedelta(days=due_days),
+        our_sales_order_num=order.our_sales_order_num,
+        delivery_po_num=order.delivery_po_num,
+        payment_terms=customer.accounting_payment_terms,
+        accounting_payable_contact_name=customer.contact_person or "",
+        accounting_payable_contact_phone=(customer.phone or "")[:20],
+        accounting_payable_contact_email=customer.email or "",
+        type_of_protein=product.type_of_protein if product else "",
+        description_of_product_item=product.description_of_product_item if product else "",
+        edible_or_inedible=product.edible_or_inedible if product else "",
+        tested_product=product.tested_product if product else False,
+        quantity=order.quantity,
+        total_weight=order.total_weight,
+        weight_unit=order.weight_unit,
+        # Price per unit of weight, as on the order
+        unit_price=(total / order.total_weight).quantize(Decimal("0.01")) if order.total_weight else None,
+        total_amount=total,
+        outstanding_amount=total,
+    )
+
+
+def generate_invoices(
+    tenant,
+    delivered_through=None,
+    customer_ids=None,
+    due_days=DEFAULT_DUE_DAYS,
+    limit=MAX_ORDERS,
+    dry_run=False,
+):
+    """
+    Invoice up to ``limit`` of the tenant's delivered, uninvoiced sales
+    orders (delivered on or before ``delivered_through``, of
+    ``customer_ids``, when given). Returns ``{"count", "first_number",
+    "last_number", "total_amount", "skipped", "invoices"}``; ``skipped``
+    lists the orders left out and why. With ``dry_run`` nothing is written
+    or numbered.
+    """
+    issued = timezone.localdate()
+    with transaction.atomic():
+        orders = list(
+            uninvoiced_sales_orders(tenant, delivered_through, customer_ids)
+            .select_related("customer", "product")
+            .select_for_update(skip_locked=True, of=("self",))[:limit]
+        )
+        invoices, skipped = [], []
+        for order in orders:
+            if order.total_amount is None:
+                skipped.append({"sales_order": order.id, "reason": "Sales order has no total amount"})
+                continue
+            invoices.append(_invoice(order, issued, due_days))
+
+        first = last = None
+        if invoices and not dry_run:
+            first = InvoiceNumberSequence.reserve(tenant.id, len(invoices))
+            last = first + len(invoices) - 1
+            for number, invoice in enumerate(invoices, first):
+                invoice.invoice_number = str(number)
+            Invoice.objects.bulk_create(invoices, batch_size=1000)
+            bulk_written(tenant, Invoice)
+            ProductPriceWeek.refresh(tenant.id, _price_weeks(invoices, issued))
+            logger.info("Invoiced %d sales orders of tenant %s as %d-%d", len(invoices), tenant.slug, first, last)
+
+    return {
+        "count": len(invoices),
+        "first_number": first and str(first),
+        "last_number": last and str(last),
+        "total_amount": sum((invoice.total_amount for invoice in invoices), Decimal("0.00")),
+        "skipped": skipped,
+        "invoices": [
+            {
+                "id": invoice.id,
+                "invoice_number": invoice.invoice_number or None,
+                "sales_order": invoice.sales_order_id,
+                "customer": invoice.customer_id,
+                "total_amount": invoice.total_amount,
+            }
+            for invoice in invoices
+        ],
+    }
+
+
+def _price_weeks(invoices, issued):
+    """The price facts the orders were priced into and their invoices now are."""
+    keys = set()
+    for invoice in invoices:
+        order = invoice.sales_order
+        order_day = order.pick_up_date or timezone.localdate(order.date_time_stamp)
+        keys.add((order.product_id, week_of(order_day)))
+        keys.add((invoice.product_id, week_of(invoice.pick_up_date or issued)))
+    return keys
@@ -0,0 +1,71 @@
+"""
+Management command to invoice delivered sales orders in one batch.
+
+Usage:
+    python manage.py generate_invoices --tenant acme-meats
+    python manage.py generate_invoices --tenant acme-meats --delivered-through 2026-09-30 --dry-run
+    python manage.py generate_invoices --tenant acme-meats --customer 12 --customer 15
+
+Creates one invoice per delivered sales order without an invoice, numbered
+from the tenant's invoice number sequence, in one transaction (see
+tenant_apps/invoices/billing.py). Same as POST /api/v1/invoices/generate/.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.tenants.models import Tenant
+from tenant_apps.invoices.billing import DEFAULT_DUE_DAYS, MAX_ORDERS, generate_invoices
+
+
+class Command(BaseCommand):
+    help = 'Invoice the delivered sales orders that have no invoice yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, required=True, help='Slug of the tenant to invoice')
+        parser.add_argument(
+            '--delivered-through',
+            type=str,
+            help='Only invoice orders delivered on or before this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--customer',
+            type=int,
+            action='append',
+            dest='customers',
+            help='Only invoice this customer id (repeatable)',
+        )
+        parser.add_argument('--due-days', type=int, default=DEFAULT_DUE_DAYS, help='Days from delivery to due date')
+        parser.add_argument('--limit', type=int, default=MAX_ORDERS, help='Most orders to invoice in this run')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be invoiced without writing')
+
+    def handle(self, *args, **options):
+        tenant = Tenant.objects.filter(slug=options['tenant']).first()
+        if tenant is None:
+            raise CommandError(f"No tenant with slug '{options['tenant']}'")
+        delivered_through = None
+        if options['delivered_through']:
+            delivered_through = parse_date(options['delivered_through'])
+            if delivered_through is None:
+                raise CommandError('--delivered-through must be a date (YYYY-MM-DD)')
+        if not 1 <= options['limit'] <= MAX_ORDERS:
+            raise CommandError(f'--limit must be from 1 to {MAX_ORDERS}')
+
+        result = generate_invoices(
+            tenant,
+            delivered_through=delivered_through,
+            customer_ids=options['customers'],
+            due_days=options['due_days'],
+            limit=options['limit'],
+            dry_run=options['dry_run'],
+        )
+        for skipped in result['skipped']:
+            self.stdout.write(self.style.WARNING(f"Skipped sales order {skipped['sales_order']}: {skipped['reason']}"))
+        if options['dry_run']:
+            self.stdout.write(f"Would invoice {result['count']:,} sales orders for ${result['total_amount']:,}")
+        elif result['count']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Invoiced {result['count']:,} sales orders for ${result['total_amount']:,} "
+                f"as invoices {result['first_number']} to {result['last_number']}"
+            ))
+        else:
+            self.stdout.write('No sales orders to invoice')
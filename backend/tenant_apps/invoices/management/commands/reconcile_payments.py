@@ -0,0 +1,83 @@
+"""
+Management command to match a bank remittance file to open invoices and orders.
+
+Usage:
+    python manage.py reconcile_payments remittance.csv --tenant acme-meats --dry-run
+    python manage.py reconcile_payments remittance.csv --tenant acme-meats --tolerance 0.50
+    python manage.py reconcile_payments remittance.csv --tenant acme-meats --payment-date 2026-10-16 --method ach
+
+Matches every line by reference, amount and payer and records the matched
+payments in one transaction (see tenant_apps/invoices/reconciliation.py).
+Same as POST /api/v1/payments/reconcile/.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.tenants.models import Tenant
+from tenant_apps.invoices.models import PaymentMethod
+from tenant_apps.invoices.reconciliation import DEFAULT_TOLERANCE, ReconciliationError, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Match a remittance CSV to open invoices and orders and record the payments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Path to the remittance CSV')
+        parser.add_argument('--tenant', type=str, required=True, help='Slug of the tenant the payments are for')
+        parser.add_argument(
+            '--tolerance',
+            type=str,
+            default=str(DEFAULT_TOLERANCE),
+            help='Largest difference between a line and a balance still matched',
+        )
+        parser.add_argument('--payment-date', type=str, help='Date of lines without one (YYYY-MM-DD, default today)')
+        parser.add_argument(
+            '--method',
+            choices=PaymentMethod.values,
+            default=PaymentMethod.OTHER,
+            help='Payment method of lines without one',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report the matches without recording payments')
+
+    def handle(self, *args, **options):
+        tenant = Tenant.objects.filter(slug=options['tenant']).first()
+        if tenant is None:
+            raise CommandError(f"No tenant with slug '{options['tenant']}'")
+        try:
+            tolerance = Decimal(options['tolerance'])
+        except InvalidOperation:
+            tolerance = None
+        if tolerance is None or not tolerance.is_finite() or tolerance < 0:
+            raise CommandError('--tolerance must be a non-negative amount')
+        payment_date = None
+        if options['payment_date']:
+            payment_date = parse_date(options['payment_date'])
+            if payment_date is None:
+                raise CommandError('--payment-date must be a date (YYYY-MM-DD)')
+
+        try:
+            result = reconcile(
+                tenant,
+                options['path'],
+                tolerance=tolerance,
+                payment_date=payment_date,
+                method=options['method'],
+                dry_run=options['dry_run'],
+            )
+        except (OSError, ReconciliationError, UnicodeDecodeError) as e:
+            raise CommandError(f'Reconciliation failed: {e}')
+
+        for reject in result['rejects']:
+            self.stdout.write(self.style.WARNING(f"Line {reject['line']}: {'; '.join(reject['errors'])}"))
+        for line in result['unmatched_lines']:
+            self.stdout.write(f"Unmatched line {line['line']} (${line['amount']:,}): {line['reason']}")
+        summary = (
+            f"{result['matched']:,} of {result['total']:,} lines for ${result['matched_amount']:,}; "
+            f"{result['unmatched']:,} unmatched, {result['rejected']:,} rejected"
+        )
+        if options['dry_run']:
+            self.stdout.write(f"Would match {summary}")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Matched {summary}; recorded {result['posted']:,} payments"))
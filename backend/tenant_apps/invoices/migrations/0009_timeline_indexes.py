@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("customers", "0006_add_products_m2m"),
+        ("invoices", "0008_alter_invoice_invoice_number_and_more"),
+        ("purchase_orders", "0012_timeline_indexes"),
+        ("sales_orders", "0009_load_board"),
+        ("suppliers", "0008_add_preferred_protein_types"),
+        ("tenants", "0006_metadata_lockdown"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                fields=["tenant", "-created_on"], name="invoices_cl_tenant__827b30_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paymenttransaction",
+            index=models.Index(
+                fields=["tenant", "-created_on"], name="invoices_pa_tenant__f07f31_idx"
+            ),
+        ),
+    ]
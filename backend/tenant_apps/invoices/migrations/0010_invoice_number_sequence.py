@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("invoices", "0009_timeline_indexes"),
+        ("tenants", "0006_metadata_lockdown"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InvoiceNumberSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("modified_on", models.DateTimeField(auto_now=True)),
+                (
+                    "last_number",
+                    models.BigIntegerField(
+                        default=0, help_text="Last invoice number reserved"
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.OneToOneField(
+                        help_text="Tenant this sequence numbers invoices for",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="invoice_number_sequence",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Invoice Number Sequence",
+                "verbose_name_plural": "Invoice Number Sequences",
+            },
+        ),
+    ]
@@ -6,7 +6,9 @@ Defines invoice entities and related business logic.
 Implements tenant ForeignKey field for shared-schema multi-tenancy.
 """
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Cast
 from apps.tenants.models import Tenant
 from apps.core.models import (
     AccountingPaymentTermsChoices,
@@ -244,6 +246,68 @@ class Invoice(TimestampModel):
     def __str__(self):
         return f"INV-{self.invoice_number}"
 
+    def save(self, *args, **kwargs):
+        """Number the invoice from the tenant's sequence if no number was given."""
+        if not self.invoice_number and self.tenant_id:
+            self.invoice_number = str(InvoiceNumberSequence.reserve(self.tenant_id, 1))
+        super().save(*args, **kwargs)
+
+
+class InvoiceNumberSequence(TimestampModel):
+    """
+    The last invoice number handed out per tenant.
+
+    ``reserve`` allocates a whole range of consecutive numbers under one row
+    lock, so a batch run numbers thousands of invoices with a single
+    update, and concurrent runs and single creates never draw the same
+    number. A tenant's sequence starts after its highest numeric invoice
+    number, and numbers already taken by hand-numbered or imported invoices
+    are skipped; so are the numbers of a rolled-back reservation.
+    """
+    # Use custom manager for multi-tenancy
+    objects = TenantManager()
+
+    # Multi-tenancy
+    tenant = models.OneToOneField(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="invoice_number_sequence",
+        help_text="Tenant this sequence numbers invoices for"
+    )
+    last_number = models.BigIntegerField(default=0, help_text="Last invoice number reserved")
+
+    class Meta:
+        verbose_name = "Invoice Number Sequence"
+        verbose_name_plural = "Invoice Number Sequences"
+
+    def __str__(self):
+        return f"Invoice numbers of {self.tenant_id} (last {self.last_number})"
+
+    @classmethod
+    def reserve(cls, tenant_id, count):
+        """Reserve ``count`` consecutive invoice numbers for the tenant; returns the first."""
+        with transaction.atomic():
+            sequence = cls.objects.select_for_update().filter(tenant_id=tenant_id).first()
+            if sequence is None:
+                highest = (
+                    Invoice.objects.filter(tenant_id=tenant_id, invoice_number__regex=r"^[0-9]{1,18}$")
+                    .aggregate(highest=Max(Cast("invoice_number", BigIntegerField())))["highest"]
+                )
+                # Creating the row takes the lock; a concurrent first reservation waits on the insert
+                sequence, _ = cls.objects.get_or_create(tenant_id=tenant_id, defaults={"last_number": highest or 0})
+                sequence = cls.objects.select_for_update().get(pk=sequence.pk)
+            first = sequence.last_number + 1
+            while True:
+                taken = Invoice.objects.filter(
+                    tenant_id=tenant_id, invoice_number__in=[str(number) for number in range(first, first + count)]
+                ).values_list("invoice_number", flat=True)
+                if not taken:
+                    break
+                first = max(map(int, taken)) + 1
+            sequence.last_number = first + count - 1
+            sequence.save(update_fields=["last_number", "modified_on"])
+        return first
+
 
 class ClaimType(models.TextChoices):
     """Type of claim (Payable or Receivable)."""
@@ -414,6 +478,7 @@ class Claim(TimestampModel):
             models.Index(fields=['tenant', 'claim_type', 'status']),
             models.Index(fields=['tenant', 'claim_number']),
             models.Index(fields=['tenant', '-claim_date']),
+            models.Index(fields=['tenant', '-created_on']),
         ]
     
     def __str__(self):
@@ -522,6 +587,7 @@ class PaymentTransaction(TimestampModel):
             models.Index(fields=['tenant', 'purchase_order']),
             models.Index(fields=['tenant', 'sales_order']),
             models.Index(fields=['tenant', 'invoice']),
+            models.Index(fields=['tenant', '-created_on']),
         ]
     
     def __str__(self):
@@ -0,0 +1,498 @@
+"""
+Payment reconciliation: match the lines of a bank remittance file to open
+invoices and orders, and record the matched payments in one batch.
+
+A remittance file is a CSV with an amount per line and, as the bank gives
+them, a date, free-text references, the payer and the payment method (see
+COLUMNS for the header names recognised). The tenant's open invoices, sales
+orders without an open invoice, and purchase orders are loaded once and
+indexed in dicts: by every number a payer may quote (invoice number, sales
+order number, the customer's PO number), by payer and amount in cents, and
+by payer in amount order for amounts within the tolerance. Each line is
+then matched in a single pass, by the first rule that applies:
+
+- ``exact``: a referenced document whose open balance is the line amount;
+- ``split``: the line pays off all the documents it references together;
+- ``near``: a referenced document within ``tolerance`` of the line amount;
+- ``partial``: the only referenced document, open for more than the line;
+- ``amount``: without a usable reference, the only document of the payer
+  open for the line amount (or within ``tolerance`` of it).
+
+References are normalised before lookup, on both sides: uppercased, cut to
+letters and digits, with a leading INV/PO/SO-style prefix and leading
+zeros dropped, so "inv 00123", "INV-123" and "123" find the same invoice.
+Balances are tracked as lines are matched, so no document is paid twice
+over. Amounts keep their sign: a positive line is money in and only pays
+customer documents (invoices and sales orders), a negative one is money
+out and only pays purchase orders. A chargeback, debit or returned
+payment is therefore never booked as a customer payment.
+
+Matched payments are written with ``bulk_create`` in one transaction, with
+the documents locked while matching. ``bulk_create`` skips
+``PaymentTransaction.save()``, so the run then recomputes the outstanding
+amount and payment status of the paid documents from their payments, as
+``save()`` does one at a time, and writes them with ``bulk_update``.
+"""
+import csv
+import logging
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.core.csv_import import _normalize_header, _open_csv
+from tenant_apps.ai_assistant.retrieval import bulk_written
+from tenant_apps.customers.models import Customer
+from tenant_apps.purchase_orders.models import PurchaseOrder, PurchaseOrderStatus
+from tenant_apps.sales_orders.models import SalesOrder, SalesOrderStatus
+from tenant_apps.suppliers.models import Supplier
+
+from .models import Invoice, InvoiceStatus, PaymentMethod, PaymentStatus, PaymentTransaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOLERANCE = Decimal("1.00")
+MAX_LINES = 20000
+
+# Header names (normalised as by the CSV import) of each remittance column
+COLUMNS = {
+    "amount": ("amount", "payment_amount", "amount_paid", "paid", "credit", "debit", "value"),
+    "date": ("date", "payment_date", "value_date", "posting_date", "posted", "transaction_date"),
+    "reference": (
+        "reference", "references", "ref", "reference_number", "invoice", "invoice_number", "invoices",
+        "description", "memo", "details", "remittance", "remittance_info", "remittance_information",
+    ),
+    "payer": ("payer", "payee", "customer", "supplier", "name", "counterparty", "remitter", "originator"),
+    "method": ("method", "payment_method", "type", "payment_type", "transaction_type"),
+}
+
+_METHODS = {
+    "WIRE": PaymentMethod.WIRE,
+    "FEDWIRE": PaymentMethod.WIRE,
+    "WIRETRANSFER": PaymentMethod.WIRE,
+    "ACH": PaymentMethod.ACH,
+    "EFT": PaymentMethod.ACH,
+    "CCD": PaymentMethod.ACH,
+    "CTX": PaymentMethod.ACH,
+    "CHECK": PaymentMethod.CHECK,
+    "CHEQUE": PaymentMethod.CHECK,
+    "CHK": PaymentMethod.CHECK,
+    "CARD": PaymentMethod.CREDIT_CARD,
+    "CREDITCARD": PaymentMethod.CREDIT_CARD,
+    "CASH": PaymentMethod.CASH,
+}
+
+_REFERENCE_PREFIX = re.compile(r"^(?:INVOICE|INV|PURCHASEORDER|PO|SALESORDER|SO|ORDER|ORD|NO|NUM|NR|REF)+(?=\d)")
+# Hyphen-joined runs of letters and digits, e.g. "INV-00123" or "SO-2026-001"
+_REFERENCE_TOKEN = re.compile(r"[A-Z0-9]+(?:-[A-Z0-9]+)*")
+_CENT = Decimal("0.01")
+
+
+class ReconciliationError(Exception):
+    """The remittance file cannot be read."""
+
+
+def normalize_reference(value):
+    """``value`` as a lookup key: letters and digits, prefix and leading zeros dropped; "" if none."""
+    key = re.sub(r"[^A-Z0-9]+", "", str(value or "").upper())
+    key = _REFERENCE_PREFIX.sub("", key)
+    stripped = key.lstrip("0")
+    return stripped or ("0" if key else "")
+
+
+def reference_keys(text):
+    """The lookup keys of the document numbers ``text`` may quote, in order."""
+    keys = []
+    for token in _REFERENCE_TOKEN.findall(str(text or "").upper()):
+        # "INV-IMP-0865" may quote "IMP-0865" or "0865": try each tail of the token
+        parts = token.split("-")
+        for candidate in ("-".join(parts[start:]) for start in range(len(parts))):
+            if any(char.isdigit() for char in candidate):
+                key = normalize_reference(candidate)
+                if key and key not in keys:
+                    keys.append(key)
+    return keys
+
+
+def normalize_name(value):
+    return re.sub(r"[^A-Z0-9]+", "", str(value or "").upper())
+
+
+def parse_amount(value):
+    """``Decimal`` of "1,234.50", "$1234.5" or "(1,234.50)"; None if not an amount."""
+    text = str(value or "").strip().replace(",", "").replace("$", "").replace(" ", "")
+    negative = text.startswith("(") and text.endswith(")")
+    try:
+        amount = Decimal(text.strip("()"))
+    except InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    return -amount if negative else amount
+
+
+def parse_day(value):
+    """The date of an ISO, US (MM/DD/YYYY or MM/DD/YY) or YYYYMMDD ``value``; None if not a date."""
+    text = str(value or "").strip()
+    try:
+        day = parse_date(text)
+    except ValueError:
+        return None
+    if day is not None:
+        return day
+    for pattern in ("%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%Y%m%d", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(text, pattern).date()
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass
+class RemittanceLine:
+    line: int
+    amount: Decimal
+    payment_date: object
+    reference: str = ""
+    payer: str = ""
+    method: str = PaymentMethod.OTHER
+
+
+@dataclass(eq=False)
+class Document:
+    """An open invoice or order, as matched against."""
+
+    kind: str  # "invoice", "sales_order" or "purchase_order"
+    id: int
+    number: str
+    party: tuple  # ("customer" or "supplier", id)
+    balance: Decimal
+    references: list = field(default_factory=list)
+
+
+def read_remittance(source, payment_date=None, method=PaymentMethod.OTHER):
+    """
+    ``(lines, rejects)`` of the remittance CSV ``source`` (a file object,
+    upload or path). Lines without a date are dated ``payment_date``
+    (default today); rejects are ``{"line", "errors"}``. Raises
+    ``ReconciliationError`` when the header has no amount column.
+    """
+    payment_date = payment_date or timezone.localdate()
+    aliases = {alias: column for column, names in COLUMNS.items() for alias in names}
+    lines, rejects = [], []
+    with _open_csv(source) as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if not header:
+            raise ReconciliationError("The file is empty")
+        positions = defaultdict(list)
+        for index, raw in enumerate(header):
+            column = aliases.get(_normalize_header(raw))
+            if column:
+                positions[column].append(index)
+        if "amount" not in positions:
+            raise ReconciliationError(
+                f"Missing an amount column (one of: {', '.join(COLUMNS['amount'])})"
+            )
+
+        def cells(row, column):
+            return [row[i].strip() for i in positions.get(column, ()) if i < len(row) and row[i].strip()]
+
+        for number, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            if len(lines) + len(rejects) >= MAX_LINES:
+                raise ReconciliationError(f"The file has more than {MAX_LINES:,} lines; split it")
+            errors = []
+            amounts = [parse_amount(cell) for cell in cells(row, "amount")]
+            amount = next((value for value in amounts if value), None)
+            if not amounts:
+                errors.append("No amount")
+            elif None in amounts:
+                errors.append("Amount is not a number")
+            elif amount is None:
+                errors.append("Amount is zero")
+            dates = cells(row, "date")
+            day = parse_day(dates[0]) if dates else payment_date
+            if day is None:
+                errors.append(f"Date '{dates[0]}' is not a date")
+            if errors:
+                rejects.append({"line": number, "errors": errors})
+                continue
+            methods = cells(row, "method")
+            lines.append(RemittanceLine(
+                line=number,
+                amount=amount.quantize(_CENT),
+                payment_date=day,
+                reference=" ".join(cells(row, "reference")),
+                payer=" ".join(cells(row, "payer")),
+                method=_METHODS.get(normalize_name(methods[0]), method) if methods else method,
+            ))
+    return lines, rejects
+
+
+def open_documents(tenant, lock=False):
+    """
+    The tenant's open invoices, sales orders without an open invoice and
+    purchase orders, with what is left to pay on them, as ``Document``\\ s;
+    locked ``FOR UPDATE`` with ``lock``.
+    """
+    invoices = Invoice.objects.filter(sales_order=OuterRef("pk")).exclude(status=InvoiceStatus.CANCELLED)
+    sources = (
+        (
+            "invoice", "customer",
+            Invoice.objects.filter(tenant=tenant).exclude(status=InvoiceStatus.CANCELLED),
+            ("invoice_number", "our_sales_order_num", "delivery_po_num"),
+        ),
+        (
+            "sales_order", "customer",
+            SalesOrder.objects.filter(tenant=tenant).exclude(status=SalesOrderStatus.CANCELLED)
+            .exclude(Exists(invoices)),
+            ("our_sales_order_num", "delivery_po_num"),
+        ),
+        (
+            "purchase_order", "supplier",
+            PurchaseOrder.objects.filter(tenant=tenant).exclude(status=PurchaseOrderStatus.CANCELLED),
+            ("order_number",),
+        ),
+    )
+    documents = []
+    for kind, party, queryset, numbers in sources:
+        queryset = queryset.exclude(payment_status=PaymentStatus.PAID).exclude(outstanding_amount__lte=0)
+        if lock:
+            queryset = queryset.select_for_update(of=("self",))
+        rows = queryset.order_by("id").values_list("id", f"{party}_id", "outstanding_amount", "total_amount", *numbers)
+        for doc_id, party_id, outstanding, total, *references in rows:
+            balance = outstanding if outstanding is not None else total
+            if not balance or balance <= 0:
+                continue
+            documents.append(Document(
+                kind, doc_id, references[0] or "", (party, party_id), balance,
+                [reference for reference in references if reference],
+            ))
+    return documents
+
+
+class Matcher:
+    """Hash indexes of open documents, and the rules matching one line to them."""
+
+    def __init__(self, documents, parties, tolerance=DEFAULT_TOLERANCE):
+        self.tolerance = tolerance
+        self.parties = parties  # normalised payer name -> {party}
+        self.by_reference = defaultdict(list)
+        self.by_amount = defaultdict(list)  # (party, cents) -> documents
+        self.by_party = defaultdict(list)  # party -> [(cents, document id, document)], sorted
+        for document in documents:
+            for reference in document.references:
+                key = normalize_reference(reference)
+                if key and document not in self.by_reference[key]:
+                    self.by_reference[key].append(document)
+            self.by_amount[document.party, _cents(document.balance)].append(document)
+            self.by_party[document.party].append((_cents(document.balance), document.id, document))
+        for entries in self.by_party.values():
+            entries.sort(key=itemgetter(0, 1))
+
+    def pay(self, document, amount):
+        """Take ``amount`` off ``document``'s balance, re-indexing what is left."""
+        document.balance -= amount
+        if document.balance > 0:
+            cents = _cents(document.balance)
+            self.by_amount[document.party, cents].append(document)
+            insort(self.by_party[document.party], (cents, document.id, document), key=itemgetter(0, 1))
+
+    def _by_amount(self, payer, amount, tolerance):
+        """The payer's documents open for ``amount``, give or take ``tolerance``."""
+        if not tolerance:
+            return [
+                document for party in payer for document in self.by_amount.get((party, _cents(amount)), ())
+                if document.balance == amount
+            ]
+        low, high = _cents(amount - tolerance), _cents(amount + tolerance)
+        found = []
+        for party in payer:
+            entries = self.by_party.get(party, [])
+            # Entries of earlier balances are stale; the current balance has its own entry
+            for cents, _, document in entries[bisect_left(entries, low, key=itemgetter(0)):]:
+                if cents > high:
+                    break
+                if _cents(document.balance) == cents:
+                    found.append(document)
+        return found
+
+    def match(self, line):
+        """
+        ``(kind, [(document, amount)], reason)``; ``kind`` is None when
+        unmatched. Allocated amounts are positive for either direction.
+        """
+        # Money in is paid by customers, money out goes to suppliers
+        side = "supplier" if line.amount < 0 else "customer"
+        amount = abs(line.amount)
+        named = self.parties.get(normalize_name(line.payer), set()) if line.payer else set()
+        payer = {party for party in named if party[0] == side}
+        referenced = []
+        for key in reference_keys(line.reference):
+            for document in self.by_reference.get(key, ()):
+                if document.balance > 0 and document not in referenced:
+                    referenced.append(document)
+        on_side = [document for document in referenced if document.party[0] == side]
+        if (referenced and not on_side) or (not referenced and named and not payer):
+            if side == "supplier":
+                return None, [], "Money out (a negative amount) only pays purchase orders"
+            return None, [], "Money in only pays invoices and sales orders"
+        referenced = on_side
+        if payer and any(document.party in payer for document in referenced):
+            referenced = [document for document in referenced if document.party in payer]
+
+        if referenced:
+            exact = [document for document in referenced if document.balance == amount]
+            if exact:
+                return "exact", [(exact[0], amount)], ""
+            if len(referenced) > 1 and sum(document.balance for document in referenced) == amount:
+                return "split", [(document, document.balance) for document in referenced], ""
+            near = min(referenced, key=lambda document: abs(document.balance - amount))
+            if abs(near.balance - amount) <= self.tolerance:
+                return "near", [(near, amount)], ""
+            if len(referenced) == 1 and amount < near.balance:
+                return "partial", [(near, amount)], ""
+            return None, [], "Amount differs from the balance of every referenced document"
+
+        if not payer:
+            if line.payer:
+                return None, [], "No reference or payer matches an open document"
+            return None, [], "No reference matches an open document"
+        for tolerance in (Decimal("0"), self.tolerance):
+            found = self._by_amount(payer, amount, tolerance)
+            if len(found) == 1:
+                return "amount", [(found[0], amount)], ""
+            if found:
+                return None, [], "Several of the payer's open documents match this amount"
+        return None, [], "No open document of the payer for this amount"
+
+
+def _cents(amount):
+    return int(amount.quantize(_CENT) * 100)
+
+
+def _parties(tenant):
+    parties = defaultdict(set)
+    for kind, model in (("customer", Customer), ("supplier", Supplier)):
+        for party_id, name in model.objects.filter(tenant=tenant).values_list("id", "name"):
+            key = normalize_name(name)
+            if key:
+                parties[key].add((kind, party_id))
+    return parties
+
+
+def reconcile(
+    tenant,
+    source,
+    tolerance=DEFAULT_TOLERANCE,
+    payment_date=None,
+    method=PaymentMethod.OTHER,
+    user=None,
+    dry_run=False,
+):
+    """
+    Match the remittance CSV ``source`` to the tenant's open documents and,
+    unless ``dry_run``, record a payment per matched document. Returns
+    ``{"total", "matched", "unmatched", "rejected", "posted",
+    "matched_amount", "unmatched_amount", "matches", "unmatched_lines",
+    "rejects"}``; line amounts keep their sign, the two totals add up
+    money in and out alike. Raises ``ReconciliationError`` for an
+    unreadable file.
+    """
+    lines, rejects = read_remittance(source, payment_date=payment_date, method=method)
+    matches, unmatched, payments = [], [], []
+    with transaction.atomic():
+        matcher = Matcher(open_documents(tenant, lock=not dry_run), _parties(tenant), tolerance)
+        for line in lines:
+            kind, allocations, reason = matcher.match(line)
+            if kind is None:
+                unmatched.append({
+                    "line": line.line,
+                    "amount": line.amount,
+                    "reference": line.reference,
+                    "payer": line.payer,
+                    "reason": reason,
+                })
+                continue
+            for document, amount in allocations:
+                matcher.pay(document, amount)
+                payments.append(PaymentTransaction(
+                    tenant=tenant,
+                    **{f"{document.kind}_id": document.id},
+                    amount=amount,
+                    payment_date=line.payment_date,
+                    payment_method=line.method,
+                    reference_number=line.reference[:100],
+                    notes=f"Reconciled from remittance line {line.line} ({kind} match)",
+                    created_by=user,
+                ))
+            matches.append({
+                "line": line.line,
+                "kind": kind,
+                "amount": line.amount,
+                "allocations": [
+                    {"type": document.kind, "id": document.id, "number": document.number, "amount": amount}
+                    for document, amount in allocations
+                ],
+            })
+
+        if payments and not dry_run:
+            PaymentTransaction.objects.bulk_create(payments, batch_size=1000)
+            _update_payment_status(payments)
+            logger.info(
+                "Reconciled %d of %d remittance lines of tenant %s into %d payments",
+                len(matches), len(lines), tenant.slug, len(payments),
+            )
+
+    return {
+        "total": len(lines) + len(rejects),
+        "matched": len(matches),
+        "unmatched": len(unmatched),
+        "rejected": len(rejects),
+        "posted": 0 if dry_run else len(payments),
+        "matched_amount": sum((abs(match["amount"]) for match in matches), Decimal("0.00")),
+        "unmatched_amount": sum((abs(line["amount"]) for line in unmatched), Decimal("0.00")),
+        "matches": matches,
+        "unmatched_lines": unmatched,
+        "rejects": rejects,
+    }
+
+
+def _update_payment_status(payments):
+    """Recompute outstanding amount and payment status of the documents ``payments`` paid."""
+    for model, kind in ((Invoice, "invoice"), (SalesOrder, "sales_order"), (PurchaseOrder, "purchase_order")):
+        ids = {getattr(payment, f"{kind}_id") for payment in payments} - {None}
+        if not ids:
+            continue
+        documents = list(
+            model.objects.filter(id__in=ids)
+            .annotate(total_paid=Sum("payments__amount"))
+            .order_by("id")
+        )
+        fields = ["outstanding_amount", "payment_status"]
+        for document in documents:
+            paid = document.total_paid or Decimal("0.00")
+            document.outstanding_amount = (document.total_amount or Decimal("0.00")) - paid
+            if document.outstanding_amount <= 0:
+                document.payment_status = PaymentStatus.PAID
+                if model is Invoice:
+                    document.status = InvoiceStatus.PAID
+            elif paid > 0:
+                document.payment_status = PaymentStatus.PARTIAL
+            else:
+                document.payment_status = PaymentStatus.UNPAID
+        if model is Invoice:
+            fields.append("status")
+        model.objects.bulk_update(documents, fields, batch_size=1000)
+        if documents:
+            bulk_written(documents[0].tenant_id, model, fields)
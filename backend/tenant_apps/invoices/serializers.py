@@ -2,10 +2,13 @@
 Serializers for Invoices app.
 """
 from rest_framework import serializers
-from .models import Invoice, Claim, PaymentTransaction
+from apps.core.serializers import FieldSelectionMixin
+from .billing import DEFAULT_DUE_DAYS, MAX_ORDERS
+from .models import Invoice, Claim, PaymentMethod, PaymentTransaction
+from .reconciliation import DEFAULT_TOLERANCE
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for Invoice model."""
     
     customer_name = serializers.CharField(source="customer.name", read_only=True)
@@ -51,9 +54,35 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "modified_on",
         ]
         read_only_fields = ["id", "date_time_stamp", "created_on", "modified_on"]
+        # Left blank, the number comes from the tenant's InvoiceNumberSequence
+        extra_kwargs = {"invoice_number": {"required": False, "allow_blank": True, "default": ""}}
+        # Opt-in nested data (?expand=customer,sales_order,product)
+        expandable_fields = {
+            "customer": ("tenant_apps.customers.serializers.CustomerSerializer", {}),
+            "sales_order": ("tenant_apps.sales_orders.serializers.SalesOrderSerializer", {}),
+            "product": ("tenant_apps.products.serializers.ProductSerializer", {}),
+        }
 
 
-class ClaimSerializer(serializers.ModelSerializer):
+class InvoiceGenerationSerializer(serializers.Serializer):
+    """Options of a batch invoicing run (billing.generate_invoices)."""
+
+    delivered_through = serializers.DateField(
+        required=False, help_text="Only invoice orders delivered on or before this date"
+    )
+    customers = serializers.ListField(
+        child=serializers.IntegerField(), required=False, help_text="Only invoice these customers' orders"
+    )
+    due_days = serializers.IntegerField(
+        min_value=0, max_value=365, default=DEFAULT_DUE_DAYS, help_text="Days from delivery to the due date"
+    )
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_ORDERS, default=MAX_ORDERS, help_text="Most orders to invoice in this run"
+    )
+    dry_run = serializers.BooleanField(default=False, help_text="Report what would be invoiced without writing")
+
+
+class ClaimSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for Claim model."""
     
     created_by_name = serializers.SerializerMethodField()
@@ -87,6 +116,14 @@ class ClaimSerializer(serializers.ModelSerializer):
             "modified_on",
         ]
         read_only_fields = ["id", "created_on", "modified_on", "assigned_to_name", "created_by_name"]
+        # Opt-in nested data (?expand=supplier,customer,purchase_order,sales_order,invoice)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+            "customer": ("tenant_apps.customers.serializers.CustomerSerializer", {}),
+            "purchase_order": ("tenant_apps.purchase_orders.serializers.PurchaseOrderSerializer", {}),
+            "sales_order": ("tenant_apps.sales_orders.serializers.SalesOrderSerializer", {}),
+            "invoice": ("tenant_apps.invoices.serializers.InvoiceSerializer", {}),
+        }
     
     def get_created_by_name(self, obj):
         """Get the name of the user who created this claim."""
@@ -101,7 +138,7 @@ class ClaimSerializer(serializers.ModelSerializer):
         return None
 
 
-class PaymentTransactionSerializer(serializers.ModelSerializer):
+class PaymentTransactionSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for PaymentTransaction model."""
     
     created_by_name = serializers.SerializerMethodField()
@@ -113,10 +150,16 @@ class PaymentTransactionSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'tenant', 'purchase_order', 'sales_order', 'invoice',
             'amount', 'payment_date', 'payment_method', 'reference_number',
-            'notes', 'created_by', 'created_by_name', 'created_on', 'updated_on',
+            'notes', 'created_by', 'created_by_name', 'created_on', 'modified_on',
             'entity_type', 'entity_reference'
         ]
-        read_only_fields = ['id', 'tenant', 'created_on', 'updated_on', 'created_by_name', 'entity_type', 'entity_reference']
+        read_only_fields = ['id', 'tenant', 'created_on', 'modified_on', 'created_by_name', 'entity_type', 'entity_reference']
+        # Opt-in nested data (?expand=purchase_order,sales_order,invoice)
+        expandable_fields = {
+            "purchase_order": ("tenant_apps.purchase_orders.serializers.PurchaseOrderSerializer", {}),
+            "sales_order": ("tenant_apps.sales_orders.serializers.SalesOrderSerializer", {}),
+            "invoice": ("tenant_apps.invoices.serializers.InvoiceSerializer", {}),
+        }
     
     def get_created_by_name(self, obj):
         """Get the name of the user who created the payment."""
@@ -143,3 +186,21 @@ class PaymentTransactionSerializer(serializers.ModelSerializer):
         elif obj.invoice:
             return obj.invoice.invoice_number
         return None
+
+
+class PaymentReconciliationSerializer(serializers.Serializer):
+    """Upload and options of a remittance reconciliation run (reconciliation.reconcile)."""
+
+    file = serializers.FileField(help_text="Remittance CSV: amount and optional date, reference, payer and method")
+    tolerance = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        min_value=0,
+        default=DEFAULT_TOLERANCE,
+        help_text="Largest difference between a line and a balance still matched",
+    )
+    payment_date = serializers.DateField(required=False, help_text="Date of lines without one (default today)")
+    payment_method = serializers.ChoiceField(
+        choices=PaymentMethod.choices, default=PaymentMethod.OTHER, help_text="Method of lines without one"
+    )
+    dry_run = serializers.BooleanField(default=False, help_text="Report the matches without recording payments")
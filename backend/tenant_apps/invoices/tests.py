@@ -1,12 +1,27 @@
 """
 Tests for Invoices app models.
 """
+import tempfile
 import uuid
+from datetime import date
+from io import StringIO
 from unittest import skip
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import TestCase
 from decimal import Decimal
-from tenant_apps.invoices.models import Invoice, InvoiceStatus
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.analytics.models import ProductPriceWeek
+from tenant_apps.invoices.models import Invoice, InvoiceStatus, PaymentTransaction
+from tenant_apps.purchase_orders.models import PurchaseOrder
 from tenant_apps.customers.models import Customer
+from tenant_apps.products.models import Product
+from tenant_apps.sales_orders.models import SalesOrder, SalesOrderStatus
+from tenant_apps.suppliers.models import Supplier
 
 
 @skip("Requires tenant-scoped objects - needs schema-based test setup")
@@ -47,3 +62,241 @@ class InvoiceModelTest(TestCase):
         
         self.assertEqual(str(invoice), f"INV-INV-{unique_id}")
 
+
+
+class InvoiceGenerationTest(APITestCase):
+    """Delivered sales orders are invoiced in one numbered batch."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Billing Co {unique_id}",
+            slug=f"billing-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@billing.com",
+        )
+        self.user = User.objects.create_user(username=f"billing-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name="Prairie Beef")
+        self.diner = Customer.objects.create(
+            tenant=self.tenant, name="Diner", contact_person="Pat", accounting_payment_terms="ACH"
+        )
+        self.grill = Customer.objects.create(tenant=self.tenant, name="Grill")
+        self.product = Product.objects.create(
+            tenant=self.tenant, product_code="RIB-1", description_of_product_item="Ribeye", type_of_protein="Beef"
+        )
+
+    def order(self, customer, delivery_date, total="1000.00", order_status=SalesOrderStatus.DELIVERED):
+        return SalesOrder.objects.create(
+            tenant=self.tenant,
+            our_sales_order_num=uuid.uuid4().hex[:10],
+            supplier=self.supplier,
+            customer=customer,
+            product=self.product,
+            pick_up_date=delivery_date,
+            delivery_date=delivery_date,
+            total_weight=Decimal("500"),
+            total_amount=None if total is None else Decimal(total),
+            status=order_status,
+        )
+
+    def test_generate_invoices(self):
+        Invoice.objects.create(tenant=self.tenant, invoice_number="1041", customer=self.grill)
+        first = self.order(self.diner, date(2026, 9, 2))
+        second = self.order(self.grill, date(2026, 9, 20), total="2500.00")
+        late = self.order(self.diner, date(2026, 10, 5))
+        self.order(self.diner, date(2026, 9, 3), order_status=SalesOrderStatus.IN_TRANSIT)
+        unpriced = self.order(self.grill, date(2026, 9, 4), total=None)
+        invoiced = self.order(self.grill, date(2026, 9, 5))
+        Invoice.objects.create(tenant=self.tenant, invoice_number="A-1", customer=self.grill, sales_order=invoiced)
+
+        url = "/api/v1/invoices/generate/"
+        dry_run = self.client.post(url, {"delivered_through": "2026-09-30", "dry_run": True}, format="json")
+        self.assertEqual(dry_run.status_code, status.HTTP_200_OK)
+        self.assertEqual(dry_run.data["count"], 2)
+        self.assertIsNone(dry_run.data["first_number"])
+        self.assertEqual(Invoice.objects.filter(tenant=self.tenant).count(), 2)
+
+        response = self.client.post(url, {"delivered_through": "2026-09-30"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["first_number"], response.data["last_number"]), ("1042", "1043"))
+        self.assertEqual(response.data["total_amount"], Decimal("3500.00"))
+        self.assertEqual(response.data["skipped"], [{"sales_order": unpriced.id, "reason": "Sales order has no total amount"}])
+
+        invoice = Invoice.objects.get(sales_order=first)
+        self.assertEqual(invoice.invoice_number, "1042")
+        self.assertEqual((invoice.customer, invoice.product, invoice.type_of_protein), (self.diner, self.product, "Beef"))
+        self.assertEqual((invoice.payment_terms, invoice.accounting_payable_contact_name), ("ACH", "Pat"))
+        self.assertEqual(invoice.our_sales_order_num, first.our_sales_order_num)
+        self.assertEqual(invoice.unit_price, Decimal("2.00"))
+        self.assertEqual(invoice.due_date, date(2026, 10, 2))
+        self.assertEqual(Invoice.objects.get(sales_order=second).invoice_number, "1043")
+        # The invoices took over their orders' price facts, as a rebuild would have them
+        def facts():
+            return sorted(ProductPriceWeek.objects.filter(tenant=self.tenant).values_list(
+                "week", "side", "customer", "order_count", "amount"
+            ))
+
+        incremental = facts()
+        ProductPriceWeek.rebuild(self.tenant)
+        self.assertEqual(facts(), incremental)
+
+        # Nothing is invoiced twice; single creates continue the sequence
+        again = self.client.post(url, {"delivered_through": "2026-09-30"}, format="json")
+        self.assertEqual((again.status_code, again.data["count"]), (status.HTTP_200_OK, 0))
+        single = self.client.post(
+            "/api/v1/invoices/", {"tenant": str(self.tenant.id), "customer": self.grill.id}, format="json"
+        )
+        self.assertEqual(single.data["invoice_number"], "1044")
+
+        output = StringIO()
+        call_command("generate_invoices", tenant=self.tenant.slug, customers=[self.diner.id], stdout=output)
+        self.assertIn("as invoices 1045 to 1045", output.getvalue())
+        self.assertEqual(Invoice.objects.get(sales_order=late).invoice_number, "1045")
+
+        self.assertEqual(self.client.post(url, {"due_days": -1}, format="json").status_code, 400)
+
+    def test_numbers_skip_hand_numbered_invoices(self):
+        self.assertEqual(Invoice.objects.create(tenant=self.tenant, customer=self.grill).invoice_number, "1")
+        Invoice.objects.create(tenant=self.tenant, invoice_number="2", customer=self.grill)
+        Invoice.objects.create(tenant=self.tenant, invoice_number="4", customer=self.grill)
+        self.order(self.diner, date(2026, 9, 2))
+        self.order(self.grill, date(2026, 9, 3))
+
+        response = self.client.post("/api/v1/invoices/generate/", {"delivered_through": "2026-09-30"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["first_number"], response.data["last_number"]), ("5", "6"))
+        self.assertEqual(Invoice.objects.create(tenant=self.tenant, customer=self.grill).invoice_number, "7")
+
+
+class PaymentReconciliationTest(APITestCase):
+    """Remittance lines are matched to open documents and paid in one batch."""
+
+    REMITTANCE = (
+        "Date,Amount,Reference,Payer,Type\n"
+        "10/01/2026,\"1,000.00\",Payment INV-001001,Diner,ACH\n"
+        "10/01/2026,1200.00,Inv 1002/1003,Diner,ACH\n"
+        "2026-10-02,799.50,1004,Grill,Wire\n"
+        "2026-10-02,500.00,Invoice 1005,Grill,Check\n"
+        "2026-10-02,300.00,,Grill,\n"
+        "2026-10-03,(450.00),PO 9,Prairie Beef,Wire\n"
+        "2026-10-03,10.00,9999,Nobody,\n"
+        "2026-10-03,abc,1001,Diner,\n"
+    )
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Remit Co {unique_id}",
+            slug=f"remit-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@remit.com",
+        )
+        self.user = User.objects.create_user(username=f"remit-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name="Prairie Beef")
+        self.diner = Customer.objects.create(tenant=self.tenant, name="Diner")
+        self.grill = Customer.objects.create(tenant=self.tenant, name="Grill")
+        self.invoices = {
+            number: Invoice.objects.create(
+                tenant=self.tenant,
+                invoice_number=number,
+                customer=customer,
+                total_amount=Decimal(total),
+                outstanding_amount=Decimal(total),
+            )
+            for number, customer, total in (
+                ("1001", self.diner, "1000.00"),
+                ("1002", self.diner, "500.00"),
+                ("1003", self.diner, "700.00"),
+                ("1004", self.grill, "800.00"),
+                ("1005", self.grill, "2000.00"),
+            )
+        }
+        self.order = SalesOrder.objects.create(
+            tenant=self.tenant,
+            our_sales_order_num="SO-77",
+            supplier=self.supplier,
+            customer=self.grill,
+            total_amount=Decimal("300.00"),
+        )
+        self.purchase = PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number="9",
+            supplier=self.supplier,
+            order_date=date(2026, 9, 20),
+            total_amount=Decimal("450.00"),
+        )
+
+    def upload(self, content=None, **options):
+        content = self.REMITTANCE if content is None else content
+        remittance = SimpleUploadedFile("remittance.csv", content.encode(), content_type="text/csv")
+        return self.client.post("/api/v1/payments/reconcile/", {"file": remittance, **options}, format="multipart")
+
+    def test_reconcile_remittance(self):
+        dry_run = self.upload(dry_run=True)
+        self.assertEqual(dry_run.status_code, status.HTTP_200_OK)
+        self.assertEqual((dry_run.data["matched"], dry_run.data["posted"]), (6, 0))
+        self.assertFalse(PaymentTransaction.objects.filter(tenant=self.tenant).exists())
+
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        kinds = {match["line"]: match["kind"] for match in response.data["matches"]}
+        self.assertEqual(kinds, {2: "exact", 3: "split", 4: "near", 5: "partial", 6: "amount", 7: "exact"})
+        self.assertEqual(response.data["posted"], 7)
+        self.assertEqual(response.data["matched_amount"], Decimal("4249.50"))
+        self.assertEqual([line["line"] for line in response.data["unmatched_lines"]], [8])
+        self.assertEqual(response.data["rejects"], [{"line": 9, "errors": ["Amount is not a number"]}])
+
+        paid = Invoice.objects.get(pk=self.invoices["1001"].pk)
+        self.assertEqual((paid.payment_status, paid.status, paid.outstanding_amount), ("paid", "paid", Decimal("0.00")))
+        self.assertEqual(paid.payments.get().payment_method, "ach")
+        self.assertEqual(Invoice.objects.get(pk=self.invoices["1003"].pk).payment_status, "paid")
+        short = Invoice.objects.get(pk=self.invoices["1004"].pk)
+        self.assertEqual((short.payment_status, short.outstanding_amount), ("partial", Decimal("0.50")))
+        partial = Invoice.objects.get(pk=self.invoices["1005"].pk)
+        self.assertEqual((partial.payment_status, partial.outstanding_amount), ("partial", Decimal("1500.00")))
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.payment_status, self.order.payments.get().payment_date), ("paid", date(2026, 10, 2)))
+        self.purchase.refresh_from_db()
+        self.assertEqual((self.purchase.payment_status, self.purchase.outstanding_amount), ("paid", Decimal("0.00")))
+
+        # Paid documents are not matched again
+        again = self.upload(dry_run=True)
+        self.assertEqual([match["line"] for match in again.data["matches"]], [5])
+
+        output = StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as remittance:
+            remittance.write("amount,memo\n1500.00,INV 1005\n")
+            remittance.flush()
+            call_command("reconcile_payments", remittance.name, tenant=self.tenant.slug, stdout=output)
+        self.assertIn("Matched 1 of 1 lines for $1,500.00", output.getvalue())
+        self.assertEqual(Invoice.objects.get(pk=self.invoices["1005"].pk).payment_status, "paid")
+
+    def test_negative_lines_only_pay_purchase_orders(self):
+        response = self.upload(
+            "Date,Amount,Reference,Payer\n"
+            "2026-10-03,-1000.00,Chargeback INV 1001,Diner\n"
+            "2026-10-03,-800.00,,Grill\n"
+            "2026-10-03,450.00,PO 9,Prairie Beef\n"
+            "2026-10-03,-450.00,PO 9,Prairie Beef\n"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(match["line"], match["amount"]) for match in response.data["matches"]], [(5, Decimal("-450.00"))]
+        )
+        reasons = {line["line"]: line["reason"] for line in response.data["unmatched_lines"]}
+        self.assertEqual(reasons, {
+            2: "Money out (a negative amount) only pays purchase orders",
+            3: "Money out (a negative amount) only pays purchase orders",
+            4: "Money in only pays invoices and sales orders",
+        })
+        self.assertEqual(response.data["unmatched_amount"], Decimal("2250.00"))
+        self.assertFalse(PaymentTransaction.objects.filter(invoice__isnull=False).exists())
+        self.assertEqual(self.purchase.payments.get().amount, Decimal("450.00"))
@@ -3,14 +3,32 @@ Invoices and Claims views for ProjectMeats.
 
 Provides REST API endpoints for invoice and claim management with strict multi-tenant isolation.
 """
-from rest_framework import viewsets
+from rest_framework import status as http_status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from tenant_apps.invoices.billing import generate_invoices
 from tenant_apps.invoices.models import Invoice, Claim, PaymentTransaction
-from tenant_apps.invoices.serializers import InvoiceSerializer, ClaimSerializer, PaymentTransactionSerializer
+from tenant_apps.invoices.reconciliation import ReconciliationError, reconcile
+from tenant_apps.invoices.serializers import (
+    ClaimSerializer,
+    InvoiceGenerationSerializer,
+    InvoiceSerializer,
+    PaymentReconciliationSerializer,
+    PaymentTransactionSerializer,
+)
 
 
 class InvoiceViewSet(viewsets.ModelViewSet):
-    """ViewSet for managing invoices with strict tenant isolation."""
+    """
+    ViewSet for managing invoices with strict tenant isolation.
+
+    POST /api/v1/invoices/generate/ invoices the delivered sales orders
+    that have no invoice yet in one batch (billing.py), with optional
+    ``delivered_through``, ``customers``, ``due_days``, ``limit`` and
+    ``dry_run``.
+    """
     
     queryset = Invoice.objects.all()
     serializer_class = InvoiceSerializer
@@ -34,6 +52,32 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         """Auto-assign tenant on invoice creation."""
         serializer.save(tenant=self.request.tenant)
 
+    @action(detail=False, methods=['post'], url_path='generate')
+    def generate_invoices(self, request):
+        """Invoice delivered, uninvoiced sales orders in one batch."""
+        options = InvoiceGenerationSerializer(data=request.data)
+        if not options.is_valid():
+            return Response(
+                {'error': 'Invalid invoicing options', 'details': options.errors},
+                status=http_status.HTTP_400_BAD_REQUEST,
+            )
+        if not getattr(request, 'tenant', None):
+            return Response(
+                {'error': 'No tenant', 'details': 'Pass X-Tenant-ID'},
+                status=http_status.HTTP_400_BAD_REQUEST,
+            )
+        data = options.validated_data
+        result = generate_invoices(
+            request.tenant,
+            delivered_through=data.get('delivered_through'),
+            customer_ids=data.get('customers'),
+            due_days=data['due_days'],
+            limit=data['limit'],
+            dry_run=data['dry_run'],
+        )
+        code = http_status.HTTP_200_OK if data['dry_run'] or not result['count'] else http_status.HTTP_201_CREATED
+        return Response(result, status=code)
+
 
 class ClaimViewSet(viewsets.ModelViewSet):
     """ViewSet for managing claims with strict tenant isolation."""
@@ -76,6 +120,11 @@ class PaymentTransactionViewSet(viewsets.ModelViewSet):
     
     Handles creating payment transactions and automatically updating
     the related order/invoice payment status.
+
+    POST /api/v1/payments/reconcile/ matches a remittance CSV (multipart
+    ``file``) to open invoices and orders and records the matched payments
+    in one batch (reconciliation.py), with optional ``tolerance``,
+    ``payment_date``, ``payment_method`` and ``dry_run``.
     """
     queryset = PaymentTransaction.objects.all()
     serializer_class = PaymentTransactionSerializer
@@ -83,7 +132,9 @@ class PaymentTransactionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter payments by tenant."""
-        return super().get_queryset().filter(tenant=self.request.tenant)
+        return super().get_queryset().filter(tenant=self.request.tenant).select_related(
+            'created_by', 'purchase_order', 'sales_order', 'invoice'
+        )
     
     def perform_create(self, serializer):
         """Set tenant and created_by when creating payment."""
@@ -91,3 +142,36 @@ class PaymentTransactionViewSet(viewsets.ModelViewSet):
             tenant=self.request.tenant,
             created_by=self.request.user
         )
+
+    @action(detail=False, methods=['post'], url_path='reconcile', parser_classes=[MultiPartParser])
+    def reconcile(self, request):
+        """Match a remittance file to open documents and record the payments."""
+        options = PaymentReconciliationSerializer(data=request.data)
+        if not options.is_valid():
+            return Response(
+                {'error': 'Invalid reconciliation options', 'details': options.errors},
+                status=http_status.HTTP_400_BAD_REQUEST,
+            )
+        if not getattr(request, 'tenant', None):
+            return Response(
+                {'error': 'No tenant', 'details': 'Pass X-Tenant-ID'},
+                status=http_status.HTTP_400_BAD_REQUEST,
+            )
+        data = options.validated_data
+        try:
+            result = reconcile(
+                request.tenant,
+                data['file'],
+                tolerance=data['tolerance'],
+                payment_date=data.get('payment_date'),
+                method=data['payment_method'],
+                user=request.user,
+                dry_run=data['dry_run'],
+            )
+        except (ReconciliationError, UnicodeDecodeError) as e:
+            return Response(
+                {'error': 'Reconciliation failed', 'details': str(e)},
+                status=http_status.HTTP_400_BAD_REQUEST,
+            )
+        code = http_status.HTTP_201_CREATED if result['posted'] else http_status.HTTP_200_OK
+        return Response(result, status=code)
@@ -0,0 +1,254 @@
+"""
+Coordinates and distances for locations, without a network service.
+
+``Location.save`` fills latitude and longitude from the centroid of the
+location's ZIP code, read from LOCATION_ZIP_CENTROIDS: a gzipped
+``zip,latitude,longitude`` CSV built from the US Census ZCTA Gazetteer file
+(public domain) by ``manage.py import_zip_centroids``. The dataset is not
+in the repository; each deployment imports it (see data/README.md), and
+until then locations are saved without coordinates.
+
+The great-circle distances between all of a tenant's geocoded locations are
+precomputed into a matrix, stored per tenant in LOCATION_DISTANCE_DIR:
+
+    <tenant_id>.dist   a JSON header (format, byte order, the state it was
+                       built from) followed by the location ids (int64),
+                       latitudes and longitudes (float64) and the N x N
+                       distances in miles (float32, row-major)
+
+The state is the tenant's count of geocoded locations and a digest of their
+ids and coordinates, so edits to other location fields leave the matrix
+alone; a matrix whose state is out of date is rebuilt on its next use.
+Each process keeps the matrices it has read in memory, so a lane distance
+is a single array lookup and "nearest to X" a scan of one row.
+"""
+import csv
+import gzip
+import heapq
+import io
+import json
+import logging
+import math
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import Count, TextField, Value
+from django.db.models.functions import Cast, Concat, MD5
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_MILES = 3958.8
+
+FORMAT_VERSION = 1
+_HEADER_SIZE = struct.Struct("<I")
+
+
+def normalize_zip(value):
+    """The 5-digit ZIP code in ``value`` ("68102-1234" -> "68102"), or ""."""
+    digits = "".join(char for char in (value or "")[:10] if char.isdigit())
+    return digits[:5] if len(digits) >= 5 else ""
+
+
+@lru_cache(maxsize=2)
+def _load_centroids(path):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            return {row["zip"]: (float(row["latitude"]), float(row["longitude"])) for row in csv.DictReader(f)}
+    except FileNotFoundError:
+        logger.warning(f"ZIP centroid dataset {path} not found; locations will not be geocoded")
+        return {}
+
+
+def zip_centroids():
+    """``{zip: (latitude, longitude)}`` from LOCATION_ZIP_CENTROIDS, read once per process."""
+    return _load_centroids(str(settings.LOCATION_ZIP_CENTROIDS))
+
+
+def zip_centroid(zip_code):
+    """``(latitude, longitude)`` of a ZIP code's centroid, None when unknown."""
+    return zip_centroids().get(normalize_zip(zip_code))
+
+
+def write_centroids(rows, path):
+    """Write ``(zip, latitude, longitude)`` rows as the gzipped centroid CSV at ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(["zip", "latitude", "longitude"])
+    writer.writerows(sorted(rows))
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "wb") as f:
+        f.write(gzip.compress(text.getvalue().encode(), mtime=0))
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    _load_centroids.cache_clear()
+
+
+class DistanceMatrix:
+    """Great-circle miles between every pair of a tenant's geocoded locations."""
+
+    def __init__(self, ids, latitudes, longitudes, distances=None, state=None):
+        self.ids = array("q", ids)
+        self.latitudes = array("d", latitudes)
+        self.longitudes = array("d", longitudes)
+        self.state = state
+        self.slots = {location_id: slot for slot, location_id in enumerate(self.ids)}
+        # Radians and cosines of every location, shared by all distance scans
+        self._phis = [math.radians(value) for value in self.latitudes]
+        self._lambdas = [math.radians(value) for value in self.longitudes]
+        self._cos_phis = [math.cos(phi) for phi in self._phis]
+        if distances is None:
+            distances = array("f")
+            for latitude, longitude in zip(self.latitudes, self.longitudes):
+                distances.extend(self.distances_from(latitude, longitude))
+        self.distances = distances
+
+    def __len__(self):
+        return len(self.ids)
+
+    def distances_from(self, latitude, longitude):
+        """Haversine miles from a point to every location, in ``ids`` order."""
+        phi, lam = math.radians(latitude), math.radians(longitude)
+        cos_phi = math.cos(phi)
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+        return [
+            2 * EARTH_RADIUS_MILES * asin(min(1.0, sqrt(
+                sin((other_phi - phi) / 2) ** 2 + cos_phi * cos_other * sin((other_lambda - lam) / 2) ** 2
+            )))
+            for other_phi, other_lambda, cos_other in zip(self._phis, self._lambdas, self._cos_phis)
+        ]
+
+    def row(self, location_id):
+        """Miles from ``location_id`` to every location, None if it is not geocoded."""
+        slot = self.slots.get(location_id)
+        if slot is None:
+            return None
+        n = len(self.ids)
+        return self.distances[slot * n:(slot + 1) * n]
+
+    def distance(self, from_id, to_id):
+        """Miles between two locations, None if either is not geocoded."""
+        row, slot = self.row(from_id), self.slots.get(to_id)
+        if row is None or slot is None:
+            return None
+        return row[slot]
+
+    def nearest(self, distances, limit, candidates=None, exclude=None):
+        """``[(location_id, miles), ...]`` of the ``limit`` closest by ``distances``."""
+        pairs = (
+            (location_id, miles)
+            for location_id, miles in zip(self.ids, distances)
+            if (candidates is None or location_id in candidates) and location_id != exclude
+        )
+        return heapq.nsmallest(limit, pairs, key=itemgetter(1))
+
+    def dump(self):
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "state": self.state,
+            "count": len(self.ids),
+        }).encode()
+        return b"".join([
+            _HEADER_SIZE.pack(len(header)), header,
+            self.ids.tobytes(), self.latitudes.tobytes(), self.longitudes.tobytes(), self.distances.tobytes(),
+        ])
+
+    @classmethod
+    def load(cls, data):
+        """Read a matrix written by ``dump``."""
+        (size,) = _HEADER_SIZE.unpack_from(data)
+        offset = _HEADER_SIZE.size + size
+        header = json.loads(data[_HEADER_SIZE.size:offset])
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported distance matrix version {header['version']}")
+
+        def read(typecode, count):
+            nonlocal offset
+            values = array(typecode)
+            end = offset + values.itemsize * count
+            values.frombytes(data[offset:end])
+            if header["byteorder"] != sys.byteorder:
+                values.byteswap()
+            offset = end
+            return values
+
+        count = header["count"]
+        ids, latitudes, longitudes = read("q", count), read("d", count), read("d", count)
+        return cls(ids, latitudes, longitudes, read("f", count * count), header["state"])
+
+
+class MatrixStore:
+    """The tenant distance matrices of this process, rebuilt when out of date."""
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._loaded = {}
+
+    @property
+    def directory(self):
+        return Path(self._directory or settings.LOCATION_DISTANCE_DIR)
+
+    def path(self, tenant_id):
+        return self.directory / f"{tenant_id}.dist"
+
+    def _geocoded(self, tenant):
+        Location = apps.get_model("locations", "Location")
+        return Location.objects.filter(tenant=tenant, latitude__isnull=False, longitude__isnull=False)
+
+    def state(self, tenant):
+        """What the tenant's matrix must have been built from to be current."""
+        points = Concat(
+            Cast("id", TextField()), Value(":"), Cast("latitude", TextField()), Value(","),
+            Cast("longitude", TextField()), output_field=TextField(),
+        )
+        totals = self._geocoded(tenant).aggregate(
+            count=Count("id"), digest=MD5(StringAgg(points, delimiter=";", order_by="id"))
+        )
+        return f"{totals['count']}:{totals['digest']}"
+
+    def build(self, tenant, state=None):
+        """Compute and write the tenant's matrix from the database."""
+        state = state or self.state(tenant)
+        rows = list(self._geocoded(tenant).order_by("id").values_list("id", "latitude", "longitude"))
+        matrix = DistanceMatrix(
+            [row[0] for row in rows], [float(row[1]) for row in rows], [float(row[2]) for row in rows], state=state
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{tenant.id}.")
+        with os.fdopen(fd, "wb") as f:
+            f.write(matrix.dump())
+        os.replace(tmp, self.path(tenant.id))
+        logger.info(f"Built distance matrix for tenant {tenant.id}: {len(matrix)} locations")
+        return matrix
+
+    def matrix(self, tenant):
+        """The tenant's current distance matrix."""
+        state = self.state(tenant)
+        tenant_id = str(tenant.id)
+        with self._lock:
+            matrix = self._loaded.get(tenant_id)
+            if matrix is None or matrix.state != state:
+                try:
+                    matrix = DistanceMatrix.load(self.path(tenant_id).read_bytes())
+                except (FileNotFoundError, ValueError):
+                    matrix = None
+                if matrix is None or matrix.state != state:
+                    matrix = self.build(tenant, state)
+                self._loaded[tenant_id] = matrix
+            return matrix
+
+
+matrix_store = MatrixStore()
@@ -0,0 +1,51 @@
+"""
+Management command to fill location coordinates from the ZIP centroids.
+
+Usage:
+    python manage.py geocode_locations
+    python manage.py geocode_locations --tenant acme-meats
+
+Sets the latitude and longitude of every location without coordinates whose
+ZIP code is in the centroid dataset (see ``import_zip_centroids``). Saved
+locations are geocoded automatically; this is for existing rows and bulk
+imports. Coordinates entered by hand are left alone.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.tenants.models import Tenant
+from tenant_apps.locations.geo import zip_centroids
+from tenant_apps.locations.models import Location
+
+
+class Command(BaseCommand):
+    help = 'Fill missing location coordinates from the ZIP centroid dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            type=str,
+            help='Slug of the only tenant to geocode',
+        )
+
+    def handle(self, *args, **options):
+        if not zip_centroids():
+            raise CommandError('The ZIP centroid dataset is missing; run import_zip_centroids first')
+
+        locations = Location.objects.filter(latitude__isnull=True)
+        if options['tenant']:
+            tenant = Tenant.objects.filter(slug=options['tenant']).first()
+            if tenant is None:
+                raise CommandError(f"No tenant with slug '{options['tenant']}'")
+            locations = locations.filter(tenant=tenant)
+
+        now = timezone.now()
+        geocoded = []
+        for location in locations.only('id', 'zip_code', 'latitude', 'longitude', 'geocoded_zip').iterator():
+            if location.geocode():
+                location.modified_on = now
+                geocoded.append(location)
+        Location.objects.bulk_update(
+            geocoded, ['latitude', 'longitude', 'geocoded_zip', 'modified_on'], batch_size=1000
+        )
+        self.stdout.write(self.style.SUCCESS(f'Geocoded {len(geocoded):,} locations'))
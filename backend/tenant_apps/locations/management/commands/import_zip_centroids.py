@@ -0,0 +1,52 @@
+"""
+Management command to build the offline ZIP centroid dataset.
+
+Usage:
+    python manage.py import_zip_centroids 2020_Gaz_zcta_national.txt
+
+Reads a US Census ZCTA Gazetteer file (tab-separated, with GEOID, INTPTLAT
+and INTPTLONG columns; https://www.census.gov/geographies/reference-files/
+time-series/geo/gazetteer-files.html) and writes LOCATION_ZIP_CENTROIDS,
+which locations are geocoded from without any network access (see
+tenant_apps/locations/geo.py). Run ``geocode_locations`` afterwards to fill
+the coordinates of existing locations.
+"""
+import csv
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tenant_apps.locations.geo import normalize_zip, write_centroids
+
+
+class Command(BaseCommand):
+    help = 'Build the ZIP centroid dataset from a Census ZCTA Gazetteer file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('gazetteer', type=str, help='Path to the ZCTA Gazetteer .txt file')
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Where to write the dataset (default: LOCATION_ZIP_CENTROIDS)',
+        )
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.LOCATION_ZIP_CENTROIDS
+        rows = []
+        try:
+            with open(options['gazetteer'], encoding='utf-8', newline='') as f:
+                reader = csv.reader(f, delimiter='\t')
+                header = [column.strip() for column in next(reader)]
+                try:
+                    columns = [header.index(name) for name in ('GEOID', 'INTPTLAT', 'INTPTLONG')]
+                except ValueError:
+                    raise CommandError('Expected GEOID, INTPTLAT and INTPTLONG columns')
+                for line in reader:
+                    zip_code, latitude, longitude = (line[column].strip() for column in columns)
+                    if normalize_zip(zip_code):
+                        rows.append((normalize_zip(zip_code), float(latitude), float(longitude)))
+        except FileNotFoundError:
+            raise CommandError(f"No such file: {options['gazetteer']}")
+
+        write_centroids(rows, output)
+        self.stdout.write(self.style.SUCCESS(f'{len(rows):,} ZIP centroids written to {output}'))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("locations", "0003_remove_location_contact_email_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="geocoded_zip",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="ZIP code the coordinates were looked up from (empty if entered by hand)",
+                max_length=5,
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="latitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                help_text="Latitude in degrees",
+                max_digits=9,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="longitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                help_text="Longitude in degrees",
+                max_digits=9,
+                null=True,
+            ),
+        ),
+    ]
@@ -6,6 +6,8 @@ Defines location entities for suppliers and customers.
 Implements tenant ForeignKey field for shared-schema multi-tenancy.
 Row-level security (RLS) enabled for additional isolation at PostgreSQL level.
 """
+from decimal import Decimal
+
 from django.db import models
 
 from apps.tenants.models import Tenant
@@ -15,6 +17,8 @@ from apps.core.models import (
     TimestampModel,
 )
 
+from . import geo
+
 
 class Location(TimestampModel):
     """Location model for supplier and customer addresses."""
@@ -77,6 +81,28 @@ class Location(TimestampModel):
         help_text="Country"
     )
 
+    # Coordinates (filled from the ZIP centroid unless entered by hand)
+    latitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        help_text="Latitude in degrees"
+    )
+    longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        help_text="Longitude in degrees"
+    )
+    geocoded_zip = models.CharField(
+        max_length=5,
+        blank=True,
+        default='',
+        help_text="ZIP code the coordinates were looked up from (empty if entered by hand)"
+    )
+
     # Contact information
     phone = models.CharField(
         max_length=20,
@@ -131,3 +157,25 @@ class Location(TimestampModel):
 
     def __str__(self):
         return f"{self.name} ({self.city or 'No city'})"
+
+    def save(self, *args, **kwargs):
+        """Fill the coordinates from the ZIP centroid unless they were entered by hand."""
+        if self.latitude is None or self.longitude is None or self.geocoded_zip:
+            self.geocode()
+        super().save(*args, **kwargs)
+
+    def geocode(self):
+        """Set the coordinates to the centroid of ``zip_code``; False when it is unknown."""
+        zip5 = geo.normalize_zip(self.zip_code)
+        if self.geocoded_zip and self.geocoded_zip == zip5 and self.latitude is not None:
+            return True
+        centroid = geo.zip_centroid(zip5)
+        if centroid is None:
+            if self.geocoded_zip:
+                # The ZIP changed to one without a centroid
+                self.latitude = self.longitude = None
+                self.geocoded_zip = ''
+            return False
+        self.latitude, self.longitude = (Decimal(str(round(value, 6))) for value in centroid)
+        self.geocoded_zip = zip5
+        return True
@@ -2,10 +2,11 @@
 Serializers for Locations app.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from .models import Location
 
 
-class LocationSerializer(serializers.ModelSerializer):
+class LocationSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for Location model."""
     
     # Read-only fields for related entity names
@@ -24,6 +25,9 @@ class LocationSerializer(serializers.ModelSerializer):
             'state',
             'zip_code',
             'country',
+            'latitude',
+            'longitude',
+            'geocoded_zip',
             'phone',
             'email',
             'contact_name',
@@ -35,10 +39,29 @@ class LocationSerializer(serializers.ModelSerializer):
             'created_on',
             'modified_on',
         ]
-        read_only_fields = ['id', 'supplier_name', 'customer_name', 'created_on', 'modified_on']
+        read_only_fields = ['id', 'supplier_name', 'customer_name', 'geocoded_zip', 'created_on', 'modified_on']
+        # Opt-in nested data (?expand=supplier,customer)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+            "customer": ("tenant_apps.customers.serializers.CustomerSerializer", {}),
+        }
 
+    def validate(self, attrs):
+        """
+        Coordinates set by the client are kept instead of the ZIP centroid.
+        Sending back the stored (geocoded) coordinates unchanged, as a full
+        PUT does, does not count as setting them.
+        """
+        attrs = super().validate(attrs)
+        if any(
+            attrs.get(field) is not None and (self.instance is None or attrs[field] != getattr(self.instance, field))
+            for field in ('latitude', 'longitude')
+        ):
+            attrs['geocoded_zip'] = ''
+        return attrs
 
-class LocationListSerializer(serializers.ModelSerializer):
+
+class LocationListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Lightweight serializer for location lists."""
     
     supplier_name = serializers.CharField(source='supplier.name', read_only=True)
@@ -53,9 +76,16 @@ class LocationListSerializer(serializers.ModelSerializer):
             'location_type',
             'city',
             'state',
+            'latitude',
+            'longitude',
             'supplier',
             'supplier_name',
             'customer',
             'customer_name',
         ]
         read_only_fields = ['id', 'supplier_name', 'customer_name']
+        # Opt-in nested data (?expand=supplier,customer)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+            "customer": ("tenant_apps.customers.serializers.CustomerSerializer", {}),
+        }
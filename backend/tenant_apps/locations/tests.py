@@ -1,3 +1,167 @@
-from django.test import TestCase
+"""
+Tests for location geocoding and the distance matrix.
+"""
+import os
+import shutil
+import tempfile
+import uuid
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.tenants.models import Tenant, TenantUser
+from tenant_apps.locations import geo
+from tenant_apps.locations.models import Location
+
+CENTROIDS = [
+    ("68102", 41.2587, -95.9378),  # Omaha
+    ("68508", 40.8136, -96.7026),  # Lincoln
+    ("75201", 32.7876, -96.7994),  # Dallas
+    ("60607", 41.8745, -87.6514),  # Chicago
+]
+# Built per deployment by import_zip_centroids, not committed
+IMPORTED_DATASET = os.path.join(os.path.dirname(geo.__file__), "data", "zip_centroids.csv.gz")
+
+
+class LocationGeoTest(APITestCase):
+    """Locations are geocoded offline and answer distance queries from a cached matrix."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Geo Co {unique_id}",
+            slug=f"geo-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@geo.com",
+        )
+        self.user = User.objects.create_user(username=f"geo-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.centroids = os.path.join(self.directory, "zip_centroids.csv.gz")
+        geo.write_centroids(CENTROIDS, self.centroids)
+        centroids = override_settings(LOCATION_ZIP_CENTROIDS=self.centroids)
+        centroids.enable()
+        self.addCleanup(centroids.disable)
+        patch = mock.patch.object(geo, "matrix_store", geo.MatrixStore(os.path.join(self.directory, "matrices")))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def location(self, name, zip_code, location_type=""):
+        return Location.objects.create(tenant=self.tenant, name=name, zip_code=zip_code, location_type=location_type)
+
+    def test_geocoding_follows_zip_unless_entered_by_hand(self):
+        plant = self.location("Plant", "68102-1234")
+        self.assertEqual((plant.latitude, plant.longitude), (Decimal("41.2587"), Decimal("-95.9378")))
+        self.assertEqual(plant.geocoded_zip, "68102")
+
+        # A full PUT echoes the geocoded coordinates back: they still follow the ZIP
+        url = f"/api/v1/locations/{plant.id}/"
+        data = self.client.get(url).data
+        data["zip_code"] = "68508"
+        response = self.client.put(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["geocoded_zip"], "68508")
+        self.assertEqual(Decimal(response.data["latitude"]), Decimal("40.8136"))
+
+        plant.refresh_from_db()
+        plant.zip_code = "75201"
+        plant.save()
+        self.assertEqual(plant.latitude, Decimal("32.7876"))
+        plant.zip_code = "99999"
+        plant.save()
+        self.assertIsNone(plant.latitude)
+
+        response = self.client.patch(
+            url, {"latitude": "40.000000", "longitude": "-100.000000"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["geocoded_zip"], "")
+        plant.refresh_from_db()
+        plant.zip_code = "68508"
+        plant.save()
+        self.assertEqual((plant.latitude, plant.longitude), (Decimal("40"), Decimal("-100")))
+
+    def test_nearest_and_distances(self):
+        omaha = self.location("Omaha Plant", "68102", "plant")
+        lincoln = self.location("Lincoln Cold Storage", "68508", "cold_storage")
+        dallas = self.location("Dallas Cold Storage", "75201", "cold_storage")
+        self.location("Nowhere", "", "cold_storage")
+
+        response = self.client.get(f"/api/v1/locations/{omaha.id}/nearest/", {"location_type": "cold_storage"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data], [lincoln.id, dallas.id])
+        self.assertAlmostEqual(response.data[0]["distance_miles"], 50, delta=5)
+
+        chicago = self.location("Chicago Cold Storage", "60607", "cold_storage")
+        nearest = self.client.get(f"/api/v1/locations/{omaha.id}/nearest/", {"limit": 2}).data
+        self.assertEqual([item["id"] for item in nearest], [lincoln.id, chicago.id])
+
+        by_zip = self.client.get("/api/v1/locations/nearest/", {"zip": "75201", "limit": 1}).data
+        self.assertEqual(by_zip[0]["id"], dallas.id)
+        self.assertEqual(by_zip[0]["distance_miles"], 0)
+
+        distances = self.client.get(
+            "/api/v1/locations/distances/", {"from": f"{omaha.id},{dallas.id}", "to": f"{dallas.id},{omaha.id}"}
+        ).data
+        self.assertEqual(distances["miles"][0][0], distances["miles"][1][1])
+        self.assertAlmostEqual(distances["miles"][0][0], 585, delta=15)
+        self.assertEqual(distances["miles"][0][1], 0)
+
+        # The matrix is written once per state and reused by other processes
+        other_process = geo.MatrixStore(geo.matrix_store.directory)
+        with mock.patch.object(geo.DistanceMatrix, "distances_from", side_effect=AssertionError):
+            self.assertEqual(len(other_process.matrix(self.tenant)), 4)
+            # Only ids and coordinates are part of the state
+            dallas.phone = "214-555-0100"
+            dallas.save()
+            self.assertEqual(len(other_process.matrix(self.tenant)), 4)
+        state = geo.matrix_store.state(self.tenant)
+        dallas.latitude = Decimal("32.7")
+        dallas.save()
+        self.assertNotEqual(geo.matrix_store.state(self.tenant), state)
+
+        for params in ({"zip": "00000"}, {"latitude": "95", "longitude": "0"}, {}):
+            self.assertEqual(self.client.get("/api/v1/locations/nearest/", params).status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/locations/distances/", {"from": "x"}).status_code, 400)
+
+    def test_import_and_geocode_commands(self):
+        with override_settings(LOCATION_ZIP_CENTROIDS=os.path.join(self.directory, "missing.csv.gz")):
+            existing = self.location("Existing", "60607")
+        self.assertIsNone(existing.latitude)
+
+        gazetteer = os.path.join(self.directory, "gazetteer.txt")
+        with open(gazetteer, "w") as f:
+            f.write("GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG                   \n")
+            f.write("60607\t1\t0\t1\t0\t41.874500\t-87.651400\n")
+            f.write("00601\t1\t0\t1\t0\t18.180555\t-66.749961\n")
+        output = os.path.join(self.directory, "imported.csv.gz")
+        call_command("import_zip_centroids", gazetteer, output=output, stdout=StringIO())
+
+        with override_settings(LOCATION_ZIP_CENTROIDS=output):
+            self.assertEqual(geo.zip_centroid("00601"), (18.180555, -66.749961))
+            call_command("geocode_locations", tenant=self.tenant.slug, stdout=StringIO())
+        existing.refresh_from_db()
+        self.assertEqual((existing.latitude, existing.geocoded_zip), (Decimal("41.8745"), "60607"))
+
+    @skipUnless(os.path.exists(IMPORTED_DATASET), "ZIP centroid dataset not imported (see locations/data/README.md)")
+    def test_geocodes_from_imported_dataset(self):
+        with override_settings(LOCATION_ZIP_CENTROIDS=IMPORTED_DATASET):
+            self.assertGreater(len(geo.zip_centroids()), 40000)
+            omaha = self.location("Omaha Plant", "68102")
+            lincoln = self.location("Lincoln Cold Storage", "68508-2210")
+            response = self.client.get(f"/api/v1/locations/{omaha.id}/nearest/")
+        self.assertAlmostEqual(float(omaha.latitude), 41.26, delta=0.05)
+        self.assertAlmostEqual(float(omaha.longitude), -95.94, delta=0.05)
+        self.assertEqual(lincoln.geocoded_zip, "68508")
+        self.assertEqual(response.data[0]["id"], lincoln.id)
+        self.assertAlmostEqual(response.data[0]["distance_miles"], 50, delta=5)
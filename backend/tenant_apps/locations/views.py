@@ -1,29 +1,125 @@
 """
 ViewSets for Locations app.
 """
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from apps.core.mixins import ValuesListMixin
+from . import geo
 from .models import Location
 from .serializers import LocationSerializer, LocationListSerializer
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+def _ids(value):
+    """Location ids from a comma-separated query parameter; ValueError if malformed."""
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+class LocationViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Location instances with tenant isolation.
+
+    Distances come from the tenant's precomputed distance matrix (geo.py):
+
+    GET /api/v1/locations/{id}/nearest/?location_type=cold_storage&limit=5
+    GET /api/v1/locations/nearest/?zip=68102 (or ?latitude=&longitude=)
+    GET /api/v1/locations/distances/?from=1,2&to=3,4
     """
     permission_classes = [IsAuthenticated]
     serializer_class = LocationSerializer
-    
+
     def get_queryset(self):
         """Filter locations by tenant for isolation."""
-        return Location.objects.filter(tenant=self.request.tenant)
-    
+        return Location.objects.filter(tenant=self.request.tenant).select_related(
+            'supplier', 'customer'
+        )
+
     def get_serializer_class(self):
         """Use lightweight serializer for list actions."""
-        if self.action == 'list':
+        if self.action in ('list', 'nearest', 'nearest_point'):
             return LocationListSerializer
         return LocationSerializer
-    
+
     def perform_create(self, serializer):
         """Assign tenant automatically on creation."""
         serializer.save(tenant=self.request.tenant)
+
+    def _bad_request(self, error, details):
+        return Response({"error": error, "details": details}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _nearest(self, matrix, distances, exclude=None):
+        """The closest active locations (optionally of ``?location_type=``) with their miles."""
+        try:
+            limit = int(self.request.query_params.get("limit", 10))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= 100:
+            return self._bad_request("Invalid limit", "Pass ?limit= from 1 to 100")
+
+        candidates = self.get_queryset().filter(is_active=True)
+        location_type = self.request.query_params.get("location_type")
+        if location_type:
+            candidates = candidates.filter(location_type=location_type)
+        nearest = matrix.nearest(distances, limit, set(candidates.values_list("id", flat=True)), exclude)
+        locations = candidates.in_bulk([location_id for location_id, _ in nearest])
+        results = []
+        for location_id, miles in nearest:
+            item = self.get_serializer(locations[location_id]).data
+            item["distance_miles"] = round(miles, 1)
+            results.append(item)
+        return Response(results)
+
+    @action(detail=True, methods=["get"], url_path="nearest")
+    def nearest(self, request, pk=None):
+        """Locations closest to this one."""
+        location = self.get_object()
+        matrix = geo.matrix_store.matrix(request.tenant)
+        distances = matrix.row(location.id)
+        if distances is None:
+            return self._bad_request(
+                "Location has no coordinates",
+                "Set its ZIP code to a known one, or its latitude and longitude",
+            )
+        return self._nearest(matrix, distances, exclude=location.id)
+
+    @action(detail=False, methods=["get"], url_path="nearest")
+    def nearest_point(self, request):
+        """Locations closest to ``?zip=`` or ``?latitude=&longitude=``."""
+        params = request.query_params
+        if params.get("zip"):
+            point = geo.zip_centroid(params["zip"])
+        else:
+            try:
+                point = float(params["latitude"]), float(params["longitude"])
+            except (KeyError, ValueError):
+                point = None
+        if point is None or not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+            return self._bad_request("Invalid point", "Pass a known ?zip= or ?latitude= and ?longitude= in degrees")
+        if not getattr(request, "tenant", None):
+            return Response([])
+        matrix = geo.matrix_store.matrix(request.tenant)
+        return self._nearest(matrix, matrix.distances_from(*point))
+
+    @action(detail=False, methods=["get"], url_path="distances")
+    def distances(self, request):
+        """Miles from each ``?from=`` location to each ``?to=`` location (null if not geocoded)."""
+        try:
+            from_ids, to_ids = _ids(request.query_params["from"]), _ids(request.query_params["to"])
+        except (KeyError, ValueError):
+            from_ids = to_ids = []
+        if not from_ids or not to_ids or len(from_ids) * len(to_ids) > 10000:
+            return self._bad_request(
+                "Invalid locations", "Pass ?from= and ?to= as comma-separated location ids, up to 10000 pairs"
+            )
+        if not getattr(request, "tenant", None):
+            return Response({"from": from_ids, "to": to_ids, "miles": []})
+        matrix = geo.matrix_store.matrix(request.tenant)
+        miles = []
+        for from_id in from_ids:
+            row = matrix.row(from_id)
+            miles.append([
+                None if row is None or to_id not in matrix.slots else round(row[matrix.slots[to_id]], 1)
+                for to_id in to_ids
+            ])
+        return Response({"from": from_ids, "to": to_ids, "miles": miles})
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from tenant_apps.plants.models import Plant
 
 
-class PlantSerializer(serializers.ModelSerializer):
+class PlantSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(
         source="created_by.username", read_only=True
     )
@@ -41,6 +42,10 @@ class PlantSerializer(serializers.ModelSerializer):
             "created_by",
             "created_by_name",
         ]
+        # Opt-in nested data (?expand=supplier)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+        }
 
     def create(self, validated_data):
         validated_data["created_by"] = self.context["request"].user
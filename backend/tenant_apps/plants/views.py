@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.filters import FieldSelectionFilter
 from django.core.exceptions import ValidationError
 from tenant_apps.plants.models import Plant
 from tenant_apps.plants.serializers import PlantSerializer
@@ -17,7 +18,7 @@ class PlantViewSet(viewsets.ModelViewSet):
     queryset = Plant.objects.all()
     serializer_class = PlantSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter, FieldSelectionFilter]
     filterset_fields = ["plant_type", "is_active", "city", "state"]
     search_fields = ["name", "code", "address", "city", "state", "manager"]
     ordering_fields = ["name", "code", "created_at", "capacity"]
@@ -26,7 +27,9 @@ class PlantViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter plants by current tenant."""
         if hasattr(self.request, 'tenant') and self.request.tenant:
-            queryset = Plant.objects.for_tenant(self.request.tenant)
+            queryset = Plant.objects.for_tenant(self.request.tenant).select_related(
+                'created_by', 'supplier'
+            )
             # Filter by active plants by default unless specified
             is_active = self.request.query_params.get("is_active")
             if is_active is None:
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:35
+
+import logging
+
+from django.db import DatabaseError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ["product_code", "description_of_product_item", "supplier_item_number", "namp", "usda"]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    GIN trigram indexes for the case-insensitive product search, which
+    filters on UPPER(column) LIKE '%term%'. Skipped with a warning when the
+    server lacks pg_trgm or the role may not create it.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            logger.warning("pg_trgm is not available; product search will not use trigram indexes")
+            return
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError as e:
+            logger.warning(f"Could not enable pg_trgm ({e}); product search will not use trigram indexes")
+            return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS products_product_{column}_trgm "
+            f"ON products_product USING gin (UPPER({column}::text) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS products_product_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0005_add_products_m2m"),
+        ("suppliers", "0008_add_preferred_protein_types"),
+        ("tenants", "0006_metadata_lockdown"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["tenant", "product_code"], name="products_pr_tenant__199ab5_idx"
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -171,6 +171,11 @@ class Product(TimestampModel):
         ordering = ["product_code"]
         verbose_name = "Product"
         verbose_name_plural = "Products"
+        indexes = [
+            models.Index(fields=["tenant", "product_code"]),
+        ]
+        # Migration 0006 also adds GIN trigram indexes on UPPER() of the
+        # search fields where pg_trgm is available (see search.py)
 
     def __str__(self):
         return f"{self.product_code} - {self.description_of_product_item[:50]}"
@@ -0,0 +1,100 @@
+"""
+Faceted product search: a page of products and the counts of every facet
+value, for one request.
+
+The search text is split into terms, and each term must appear
+(case-insensitively) in one of SEARCH_FIELDS, the same rule as the list
+endpoint's ``?search=``. Where the pg_trgm extension is available, migration
+0006 indexes ``UPPER(field)`` of each search field with a GIN trigram index,
+so every ``LIKE '%term%'`` is an index scan rather than a scan of the
+tenant's catalog.
+
+Facet counts are disjunctive: the counts of a facet's values apply every
+selected filter except that facet's own, so with "Beef" picked the protein
+facet still shows how many Pork products match. They come from a single
+GROUPING SETS query over the search matches, with one ``count(*) FILTER``
+per facet; its empty grouping set counts the products matching everything.
+"""
+from django.db import connection
+from django.db.models import Q
+
+from tenant_apps.suppliers.models import Supplier
+
+SEARCH_FIELDS = (
+    "product_code",
+    "description_of_product_item",
+    "supplier_item_number",
+    "namp",
+    "usda",
+)
+
+FACETS = ("type_of_protein", "fresh_or_frozen", "package_type", "edible_or_inedible", "supplier")
+
+
+def search_filter(text):
+    """Q matching products that contain every term of ``text`` in some search field."""
+    condition = Q()
+    for term in text.split():
+        term_condition = Q()
+        for field in SEARCH_FIELDS:
+            term_condition |= Q(**{f"{field}__icontains": term})
+        condition &= term_condition
+    return condition
+
+
+def facet_filter(selected):
+    """Q of the products having one of the selected values of every facet in ``{facet: [values]}``."""
+    condition = Q()
+    for facet, values in selected.items():
+        condition &= Q(**{f"{facet}__in": values})
+    return condition
+
+
+def facet_counts(matches, selected):
+    """
+    ``(facets, total)`` for the products in ``matches`` (the search results)
+    with the ``{facet: [values]}`` selection: ``facets`` maps each facet to
+    ``[{"value", "count"}, ...]`` by descending count, and ``total`` is the
+    number of products matching every selected value.
+    """
+    sql, match_params = matches.order_by().values_list(*FACETS).query.sql_with_params()
+    params = []
+
+    def where(exclude=None):
+        conditions = []
+        for facet, values in selected.items():
+            if facet != exclude:
+                conditions.append(f"{facet} = ANY(%s)")
+                params.append(list(values))
+        return f" FILTER (WHERE {' AND '.join(conditions)})" if conditions else ""
+
+    counts = [f"count(*){where(facet)}" for facet in FACETS] + [f"count(*){where()}"]
+    columns = ", ".join(FACETS)
+    query = f"""
+        SELECT GROUPING({columns}), {columns}, {', '.join(counts)}
+        FROM ({sql}) AS matches ({columns})
+        GROUP BY GROUPING SETS ({', '.join(f'({facet})' for facet in FACETS)}, ())
+    """
+    n = len(FACETS)
+    # GROUPING() has a 0 bit for the facet a row is grouped by, first facet highest
+    grouped_by = {(1 << n) - 1 - (1 << (n - 1 - index)): index for index in range(n)}
+    facets = {facet: [] for facet in FACETS}
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(query, [*params, *match_params])
+        for grouping, *row in cursor.fetchall():
+            if grouping not in grouped_by:
+                total = row[-1]
+                continue
+            index = grouped_by[grouping]
+            count = row[n + index]
+            if count:
+                facets[FACETS[index]].append({"value": row[index], "count": count})
+    for items in facets.values():
+        items.sort(key=lambda item: (-item["count"], str(item["value"])))
+    names = dict(Supplier.objects.filter(
+        id__in=[item["value"] for item in facets["supplier"] if item["value"] is not None]
+    ).values_list("id", "name"))
+    for item in facets["supplier"]:
+        item["label"] = names.get(item["value"], "")
+    return facets, total
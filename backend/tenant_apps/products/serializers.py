@@ -2,10 +2,11 @@
 Serializers for Products app.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from .models import Product
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for Product model with tenant validation."""
     
     # Read-only fields for display
@@ -45,3 +46,7 @@ class ProductSerializer(serializers.ModelSerializer):
             'product_code': {'required': True},
             'description_of_product_item': {'required': True},
         }
+        # Opt-in nested data (?expand=supplier)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+        }
@@ -4,7 +4,14 @@ Tests for Products app models.
 import uuid
 from decimal import Decimal
 from unittest import skip
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from apps.tenants.models import Tenant, TenantUser
 from tenant_apps.products.models import Product
 from tenant_apps.suppliers.models import Supplier
 from apps.core.models import (
@@ -122,3 +129,80 @@ class ProductModelTest(TestCase):
         self.assertEqual(product.unit_weight, Decimal("50.25"))
 
 
+class ProductFacetedSearchTest(APITestCase):
+    """Faceted catalog search returns a page and every facet's counts."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.unique_id = unique_id
+        self.tenant = Tenant.objects.create(
+            name=f"Catalog Co {unique_id}",
+            slug=f"catalog-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@catalog.com",
+        )
+        user = User.objects.create_user(username=f"catalog-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=user, role="admin")
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+
+        self.prairie = Supplier.objects.create(tenant=self.tenant, name="Prairie Packing")
+        self.delta = Supplier.objects.create(tenant=self.tenant, name="Delta Pork")
+        catalog = [
+            ("Beef ribeye lip on", ProteinTypeChoices.BEEF, FreshOrFrozenChoices.FRESH, self.prairie),
+            ("Beef ribeye boneless", ProteinTypeChoices.BEEF, FreshOrFrozenChoices.FROZEN, self.prairie),
+            ("Beef brisket", ProteinTypeChoices.BEEF, FreshOrFrozenChoices.FROZEN, self.prairie),
+            ("Pork ribeye chop", ProteinTypeChoices.PORK, FreshOrFrozenChoices.FRESH, self.delta),
+            ("Pork belly", ProteinTypeChoices.PORK, FreshOrFrozenChoices.FROZEN, self.delta),
+            ("Chicken breast", ProteinTypeChoices.CHICKEN, FreshOrFrozenChoices.FROZEN, None),
+        ]
+        for n, (description, protein, state, supplier) in enumerate(catalog):
+            Product.objects.create(
+                tenant=self.tenant,
+                product_code=f"{unique_id}-{n:02d}",
+                description_of_product_item=description,
+                type_of_protein=protein,
+                fresh_or_frozen=state,
+                supplier=supplier,
+            )
+
+    def search(self, **params):
+        response = self.client.get("/api/v1/products/search/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def counts(self, data, facet):
+        return {item["value"]: item["count"] for item in data["facets"][facet]}
+
+    def test_facets_are_disjunctive(self):
+        data = self.search(search="ribeye", type_of_protein="Beef")
+
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(
+            [item["description_of_product_item"] for item in data["results"]],
+            ["Beef ribeye lip on", "Beef ribeye boneless"],
+        )
+        # The protein facet ignores its own selection, the others apply it
+        self.assertEqual(self.counts(data, "type_of_protein"), {"Beef": 2, "Pork": 1})
+        self.assertEqual(self.counts(data, "fresh_or_frozen"), {"Fresh": 1, "Frozen": 1})
+        self.assertEqual(data["facets"]["supplier"], [{"value": self.prairie.id, "count": 2, "label": "Prairie Packing"}])
+
+        data = self.search(type_of_protein=["Beef", "Chicken"], fresh_or_frozen="Frozen")
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(self.counts(data, "type_of_protein"), {"Beef": 2, "Pork": 1, "Chicken": 1})
+        self.assertEqual(self.counts(data, "supplier"), {self.prairie.id: 2, None: 1})
+
+    def test_pages_and_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            first = self.search(page_size=4, ordering="-product_code")
+        self.assertEqual(first["count"], 6)
+        self.assertEqual(first["results"][0]["product_code"], f"{self.unique_id}-05")
+        self.assertIsNone(first["previous"])
+        second = self.client.get(first["next"]).data
+        self.assertEqual(len(second["results"]), 2)
+        self.assertIsNone(second["next"])
+        # Facet counts, supplier labels and the page, whatever the facets
+        self.assertLessEqual(len([q for q in queries.captured_queries if "products_product" in q["sql"]]), 2)
+
+        for params in ({"supplier": "x"}, {"page_size": 0}, {"ordering": "tenant"}):
+            response = self.client.get("/api/v1/products/search/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
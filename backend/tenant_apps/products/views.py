@@ -5,16 +5,22 @@ Provides CRUD operations for product management with tenant isolation.
 Uses shared-schema multi-tenancy with tenant ForeignKey filtering.
 """
 import logging
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.filters import FieldSelectionFilter
+from . import search
 from .models import Product
 from .serializers import ProductSerializer
+from apps.core.mixins import CSVImportMixin, ValuesListMixin
 
 logger = logging.getLogger(__name__)
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(CSVImportMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing products with tenant filtering.
     
@@ -30,12 +36,16 @@ class ProductViewSet(viewsets.ModelViewSet):
     - Filter: type_of_protein, fresh_or_frozen, package_type, is_active, supplier, tested_product
     - Ordering: product_code, description_of_product_item, created_on, modified_on, unit_weight
     - Custom: customer (M2M filter via query param)
+    
+    Faceted search (search.py), the page and all facet counts in one request:
+    GET /api/v1/products/search/?search=ribeye&type_of_protein=Beef&type_of_protein=Pork&page=2
     """
     
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    csv_import_entity = 'products'
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter, FieldSelectionFilter]
     
     # Search fields
     search_fields = [
@@ -82,7 +92,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         
         # Filter by tenant from middleware
         if hasattr(self.request, 'tenant') and self.request.tenant:
-            queryset = queryset.filter(tenant=self.request.tenant)
+            queryset = queryset.filter(tenant=self.request.tenant).select_related('supplier')
             logger.debug(f"Filtered products for tenant: {self.request.tenant.slug}")
         else:
             # Fallback: no tenant context (should not happen in production)
@@ -115,3 +125,63 @@ class ProductViewSet(viewsets.ModelViewSet):
         else:
             logger.error("Cannot create product without tenant context")
             raise ValueError("Tenant context is required to create products")
+    
+    def _bad_request(self, error, details):
+        return Response({'error': error, 'details': details}, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['get'], url_path='search')
+    def faceted_search(self, request):
+        """
+        Search products and count the values of every facet.
+        
+        Query Parameters:
+        - search: terms that must all appear in a search field
+        - type_of_protein, fresh_or_frozen, package_type, edible_or_inedible,
+          supplier: facet values to keep (repeat a parameter to keep several)
+        - is_active, tested_product: true/false
+        - ordering, page, page_size (up to 100)
+        
+        Returns ``{count, next, previous, results, facets}``, where each facet
+        is a list of ``{value, count}`` (suppliers also have a ``label``).
+        """
+        params = request.query_params
+        selected = {}
+        for facet in search.FACETS:
+            values = params.getlist(facet)
+            if values:
+                selected[facet] = values
+        try:
+            if 'supplier' in selected:
+                selected['supplier'] = [int(value) for value in selected['supplier']]
+            page = int(params.get('page', 1))
+            page_size = int(params.get('page_size', self.paginator.page_size))
+        except ValueError:
+            page = page_size = 0
+        if page < 1 or not 1 <= page_size <= 100:
+            return self._bad_request(
+                'Invalid parameters', 'Pass numeric supplier ids, ?page= from 1 and ?page_size= from 1 to 100'
+            )
+        ordering = params.get('ordering', self.ordering[0])
+        if ordering.lstrip('-') not in self.ordering_fields:
+            return self._bad_request('Invalid ordering', f"Order by one of {', '.join(self.ordering_fields)}")
+        
+        matches = self.get_queryset().filter(search.search_filter(params.get('search', '')))
+        for flag in ('is_active', 'tested_product'):
+            if params.get(flag) in ('true', 'false'):
+                matches = matches.filter(**{flag: params[flag] == 'true'})
+        facets, count = search.facet_counts(matches, selected)
+        
+        offset = (page - 1) * page_size
+        products = matches.filter(search.facet_filter(selected)).order_by(ordering, 'pk')[offset:offset + page_size]
+        url = request.build_absolute_uri()
+        return Response({
+            'count': count,
+            'next': replace_query_param(url, 'page', page + 1) if offset + page_size < count else None,
+            'previous': (
+                None if page == 1
+                else remove_query_param(url, 'page') if page == 2
+                else replace_query_param(url, 'page', page - 1)
+            ),
+            'results': self.get_serializer(products, many=True).data,
+            'facets': facets,
+        })
@@ -3,7 +3,14 @@ Django admin configuration for Purchase Orders app.
 """
 from django.contrib import admin
 from apps.core.admin import TenantFilteredAdmin
-from .models import PurchaseOrder, CarrierPurchaseOrder, ColdStorageEntry, PurchaseOrderHistory
+from .models import (
+    CarrierLane,
+    CarrierPurchaseOrder,
+    ColdStorageEntry,
+    ColdStoragePosition,
+    PurchaseOrder,
+    PurchaseOrderHistory,
+)
 
 
 @admin.register(PurchaseOrder)
@@ -297,6 +304,53 @@ class ColdStorageEntryAdmin(TenantFilteredAdmin):
         ),
     )
 
+@admin.register(ColdStoragePosition)
+class ColdStoragePositionAdmin(TenantFilteredAdmin):
+    """Read-only admin for ColdStoragePosition, maintained from cold storage entries."""
+
+    list_display = (
+        "product",
+        "status_of_load",
+        "entry_count",
+        "finished_weight",
+        "total_cost",
+        "modified_on",
+    )
+    list_filter = ("status_of_load",)
+    search_fields = ("product__product_code", "product__description_of_product_item")
+    raw_id_fields = ("product",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CarrierLane)
+class CarrierLaneAdmin(TenantFilteredAdmin):
+    """Read-only admin for CarrierLane, maintained from carrier purchase orders."""
+
+    list_display = (
+        "pick_up_location",
+        "delivery_location",
+        "carrier",
+        "type_of_protein",
+        "load_count",
+        "max_weight",
+        "last_pick_up_date",
+    )
+    list_filter = ("type_of_protein",)
+    search_fields = ("carrier__name", "pick_up_location__name", "delivery_location__name")
+    raw_id_fields = ("pick_up_location", "delivery_location", "carrier")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(PurchaseOrderHistory)
 class PurchaseOrderHistoryAdmin(admin.ModelAdmin):
     """Admin interface for PurchaseOrderHistory model."""
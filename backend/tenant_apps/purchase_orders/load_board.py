@@ -0,0 +1,151 @@
+"""
+Load board: open orders without a carrier and the carriers proposed for them.
+
+An order is open when it is a pending or approved PurchaseOrder, or a
+pending or confirmed SalesOrder, with no carrier and no CarrierPurchaseOrder
+linked to it, picking up within the board's date window. Both are read
+through the partial ``*_load_board_idx`` indexes. A sales order's protein is
+that of its product.
+
+Candidates come from ``CarrierLane``, which is maintained from the carrier
+PO history: the LANE_DEPTH best carriers per protein of every lane on the
+board are read in one indexed query and grouped into ranked candidate lists
+per lane and protein, then each order picks from its lane's lists. A
+carrier qualifies when it is active, has hauled the order's protein on that
+lane (or either protein is unknown) and has hauled at least the order's
+weight; carriers with the same protein rank first, then by number of loads
+and the most recent pick up.
+"""
+from datetime import date
+from itertools import chain
+
+from django.db.models import Exists, F, OuterRef
+
+from tenant_apps.carriers.models import Carrier
+from tenant_apps.purchase_orders.models import (
+    CarrierLane,
+    CarrierPurchaseOrder,
+    PurchaseOrder,
+    PurchaseOrderStatus,
+    weight_in_lbs,
+)
+from tenant_apps.sales_orders.models import SalesOrder, SalesOrderStatus
+
+# Carriers read per lane and protein; the most candidates an order can get
+LANE_DEPTH = 10
+
+ORDER_FIELDS = ("id", "pick_up_date", "pick_up_location", "delivery_location", "total_weight", "weight_unit")
+
+# (order_type, model, number field, protein field, CarrierPurchaseOrder link, open statuses)
+OPEN_ORDERS = (
+    (
+        "purchase_order",
+        PurchaseOrder,
+        "order_number",
+        "type_of_protein",
+        "linked_order",
+        [PurchaseOrderStatus.PENDING, PurchaseOrderStatus.APPROVED],
+    ),
+    (
+        "sales_order",
+        SalesOrder,
+        "our_sales_order_num",
+        "product__type_of_protein",
+        "sales_order",
+        [SalesOrderStatus.PENDING, SalesOrderStatus.CONFIRMED],
+    ),
+)
+
+
+def open_orders(tenant, start, end):
+    """The tenant's open orders picking up between ``start`` and ``end``, by pick up date."""
+    orders = []
+    for order_type, model, number_field, protein_field, carrier_po_link, statuses in OPEN_ORDERS:
+        hauled = CarrierPurchaseOrder.objects.filter(**{carrier_po_link: OuterRef("pk")})
+        rows = (
+            model.objects.filter(
+                tenant=tenant,
+                carrier__isnull=True,
+                status__in=statuses,
+                pick_up_date__range=(start, end),
+            )
+            .exclude(Exists(hauled))
+            .order_by()
+            .values(*ORDER_FIELDS, number=F(number_field), protein=F(protein_field))
+        )
+        for row in rows:
+            row["type_of_protein"] = row.pop("protein") or ""
+            row["order_type"] = order_type
+            orders.append(row)
+    orders.sort(key=lambda order: (order["pick_up_date"], order["order_type"], order["number"]))
+    return orders
+
+
+def ranking(candidate):
+    """Sort key across proteins: most loads, then latest pick up."""
+    return -candidate["load_count"], -(candidate["last_pick_up_date"] or date.min).toordinal()
+
+
+def lane_candidates(tenant, lanes):
+    """
+    ``{(pick_up_id, delivery_id): {protein: [candidate, ...]}}`` for
+    ``lanes``, each list in ``rank`` order and with active carriers only.
+    """
+    pick_ups = {pick_up for pick_up, _ in lanes}
+    rows = (
+        CarrierLane.objects.filter(tenant=tenant, pick_up_location__in=pick_ups, rank__lte=LANE_DEPTH)
+        .order_by("rank")
+        .values_list(
+            "pick_up_location", "delivery_location", "type_of_protein",
+            "carrier", "load_count", "max_weight", "last_pick_up_date",
+        )
+    )
+    names = dict(Carrier.objects.filter(tenant=tenant, is_active=True).values_list("id", "name"))
+    candidates = {}
+    for pick_up, delivery, protein, carrier, load_count, max_weight, last_pick_up_date in rows:
+        lane = (pick_up, delivery)
+        if lane in lanes and carrier in names:
+            candidates.setdefault(lane, {}).setdefault(protein, []).append({
+                "carrier": carrier,
+                "carrier_name": names[carrier],
+                "load_count": load_count,
+                "max_weight": max_weight,
+                "last_pick_up_date": last_pick_up_date,
+            })
+    return candidates
+
+
+def match(order, by_protein, limit):
+    """Up to ``limit`` carriers for ``order`` from its lane's candidates."""
+    protein = order["type_of_protein"]
+    weight = weight_in_lbs(order["total_weight"], order["weight_unit"])
+    if protein:
+        ranked = chain(by_protein.get(protein, ()), by_protein.get("", ()))
+    else:
+        if None not in by_protein:
+            by_protein[None] = sorted(chain.from_iterable(by_protein.values()), key=ranking)
+        ranked = by_protein[None]
+    chosen = {}
+    for candidate in ranked:
+        if weight is not None and candidate["max_weight"] is not None and candidate["max_weight"] < weight:
+            continue
+        if candidate["carrier"] not in chosen:
+            chosen[candidate["carrier"]] = candidate
+            if len(chosen) == limit:
+                break
+    return list(chosen.values())
+
+
+def build_load_board(tenant, start, end, limit):
+    """The open orders between ``start`` and ``end``, each with its ``candidates``."""
+    orders = open_orders(tenant, start, end)
+    lanes = {
+        (order["pick_up_location"], order["delivery_location"])
+        for order in orders
+        if order["pick_up_location"] and order["delivery_location"]
+    }
+    candidates = lane_candidates(tenant, lanes) if lanes else {}
+    for order in orders:
+        by_protein = candidates.setdefault((order["pick_up_location"], order["delivery_location"]), {})
+        order["candidates"] = match(order, by_protein, limit)
+    return orders
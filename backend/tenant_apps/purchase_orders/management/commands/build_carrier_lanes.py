@@ -0,0 +1,40 @@
+"""
+Management command to rebuild the carrier lanes behind the load board.
+
+Usage:
+    python manage.py build_carrier_lanes
+    python manage.py build_carrier_lanes --tenant acme-meats
+
+Lanes follow every saved or deleted carrier purchase order; run this after
+deploying the lanes table and after bulk imports or ``QuerySet.update()``
+calls, which bypass saves.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.models import Tenant
+from tenant_apps.purchase_orders.models import CarrierLane
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the carrier lanes from the carrier purchase orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            type=str,
+            help='Slug of the only tenant to rebuild',
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.order_by('slug')
+        if options['tenant']:
+            tenants = tenants.filter(slug=options['tenant'])
+            if not tenants.exists():
+                raise CommandError(f"No tenant with slug '{options['tenant']}'")
+
+        total = 0
+        for tenant in tenants:
+            lanes = CarrierLane.rebuild(tenant)
+            total += len(lanes)
+            self.stdout.write(f'{tenant.slug}: {len(lanes):,} lanes')
+        self.stdout.write(self.style.SUCCESS(f'Built {total:,} carrier lanes'))
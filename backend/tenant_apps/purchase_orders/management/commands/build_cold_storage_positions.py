@@ -0,0 +1,41 @@
+"""
+Management command to rebuild the cold storage positions (on-hand totals
+per product and load status).
+
+Usage:
+    python manage.py build_cold_storage_positions
+    python manage.py build_cold_storage_positions --tenant acme-meats
+
+Positions follow every saved or deleted cold storage entry; run this after
+deploying the positions table and after bulk imports or
+``QuerySet.update()`` calls, which bypass saves.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.models import Tenant
+from tenant_apps.purchase_orders.models import ColdStoragePosition
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cold storage positions from the cold storage entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            type=str,
+            help='Slug of the only tenant to rebuild',
+        )
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.order_by('slug')
+        if options['tenant']:
+            tenants = tenants.filter(slug=options['tenant'])
+            if not tenants.exists():
+                raise CommandError(f"No tenant with slug '{options['tenant']}'")
+
+        total = 0
+        for tenant in tenants:
+            positions = ColdStoragePosition.rebuild(tenant)
+            total += len(positions)
+            self.stdout.write(f'{tenant.slug}: {len(positions):,} positions')
+        self.stdout.write(self.style.SUCCESS(f'Built {total:,} cold storage positions'))
@@ -0,0 +1,167 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:08
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+AMOUNTS = ("finished_weight", "shrink", "boxing_cost", "cold_storage_cost", "total_cost")
+
+
+def build_positions(apps, schema_editor):
+    """Total the existing cold storage entries into positions."""
+    ColdStorageEntry = apps.get_model("purchase_orders", "ColdStorageEntry")
+    ColdStoragePosition = apps.get_model("purchase_orders", "ColdStoragePosition")
+    rows = (
+        ColdStorageEntry.objects.order_by()
+        .values("tenant", "product", "status_of_load")
+        .annotate(entry_count=Count("id"), **{field: Coalesce(Sum(field), Decimal("0.00")) for field in AMOUNTS})
+    )
+    ColdStoragePosition.objects.bulk_create(
+        (ColdStoragePosition(tenant_id=row.pop("tenant"), product_id=row.pop("product"), **row) for row in rows),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0005_add_products_m2m"),
+        ("purchase_orders", "0009_alter_purchaseorder_order_number_and_more"),
+        ("sales_orders", "0008_alter_salesorder_our_sales_order_num_and_more"),
+        ("tenants", "0006_metadata_lockdown"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ColdStoragePosition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("modified_on", models.DateTimeField(auto_now=True)),
+                (
+                    "status_of_load",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("Matched", "Matched"),
+                            ("TBD - Not Matched", "TBD - Not Matched"),
+                        ],
+                        default="",
+                        help_text="Load matching status",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "entry_count",
+                    models.IntegerField(
+                        default=0, help_text="Number of cold storage entries"
+                    ),
+                ),
+                (
+                    "finished_weight",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total finished weight",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "shrink",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total shrink",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "boxing_cost",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total boxing cost",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "cold_storage_cost",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total cold storage cost",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "total_cost",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total cost",
+                        max_digits=14,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cold Storage Position",
+                "verbose_name_plural": "Cold Storage Positions",
+                "ordering": ["product", "status_of_load"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="coldstorageentry",
+            index=models.Index(
+                fields=["tenant", "product", "date_time_stamp_created"],
+                name="purchase_or_tenant__af5933_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="coldstorageposition",
+            name="product",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Product in storage (empty for entries without a product)",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="cold_storage_positions",
+                to="products.product",
+            ),
+        ),
+        migrations.AddField(
+            model_name="coldstorageposition",
+            name="tenant",
+            field=models.ForeignKey(
+                help_text="Tenant this cold storage position belongs to",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="cold_storage_positions",
+                to="tenants.tenant",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="coldstorageposition",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("product__isnull", False)),
+                fields=("tenant", "product", "status_of_load"),
+                name="unique_cold_storage_position",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="coldstorageposition",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("product__isnull", True)),
+                fields=("tenant", "status_of_load"),
+                name="unique_cold_storage_position_no_product",
+            ),
+        ),
+        migrations.RunPython(build_positions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,205 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:16
+
+from datetime import date
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, Count, F, Max, When
+
+
+def build_lanes(apps, schema_editor):
+    """Aggregate the existing carrier purchase orders into ranked carrier lanes."""
+    CarrierPurchaseOrder = apps.get_model("purchase_orders", "CarrierPurchaseOrder")
+    CarrierLane = apps.get_model("purchase_orders", "CarrierLane")
+    weight_lbs = Case(
+        When(weight_unit="KG", then=F("total_weight") * Decimal("2.20462")),
+        default=F("total_weight"),
+    )
+    rows = (
+        CarrierPurchaseOrder.objects.filter(pick_up_location__isnull=False, delivery_location__isnull=False)
+        .order_by()
+        .values("tenant", "pick_up_location", "delivery_location", "carrier", "type_of_protein")
+        .annotate(load_count=Count("id"), max_weight=Max(weight_lbs), last_pick_up_date=Max("pick_up_date"))
+    )
+    lanes = {}
+    for row in rows:
+        key = (row["tenant"], row["pick_up_location"], row["delivery_location"], row["type_of_protein"])
+        lanes.setdefault(key, []).append(row)
+    created = []
+    for ranked in lanes.values():
+        ranked.sort(key=lambda row: (-row["load_count"], -(row["last_pick_up_date"] or date.min).toordinal()))
+        created.extend(
+            CarrierLane(
+                tenant_id=row.pop("tenant"),
+                pick_up_location_id=row.pop("pick_up_location"),
+                delivery_location_id=row.pop("delivery_location"),
+                carrier_id=row.pop("carrier"),
+                rank=rank,
+                **row,
+            )
+            for rank, row in enumerate(ranked, 1)
+        )
+    CarrierLane.objects.bulk_create(created, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carriers", "0004_carrier_departments_array_and_more"),
+        ("contacts", "0003_add_parent_entity_fields"),
+        ("locations", "0003_remove_location_contact_email_and_more"),
+        ("plants", "0006_fix_address_fields_blank"),
+        ("products", "0005_add_products_m2m"),
+        ("purchase_orders", "0010_cold_storage_positions"),
+        ("suppliers", "0008_add_preferred_protein_types"),
+        ("tenants", "0006_metadata_lockdown"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CarrierLane",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("modified_on", models.DateTimeField(auto_now=True)),
+                (
+                    "type_of_protein",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("Beef", "Beef"),
+                            ("Chicken", "Chicken"),
+                            ("Pork", "Pork"),
+                            ("Lamb", "Lamb"),
+                            ("Turkey", "Turkey"),
+                            ("Fish", "Fish"),
+                            ("Horse", "Horse"),
+                            ("Other", "Other"),
+                        ],
+                        default="",
+                        help_text="Type of protein hauled",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "load_count",
+                    models.IntegerField(
+                        default=0, help_text="Number of carrier purchase orders"
+                    ),
+                ),
+                (
+                    "max_weight",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        help_text="Heaviest load hauled, in pounds",
+                        max_digits=12,
+                        null=True,
+                        verbose_name="Max Weight (LBS)",
+                    ),
+                ),
+                (
+                    "last_pick_up_date",
+                    models.DateField(
+                        blank=True, help_text="Latest pick up date", null=True
+                    ),
+                ),
+                (
+                    "rank",
+                    models.IntegerField(
+                        default=1,
+                        help_text="Position among the lane's carriers for this protein (1 = most loads, then latest pick up)",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Carrier Lane",
+                "verbose_name_plural": "Carrier Lanes",
+                "ordering": [
+                    "pick_up_location",
+                    "delivery_location",
+                    "type_of_protein",
+                    "rank",
+                ],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                condition=models.Q(
+                    ("carrier__isnull", True), ("status__in", ["pending", "approved"])
+                ),
+                fields=["tenant", "pick_up_date"],
+                name="po_load_board_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="carrierlane",
+            name="carrier",
+            field=models.ForeignKey(
+                help_text="Carrier that hauled on this lane",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lanes",
+                to="carriers.carrier",
+            ),
+        ),
+        migrations.AddField(
+            model_name="carrierlane",
+            name="delivery_location",
+            field=models.ForeignKey(
+                help_text="Delivery location of the lane",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="delivery_carrier_lanes",
+                to="locations.location",
+            ),
+        ),
+        migrations.AddField(
+            model_name="carrierlane",
+            name="pick_up_location",
+            field=models.ForeignKey(
+                help_text="Pick up location of the lane",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="pickup_carrier_lanes",
+                to="locations.location",
+            ),
+        ),
+        migrations.AddField(
+            model_name="carrierlane",
+            name="tenant",
+            field=models.ForeignKey(
+                help_text="Tenant this carrier lane belongs to",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="carrier_lanes",
+                to="tenants.tenant",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="carrierlane",
+            index=models.Index(
+                fields=["tenant", "pick_up_location", "rank"],
+                name="purchase_or_tenant__0fa35b_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="carrierlane",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "tenant",
+                    "pick_up_location",
+                    "delivery_location",
+                    "carrier",
+                    "type_of_protein",
+                ),
+                name="unique_carrier_lane",
+            ),
+        ),
+        migrations.RunPython(build_lanes, migrations.RunPython.noop),
+    ]
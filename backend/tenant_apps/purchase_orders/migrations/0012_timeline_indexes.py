@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("purchase_orders", "0011_load_board"),
+        ("tenants", "0006_metadata_lockdown"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="purchaseorderhistory",
+            index=models.Index(
+                fields=["tenant", "-created_on"], name="purchase_or_tenant__6e9210_idx"
+            ),
+        ),
+    ]
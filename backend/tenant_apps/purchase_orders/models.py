@@ -5,12 +5,16 @@ Defines purchase order entities and related business logic.
 
 Implements tenant ForeignKey field for shared-schema multi-tenancy.
 """
+from datetime import date
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save, pre_save
+from django.db.models import Case, Count, F, Max, Q, Sum, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from apps.tenants.models import Tenant
+from apps.core.bulk import advisory_xact_lock
 from apps.core.models import (
     AccountingPaymentTermsChoices,
     AppointmentMethodChoices,
@@ -327,6 +331,12 @@ class PurchaseOrder(TimestampModel):
         indexes = [
             models.Index(fields=['tenant', 'order_number']),
             models.Index(fields=['tenant', 'order_date']),
+            # Load board: open orders without a carrier by pick up date
+            models.Index(
+                fields=['tenant', 'pick_up_date'],
+                condition=Q(carrier__isnull=True, status__in=['pending', 'approved']),
+                name='po_load_board_idx',
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -626,6 +636,177 @@ class CarrierPurchaseOrder(TimestampModel):
     def __str__(self):
         return f"Carrier PO-{self.our_carrier_po_num or self.id}"
 
+    def save(self, *args, **kwargs):
+        """Save the carrier PO and refresh the carrier lanes it was and is on."""
+        with transaction.atomic():
+            lanes = set()
+            if not self._state.adding:
+                previous = (
+                    CarrierPurchaseOrder.objects.filter(pk=self.pk)
+                    .values_list("pick_up_location_id", "delivery_location_id")
+                    .first()
+                )
+                if previous:
+                    lanes.add(previous)
+            super().save(*args, **kwargs)
+            lanes.add((self.pick_up_location_id, self.delivery_location_id))
+            CarrierLane.refresh(self.tenant_id, lanes)
+
+
+KG_TO_LBS = Decimal("2.20462")
+
+
+def weight_in_lbs(weight, unit):
+    """``weight`` in pounds (None stays None)."""
+    if weight is None:
+        return None
+    return weight * KG_TO_LBS if unit == WeightUnitChoices.KG else weight
+
+
+class CarrierLane(TimestampModel):
+    """
+    What a carrier has hauled per lane: one row per (tenant, pick-up location,
+    delivery location, carrier, protein) with the number of carrier POs, the
+    heaviest load in pounds and the latest pick-up date.
+
+    Recomputed for the affected lanes on every carrier PO save and delete, so
+    the load board reads each lane's candidate carriers with one indexed
+    lookup instead of aggregating the carrier PO history per request;
+    ``rank`` orders a lane's carriers per protein so it can read only the best.
+    Carrier POs without both locations are not on a lane. ``QuerySet.update()``
+    and ``bulk_create()`` bypass this; call ``CarrierLane.rebuild(tenant)``
+    after such bulk changes.
+    """
+    # Use custom manager for multi-tenancy
+    objects = TenantManager()
+
+    # Multi-tenancy
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="carrier_lanes",
+        help_text="Tenant this carrier lane belongs to"
+    )
+
+    pick_up_location = models.ForeignKey(
+        "locations.Location",
+        on_delete=models.CASCADE,
+        related_name="pickup_carrier_lanes",
+        help_text="Pick up location of the lane",
+    )
+    delivery_location = models.ForeignKey(
+        "locations.Location",
+        on_delete=models.CASCADE,
+        related_name="delivery_carrier_lanes",
+        help_text="Delivery location of the lane",
+    )
+    carrier = models.ForeignKey(
+        "carriers.Carrier",
+        on_delete=models.CASCADE,
+        related_name="lanes",
+        help_text="Carrier that hauled on this lane",
+    )
+    type_of_protein = models.CharField(
+        max_length=50,
+        choices=ProteinTypeChoices.choices,
+        blank=True,
+        default="",
+        help_text="Type of protein hauled",
+    )
+
+    load_count = models.IntegerField(default=0, help_text="Number of carrier purchase orders")
+    max_weight = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Max Weight (LBS)",
+        help_text="Heaviest load hauled, in pounds",
+    )
+    last_pick_up_date = models.DateField(null=True, blank=True, help_text="Latest pick up date")
+    rank = models.IntegerField(
+        default=1,
+        help_text="Position among the lane's carriers for this protein (1 = most loads, then latest pick up)",
+    )
+
+    class Meta:
+        ordering = ["pick_up_location", "delivery_location", "type_of_protein", "rank"]
+        verbose_name = "Carrier Lane"
+        verbose_name_plural = "Carrier Lanes"
+        indexes = [
+            # Load board: the best carriers of many lanes
+            models.Index(fields=['tenant', 'pick_up_location', 'rank']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'pick_up_location', 'delivery_location', 'carrier', 'type_of_protein'],
+                name='unique_carrier_lane',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Carrier Lane {self.pick_up_location_id} -> {self.delivery_location_id} ({self.carrier_id})"
+
+    @classmethod
+    def _rows(cls, carrier_pos):
+        weight_lbs = Case(
+            When(weight_unit=WeightUnitChoices.KG, then=F("total_weight") * KG_TO_LBS),
+            default=F("total_weight"),
+        )
+        return (
+            carrier_pos.filter(pick_up_location__isnull=False, delivery_location__isnull=False)
+            .order_by()
+            .values("tenant", "pick_up_location", "delivery_location", "carrier", "type_of_protein")
+            .annotate(load_count=Count("id"), max_weight=Max(weight_lbs), last_pick_up_date=Max("pick_up_date"))
+        )
+
+    @classmethod
+    def _create(cls, rows):
+        lanes = {}
+        for row in rows:
+            key = (row["tenant"], row["pick_up_location"], row["delivery_location"], row["type_of_protein"])
+            lanes.setdefault(key, []).append(row)
+        created = []
+        for ranked in lanes.values():
+            ranked.sort(key=lambda row: (-row["load_count"], -(row["last_pick_up_date"] or date.min).toordinal()))
+            created.extend(
+                cls(
+                    tenant_id=row.pop("tenant"),
+                    pick_up_location_id=row.pop("pick_up_location"),
+                    delivery_location_id=row.pop("delivery_location"),
+                    carrier_id=row.pop("carrier"),
+                    rank=rank,
+                    **row,
+                )
+                for rank, row in enumerate(ranked, 1)
+            )
+        return cls.objects.bulk_create(created, batch_size=1000)
+
+    @classmethod
+    def refresh(cls, tenant_id, lanes):
+        """Recompute the tenant's ``(pick_up_location_id, delivery_location_id)`` lanes."""
+        lane_filter, lock_keys = Q(), []
+        for pick_up_id, delivery_id in lanes:
+            if pick_up_id is not None and delivery_id is not None:
+                lane_filter |= Q(pick_up_location_id=pick_up_id, delivery_location_id=delivery_id)
+                lock_keys.append(f"carrier_lane:{tenant_id}:{pick_up_id}:{delivery_id}")
+        if not lane_filter:
+            return
+        with transaction.atomic():
+            # Concurrent refreshes of a lane would both insert its rows
+            advisory_xact_lock([f"carrier_lane:{tenant_id}"], shared=True)
+            advisory_xact_lock(lock_keys)
+            cls.objects.filter(lane_filter, tenant_id=tenant_id).delete()
+            cls._create(cls._rows(CarrierPurchaseOrder.objects.filter(lane_filter, tenant_id=tenant_id)))
+
+    @classmethod
+    def rebuild(cls, tenant):
+        """Recompute all of ``tenant``'s lanes from its carrier purchase orders."""
+        with transaction.atomic():
+            advisory_xact_lock([f"carrier_lane:{tenant.id}"])
+            cls.objects.filter(tenant=tenant).delete()
+            return cls._create(cls._rows(CarrierPurchaseOrder.objects.filter(tenant=tenant)))
+
 
 class ColdStorageEntry(TimestampModel):
     """Cold Storage Entry model for tracking boxing and cold storage operations."""
@@ -742,11 +923,148 @@ class ColdStorageEntry(TimestampModel):
         verbose_name_plural = "Cold Storage Entries"
         indexes = [
             models.Index(fields=['tenant', 'date_time_stamp_created']),
+            # As-of reconstruction of one product's positions
+            models.Index(fields=['tenant', 'product', 'date_time_stamp_created']),
         ]
 
     def __str__(self):
         return f"Cold Storage Entry-{self.id} ({self.status_of_load})"
 
+    def save(self, *args, **kwargs):
+        """Save the entry and apply the change to its cold storage positions."""
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = ColdStorageEntry.objects.select_for_update().filter(pk=self.pk).first()
+            super().save(*args, **kwargs)
+            ColdStoragePosition.record(previous, self)
+
+
+# Amounts of a cold storage entry totalled by ColdStoragePosition
+POSITION_AMOUNTS = ("finished_weight", "shrink", "boxing_cost", "cold_storage_cost", "total_cost")
+
+
+class ColdStoragePosition(TimestampModel):
+    """
+    What is in cold storage per (tenant, product, status_of_load): the number
+    of entries and the sums of their weights and costs.
+
+    Updated in the same transaction as every entry save and delete, so on-hand
+    weight and cost are a single-row lookup instead of a scan of the entries.
+    Entries without a product are totalled under ``product=None``.
+    ``QuerySet.update()`` and ``bulk_create()`` on entries bypass this; call
+    ``ColdStoragePosition.rebuild(tenant)`` after such bulk changes.
+    """
+    # Use custom manager for multi-tenancy
+    objects = TenantManager()
+
+    # Multi-tenancy
+    tenant = models.ForeignKey(
+        Tenant,
+        on_delete=models.CASCADE,
+        related_name="cold_storage_positions",
+        help_text="Tenant this cold storage position belongs to"
+    )
+
+    product = models.ForeignKey(
+        "products.Product",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="cold_storage_positions",
+        help_text="Product in storage (empty for entries without a product)",
+    )
+    status_of_load = models.CharField(
+        max_length=50,
+        choices=LoadStatusChoices.choices,
+        blank=True,
+        default="",
+        help_text="Load matching status",
+    )
+
+    entry_count = models.IntegerField(default=0, help_text="Number of cold storage entries")
+    finished_weight = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Total finished weight"
+    )
+    shrink = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Total shrink"
+    )
+    boxing_cost = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Total boxing cost"
+    )
+    cold_storage_cost = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Total cold storage cost"
+    )
+    total_cost = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Total cost"
+    )
+
+    class Meta:
+        ordering = ["product", "status_of_load"]
+        verbose_name = "Cold Storage Position"
+        verbose_name_plural = "Cold Storage Positions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'product', 'status_of_load'],
+                condition=Q(product__isnull=False),
+                name='unique_cold_storage_position',
+            ),
+            models.UniqueConstraint(
+                fields=['tenant', 'status_of_load'],
+                condition=Q(product__isnull=True),
+                name='unique_cold_storage_position_no_product',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Cold Storage Position ({self.product_id or 'no product'}, {self.status_of_load or 'no status'})"
+
+    @classmethod
+    def record(cls, before, after):
+        """
+        Move the amounts of entry version ``before`` (None for a new entry)
+        to version ``after`` (None for a deleted entry).
+        """
+        deltas = {}
+        for entry, sign in ((before, -1), (after, 1)):
+            if entry is None:
+                continue
+            key = (entry.tenant_id, entry.product_id, entry.status_of_load)
+            delta = deltas.setdefault(key, dict.fromkeys(("entry_count",) + POSITION_AMOUNTS, 0))
+            delta["entry_count"] += sign
+            for field in POSITION_AMOUNTS:
+                delta[field] += sign * (getattr(entry, field) or Decimal("0.00"))
+
+        for key, delta in deltas.items():
+            if any(delta.values()):
+                cls.adjust(*key, delta)
+
+    @classmethod
+    def adjust(cls, tenant_id, product_id, status_of_load, delta):
+        """Add ``delta`` (entry_count and amounts) to one position."""
+        key = {"tenant_id": tenant_id, "product_id": product_id, "status_of_load": status_of_load}
+        if delta["entry_count"] > 0:
+            cls.objects.get_or_create(**key)
+        # Decrements never create: the position may be going away in the
+        # same cascade (tenant or product deletion)
+        cls.objects.filter(**key).update(**{field: F(field) + value for field, value in delta.items()})
+
+    @classmethod
+    def rebuild(cls, tenant):
+        """Recompute all of ``tenant``'s positions from its entries."""
+        totals = {field: Coalesce(Sum(field), Decimal("0.00")) for field in POSITION_AMOUNTS}
+        rows = (
+            ColdStorageEntry.objects.filter(tenant=tenant)
+            .order_by()
+            .values("product", "status_of_load")
+            .annotate(entry_count=Count("id"), **totals)
+        )
+        with transaction.atomic():
+            cls.objects.filter(tenant=tenant).delete()
+            return cls.objects.bulk_create(
+                cls(tenant=tenant, product_id=row.pop("product"), **row) for row in rows
+            )
+
 
 class PurchaseOrderHistory(TimestampModel):
     """Version history for Purchase Order modifications."""
@@ -790,6 +1108,7 @@ class PurchaseOrderHistory(TimestampModel):
         verbose_name_plural = "Purchase Order Histories"
         indexes = [
             models.Index(fields=["purchase_order", "-created_on"]),
+            models.Index(fields=["tenant", "-created_on"]),
         ]
 
     def __str__(self):
@@ -895,3 +1214,39 @@ def create_purchase_order_history(sender, instance, created, **kwargs):
         changed_by=user,
         change_type=change_type,
     )
+
+
+def _deleting_tenant(origin):
+    """Whether a delete cascades from a tenant, whose positions all go with it."""
+    return getattr(origin, "model", type(origin)) is Tenant
+
+
+@receiver(post_delete, sender=ColdStorageEntry)
+def remove_cold_storage_entry_from_position(sender, instance, **kwargs):
+    """Take a deleted entry (including bulk and cascade deletes) out of its position."""
+    if not _deleting_tenant(kwargs.get("origin")):
+        ColdStoragePosition.record(instance, None)
+
+
+@receiver(post_delete, sender=CarrierPurchaseOrder)
+def remove_carrier_purchase_order_from_lane(sender, instance, **kwargs):
+    """Recompute the lane of a deleted carrier PO (including cascades from its carrier)."""
+    if not _deleting_tenant(kwargs.get("origin")):
+        CarrierLane.refresh(instance.tenant_id, [(instance.pick_up_location_id, instance.delivery_location_id)])
+
+
+@receiver(pre_delete, sender="products.Product")
+def move_cold_storage_positions_to_no_product(sender, instance, **kwargs):
+    """
+    Deleting a product sets its entries' product to NULL without saving them;
+    move the totals of its positions (deleted with it) to the no-product ones.
+    """
+    if _deleting_tenant(kwargs.get("origin")):
+        return
+    for position in ColdStoragePosition.objects.filter(product=instance):
+        ColdStoragePosition.adjust(
+            position.tenant_id,
+            None,
+            position.status_of_load,
+            {field: getattr(position, field) for field in ("entry_count",) + POSITION_AMOUNTS},
+        )
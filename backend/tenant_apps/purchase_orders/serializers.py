@@ -4,12 +4,13 @@ Purchase Orders serializers for ProjectMeats.
 Provides serialization for purchase order API endpoints.
 """
 from rest_framework import serializers
-from tenant_apps.purchase_orders.models import PurchaseOrder, CarrierPurchaseOrder, ColdStorageEntry
+from apps.core.serializers import FieldSelectionMixin
+from tenant_apps.purchase_orders.models import PurchaseOrder, CarrierPurchaseOrder, ColdStorageEntry, ColdStoragePosition
 from tenant_apps.purchase_orders.models import PurchaseOrderHistory
 from tenant_apps.locations.serializers import LocationListSerializer
 
 
-class PurchaseOrderSerializer(serializers.ModelSerializer):
+class PurchaseOrderSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for PurchaseOrder model."""
     
     # Nested location serializers (read-only)
@@ -47,9 +48,16 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
             "modified_on",
         ]
         read_only_fields = ["id", "created_on", "modified_on", "pick_up_location_details", "delivery_location_details"]
+        # Opt-in nested data (?expand=supplier,product,carrier,plant)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+            "product": ("tenant_apps.products.serializers.ProductSerializer", {}),
+            "carrier": ("tenant_apps.carriers.serializers.CarrierSerializer", {}),
+            "plant": ("tenant_apps.plants.serializers.PlantSerializer", {}),
+        }
 
 
-class CarrierPurchaseOrderSerializer(serializers.ModelSerializer):
+class CarrierPurchaseOrderSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for CarrierPurchaseOrder model."""
     
     # Nested location serializers (read-only)
@@ -92,10 +100,17 @@ class CarrierPurchaseOrderSerializer(serializers.ModelSerializer):
             "created_on",
             "modified_on",
         ]
-        read_only_fields = ["id", "date_time_stamp_created", "created_on", "modified_on", "pick_up_location_details", "delivery_location_details"]
+        read_only_fields = ["id", "tenant", "date_time_stamp_created", "created_on", "modified_on", "pick_up_location_details", "delivery_location_details"]
+        # Opt-in nested data (?expand=carrier,supplier,product,plant)
+        expandable_fields = {
+            "carrier": ("tenant_apps.carriers.serializers.CarrierSerializer", {}),
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+            "product": ("tenant_apps.products.serializers.ProductSerializer", {}),
+            "plant": ("tenant_apps.plants.serializers.PlantSerializer", {}),
+        }
 
 
-class ColdStorageEntrySerializer(serializers.ModelSerializer):
+class ColdStorageEntrySerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for ColdStorageEntry model."""
 
     class Meta:
@@ -119,9 +134,29 @@ class ColdStorageEntrySerializer(serializers.ModelSerializer):
             "created_on",
             "modified_on",
         ]
-        read_only_fields = ["id", "date_time_stamp_created", "created_on", "modified_on"]
+        read_only_fields = ["id", "tenant", "date_time_stamp_created", "created_on", "modified_on"]
 
-class PurchaseOrderHistorySerializer(serializers.ModelSerializer):
+
+class ColdStoragePositionSerializer(FieldSelectionMixin, serializers.ModelSerializer):
+    """Serializer for ColdStoragePosition model (read-only totals)."""
+
+    class Meta:
+        model = ColdStoragePosition
+        fields = [
+            "product",
+            "status_of_load",
+            "entry_count",
+            "finished_weight",
+            "shrink",
+            "boxing_cost",
+            "cold_storage_cost",
+            "total_cost",
+            "modified_on",
+        ]
+        read_only_fields = fields
+
+
+class PurchaseOrderHistorySerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for PurchaseOrderHistory model."""
 
     changed_by_username = serializers.CharField(
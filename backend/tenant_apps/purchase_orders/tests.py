@@ -222,11 +222,15 @@ import uuid
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from rest_framework import status
-from tenant_apps.purchase_orders.models import PurchaseOrder, PurchaseOrderHistory
+from rest_framework.authtoken.models import Token
+from tenant_apps.purchase_orders.models import CarrierLane, ColdStoragePosition, PurchaseOrder, PurchaseOrderHistory
+from tenant_apps.locations.models import Location
 from tenant_apps.suppliers.models import Supplier
 from apps.tenants.models import Tenant, TenantUser
 from decimal import Decimal
-from datetime import date
+from datetime import date, datetime, timedelta
+from io import StringIO
+from django.core.management import call_command
 
 
 @skip("Requires refactoring for schema-based multi-tenancy - see SCHEMA_ISOLATION_MIGRATION_COMPLETE.md")
@@ -423,3 +427,302 @@ class PurchaseOrderHistoryTests(APITestCase):
             PurchaseOrderHistory.objects.filter(purchase_order=po2).count(),
             po2_history_count,
         )
+
+
+class ColdStorageLedgerTest(APITestCase):
+    """Cold storage positions follow every entry change."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Cold Co {unique_id}",
+            slug=f"cold-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@cold.com",
+        )
+        self.user = User.objects.create_user(username=f"cold-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+        self.trim = Product.objects.create(
+            tenant=self.tenant, product_code=f"TRIM-{unique_id}", description_of_product_item="50% Beef Trim"
+        )
+        self.brisket = Product.objects.create(
+            tenant=self.tenant, product_code=f"BRSK-{unique_id}", description_of_product_item="Brisket"
+        )
+
+    def entry(self, product, weight, status="Matched", **fields):
+        return ColdStorageEntry.objects.create(
+            tenant=self.tenant,
+            product=product,
+            status_of_load=status,
+            finished_weight=Decimal(weight),
+            total_cost=Decimal("10.00"),
+            **fields,
+        )
+
+    def positions(self):
+        return {
+            (position.product_id, position.status_of_load): (
+                position.entry_count, position.finished_weight, position.total_cost
+            )
+            for position in ColdStoragePosition.objects.filter(tenant=self.tenant, entry_count__gt=0)
+        }
+
+    def assertPositionsMatchRebuild(self):
+        maintained = self.positions()
+        ColdStoragePosition.rebuild(self.tenant)
+        self.assertEqual(maintained, self.positions())
+
+    def test_api_changes_update_positions(self):
+        url = "/api/v1/cold-storage-entries/"
+        first = self.client.post(
+            url, {"product": self.trim.id, "status_of_load": "Matched", "finished_weight": "100.00"}, format="json"
+        )
+        second = self.client.post(
+            url, {"product": self.trim.id, "status_of_load": "Matched", "finished_weight": "50.00"}, format="json"
+        )
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(self.positions(), {(self.trim.id, "Matched"): (2, Decimal("150.00"), Decimal("0.00"))})
+
+        self.client.patch(
+            f"{url}{first.data['id']}/",
+            {"product": self.brisket.id, "status_of_load": "TBD - Not Matched", "total_cost": "12.50"},
+            format="json",
+        )
+        self.client.delete(f"{url}{second.data['id']}/")
+
+        self.assertEqual(
+            self.positions(), {(self.brisket.id, "TBD - Not Matched"): (1, Decimal("100.00"), Decimal("12.50"))}
+        )
+        on_hand = self.client.get("/api/v1/cold-storage-positions/", {"product": self.brisket.id})
+        self.assertEqual(on_hand.status_code, 200)
+        self.assertEqual(on_hand.data["results"][0]["finished_weight"], "100.00")
+        self.assertPositionsMatchRebuild()
+
+    def test_bulk_and_product_deletes(self):
+        self.entry(self.trim, "100.00")
+        self.entry(self.trim, "40.00", status="TBD - Not Matched")
+        self.entry(self.brisket, "70.00")
+        self.entry(self.brisket, "30.00")
+
+        ColdStorageEntry.objects.filter(product=self.trim, status_of_load="Matched").delete()
+        self.brisket.delete()
+
+        self.assertEqual(self.positions(), {
+            (self.trim.id, "TBD - Not Matched"): (1, Decimal("40.00"), Decimal("10.00")),
+            (None, "Matched"): (2, Decimal("100.00"), Decimal("20.00")),
+        })
+        self.assertPositionsMatchRebuild()
+
+    def test_as_of_reconstruction(self):
+        old = self.entry(self.trim, "100.00")
+        ColdStorageEntry.objects.filter(pk=old.pk).update(
+            date_time_stamp_created=timezone.make_aware(datetime(2024, 3, 1, 12, 0))
+        )
+        self.entry(self.trim, "25.00")
+
+        march = self.client.get("/api/v1/cold-storage-positions/as-of/", {"date": "2024-03-01"})
+        february = self.client.get("/api/v1/cold-storage-positions/as-of/", {"date": "2024-02-29"})
+        invalid = self.client.get("/api/v1/cold-storage-positions/as-of/", {"date": "last week"})
+
+        self.assertEqual(len(march.data), 1)
+        self.assertEqual(march.data[0]["entry_count"], 1)
+        self.assertEqual(march.data[0]["finished_weight"], "100.00")
+        self.assertEqual(february.data, [])
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_invalid_product_filter(self):
+        for url in ("/api/v1/cold-storage-entries/", "/api/v1/cold-storage-positions/"):
+            response = self.client.get(url, {"product": "abc"})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("?product=", response.data["details"][0])
+
+    def test_rebuild_command(self):
+        self.entry(self.trim, "100.00")
+        self.entry(self.trim, "40.00")
+        ColdStoragePosition.objects.filter(tenant=self.tenant).delete()
+
+        out = StringIO()
+        call_command("build_cold_storage_positions", tenant=self.tenant.slug, stdout=out)
+
+        self.assertEqual(self.positions(), {(self.trim.id, "Matched"): (2, Decimal("140.00"), Decimal("20.00"))})
+        self.assertIn("1 positions", out.getvalue())
+
+
+class LoadBoardTest(APITestCase):
+    """Open orders are matched to carriers from their lane history."""
+
+    def setUp(self):
+        unique_id = uuid.uuid4().hex[:8]
+        self.tenant = Tenant.objects.create(
+            name=f"Board Co {unique_id}",
+            slug=f"board-co-{unique_id}",
+            contact_email=f"admin-{unique_id}@board.com",
+        )
+        self.user = User.objects.create_user(username=f"board-{unique_id}", password="testpass123")
+        TenantUser.objects.create(tenant=self.tenant, user=self.user, role="admin")
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}", HTTP_X_TENANT_ID=str(self.tenant.id))
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name=f"Board Supplier {unique_id}")
+        self.customer = Customer.objects.create(tenant=self.tenant, name=f"Board Customer {unique_id}")
+        self.plant, self.dock, self.store = (
+            Location.objects.create(tenant=self.tenant, name=name) for name in ("Plant", "Dock", "Store")
+        )
+        self.start = date(2024, 6, 3)
+
+    def carrier(self, name, **fields):
+        return Carrier.objects.create(tenant=self.tenant, name=name, code=uuid.uuid4().hex[:8], **fields)
+
+    def haul(self, carrier, weight, protein="Beef", pick_up=None, delivery=None, **fields):
+        return CarrierPurchaseOrder.objects.create(
+            tenant=self.tenant,
+            carrier=carrier,
+            supplier=self.supplier,
+            pick_up_location=pick_up or self.plant,
+            delivery_location=delivery or self.dock,
+            pick_up_date=self.start - timedelta(days=30),
+            type_of_protein=protein,
+            total_weight=Decimal(weight),
+            **fields,
+        )
+
+    def order(self, number, days=0, protein="Beef", weight="20000", **fields):
+        fields.setdefault("pick_up_location", self.plant)
+        fields.setdefault("delivery_location", self.dock)
+        return PurchaseOrder.objects.create(
+            tenant=self.tenant,
+            order_number=number,
+            supplier=self.supplier,
+            order_date=self.start,
+            pick_up_date=self.start + timedelta(days=days),
+            type_of_protein=protein,
+            total_weight=Decimal(weight),
+            **fields,
+        )
+
+    def lanes(self):
+        return sorted(
+            CarrierLane.objects.filter(tenant=self.tenant).values_list(
+                "pick_up_location", "delivery_location", "carrier", "type_of_protein",
+                "load_count", "max_weight", "last_pick_up_date", "rank",
+            )
+        )
+
+    def board(self, **params):
+        return self.client.get(
+            "/api/v1/carrier-purchase-orders/load-board/", {"start": self.start.isoformat(), **params}
+        )
+
+    def test_board_proposes_lane_carriers(self):
+        regular = self.carrier("Regular Reefer")
+        small = self.carrier("Small Box")
+        pork = self.carrier("Pork Haulers")
+        retired = self.carrier("Retired", is_active=False)
+        for _ in range(3):
+            self.haul(regular, "40000")
+        self.haul(regular, "42000", pick_up=self.plant, delivery=self.store)
+        self.haul(small, "10000")
+        self.haul(pork, "45000", protein="Pork")
+        self.haul(pork, "45000", protein="Pork")
+        self.haul(retired, "50000")
+
+        beef = self.order("PO-1", days=1)
+        light = self.order("PO-2", days=2, weight="5000", protein="")
+        self.order("PO-3", days=1, carrier=small)
+        self.order("PO-4", days=1, status="delivered")
+        self.order("PO-5", days=9)
+        self.haul(regular, "1000", linked_order=self.order("PO-6"))
+        unmatched = self.order("PO-7", delivery_location=self.plant)
+        sales = SalesOrder.objects.create(
+            tenant=self.tenant,
+            our_sales_order_num="SO-1",
+            supplier=self.supplier,
+            customer=self.customer,
+            pick_up_location=self.plant,
+            delivery_location=self.dock,
+            pick_up_date=self.start,
+            product=Product.objects.create(
+                tenant=self.tenant,
+                product_code=f"PB-{self.tenant.slug}",
+                description_of_product_item="Pork Belly",
+                type_of_protein="Pork",
+            ),
+        )
+
+        response = self.board(days=7)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        board = {order["number"]: order for order in response.data["orders"]}
+        self.assertEqual(list(board), ["PO-7", "SO-1", "PO-1", "PO-2"])
+        self.assertEqual(response.data["end"], self.start + timedelta(days=6))
+        self.assertEqual(board["PO-1"]["id"], beef.id)
+        self.assertEqual([c["carrier_name"] for c in board["PO-1"]["candidates"]], ["Regular Reefer"])
+        self.assertEqual(board["PO-1"]["candidates"][0]["load_count"], 4)
+        # No protein: every active carrier on the lane, most loads first
+        self.assertEqual(
+            [c["carrier"] for c in board["PO-2"]["candidates"]], [regular.id, pork.id, small.id]
+        )
+        self.assertEqual(board["PO-2"]["id"], light.id)
+        self.assertEqual(board["SO-1"]["order_type"], "sales_order")
+        self.assertEqual(board["SO-1"]["id"], sales.id)
+        self.assertEqual([c["carrier"] for c in board["SO-1"]["candidates"]], [pork.id])
+        self.assertEqual(board["PO-7"]["id"], unmatched.id)
+        self.assertEqual(board["PO-7"]["candidates"], [])
+        self.assertEqual(len(self.board(days=7, limit=1).data["orders"][3]["candidates"]), 1)
+
+    def test_lanes_follow_carrier_po_changes(self):
+        carrier = self.carrier("Lane Carrier")
+        first = self.haul(carrier, "1000", weight_unit="KG")
+        second = self.haul(carrier, "3000")
+        self.assertEqual(
+            self.lanes(),
+            [(self.plant.id, self.dock.id, carrier.id, "Beef", 2, Decimal("3000.00"), first.pick_up_date, 1)],
+        )
+
+        second.delivery_location = self.store
+        second.save()
+        first.delete()
+        self.haul(carrier, "500", protein="Pork", delivery=self.store)
+        busier = self.carrier("Busier Carrier")
+        self.haul(busier, "800", delivery=self.store)
+        self.haul(busier, "800", delivery=self.store)
+
+        maintained = self.lanes()
+        self.assertEqual([lane[1] for lane in maintained], [self.store.id] * 3)
+        ranks = {(lane[2], lane[3]): lane[-1] for lane in maintained}
+        self.assertEqual(ranks, {(carrier.id, "Beef"): 2, (carrier.id, "Pork"): 1, (busier.id, "Beef"): 1})
+        CarrierLane.rebuild(self.tenant)
+        self.assertEqual(self.lanes(), maintained)
+        CarrierLane.objects.filter(tenant=self.tenant).delete()
+        call_command("build_carrier_lanes", tenant=self.tenant.slug, stdout=StringIO())
+        self.assertEqual(self.lanes(), maintained)
+
+        busier.delete()
+        carrier.delete()
+        self.assertEqual(self.lanes(), [])
+
+    def test_carrier_po_api_and_board_validation(self):
+        carrier = self.carrier("API Carrier")
+        response = self.client.post(
+            "/api/v1/carrier-purchase-orders/",
+            {
+                "carrier": carrier.id,
+                "supplier": self.supplier.id,
+                "pick_up_location": self.plant.id,
+                "delivery_location": self.dock.id,
+                "total_weight": "1000.00",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(CarrierLane.objects.get(tenant=self.tenant).load_count, 1)
+        listed = self.client.get("/api/v1/carrier-purchase-orders/", {"carrier": carrier.id})
+        self.assertEqual(len(listed.data["results"]), 1)
+        for params in ({"carrier": "abc"}, {"pick_up_location": "-1"}, {"linked_order": "1" * 20}):
+            response = self.client.get("/api/v1/carrier-purchase-orders/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+        for params in ({"start": "June 3"}, {"days": "0"}, {"days": "x"}, {"limit": "11"}):
+            response = self.board(**params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertIn("error", response.data)
@@ -1,10 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from tenant_apps.purchase_orders.views import PurchaseOrderViewSet
+from tenant_apps.purchase_orders.views import (
+    CarrierPurchaseOrderViewSet,
+    ColdStorageEntryViewSet,
+    ColdStoragePositionViewSet,
+    PurchaseOrderViewSet,
+)
 
 # Create a router and register our viewsets
 router = DefaultRouter()
 router.register(r"purchase-orders", PurchaseOrderViewSet)
+router.register(r"carrier-purchase-orders", CarrierPurchaseOrderViewSet)
+router.register(r"cold-storage-entries", ColdStorageEntryViewSet)
+router.register(r"cold-storage-positions", ColdStoragePositionViewSet)
 
 # The API URLs are now determined automatically by the router
 urlpatterns = [
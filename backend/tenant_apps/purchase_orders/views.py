@@ -9,28 +9,69 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from django.core.exceptions import ValidationError
-from tenant_apps.purchase_orders.models import PurchaseOrder, PurchaseOrderHistory
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from tenant_apps.purchase_orders.load_board import LANE_DEPTH, build_load_board
+from tenant_apps.purchase_orders.models import (
+    POSITION_AMOUNTS,
+    CarrierPurchaseOrder,
+    ColdStorageEntry,
+    ColdStoragePosition,
+    PurchaseOrder,
+    PurchaseOrderHistory,
+)
 from tenant_apps.purchase_orders.serializers import (
+    CarrierPurchaseOrderSerializer,
+    ColdStorageEntrySerializer,
+    ColdStoragePositionSerializer,
     PurchaseOrderSerializer,
     PurchaseOrderHistorySerializer,
 )
 import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from apps.core.mixins import CSVImportMixin, ValuesListMixin
 
 logger = logging.getLogger(__name__)
 
 
-class PurchaseOrderViewSet(viewsets.ModelViewSet):
+def _id_filters(params, names):
+    """
+    ``{name: id}`` for each of the ``names`` query parameters given; raises
+    ``ValidationError`` (a 400) unless every one is a valid id.
+    """
+    filters = {}
+    for name in names:
+        value = params.get(name)
+        if not value:
+            continue
+        try:
+            filters[name] = int(value)
+            valid = 0 < filters[name] < 2 ** 63
+        except ValueError:
+            valid = False
+        if not valid:
+            raise ValidationError(f"?{name}= must be a record id, got '{value}'")
+    return filters
+
+
+class PurchaseOrderViewSet(CSVImportMixin, ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for managing purchase orders."""
 
     queryset = PurchaseOrder.objects.all()
     serializer_class = PurchaseOrderSerializer
+    csv_import_entity = 'purchase_orders'
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Filter purchase orders by current tenant."""
         if hasattr(self.request, "tenant") and self.request.tenant:
-            return PurchaseOrder.objects.for_tenant(self.request.tenant)
+            return PurchaseOrder.objects.for_tenant(self.request.tenant).select_related(
+                'pick_up_location__supplier', 'pick_up_location__customer',
+                'delivery_location__supplier', 'delivery_location__customer',
+            )
         return PurchaseOrder.objects.none()
 
     def perform_create(self, serializer):
@@ -167,3 +208,146 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
 
         serializer = PurchaseOrderHistorySerializer(history_entries, many=True)
         return Response(serializer.data)
+
+
+class CarrierPurchaseOrderViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for carrier purchase orders and the load board.
+
+    GET /api/v1/carrier-purchase-orders/load-board/?start=2024-06-03&days=7&limit=3
+    lists the open orders without a carrier picking up in that window, each
+    with up to ``limit`` carriers proposed from their lane history (see
+    load_board.py).
+    """
+
+    queryset = CarrierPurchaseOrder.objects.all()
+    serializer_class = CarrierPurchaseOrderSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Filter carrier POs by tenant and optional carrier, lane and linked orders."""
+        if not hasattr(self.request, "tenant") or not self.request.tenant:
+            return CarrierPurchaseOrder.objects.none()
+
+        filters = _id_filters(
+            self.request.query_params,
+            ("carrier", "pick_up_location", "delivery_location", "linked_order", "sales_order"),
+        )
+        return CarrierPurchaseOrder.objects.filter(tenant=self.request.tenant, **filters).select_related(
+            'pick_up_location__supplier', 'pick_up_location__customer',
+            'delivery_location__supplier', 'delivery_location__customer',
+        )
+
+    def perform_create(self, serializer):
+        """Auto-assign tenant on carrier PO creation."""
+        serializer.save(tenant=self.request.tenant)
+
+    @action(detail=False, methods=["get"], url_path="load-board")
+    def load_board(self, request):
+        """Open orders picking up from ``?start=`` (default today) for ``?days=`` days."""
+        params = request.query_params
+        try:
+            start = parse_date(params["start"]) if params.get("start") else timezone.localdate()
+            days = int(params.get("days", 7))
+            limit = int(params.get("limit", 3))
+        except ValueError:
+            start = None
+        if start is None or not 1 <= days <= 60 or not 1 <= limit <= LANE_DEPTH:
+            return Response(
+                {
+                    "error": "Invalid load board window",
+                    "details": f"Pass ?start= as YYYY-MM-DD, ?days= from 1 to 60 and ?limit= from 1 to {LANE_DEPTH}",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        end = start + timedelta(days=days - 1)
+        orders = build_load_board(request.tenant, start, end, limit) if getattr(request, "tenant", None) else []
+        return Response({"start": start, "end": end, "count": len(orders), "orders": orders})
+
+
+class ColdStorageEntryViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for cold storage entries.
+
+    Every create, update and delete also updates the entry's
+    ``ColdStoragePosition`` in the same transaction.
+    """
+
+    queryset = ColdStorageEntry.objects.all()
+    serializer_class = ColdStorageEntrySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Filter entries by tenant and optional product, status and supplier PO."""
+        if not hasattr(self.request, "tenant") or not self.request.tenant:
+            return ColdStorageEntry.objects.none()
+
+        params = self.request.query_params
+        queryset = ColdStorageEntry.objects.filter(
+            tenant=self.request.tenant, **_id_filters(params, ("product", "supplier_po"))
+        )
+        if params.get("status_of_load"):
+            queryset = queryset.filter(status_of_load=params["status_of_load"])
+        return queryset
+
+    def perform_create(self, serializer):
+        """Auto-assign tenant on entry creation."""
+        serializer.save(tenant=self.request.tenant)
+
+
+class ColdStoragePositionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    What is on hand in cold storage per product and load status.
+
+    GET /api/v1/cold-storage-positions/?product={id}&status_of_load=Matched
+    reads the maintained totals (one indexed row per product and status).
+    GET /api/v1/cold-storage-positions/as-of/?date=2024-06-30 reconstructs
+    them from the entries created up to that date or datetime.
+    """
+
+    queryset = ColdStoragePosition.objects.all()
+    serializer_class = ColdStoragePositionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def _filter(self, queryset):
+        queryset = queryset.filter(**_id_filters(self.request.query_params, ("product",)))
+        status_of_load = self.request.query_params.get("status_of_load")
+        if status_of_load is not None:
+            queryset = queryset.filter(status_of_load=status_of_load)
+        return queryset
+
+    def get_queryset(self):
+        """Non-empty positions of the tenant."""
+        if not hasattr(self.request, "tenant") or not self.request.tenant:
+            return ColdStoragePosition.objects.none()
+        return self._filter(ColdStoragePosition.objects.filter(tenant=self.request.tenant, entry_count__gt=0))
+
+    @action(detail=False, methods=["get"], url_path="as-of")
+    def as_of(self, request):
+        """Positions as of ``?date=`` (a date includes that whole day)."""
+        value = request.query_params.get("date", "")
+        try:
+            day = parse_date(value)
+            as_of = datetime.combine(day, time.max) if day else parse_datetime(value)
+        except ValueError:
+            as_of = None
+        if as_of is None:
+            return Response(
+                {"error": "Invalid date", "details": "Pass ?date= as YYYY-MM-DD or an ISO 8601 datetime"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if timezone.is_naive(as_of):
+            as_of = timezone.make_aware(as_of)
+        if not getattr(request, "tenant", None):
+            return Response([])
+
+        totals = {field: Coalesce(Sum(field), Decimal("0.00")) for field in POSITION_AMOUNTS}
+        rows = (
+            self._filter(ColdStorageEntry.objects.filter(tenant=request.tenant, date_time_stamp_created__lte=as_of))
+            .order_by()
+            .values("product", "status_of_load")
+            .annotate(entry_count=Count("id"), **totals)
+            .order_by("product", "status_of_load")
+        )
+        positions = [ColdStoragePosition(product_id=row.pop("product"), **row) for row in rows]
+        return Response(self.get_serializer(positions, many=True).data)
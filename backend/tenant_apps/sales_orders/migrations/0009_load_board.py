@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carriers", "0004_carrier_departments_array_and_more"),
+        ("contacts", "0003_add_parent_entity_fields"),
+        ("customers", "0006_add_products_m2m"),
+        ("locations", "0003_remove_location_contact_email_and_more"),
+        ("plants", "0006_fix_address_fields_blank"),
+        ("products", "0005_add_products_m2m"),
+        ("sales_orders", "0008_alter_salesorder_our_sales_order_num_and_more"),
+        ("suppliers", "0008_add_preferred_protein_types"),
+        ("tenants", "0006_metadata_lockdown"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="salesorder",
+            index=models.Index(
+                condition=models.Q(
+                    ("carrier__isnull", True), ("status__in", ["pending", "confirmed"])
+                ),
+                fields=["tenant", "pick_up_date"],
+                name="so_load_board_idx",
+            ),
+        ),
+    ]
@@ -6,6 +6,7 @@ Defines sales order entities and related business logic.
 Implements tenant ForeignKey field for shared-schema multi-tenancy.
 """
 from django.db import models
+from django.db.models import Q
 from apps.tenants.models import Tenant
 from apps.core.models import (
     CarrierReleaseFormatChoices,
@@ -206,6 +207,12 @@ class SalesOrder(TimestampModel):
         verbose_name_plural = "Sales Orders"
         indexes = [
             models.Index(fields=['tenant', 'our_sales_order_num']),
+            # Load board: open orders without a carrier by pick up date
+            models.Index(
+                fields=['tenant', 'pick_up_date'],
+                condition=Q(carrier__isnull=True, status__in=['pending', 'confirmed']),
+                name='so_load_board_idx',
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -2,11 +2,12 @@
 Serializers for Sales Orders app.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from .models import SalesOrder
 from tenant_apps.locations.serializers import LocationListSerializer
 
 
-class SalesOrderSerializer(serializers.ModelSerializer):
+class SalesOrderSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for SalesOrder model."""
     
     supplier_name = serializers.CharField(source="supplier.name", read_only=True)
@@ -57,3 +58,11 @@ class SalesOrderSerializer(serializers.ModelSerializer):
             "modified_on",
         ]
         read_only_fields = ["id", "date_time_stamp", "created_on", "modified_on", "pick_up_location_details", "delivery_location_details"]
+        # Opt-in nested data (?expand=supplier,customer,carrier,product,plant)
+        expandable_fields = {
+            "supplier": ("tenant_apps.suppliers.serializers.SupplierSerializer", {}),
+            "customer": ("tenant_apps.customers.serializers.CustomerSerializer", {}),
+            "carrier": ("tenant_apps.carriers.serializers.CarrierSerializer", {}),
+            "product": ("tenant_apps.products.serializers.ProductSerializer", {}),
+            "plant": ("tenant_apps.plants.serializers.PlantSerializer", {}),
+        }
@@ -13,21 +13,27 @@ from django.utils import timezone
 from tenant_apps.sales_orders.models import SalesOrder
 from tenant_apps.sales_orders.serializers import SalesOrderSerializer
 import logging
+from apps.core.mixins import CSVImportMixin
 
 logger = logging.getLogger(__name__)
 
 
-class SalesOrderViewSet(viewsets.ModelViewSet):
+class SalesOrderViewSet(CSVImportMixin, viewsets.ModelViewSet):
     """ViewSet for managing sales orders."""
 
     queryset = SalesOrder.objects.all()
     serializer_class = SalesOrderSerializer
+    csv_import_entity = 'sales_orders'
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """Filter sales orders by current tenant."""
         if hasattr(self.request, "tenant") and self.request.tenant:
-            return SalesOrder.objects.for_tenant(self.request.tenant)
+            return SalesOrder.objects.for_tenant(self.request.tenant).select_related(
+                'supplier', 'customer', 'carrier', 'product',
+                'pick_up_location__supplier', 'pick_up_location__customer',
+                'delivery_location__supplier', 'delivery_location__customer',
+            )
         return SalesOrder.objects.none()
 
     def perform_create(self, serializer):
@@ -4,11 +4,12 @@ Suppliers serializers for ProjectMeats.
 Provides serialization for supplier API endpoints.
 """
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionMixin
 from tenant_apps.suppliers.models import Supplier
 from tenant_apps.locations.serializers import LocationListSerializer
 
 
-class SupplierSerializer(serializers.ModelSerializer):
+class SupplierSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """Serializer for Supplier model."""
     
     # ArrayField serialization
@@ -17,9 +18,6 @@ class SupplierSerializer(serializers.ModelSerializer):
         required=False,
         allow_empty=True,
     )
-    
-    # Nested locations (via reverse FK)
-    locations = LocationListSerializer(many=True, read_only=True)
 
     class Meta:
         model = Supplier
@@ -57,7 +55,6 @@ class SupplierSerializer(serializers.ModelSerializer):
             "net_or_catch",
             "departments",
             "departments_array",
-            "locations",
             "accounting_terms",
             "accounting_line_of_credit",
             "credit_app_sent",
@@ -65,7 +62,13 @@ class SupplierSerializer(serializers.ModelSerializer):
             "created_on",
             "modified_on",
         ]
-        read_only_fields = ["id", "created_on", "modified_on", "locations"]
+        read_only_fields = ["id", "created_on", "modified_on"]
+        # Opt-in nested data (?expand=locations,contacts,plant)
+        expandable_fields = {
+            "locations": (LocationListSerializer, {"source": "supplier_locations", "many": True}),
+            "contacts": ("tenant_apps.contacts.serializers.ContactSerializer", {"many": True}),
+            "plant": ("tenant_apps.plants.serializers.PlantSerializer", {}),
+        }
 
     def validate_name(self, value):
         """Validate supplier name is provided and is a valid string."""
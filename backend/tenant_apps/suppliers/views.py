@@ -22,11 +22,12 @@ from tenant_apps.suppliers.serializers import SupplierSerializer
 from apps.tenants.models import TenantUser
 import logging
 from django.utils import timezone
+from apps.core.mixins import CSVImportMixin
 
 logger = logging.getLogger(__name__)
 
 
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(CSVImportMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing suppliers with strict tenant isolation.
     
@@ -38,6 +39,7 @@ class SupplierViewSet(viewsets.ModelViewSet):
 
     queryset = Supplier.objects.all()
     serializer_class = SupplierSerializer
+    csv_import_entity = 'suppliers'
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -53,7 +55,9 @@ class SupplierViewSet(viewsets.ModelViewSet):
         """
         # Use tenant from middleware
         if hasattr(self.request, 'tenant') and self.request.tenant:
-            return Supplier.objects.for_tenant(self.request.tenant)
+            return Supplier.objects.for_tenant(self.request.tenant).prefetch_related(
+                'proteins', 'contacts', 'products'
+            )
         
         # No tenant = no data (security)
         logger.warning(
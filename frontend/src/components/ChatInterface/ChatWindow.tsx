@@ -39,7 +39,7 @@ const ChatWindow: React.FC<ChatWindowProps> = ({ sessionId, onSessionChange }) =
         ]);
 
         setSession(sessionData);
-        setMessages(messagesData);
+        setMessages([...messagesData.results].reverse());
         onSessionChange?.(sessionData);
       } catch (err) {
         console.error('Error loading session:', err);
@@ -90,7 +90,7 @@ const ChatWindow: React.FC<ChatWindowProps> = ({ sessionId, onSessionChange }) =
       // Reload messages to get the latest
       if (response.session_id) {
         const updatedMessages = await chatSessionsApi.getMessages(response.session_id);
-        setMessages(updatedMessages);
+        setMessages([...updatedMessages.results].reverse());
       }
     } catch (err) {
       console.error('Error sending message:', err);
@@ -36,6 +36,9 @@ interface ScheduledCall {
   description: string;
   scheduled_for: string;
   duration_minutes: number;
+  recurrence?: 'none' | 'daily' | 'weekly' | 'monthly';
+  recurrence_interval?: number;
+  recurrence_until?: string | null;
   call_purpose: string;
   outcome: string;
   is_completed: boolean;
@@ -79,6 +79,8 @@ export interface ChatSession {
   created_on: string;
   modified_on: string;
   message_count: number;
+  /** Rolling summary of the messages older than the assistant's history window */
+  summary?: string;
 }
 
 export interface ChatMessage {
@@ -92,6 +94,13 @@ export interface ChatMessage {
   modified_on: string;
 }
 
+/** A cursor-paginated page of messages, newest first */
+export interface ChatMessagePage {
+  next: string | null;
+  previous: string | null;
+  results: ChatMessage[];
+}
+
 export interface ChatRequest {
   message: string;
   session_id?: string;
@@ -106,6 +115,21 @@ export interface ChatResponse {
   metadata?: Record<string, unknown>;
 }
 
+export interface ChatStreamHandlers {
+  /** Called once the session is known, before any reply text */
+  onStart?: (sessionId: string) => void;
+  /** Called with each chunk of the reply as it is generated */
+  onDelta?: (content: string) => void;
+}
+
+export interface ChatStreamDone {
+  session_id: string;
+  message_id: string;
+  processing_time: number;
+  time_to_first_chunk?: number;
+  metadata?: Record<string, unknown>;
+}
+
 export interface DocumentProcessingRequest {
   document_id: string;
   session_id?: string;
@@ -142,6 +166,59 @@ export const chatApi = {
     });
   },
 
+  /**
+   * Send a message and stream the AI response as server-sent events.
+   * Resolves with the final `done` event once the reply has been saved.
+   */
+  streamMessage: async (
+    data: ChatRequest,
+    handlers: ChatStreamHandlers = {}
+  ): Promise<ChatStreamDone> => {
+    const token = localStorage.getItem('authToken');
+    const tenantId = localStorage.getItem('tenantId');
+    const response = await fetch(`${API_BASE_URL}/ai-assistant/ai-chat/stream/`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Accept: 'text/event-stream',
+        ...(token ? { Authorization: `Token ${token}` } : {}),
+        ...(tenantId ? { 'X-Tenant-ID': tenantId } : {}),
+      },
+      body: JSON.stringify(data),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`API request failed: ${response.status} ${response.statusText}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        let event = 'message';
+        let payload = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) payload += line.slice(6);
+        }
+        const parsed = payload ? JSON.parse(payload) : {};
+        if (event === 'start') handlers.onStart?.(parsed.session_id);
+        else if (event === 'delta') handlers.onDelta?.(parsed.content);
+        else if (event === 'done') return parsed as ChatStreamDone;
+        else if (event === 'error') throw new Error(parsed.error || 'Failed to generate response');
+      }
+    }
+    throw new Error('Chat stream ended before the reply completed');
+  },
+
   /**
    * Process a document with AI
    * Fixed endpoint: /ai-assistant/ai-chat/process_document/ (from PR #63)
@@ -200,10 +277,12 @@ export const chatSessionsApi = {
   },
 
   /**
-   * Get messages for a specific session
+   * Get the most recent messages of a session, newest first.
+   * Pass the `cursor` parameter of a page's `next` URL to load older messages.
    */
-  getMessages: async (sessionId: string): Promise<ChatMessage[]> => {
-    return apiRequest<ChatMessage[]>(`/ai-assistant/ai-sessions/${sessionId}/messages/`);
+  getMessages: async (sessionId: string, cursor?: string): Promise<ChatMessagePage> => {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    return apiRequest<ChatMessagePage>(`/ai-assistant/ai-sessions/${sessionId}/messages/${query}`);
   },
 };
 
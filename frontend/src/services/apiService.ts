@@ -252,7 +252,31 @@ export interface AccountsReceivable {
 }
 
 // API Service Class
+export interface BatchResponse<T = unknown> {
+  id: string | number;
+  status: number;
+  body: T;
+}
+
 export class ApiService {
+  // Batched GETs: one round trip, authentication and tenant resolved once.
+  // Keys name the results; paths are relative to the API base, e.g.
+  // { suppliers: '/suppliers/?fields=id,name', carriers: '/carriers/' }.
+  async batchGet(
+    requests: Record<string, string>,
+    parallel = false
+  ): Promise<Record<string, BatchResponse>> {
+    const response = await apiClient.post('/batch/', {
+      requests: Object.entries(requests).map(([id, path]) => ({ id, path: `/api/v1${path}` })),
+      parallel,
+    });
+    const results: Record<string, BatchResponse> = {};
+    for (const item of response.data.responses as BatchResponse[]) {
+      results[String(item.id)] = item;
+    }
+    return results;
+  }
+
   // Suppliers
   async getSuppliers(): Promise<Supplier[]> {
     const response = await apiClient.get('/suppliers/');
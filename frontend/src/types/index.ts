@@ -103,6 +103,9 @@ export interface Location {
   state_province: string;
   zip_postal_code: string;
   country: string;
+  latitude?: string | null;
+  longitude?: string | null;
+  geocoded_zip?: string;
   contact_name?: string;
   contact_phone?: string;
   contact_email?: string;
@@ -124,6 +127,9 @@ export interface LocationListItem {
   location_type: string;
   city: string;
   state_province: string;
+  latitude?: string | null;
+  longitude?: string | null;
+  distance_miles?: number;
 }
 
 /**
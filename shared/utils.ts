@@ -235,4 +235,80 @@ export const isNetworkError = (error: unknown): boolean => {
            !navigator?.onLine;
   }
   return !navigator?.onLine;
-};
\ No newline at end of file
+};
+
+/**
+ * Columnar list responses (`?format=columnar` or the
+ * COLUMNAR_MEDIA_TYPE Accept header). Rows are arrays ordered like
+ * `columns`; values of columns listed in `dictionaries` are indexes into
+ * that column's dictionary. Paginated lists also carry count/next/previous.
+ */
+export const COLUMNAR_MEDIA_TYPE = 'application/vnd.projectmeats.columnar+json';
+
+export interface ColumnarPayload {
+  columns: string[];
+  rows: unknown[][];
+  dictionaries: Record<string, unknown[]>;
+  count?: number;
+  next?: string | null;
+  previous?: string | null;
+}
+
+export const isColumnarPayload = (data: unknown): data is ColumnarPayload => {
+  return (
+    typeof data === 'object' &&
+    data !== null &&
+    Array.isArray((data as ColumnarPayload).columns) &&
+    Array.isArray((data as ColumnarPayload).rows)
+  );
+};
+
+/**
+ * Decode a columnar payload back into row objects. Keys the server left
+ * out of a row come back as null. Building objects gives back most of the
+ * parse-time saving; large grids should read cells with columnarReader.
+ */
+export const decodeColumnar = <T = Record<string, unknown>>(payload: ColumnarPayload): T[] => {
+  const { columns, rows, dictionaries } = payload;
+  const lookups = columns.map((column) => dictionaries[column]);
+  const items = new Array<T>(rows.length);
+  for (let r = 0; r < rows.length; r++) {
+    const row = rows[r];
+    const item: Record<string, unknown> = {};
+    for (let c = 0; c < columns.length; c++) {
+      const value = row[c];
+      const lookup = lookups[c];
+      item[columns[c]] = lookup !== undefined && value !== null ? lookup[value as number] : value;
+    }
+    items[r] = item as T;
+  }
+  return items;
+};
+
+/**
+ * Read cells of a columnar payload without materializing row objects.
+ */
+export const columnarReader = (payload: ColumnarPayload) => {
+  const { columns, rows, dictionaries } = payload;
+  const positions = new Map<string, number>(columns.map((column, index) => [column, index] as [string, number]));
+  return {
+    length: rows.length,
+    columns,
+    get: (rowIndex: number, column: string): unknown => {
+      const index = positions.get(column);
+      if (index === undefined) return null;
+      const value = rows[rowIndex][index];
+      const lookup = dictionaries[column];
+      return lookup !== undefined && value !== null ? lookup[value as number] : value;
+    },
+  };
+};
+
+/**
+ * Append `format=columnar` (and optionally `page_size`) to a list URL.
+ */
+export const withColumnarFormat = (url: string, pageSize?: number): string => {
+  const separator = url.includes('?') ? '&' : '?';
+  const pageParam = pageSize ? `&page_size=${pageSize}` : '';
+  return `${url}${separator}format=columnar${pageParam}`;
+};